@@ -0,0 +1,392 @@
+"""
+Admission control for zone analyses.
+
+Every analysis request is weighed against the remaining daily budget, the
+expected wait in the analysis queue and the recent health of each model
+tier before it is queued. A request is admitted at the model tier its
+priority asks for, downgraded to a cheaper tier, deferred for a while or
+dropped. Model tiers are the priority hints the AI coordinator uses to pick
+a model ("manual" for the detailed model, "scheduled" for the fast one,
+"local" for the local model).
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Deque, Dict, List, Optional
+
+from .analysis_queue import AnalysisPriority
+
+
+class AdmissionAction(Enum):
+    """What happens to an analysis request."""
+    ADMIT = "admit"
+    DOWNGRADE = "downgrade"
+    DEFER = "defer"
+    DROP = "drop"
+
+
+@dataclass
+class AdmissionDecision:
+    """Outcome of weighing one analysis request."""
+    action: AdmissionAction
+    reason: str
+    model_tier: Optional[str] = None
+    estimated_cost: float = 0.0
+    defer_seconds: float = 0.0
+
+    @property
+    def queued(self) -> bool:
+        """Whether the request goes into the analysis queue now."""
+        return self.action in (AdmissionAction.ADMIT, AdmissionAction.DOWNGRADE)
+
+
+@dataclass
+class AdmissionRecord:
+    """A logged admission decision with the inputs it was based on."""
+    zone: str
+    priority: str
+    timestamp: datetime
+    action: str
+    reason: str
+    model_tier: Optional[str]
+    estimated_cost: float
+    budget_remaining: float
+    queue_delay: float
+    provider_health: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "zone": self.zone,
+            "priority": self.priority,
+            "timestamp": self.timestamp.isoformat(),
+            "action": self.action,
+            "reason": self.reason,
+            "model_tier": self.model_tier,
+            "estimated_cost": round(self.estimated_cost, 6),
+            "budget_remaining": None if math.isinf(self.budget_remaining) else round(self.budget_remaining, 6),
+            "queue_delay": round(self.queue_delay, 1),
+            "provider_health": round(self.provider_health, 3),
+        }
+
+
+class _TierHealth:
+    """Success rate of recent analyses on one model tier."""
+
+    def __init__(self):
+        self.score = 1.0
+        self.last_failure: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+
+
+class AdmissionController:
+    """
+    Admission controller in front of the analysis queue.
+
+    Tiers are tried from the one the request's priority maps to down the
+    ``tier_order`` list, and the first tier that is affordable and healthy is
+    used. Lower priorities must leave a share of the daily budget unspent
+    (``budget_reserve``) so manual analyses can still run late in the day.
+    Scheduled work is dropped rather than queued behind a long backlog, since
+    the scheduler will ask again; high-messiness requests are deferred a
+    bounded number of times instead. Manual requests are never deferred or
+    dropped, at worst they run on the cheapest tier.
+
+    The spend used is the higher of the recorded provider cost for today and
+    the estimated cost of everything admitted today, so admitted work counts
+    against the budget before its provider calls are recorded.
+    """
+
+    DEFAULT_TIER_COSTS = {"manual": 0.01, "scheduled": 0.002, "local": 0.0}
+    DEFAULT_PRIORITY_TIERS = {"MANUAL": "manual"}
+    DEFAULT_BUDGET_RESERVE = {"MANUAL": 0.0, "HIGH_MESSINESS": 0.1, "SCHEDULED": 0.25, "RETRY": 0.25}
+
+    def __init__(self, config: Dict[str, Any], history_size: int = 100):
+        """
+        Initialize the admission controller.
+
+        Args:
+            config: The ``admission_control`` configuration section
+            history_size: Number of decision records kept
+        """
+        self.logger = logging.getLogger("admission_controller")
+
+        self.enabled = config.get("enabled", True)
+        self.daily_budget = config.get("daily_budget", 0.0)
+        self.tier_costs: Dict[str, float] = {**self.DEFAULT_TIER_COSTS, **config.get("tier_costs", {})}
+        self.tier_order: List[str] = config.get("tier_order", ["manual", "scheduled", "local"])
+        self.priority_tiers: Dict[str, str] = {**self.DEFAULT_PRIORITY_TIERS, **config.get("priority_tiers", {})}
+        self.default_tier = config.get("default_tier", "scheduled")
+        self.budget_reserve: Dict[str, float] = {**self.DEFAULT_BUDGET_RESERVE, **config.get("budget_reserve", {})}
+
+        # Latency
+        self.max_queue_delay = config.get("max_queue_delay_seconds", 600.0)
+        self.expected_analysis_seconds = config.get("expected_analysis_seconds", 30.0)
+
+        # Provider health
+        self.min_provider_health = config.get("min_provider_health", 0.5)
+        self.health_recovery_seconds = config.get("health_recovery_seconds", 600.0)
+        self.health_smoothing = config.get("health_smoothing", 0.3)
+
+        # Deferral
+        self.defer_seconds = config.get("defer_seconds", 300.0)
+        self.max_deferrals = config.get("max_deferrals", 3)
+
+        self._health: Dict[str, _TierHealth] = {}
+        self._avg_duration: Optional[float] = None
+        self._committed_cost = 0.0
+        self._ledger_date = datetime.now(timezone.utc).date()
+
+        # Metrics
+        self.decisions: Dict[str, int] = {action.value: 0 for action in AdmissionAction}
+        self.decisions_by_priority: Dict[str, Dict[str, int]] = {}
+        self.reasons: Dict[str, int] = {}
+        self.cost_admitted = 0.0
+        self.cost_avoided = 0.0
+        self.history: Deque[AdmissionRecord] = deque(maxlen=history_size)
+
+    def decide(self, zone: str, priority: AnalysisPriority, spent_today: float,
+               queue_size: int, workers: int, deferrals: int = 0,
+               now: Optional[datetime] = None) -> AdmissionDecision:
+        """
+        Decide what to do with an analysis request.
+
+        Args:
+            zone: Zone name
+            priority: Analysis priority
+            spent_today: Provider cost recorded today
+            queue_size: Requests currently waiting in the analysis queue
+            workers: Analysis workers draining the queue
+            deferrals: How often this request was already deferred
+            now: Current time (defaults to datetime.now(timezone.utc))
+
+        Returns:
+            Admission decision
+        """
+        now = now or datetime.now(timezone.utc)
+        requested_tier = self.priority_tiers.get(priority.name, self.default_tier)
+        budget_remaining = self._budget_remaining(spent_today, now)
+        queue_delay = self.estimate_queue_delay(queue_size, workers)
+        health = self.get_tier_health(requested_tier)
+
+        decision = self._decide(priority, requested_tier, budget_remaining, queue_delay, deferrals)
+
+        if decision.queued:
+            self._committed_cost += decision.estimated_cost
+            self.cost_admitted += decision.estimated_cost
+        if decision.action != AdmissionAction.DEFER:
+            self.cost_avoided += max(0.0, self.tier_costs.get(requested_tier, 0.0) - decision.estimated_cost)
+
+        self._record(AdmissionRecord(
+            zone=zone,
+            priority=priority.name,
+            timestamp=now,
+            action=decision.action.value,
+            reason=decision.reason,
+            model_tier=decision.model_tier,
+            estimated_cost=decision.estimated_cost,
+            budget_remaining=budget_remaining,
+            queue_delay=queue_delay,
+            provider_health=health
+        ))
+        return decision
+
+    def _decide(self, priority: AnalysisPriority, requested_tier: str, budget_remaining: float,
+                queue_delay: float, deferrals: int) -> AdmissionDecision:
+        """Apply the admission policy to precomputed inputs."""
+        if not self.enabled:
+            return AdmissionDecision(AdmissionAction.ADMIT, "disabled", requested_tier,
+                                     self.tier_costs.get(requested_tier, 0.0))
+
+        manual = priority == AnalysisPriority.MANUAL
+
+        if not manual and queue_delay > self.max_queue_delay:
+            if priority == AnalysisPriority.HIGH_MESSINESS:
+                return self._defer_or_drop("queue_delay", deferrals)
+            return AdmissionDecision(AdmissionAction.DROP, "queue_delay")
+
+        spendable = budget_remaining - self.budget_reserve.get(priority.name, 0.0) * self.daily_budget
+        candidates = self._tiers_from(requested_tier)
+        affordable = [tier for tier in candidates if self._affordable(tier, spendable)]
+        usable = [tier for tier in affordable if self.get_tier_health(tier) >= self.min_provider_health]
+
+        if usable:
+            tier = usable[0]
+            cost = self.tier_costs.get(tier, 0.0)
+            if tier == requested_tier:
+                return AdmissionDecision(AdmissionAction.ADMIT, "within_budget", tier, cost)
+            reason = "provider_unhealthy" if requested_tier in affordable else "budget_low"
+            return AdmissionDecision(AdmissionAction.DOWNGRADE, reason, tier, cost)
+
+        if manual:
+            # Manual requests always run, on the cheapest tier if nothing fits
+            tier = min(candidates, key=lambda t: (self.tier_costs.get(t, 0.0), -self.get_tier_health(t)))
+            action = AdmissionAction.ADMIT if tier == requested_tier else AdmissionAction.DOWNGRADE
+            return AdmissionDecision(action, "manual_override", tier, self.tier_costs.get(tier, 0.0))
+
+        if affordable:
+            # Affordable tiers exist but none is healthy; they may recover
+            if priority == AnalysisPriority.HIGH_MESSINESS:
+                return self._defer_or_drop("provider_unhealthy", deferrals)
+            return AdmissionDecision(AdmissionAction.DROP, "provider_unhealthy")
+
+        return AdmissionDecision(AdmissionAction.DROP, "budget_exhausted")
+
+    def _affordable(self, tier: str, spendable: float) -> bool:
+        """Whether a tier fits the spendable budget; free tiers always do."""
+        cost = self.tier_costs.get(tier, 0.0)
+        return cost <= 0.0 or cost <= spendable
+
+    def _defer_or_drop(self, reason: str, deferrals: int) -> AdmissionDecision:
+        """Defer a request, or drop it once it has been deferred too often."""
+        if deferrals >= self.max_deferrals:
+            return AdmissionDecision(AdmissionAction.DROP, "max_deferrals")
+        return AdmissionDecision(AdmissionAction.DEFER, reason, defer_seconds=self.defer_seconds)
+
+    def _tiers_from(self, tier: str) -> List[str]:
+        """The requested tier followed by the cheaper tiers after it."""
+        if tier not in self.tier_order:
+            return [tier] + self.tier_order[-1:]
+        return self.tier_order[self.tier_order.index(tier):]
+
+    def _budget_remaining(self, spent_today: float, now: datetime) -> float:
+        """Budget left today; infinite without a configured budget."""
+        today = now.astimezone(timezone.utc).date()
+        if today != self._ledger_date:
+            self._ledger_date = today
+            self._committed_cost = 0.0
+
+        if not self.daily_budget:
+            return math.inf
+        return self.daily_budget - max(spent_today, self._committed_cost)
+
+    def estimate_queue_delay(self, queue_size: int, workers: int) -> float:
+        """
+        Expected seconds a new request waits before a worker picks it up.
+
+        Args:
+            queue_size: Requests waiting in the queue
+            workers: Analysis workers draining the queue
+
+        Returns:
+            Estimated queue delay in seconds
+        """
+        duration = self._avg_duration if self._avg_duration is not None else self.expected_analysis_seconds
+        return queue_size * duration / max(1, workers)
+
+    def record_outcome(self, model_tier: str, success: bool, duration: float,
+                       now: Optional[float] = None):
+        """
+        Record how a provider call on a tier went.
+
+        Args:
+            model_tier: Tier the analysis ran on
+            success: Whether the provider returned a usable result
+            duration: Seconds the analysis took
+            now: Monotonic time of the outcome (defaults to time.monotonic())
+        """
+        health = self._health.setdefault(model_tier, _TierHealth())
+        health.score = self.get_tier_health(model_tier, now)
+        health.score += self.health_smoothing * ((1.0 if success else 0.0) - health.score)
+        if success:
+            health.successes += 1
+        else:
+            health.failures += 1
+            health.last_failure = now if now is not None else time.monotonic()
+
+        if success:
+            if self._avg_duration is None:
+                self._avg_duration = duration
+            else:
+                self._avg_duration += 0.2 * (duration - self._avg_duration)
+
+    def get_tier_health(self, model_tier: str, now: Optional[float] = None) -> float:
+        """
+        Health score of a tier in [0, 1].
+
+        The score drifts back to 1.0 over ``health_recovery_seconds`` after
+        the last failure, so a tier that stopped getting traffic because it
+        was unhealthy is tried again eventually.
+
+        Args:
+            model_tier: Model tier
+            now: Monotonic time (defaults to time.monotonic())
+
+        Returns:
+            Health score
+        """
+        health = self._health.get(model_tier)
+        if health is None or health.last_failure is None:
+            return health.score if health else 1.0
+        elapsed = (now if now is not None else time.monotonic()) - health.last_failure
+        recovered = min(1.0, max(0.0, elapsed) / self.health_recovery_seconds) if self.health_recovery_seconds else 1.0
+        return health.score + (1.0 - health.score) * recovered
+
+    def _record(self, record: AdmissionRecord):
+        """Count and log a decision."""
+        self.decisions[record.action] += 1
+        by_priority = self.decisions_by_priority.setdefault(record.priority, {})
+        by_priority[record.action] = by_priority.get(record.action, 0) + 1
+        self.reasons[record.reason] = self.reasons.get(record.reason, 0) + 1
+        self.history.append(record)
+
+        budget = "unlimited" if math.isinf(record.budget_remaining) else f"{record.budget_remaining:.4f}"
+        self.logger.info(
+            f"Admission {record.action} for zone {record.zone} ({record.priority}): {record.reason}, "
+            f"tier={record.model_tier}, cost={record.estimated_cost:.4f}, budget_remaining={budget}, "
+            f"queue_delay={record.queue_delay:.0f}s, health={record.provider_health:.2f}"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get admission control statistics.
+
+        Returns:
+            Decision counters, cost totals, tier health and recent decisions
+        """
+        return {
+            "enabled": self.enabled,
+            "daily_budget": self.daily_budget,
+            "committed_cost_today": self._committed_cost,
+            "decisions": dict(self.decisions),
+            "decisions_by_priority": {p: dict(c) for p, c in self.decisions_by_priority.items()},
+            "reasons": dict(self.reasons),
+            "estimated_cost_admitted": self.cost_admitted,
+            "estimated_cost_avoided": self.cost_avoided,
+            "avg_analysis_seconds": self._avg_duration,
+            "tiers": {
+                tier: {
+                    "cost": self.tier_costs.get(tier, 0.0),
+                    "health": self.get_tier_health(tier),
+                    "successes": self._health[tier].successes if tier in self._health else 0,
+                    "failures": self._health[tier].failures if tier in self._health else 0,
+                }
+                for tier in dict.fromkeys(self.tier_order + list(self._health))
+            },
+            "recent_decisions": [record.to_dict() for record in self.history],
+        }
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Flat metric samples for export.
+
+        Returns:
+            Metric name with labels mapped to its value
+        """
+        metrics: Dict[str, float] = {}
+        for priority, counts in self.decisions_by_priority.items():
+            for action, count in counts.items():
+                metrics[f'aicleaner_admission_decisions_total{{priority="{priority}",action="{action}"}}'] = count
+        for reason, count in self.reasons.items():
+            metrics[f'aicleaner_admission_reasons_total{{reason="{reason}"}}'] = count
+        for tier in dict.fromkeys(self.tier_order + list(self._health)):
+            metrics[f'aicleaner_admission_tier_health{{tier="{tier}"}}'] = self.get_tier_health(tier)
+        metrics["aicleaner_admission_cost_admitted_total"] = self.cost_admitted
+        metrics["aicleaner_admission_cost_avoided_total"] = self.cost_avoided
+        metrics["aicleaner_admission_committed_cost_today"] = self._committed_cost
+        return metrics
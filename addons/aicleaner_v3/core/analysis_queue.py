@@ -67,13 +67,14 @@ class AnalysisQueueManager:
         self.logger.info("Analysis queue manager stopped.")
 
     async def queue_analysis(self, zone_name: str, priority: AnalysisPriority,
-                           analysis_func: Optional[Callable] = None) -> str:
+                           analysis_func: Optional[Callable] = None,
+                           analysis_id: Optional[str] = None) -> str:
         """
         Add an analysis request to the queue.
-        Returns a unique analysis ID.
+        Returns the analysis ID, a new unique one unless given.
         """
         # Generate unique analysis ID
-        analysis_id = f"{zone_name}_{uuid.uuid4().hex[:8]}"
+        analysis_id = analysis_id or f"{zone_name}_{uuid.uuid4().hex[:8]}"
 
         # Create analysis request
         request = AnalysisRequest(
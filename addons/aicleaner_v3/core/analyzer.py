@@ -17,6 +17,8 @@ from ai.predictive_analytics import PredictiveAnalytics
 from ai.scene_understanding import AdvancedSceneUnderstanding
 from notifications.notification_engine import NotificationEngine
 from .analysis_queue import AnalysisQueueManager, AnalysisPriority
+from .admission_control import AdmissionController, AdmissionAction
+from .change_detection import ChangeDetector, compute_fingerprint
 
 class ZoneAnalyzer:
     """
@@ -27,6 +29,7 @@ class ZoneAnalyzer:
     - Priority-based analysis
     - Resource limiting
     - Worker pool
+    - Budget, latency and provider health aware admission control
     """
 
     def __init__(self, ha_client, state_manager, config, multi_model_ai_optimizer):
@@ -52,6 +55,20 @@ class ZoneAnalyzer:
         self.zone_managers: Dict[str, ZoneManager] = {}
         self.zone_semaphores: Dict[str, asyncio.Semaphore] = {}
 
+        # Skip provider calls for snapshots that have not changed
+        change_config = config.get("change_detection", {})
+        self.change_detector: Optional[ChangeDetector] = None
+        if change_config.get("enabled", True):
+            self.change_detector = ChangeDetector(
+                similarity_threshold=change_config.get("similarity_threshold", 0.95),
+                max_result_age=change_config.get("max_result_age", 3600),
+                max_consecutive_skips=change_config.get("max_consecutive_skips", 12)
+            )
+
+        # Admit, downgrade, defer or drop requests before they are queued
+        self.admission_controller = AdmissionController(config.get("admission_control", {}))
+        self._deferred_analyses: Dict[str, asyncio.Task] = {}
+
     @property
     def analysis_queue(self):
         """Expose the analysis queue for testing purposes."""
@@ -75,6 +92,11 @@ class ZoneAnalyzer:
         self.logger.info("Stopping zone analyzer")
         self.running = False
 
+        # Deferred requests are not re-admitted after shutdown
+        for task in list(self._deferred_analyses.values()):
+            task.cancel()
+        await asyncio.gather(*self._deferred_analyses.values(), return_exceptions=True)
+
         # Stop the queue manager
         await self.queue_manager.stop()
 
@@ -95,18 +117,83 @@ class ZoneAnalyzer:
         if not self._get_zone_config(zone_name):
             raise ValueError(f"Zone '{zone_name}' not found in configuration")
 
+        return await self._admit_analysis(zone_name, priority)
+
+    async def _admit_analysis(self, zone_name: str, priority: AnalysisPriority,
+                              analysis_id: Optional[str] = None, deferrals: int = 0) -> str:
+        """
+        Run admission control for a request and queue, defer or drop it.
+
+        Args:
+            zone_name: Zone name
+            priority: Analysis priority
+            analysis_id: ID of a deferred request being re-admitted
+            deferrals: How often the request was already deferred
+
+        Returns:
+            Analysis ID
+        """
+        # Scanning today's API calls is only needed when a budget is set
+        spent_today = 0.0
+        if self.admission_controller.daily_budget:
+            spent_today = await self.state_manager.get_cost_estimate_today()
+
+        decision = self.admission_controller.decide(
+            zone_name,
+            priority,
+            spent_today=spent_today,
+            queue_size=self.queue_manager.queue.qsize(),
+            workers=self.queue_manager.worker_count,
+            deferrals=deferrals
+        )
+        admission = {"action": decision.action.value, "reason": decision.reason}
+
+        if decision.action == AdmissionAction.DEFER:
+            analysis_id = analysis_id or f"{zone_name}_{uuid.uuid4().hex[:8]}"
+            task = asyncio.create_task(
+                self._readmit_deferred(zone_name, priority, analysis_id, deferrals + 1, decision.defer_seconds)
+            )
+            self._deferred_analyses[analysis_id] = task
+            task.add_done_callback(lambda done: self._forget_deferred(analysis_id, done))
+            await self.state_manager.update_analysis_state(
+                analysis_id,
+                AnalysisState.ADMISSION_DEFERRED,
+                {
+                    "zone_name": zone_name,
+                    "priority": priority.name,
+                    "admission": admission,
+                    "defer_seconds": decision.defer_seconds
+                }
+            )
+            return analysis_id
+
+        if decision.action == AdmissionAction.DROP:
+            analysis_id = analysis_id or f"{zone_name}_{uuid.uuid4().hex[:8]}"
+            await self.state_manager.update_analysis_state(
+                analysis_id,
+                AnalysisState.ADMISSION_DROPPED,
+                {"zone_name": zone_name, "priority": priority.name, "admission": admission}
+            )
+            return analysis_id
+
+        model_tier = decision.model_tier
+
         # Create analysis function for this zone
         async def analysis_func(zone_name: str, analysis_id: str):
-            await self._perform_zone_analysis(zone_name, analysis_id)
+            await self._perform_zone_analysis(zone_name, analysis_id, model_tier)
 
         # Queue the analysis using the queue manager
         analysis_id = await self.queue_manager.queue_analysis(
             zone_name=zone_name,
             priority=priority,
-            analysis_func=analysis_func
+            analysis_func=analysis_func,
+            analysis_id=analysis_id
         )
 
-        self.logger.info(f"Queued analysis for zone {zone_name} with priority {priority.name} (ID: {analysis_id})")
+        self.logger.info(
+            f"Queued analysis for zone {zone_name} with priority {priority.name} "
+            f"on model tier {model_tier} (ID: {analysis_id})"
+        )
 
         # Update state to indicate analysis has been queued
         await self.state_manager.update_analysis_state(
@@ -114,19 +201,51 @@ class ZoneAnalyzer:
             AnalysisState.IMAGE_CAPTURED,
             {
                 "zone_name": zone_name,
-                "priority": priority.name
+                "priority": priority.name,
+                "model_tier": model_tier,
+                "admission": admission
             }
         )
 
         return analysis_id
 
-    async def _perform_zone_analysis(self, zone_name: str, analysis_id: str):
+    def _forget_deferred(self, analysis_id: str, task: asyncio.Task):
+        """
+        Drop a finished deferral task from tracking.
+
+        A request deferred again while re-admitted is stored under the same ID
+        before the earlier task finishes, so only the task's own entry is removed.
+        """
+        if self._deferred_analyses.get(analysis_id) is task:
+            del self._deferred_analyses[analysis_id]
+
+    async def _readmit_deferred(self, zone_name: str, priority: AnalysisPriority,
+                                analysis_id: str, deferrals: int, delay: float):
+        """
+        Wait out a deferral and run admission control again.
+
+        Args:
+            zone_name: Zone name
+            priority: Analysis priority
+            analysis_id: ID handed out for the deferred request
+            deferrals: Deferral count including this one
+            delay: Seconds to wait
+        """
+        await asyncio.sleep(delay)
+        try:
+            await self._admit_analysis(zone_name, priority, analysis_id, deferrals)
+        except Exception as e:
+            self.logger.error(f"Error re-admitting deferred analysis {analysis_id} for zone {zone_name}: {e}")
+
+    async def _perform_zone_analysis(self, zone_name: str, analysis_id: str,
+                                     model_tier: str = "scheduled"):
         """
         Perform analysis for a specific zone.
 
         Args:
             zone_name: Zone name
             analysis_id: Analysis ID
+            model_tier: Model tier chosen by admission control
         """
         try:
             # Get zone manager
@@ -148,10 +267,37 @@ class ZoneAnalyzer:
                 {"zone_name": zone_name, "image_path": image_path}
             )
 
+            # Reuse the previous result if the zone has not visibly changed
+            fingerprint = await self._fingerprint_snapshot(image_path)
+            if fingerprint is not None:
+                decision = self.change_detector.check(zone_name, fingerprint)
+                if not decision.changed:
+                    self.logger.info(
+                        f"Skipping analysis for zone {zone_name}: {decision.reason} "
+                        f"(similarity {decision.similarity:.3f})"
+                    )
+                    await self.state_manager.update_analysis_state(
+                        analysis_id,
+                        AnalysisState.CYCLE_COMPLETE,
+                        {
+                            "zone_name": zone_name,
+                            "result": decision.previous_result,
+                            "skipped": True,
+                            "skip_reason": decision.reason,
+                            "similarity": decision.similarity
+                        }
+                    )
+                    return
+
             # Perform analysis using zone manager
-            result = await zone_manager.analyze_image_batch_optimized(image_path)
+            started = time.monotonic()
+            result = await zone_manager.analyze_image_batch_optimized(image_path, priority=model_tier)
+            self.admission_controller.record_outcome(model_tier, bool(result), time.monotonic() - started)
 
             if result:
+                if fingerprint is not None:
+                    self.change_detector.update(zone_name, fingerprint, result)
+
                 # Update state to complete
                 await self.state_manager.update_analysis_state(
                     analysis_id,
@@ -165,6 +311,54 @@ class ZoneAnalyzer:
             self.logger.error(f"Error performing zone analysis for {zone_name}: {e}")
             raise
 
+    async def _fingerprint_snapshot(self, image_path: str):
+        """
+        Fingerprint a captured snapshot for change detection.
+
+        Args:
+            image_path: Path to the captured image
+
+        Returns:
+            Image fingerprint, or None if change detection is disabled or fails
+        """
+        if not self.change_detector:
+            return None
+
+        try:
+            return await asyncio.to_thread(compute_fingerprint, image_path)
+        except Exception as e:
+            self.logger.warning(f"Change detection unavailable for {image_path}: {e}")
+            return None
+
+    def get_change_detection_stats(self) -> Dict[str, Any]:
+        """
+        Get change detection statistics.
+
+        Returns:
+            Skip counts, reasons and recent skips, or an empty dict if disabled
+        """
+        if not self.change_detector:
+            return {}
+        return self.change_detector.get_stats()
+
+    def get_admission_stats(self) -> Dict[str, Any]:
+        """
+        Get admission control statistics.
+
+        Returns:
+            Decision counters, cost totals, tier health and recent decisions
+        """
+        return self.admission_controller.get_stats()
+
+    def get_admission_metrics(self) -> Dict[str, float]:
+        """
+        Get admission control metrics for export.
+
+        Returns:
+            Metric samples keyed by name and labels
+        """
+        return self.admission_controller.get_metrics()
+
     async def _initialize_zone_components(self):
         """
         Initialize zone semaphores and managers.
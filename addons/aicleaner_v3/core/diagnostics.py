@@ -22,6 +22,7 @@ import requests
 import yaml
 
 from .simple_logging import get_simple_logger, get_logging_stats
+from .log_search import LogSearchIndex
 
 
 @dataclass
@@ -73,6 +74,9 @@ class DiagnosticTool:
         self.logger = get_simple_logger("diagnostics")
         self.config_path = self.addon_root / "config.yaml"
         self.log_directory = self.addon_root / "logs"
+        self.archive_directory = self.addon_root / "archives"
+        self.index_directory = self.addon_root / "log_index"
+        self._search_index: Optional[LogSearchIndex] = None
         
     def get_system_info(self) -> SystemInfo:
         """Get system information"""
@@ -308,8 +312,43 @@ class DiagnosticTool:
         except Exception as e:
             return [f"Error reading logs: {e}"]
     
+    def _get_search_index(self) -> LogSearchIndex:
+        """Get the log search index, bringing it up to date with live and archived logs"""
+        if self._search_index is None:
+            self._search_index = LogSearchIndex(str(self.index_directory))
+        
+        # Incremental: live files resume from their last offset, archives are indexed once
+        self._search_index.ingest_directory(self.log_directory)
+        self._search_index.ingest_directory(self.archive_directory)
+        return self._search_index
+    
+    def search_logs(self, query: Optional[str] = None, levels: Optional[List[str]] = None,
+                    component: Optional[str] = None, correlation_id: Optional[str] = None,
+                    hours: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Search live and archived logs through the full-text index, newest first"""
+        start_time = datetime.now() - timedelta(hours=hours) if hours else None
+        index = self._get_search_index()
+        return list(index.search(
+            query=query,
+            levels=levels,
+            component=component,
+            correlation_id=correlation_id,
+            start_time=start_time,
+            limit=limit
+        ))
+    
     def get_error_logs(self, hours: int = 24) -> List[str]:
         """Get recent error log entries"""
+        try:
+            results = self.search_logs(levels=["ERROR", "CRITICAL"], hours=hours, limit=100)
+            return [result["raw"] for result in reversed(results)]
+        except Exception as e:
+            # Fall back to scanning the live file if the index is unavailable
+            self.logger.warning(f"Log index unavailable, scanning log file: {e}")
+            return self._scan_error_logs(hours)
+    
+    def _scan_error_logs(self, hours: int) -> List[str]:
+        """Get recent error log entries by scanning the live log file"""
         try:
             main_log = self.log_directory / "aicleaner.log"
             if not main_log.exists():
@@ -34,7 +34,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Callable, Set
+from typing import Any, Dict, List, Optional, Union, Callable, Set, Tuple
 from urllib.parse import urlparse
 import socket
 import traceback
@@ -42,12 +42,12 @@ import re
 import hashlib
 import os
 import stat
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
 import queue
 
 # Performance imports
 import psutil
-import memory_profiler
 
 
 class LogLevel(Enum):
@@ -106,9 +106,15 @@ class LogContext:
     span_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
-    """Structured log entry"""
+    """
+    Structured log entry.
+
+    ``message`` may be a %-style template with its arguments held in ``args``;
+    call ``resolve_message()`` before handing the entry to handlers so the
+    formatting cost is only paid for entries that are actually emitted.
+    """
     timestamp: datetime
     level: LogLevel
     message: str
@@ -124,6 +130,17 @@ class LogEntry:
     stack_trace: Optional[str] = None
     performance_metrics: Optional[Dict[str, Any]] = None
     security_context: Optional[Dict[str, Any]] = None
+    args: Tuple[Any, ...] = ()
+    
+    def resolve_message(self) -> str:
+        """Apply deferred %-style arguments to the message (idempotent)"""
+        if self.args:
+            try:
+                self.message = self.message % self.args
+            except (TypeError, ValueError):
+                self.message = f"{self.message} {self.args!r}"
+            self.args = ()
+        return self.message
 
 
 @dataclass
@@ -159,6 +176,10 @@ class LogHandler(ABC):
         """Handle a log entry"""
         pass
     
+    def close(self):
+        """Release handler resources (no-op for unbuffered handlers)"""
+        pass
+    
     def should_process(self, entry: LogEntry) -> bool:
         """Check if log entry should be processed by this handler"""
         if not self.enabled:
@@ -211,24 +232,68 @@ class LogHandler(ABC):
 
 
 class FileLogHandler(LogHandler):
-    """File-based log handler with rotation"""
+    """
+    Buffered file log handler with background rotation.
+
+    Entries are formatted on the caller's side and appended to a bounded
+    in-memory queue. A dedicated writer thread keeps the log file open and
+    writes the queue out in batches, either once ``batch_size`` lines are
+    pending or every ``flush_interval`` seconds. Rotation happens on the
+    writer thread and compression of the oldest backup is handed off to a
+    separate worker, so neither blocks logging callers. When the disk stalls
+    and the queue fills up, the oldest pending lines are dropped and counted
+    in ``stats["messages_dropped"]``.
+    """
     
     def __init__(self, name: str, file_path: str, max_size: int = 10*1024*1024,
                  backup_count: int = 5, compression: bool = True,
-                 log_filter: LogFilter = None):
+                 log_filter: LogFilter = None, batch_size: int = 100,
+                 flush_interval: float = 1.0, max_queue_size: int = 10000):
         super().__init__(name, log_filter)
         self.file_path = Path(file_path)
         self.max_size = max_size
         self.backup_count = backup_count
         self.compression = compression
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_queue_size = max(1, max_queue_size)
         self.current_size = 0
         self.lock = threading.Lock()
         
+        self.stats.update({
+            "messages_dropped": 0,
+            "batches_written": 0,
+            "rotations": 0
+        })
+        
+        # Pending lines, guarded by the condition variable
+        self._pending: deque = deque()
+        self._pending_cond = threading.Condition()
+        self._closed = False
+        
+        # Open file handle, only touched while holding self.lock
+        self._stream = None
+        
+        # Compression runs off the writer thread
+        self._compression_executor: Optional[ThreadPoolExecutor] = None
+        self._compression_future: Optional[Future] = None
+        if self.compression:
+            self._compression_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"LogCompress-{name}"
+            )
+        
         # Create directory if it doesn't exist
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Set up rotating file handler
         self._setup_rotation()
+        
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name=f"LogWriter-{name}",
+            daemon=True
+        )
+        self._writer_thread.start()
     
     def _setup_rotation(self):
         """Setup log rotation"""
@@ -236,7 +301,7 @@ class FileLogHandler(LogHandler):
             self.current_size = self.file_path.stat().st_size
     
     async def handle_log(self, entry: LogEntry) -> bool:
-        """Handle log entry to file"""
+        """Queue log entry for the background writer"""
         try:
             if not self.should_process(entry):
                 self.stats["messages_filtered"] += 1
@@ -245,17 +310,8 @@ class FileLogHandler(LogHandler):
             # Format log entry
             log_line = self._format_entry(entry)
             
-            with self.lock:
-                # Check if rotation is needed
-                if self.current_size + len(log_line.encode()) > self.max_size:
-                    await self._rotate_logs()
-                
-                # Write to file
-                with open(self.file_path, 'a', encoding='utf-8') as f:
-                    f.write(log_line + '\n')
-                    f.flush()
-                
-                self.current_size += len(log_line.encode())
+            if not self._enqueue(log_line):
+                return False
             
             self.stats["messages_processed"] += 1
             self.stats["last_message_time"] = datetime.now()
@@ -266,6 +322,109 @@ class FileLogHandler(LogHandler):
             print(f"Error in FileLogHandler: {e}")  # Fallback logging
             return False
     
+    def _enqueue(self, log_line: str) -> bool:
+        """Append a formatted line to the pending queue, dropping the oldest on overflow"""
+        with self._pending_cond:
+            if self._closed:
+                return False
+            
+            if len(self._pending) >= self.max_queue_size:
+                self._pending.popleft()
+                self.stats["messages_dropped"] += 1
+            
+            self._pending.append(log_line)
+            
+            if len(self._pending) >= self.batch_size:
+                self._pending_cond.notify()
+        return True
+    
+    def _take_batch(self) -> List[str]:
+        """Remove and return all pending lines (caller holds the condition)"""
+        batch = list(self._pending)
+        self._pending.clear()
+        return batch
+    
+    def _writer_loop(self):
+        """Drain pending lines to disk in batches"""
+        while True:
+            with self._pending_cond:
+                if len(self._pending) < self.batch_size and not self._closed:
+                    self._pending_cond.wait(self.flush_interval)
+                closed = self._closed
+            
+            self._drain()
+            
+            if closed:
+                break
+    
+    def _drain(self):
+        """Take and write pending lines as one step so concurrent drains keep line order"""
+        with self.lock:
+            with self._pending_cond:
+                batch = self._take_batch()
+            if batch:
+                self._write_batch(batch)
+    
+    def _write_batch(self, lines: List[str]):
+        """Write a batch of lines through the open file handle (caller holds self.lock)"""
+        data = '\n'.join(lines) + '\n'
+        data_size = len(data.encode('utf-8'))
+        
+        try:
+            # Check if rotation is needed
+            if self.current_size > 0 and self.current_size + data_size > self.max_size:
+                self._rotate_logs()
+            
+            if self._stream is None:
+                self._stream = open(self.file_path, 'a', encoding='utf-8')
+            
+            self._stream.write(data)
+            self._stream.flush()
+            self.current_size += data_size
+            self.stats["batches_written"] += 1
+            
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Error writing log batch: {e}")  # Fallback logging
+    
+    def flush(self):
+        """Synchronously write out everything that is currently pending"""
+        self._drain()
+    
+    def close(self):
+        """Flush pending lines, stop the writer and wait for compression to finish"""
+        with self._pending_cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending_cond.notify()
+        
+        if self._writer_thread.is_alive():
+            self._writer_thread.join(timeout=10.0)
+        
+        # Catch anything left if the writer timed out
+        self.flush()
+        
+        with self.lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+        
+        if self._compression_executor is not None:
+            self._compression_executor.shutdown(wait=True)
+    
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Get writer queue statistics"""
+        with self._pending_cond:
+            depth = len(self._pending)
+        return {
+            "queue_depth": depth,
+            "queue_max_size": self.max_queue_size,
+            "messages_dropped": self.stats["messages_dropped"],
+            "batches_written": self.stats["batches_written"],
+            "rotations": self.stats["rotations"]
+        }
+    
     def _format_entry(self, entry: LogEntry) -> str:
         """Format log entry for file output"""
         return json.dumps({
@@ -291,9 +450,19 @@ class FileLogHandler(LogHandler):
             "security": entry.security_context
         }, separators=(',', ':'))
     
-    async def _rotate_logs(self):
-        """Rotate log files"""
+    def _rotate_logs(self):
+        """Rotate log files (caller holds self.lock)"""
         try:
+            # Close the handle so the current file can be renamed
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+            
+            # Don't shuffle backups underneath a running compression job
+            if self._compression_future is not None:
+                self._compression_future.result()
+                self._compression_future = None
+            
             # Move current file to backup
             for i in range(self.backup_count - 1, 0, -1):
                 old_backup = self.file_path.with_suffix(f'.{i}.log')
@@ -305,8 +474,10 @@ class FileLogHandler(LogHandler):
                     old_backup.rename(new_backup)
                     
                     # Compress if enabled
-                    if self.compression and i == self.backup_count - 1:
-                        await self._compress_file(new_backup)
+                    if self._compression_executor is not None and i == self.backup_count - 1:
+                        self._compression_future = self._compression_executor.submit(
+                            self._compress_file, new_backup
+                        )
             
             # Move current file to .1
             if self.file_path.exists():
@@ -316,11 +487,13 @@ class FileLogHandler(LogHandler):
                 self.file_path.rename(backup_file)
             
             self.current_size = 0
+            self.stats["rotations"] += 1
             
         except Exception as e:
             print(f"Error rotating logs: {e}")
     
-    async def _compress_file(self, file_path: Path):
+    @staticmethod
+    def _compress_file(file_path: Path):
         """Compress log file"""
         try:
             compressed_path = file_path.with_suffix(file_path.suffix + '.gz')
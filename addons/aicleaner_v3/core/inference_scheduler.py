@@ -0,0 +1,179 @@
+"""
+Local inference scheduler for AI Cleaner addon.
+Groups pending local model requests by model and feeds them to Ollama's parallel slots.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+
+@dataclass
+class PendingInference:
+    """A request waiting for a slot."""
+    model: str
+    work: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class LocalInferenceScheduler:
+    """
+    Schedules local inference so the loaded model is reused as long as possible.
+
+    Features:
+    - Requests are queued per model and the active model is served until its
+      queue is empty, so a model is swapped once per batch rather than per request
+    - Up to ``num_parallel`` requests for the active model run concurrently,
+      matching the server's OLLAMA_NUM_PARALLEL slots
+    - A different model is only started after in-flight work drains, since
+      Ollama would otherwise load it alongside the active one
+    - When a model becomes active it commits to the requests queued for it at
+      that moment; afterwards, a model whose oldest request has waited longer
+      than ``max_wait_seconds`` takes over, so a busy model cannot starve the
+      others and overdue models do not preempt each other after every request
+    """
+
+    def __init__(self, num_parallel: Optional[int] = None, max_wait_seconds: float = 30.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            num_parallel: Concurrent requests per model, defaults to OLLAMA_NUM_PARALLEL or 1
+            max_wait_seconds: Queue time after which a waiting model is served next
+        """
+        self.logger = logging.getLogger(__name__)
+        self.num_parallel = max(1, int(num_parallel or os.environ.get("OLLAMA_NUM_PARALLEL") or 1))
+        self.max_wait_seconds = max_wait_seconds
+
+        self._pending: "OrderedDict[str, Deque[PendingInference]]" = OrderedDict()
+        self._active_model: Optional[str] = None
+        self._batch_remaining = 0
+        self._in_flight = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Statistics
+        self._started_at = time.monotonic()
+        self.submitted = 0
+        self.completed = 0
+        self.swaps = 0
+        self.batches = 0
+        self._wait_total = 0.0
+
+    async def submit(self, model: str, work: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run inference work for a model when the scheduler grants it a slot.
+
+        Args:
+            model: Model the work runs on
+            work: Coroutine factory performing the request
+
+        Returns:
+            Result of the work
+        """
+        request = PendingInference(
+            model=model,
+            work=work,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued_at=time.monotonic()
+        )
+        self._pending.setdefault(model, deque()).append(request)
+        self.submitted += 1
+        self._dispatch()
+        return await request.future
+
+    def _dispatch(self):
+        """Start pending requests while slots are free."""
+        while self._in_flight < self.num_parallel:
+            model = self._select_model()
+            if model is None:
+                return
+
+            if model != self._active_model:
+                if self._in_flight:
+                    # Let the active model's batch finish before swapping
+                    return
+                if self._active_model is not None:
+                    self.swaps += 1
+                    self.logger.debug(f"Switching local inference from {self._active_model} to {model}")
+                self._active_model = model
+                self.batches += 1
+                self._batch_remaining = len(self._pending[model])
+            elif self._batch_remaining <= 0:
+                # Same model again after its batch: new arrivals form the next batch
+                self._batch_remaining = len(self._pending[model])
+
+            queue = self._pending[model]
+            request = queue.popleft()
+            self._batch_remaining -= 1
+            if not queue:
+                del self._pending[model]
+            if request.future.cancelled():
+                continue
+
+            self._in_flight += 1
+            self._wait_total += time.monotonic() - request.enqueued_at
+            task = asyncio.create_task(self._run(request))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _select_model(self) -> Optional[str]:
+        """Pick the model to serve next."""
+        if not self._pending:
+            return None
+
+        if self._batch_remaining > 0 and self._active_model in self._pending:
+            return self._active_model
+
+        now = time.monotonic()
+        overdue = [
+            model for model, queue in self._pending.items()
+            if model != self._active_model and now - queue[0].enqueued_at >= self.max_wait_seconds
+        ]
+        if overdue:
+            return min(overdue, key=lambda model: self._pending[model][0].enqueued_at)
+
+        if self._active_model in self._pending:
+            return self._active_model
+
+        # Largest backlog first amortizes the swap over the most requests
+        return max(self._pending, key=lambda model: (len(self._pending[model]), -self._pending[model][0].enqueued_at))
+
+    async def _run(self, request: PendingInference):
+        """Run one request and release its slot."""
+        try:
+            result = await request.work()
+            if not request.future.done():
+                request.future.set_result(result)
+        except asyncio.CancelledError:
+            request.future.cancel()
+            raise
+        except Exception as e:
+            if not request.future.done():
+                request.future.set_exception(e)
+        finally:
+            self._in_flight -= 1
+            self.completed += 1
+            self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics."""
+        hours = max(time.monotonic() - self._started_at, 60.0) / 3600
+        started = self.completed + self._in_flight
+        return {
+            "num_parallel": self.num_parallel,
+            "active_model": self._active_model,
+            "in_flight": self._in_flight,
+            "pending": {model: len(queue) for model, queue in self._pending.items()},
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "swaps": self.swaps,
+            "batches": self.batches,
+            "swaps_per_hour": self.swaps / hours,
+            "requests_per_batch": started / self.batches if self.batches else 0.0,
+            "avg_wait_seconds": self._wait_total / started if started else 0.0,
+        }
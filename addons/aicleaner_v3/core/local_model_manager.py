@@ -10,7 +10,8 @@ import time
 import psutil
 import json
 import threading
-from typing import Dict, Any, List, Optional, Set, Tuple
+import heapq
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -40,6 +41,8 @@ except ImportError:
             def __init__(self, config):
                 pass
 
+from .inference_scheduler import LocalInferenceScheduler
+
 
 class ModelStatus(Enum):
     """Model status enumeration."""
@@ -90,6 +93,13 @@ class ModelInfo:
     compressed_size_gb: float = 0.0
     gpu_compatible: bool = False
     optimization_history: List[Dict[str, Any]] = field(default_factory=list)
+    # Warm pool residency and latency split
+    keep_alive_seconds: float = 0.0
+    resident_until: Optional[float] = None
+    cold_starts: int = 0
+    cold_latency_total: float = 0.0
+    warm_requests: int = 0
+    warm_latency_total: float = 0.0
 
 
 @dataclass
@@ -174,12 +184,36 @@ class LocalModelManager:
         # Ollama client integration
         self.ollama_client = OllamaClient(config)
         self.host = self.config.get("ollama_host", "localhost:11434")
+        self._async_client = None
+
+        # Warm pool: keep_alive bounds and how early to prefetch before a predicted use
+        self.warm_pool_settings = self.config.get("warm_pool", {
+            "min_keep_alive_seconds": 60,
+            "max_keep_alive_seconds": 1800,
+            "prefetch_lead_seconds": 30,
+        })
+        self._upcoming_uses: List[Tuple[float, str]] = []  # heap of (expected_at, model)
+        self._upcoming_changed = asyncio.Event()
+        self._arrival_gaps: Dict[str, float] = {}  # EWMA of seconds between requests
+        self._last_request_at: Dict[str, float] = {}
+        self._load_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._eviction_priority: Dict[str, float] = {}
+        self._eviction_floor = 0.0
+        self.warm_pool_stats = {"prefetches": 0, "prefetch_hits": 0, "evictions": 0, "expired": 0}
+
+        # Requests are grouped by model so the loaded model serves a whole batch
+        scheduler_settings = self.config.get("inference_scheduler", {})
+        self.inference_scheduler = LocalInferenceScheduler(
+            num_parallel=scheduler_settings.get("num_parallel"),
+            max_wait_seconds=scheduler_settings.get("max_wait_seconds", 30.0)
+        )
 
         # Background tasks
         self._monitoring_task = None
         self._cleanup_task = None
         self._health_check_task = None
         self._optimization_task = None
+        self._prefetch_task = None
 
         # GPU detection
         self._gpu_available = self._detect_gpu_availability()
@@ -224,6 +258,8 @@ class LocalModelManager:
                 self._health_check_task.cancel()
             if self._optimization_task:
                 self._optimization_task.cancel()
+            if self._prefetch_task:
+                self._prefetch_task.cancel()
                 
             # Unload all models
             await self._unload_all_models()
@@ -245,19 +281,28 @@ class LocalModelManager:
         """
         try:
             # Check if model is already loaded
-            if model_name in self.loaded_models:
+            if self._is_resident(model_name):
                 # Update last used time
                 if model_name in self.models:
                     self.models[model_name].last_used = datetime.now()
+                self._touch_eviction_priority(model_name)
                 return True
             
-            # Check resource constraints before loading
-            if not await self._check_resource_constraints():
-                self.logger.warning("Resource constraints prevent model loading")
-                await self._free_resources()
-            
-            # Load the model
-            return await self._load_model(model_name)
+            async with self._load_locks[model_name]:
+                # A concurrent request or prefetch may have loaded it meanwhile
+                if self._is_resident(model_name):
+                    return True
+                
+                # Check resource constraints before loading
+                max_loaded = self.performance_settings.get("max_loaded_models", 2)
+                if len(self.loaded_models) >= max_loaded:
+                    await self._free_resources(keep=model_name)
+                elif not await self._check_resource_constraints():
+                    self.logger.warning("Resource constraints prevent model loading")
+                    await self._free_resources(keep=model_name)
+                
+                # Load the model
+                return await self._load_model(model_name)
             
         except Exception as e:
             self.logger.error(f"Error ensuring model {model_name} is loaded: {e}")
@@ -281,11 +326,17 @@ class LocalModelManager:
             if model_name in self.models:
                 self.models[model_name].status = ModelStatus.UNLOADING
             
-            # Note: Ollama doesn't have explicit unload API, so we track it locally
+            # keep_alive=0 makes Ollama release the model immediately
+            try:
+                await self._send_keep_alive(model_name, 0)
+            except Exception as e:
+                self.logger.debug(f"Ollama did not acknowledge unload of {model_name}: {e}")
             self.loaded_models.discard(model_name)
+            self._eviction_priority.pop(model_name, None)
             
             if model_name in self.models:
                 self.models[model_name].status = ModelStatus.AVAILABLE
+                self.models[model_name].resident_until = None
                 
             self.logger.info(f"Model {model_name} unloaded")
             return True
@@ -294,6 +345,55 @@ class LocalModelManager:
             self.logger.error(f"Error unloading model {model_name}: {e}")
             return False
     
+    def schedule_model_use(self, model_name: str, expected_at: Union[float, datetime]):
+        """
+        Tell the warm pool a model will be needed at a given time.
+        
+        The prefetch loop loads the model shortly before ``expected_at`` and
+        keep_alive is extended to cover the gap, so scheduled zone analyses
+        find their model resident.
+        
+        Args:
+            model_name: Name of the model
+            expected_at: Expected time of use, as a datetime or epoch seconds
+        """
+        if isinstance(expected_at, datetime):
+            expected_at = expected_at.timestamp()
+        heapq.heappush(self._upcoming_uses, (float(expected_at), model_name))
+        self._upcoming_changed.set()
+    
+    def predict_next_use(self, model_name: str, now: Optional[float] = None) -> Optional[float]:
+        """Predict when a model is next needed, from scheduled uses and past request spacing."""
+        now = time.time() if now is None else now
+        predictions = [at for at, name in self._upcoming_uses if name == model_name and at >= now]
+        
+        gap = self._arrival_gaps.get(model_name)
+        last = self._last_request_at.get(model_name)
+        if gap is not None and last is not None:
+            predictions.append(max(last + gap, now))
+        
+        return min(predictions) if predictions else None
+    
+    def keep_alive_for(self, model_name: str, now: Optional[float] = None) -> float:
+        """
+        keep_alive in seconds for a model, sized to cover its predicted next use.
+        
+        Uses further away than the maximum keep_alive get the minimum instead:
+        holding memory that long costs more than the prefetch reload.
+        """
+        now = time.time() if now is None else now
+        min_keep_alive = self.warm_pool_settings.get("min_keep_alive_seconds", 60)
+        max_keep_alive = self.warm_pool_settings.get("max_keep_alive_seconds", 1800)
+        lead = self.warm_pool_settings.get("prefetch_lead_seconds", 30)
+        
+        next_use = self.predict_next_use(model_name, now)
+        if next_use is None:
+            return min_keep_alive
+        needed = next_use - now + lead
+        if needed > max_keep_alive:
+            return min_keep_alive
+        return max(min_keep_alive, needed)
+    
     async def get_model_status(self, model_name: str) -> ModelStatus:
         """Get the current status of a model."""
         if model_name in self.models:
@@ -303,7 +403,8 @@ class LocalModelManager:
     async def get_resource_metrics(self) -> ResourceMetrics:
         """Get current system resource metrics."""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Sampling blocks for the interval, so keep it off the event loop
+            cpu_percent = await asyncio.to_thread(psutil.cpu_percent, 1)
             memory = psutil.virtual_memory()
 
             # Get GPU metrics if available
@@ -369,9 +470,24 @@ class LocalModelManager:
                 "last_used": model_info.last_used.isoformat() if model_info.last_used else None,
                 "load_time": model_info.load_time,
                 "memory_usage_mb": model_info.memory_usage_mb,
-                "performance_metrics": model_info.performance_metrics
+                "performance_metrics": model_info.performance_metrics,
+                "cold_starts": model_info.cold_starts,
+                "cold_latency_avg": (model_info.cold_latency_total / model_info.cold_starts
+                                     if model_info.cold_starts else None),
+                "warm_requests": model_info.warm_requests,
+                "warm_latency_avg": (model_info.warm_latency_total / model_info.warm_requests
+                                     if model_info.warm_requests else None),
+                "keep_alive_seconds": model_info.keep_alive_seconds,
+                "predicted_next_use": self.predict_next_use(model_name),
             }
         
+        stats["inference_scheduler"] = self.inference_scheduler.get_stats()
+        stats["warm_pool"] = {
+            **self.warm_pool_stats,
+            "upcoming_uses": len(self._upcoming_uses),
+            "eviction_floor": self._eviction_floor,
+        }
+        
         return stats
 
     async def analyze_image_with_model(self, model_name: str, image_path: str, prompt: str = None) -> Dict[str, Any]:
@@ -386,7 +502,17 @@ class LocalModelManager:
         Returns:
             Dictionary with analysis results
         """
+        self._note_request(model_name, time.time())
+        return await self.inference_scheduler.submit(
+            model_name, lambda: self._run_image_analysis(model_name, image_path, prompt)
+        )
+
+    async def _run_image_analysis(self, model_name: str, image_path: str, prompt: Optional[str]) -> Dict[str, Any]:
+        """Analyze an image once the scheduler grants the model a slot."""
         try:
+            request_start = time.time()
+            cold = not self._is_resident(model_name)
+
             # Ensure model is loaded and ready
             if not await self.ensure_model_loaded(model_name):
                 raise Exception(f"Failed to load model {model_name}")
@@ -408,6 +534,7 @@ class LocalModelManager:
             if model_name in self.models:
                 self.models[model_name].success_count += 1
                 self.models[model_name].performance_metrics["last_analysis_time"] = analysis_time
+            await self._after_request(model_name, time.time() - request_start, cold)
 
             return result
 
@@ -430,7 +557,17 @@ class LocalModelManager:
         Returns:
             List of generated tasks
         """
+        self._note_request(model_name, time.time())
+        return await self.inference_scheduler.submit(
+            model_name, lambda: self._run_task_generation(model_name, analysis, context)
+        )
+
+    async def _run_task_generation(self, model_name: str, analysis: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate tasks once the scheduler grants the model a slot."""
         try:
+            request_start = time.time()
+            cold = not self._is_resident(model_name)
+
             # Ensure model is loaded and ready
             if not await self.ensure_model_loaded(model_name):
                 raise Exception(f"Failed to load model {model_name}")
@@ -451,6 +588,7 @@ class LocalModelManager:
             if model_name in self.models:
                 self.models[model_name].success_count += 1
                 self.models[model_name].performance_metrics["last_generation_time"] = generation_time
+            await self._after_request(model_name, time.time() - request_start, cold)
 
             return result
 
@@ -621,13 +759,9 @@ class LocalModelManager:
             if model_name in self.models:
                 self.models[model_name].status = ModelStatus.LOADING
             
-            # For Ollama, we don't explicitly load models - they're loaded on first use
-            # We'll simulate this by making a small test request
-            test_response = self.ollama_client.generate(
-                model=model_name,
-                prompt="test",
-                options={"num_predict": 1}
-            )
+            # An empty prompt makes Ollama load the model without generating
+            keep_alive = self.keep_alive_for(model_name, start_time)
+            await self._send_keep_alive(model_name, keep_alive)
             
             load_time = time.time() - start_time
             
@@ -635,13 +769,24 @@ class LocalModelManager:
             if model_name not in self.models:
                 self.models[model_name] = ModelInfo(name=model_name)
             
-            self.models[model_name].status = ModelStatus.LOADED
-            self.models[model_name].load_time = load_time
-            self.models[model_name].last_used = datetime.now()
+            model_info = self.models[model_name]
+            model_info.status = ModelStatus.LOADED
+            # Smoothed so one slow load does not dominate eviction decisions
+            model_info.load_time = load_time if not model_info.load_time else 0.7 * model_info.load_time + 0.3 * load_time
+            model_info.last_used = datetime.now()
+            model_info.keep_alive_seconds = keep_alive
+            model_info.resident_until = time.time() + keep_alive
             
             self.loaded_models.add(model_name)
+            self._touch_eviction_priority(model_name)
+            
+            # The model is loaded either way; stale memory figures are not a load failure
+            try:
+                await self._refresh_residency()
+            except Exception as e:
+                self.logger.warning(f"Could not refresh residency after loading {model_name}: {e}")
             
-            self.logger.info(f"Model {model_name} loaded in {load_time:.2f}s")
+            self.logger.info(f"Model {model_name} loaded in {load_time:.2f}s (keep_alive {keep_alive:.0f}s)")
             return True
             
         except Exception as e:
@@ -651,6 +796,109 @@ class LocalModelManager:
                 self.models[model_name].error_count += 1
             return False
     
+    def _get_async_client(self):
+        """Async Ollama client, or None when the package is unavailable."""
+        if self._async_client is None and OLLAMA_AVAILABLE:
+            host = self.host if "://" in self.host else f"http://{self.host}"
+            self._async_client = ollama.AsyncClient(host=host)
+        return self._async_client
+    
+    async def _send_keep_alive(self, model_name: str, keep_alive: float):
+        """Load a model, or refresh its residency, with the given keep_alive in seconds."""
+        client = self._get_async_client()
+        if client is not None:
+            await client.generate(model=model_name, prompt="", keep_alive=int(keep_alive))
+        else:
+            await asyncio.to_thread(
+                self.ollama_client.generate, model=model_name, prompt="", keep_alive=int(keep_alive)
+            )
+    
+    async def _refresh_residency(self):
+        """Sync memory usage and expiry of loaded models with what Ollama reports."""
+        client = self._get_async_client()
+        if client is None:
+            return
+        try:
+            running = await client.ps()
+        except Exception as e:
+            self.logger.debug(f"Could not query running models: {e}")
+            return
+        
+        for entry in running.get("models", []):
+            model_info = self.models.get(entry.get("name") or entry.get("model"))
+            if model_info is None:
+                continue
+            size = entry.get("size_vram") or entry.get("size") or 0
+            if size:
+                model_info.memory_usage_mb = size / (1024 * 1024)
+    
+    def _is_resident(self, model_name: str) -> bool:
+        """Whether a model is loaded and its keep_alive has not run out."""
+        if model_name not in self.loaded_models:
+            return False
+        model_info = self.models.get(model_name)
+        if model_info and model_info.resident_until and time.time() > model_info.resident_until:
+            # Ollama has already dropped it
+            self.loaded_models.discard(model_name)
+            self._eviction_priority.pop(model_name, None)
+            model_info.status = ModelStatus.AVAILABLE
+            model_info.resident_until = None
+            self.warm_pool_stats["expired"] += 1
+            return False
+        return True
+    
+    def _note_request(self, model_name: str, now: float):
+        """Track request spacing per model for next-use prediction."""
+        last = self._last_request_at.get(model_name)
+        if last is not None:
+            gap = now - last
+            previous = self._arrival_gaps.get(model_name)
+            self._arrival_gaps[model_name] = gap if previous is None else 0.7 * previous + 0.3 * gap
+        self._last_request_at[model_name] = now
+    
+    async def _after_request(self, model_name: str, latency: float, cold: bool):
+        """Record request latency as cold or warm and re-arm keep_alive."""
+        model_info = self.models.get(model_name)
+        if model_info is None:
+            return
+        if cold:
+            model_info.cold_starts += 1
+            model_info.cold_latency_total += latency
+        else:
+            model_info.warm_requests += 1
+            model_info.warm_latency_total += latency
+        
+        # Each request resets Ollama's timer to its default, so restate ours
+        await self._extend_keep_alive(model_name, force=True)
+    
+    async def _extend_keep_alive(self, model_name: str, force: bool = False):
+        """Restate keep_alive for a resident model so it covers the next predicted use."""
+        model_info = self.models.get(model_name)
+        keep_alive = self.keep_alive_for(model_name)
+        if model_info is None:
+            return
+        if not force and model_info.resident_until and model_info.resident_until >= time.time() + keep_alive:
+            return
+        try:
+            await self._send_keep_alive(model_name, keep_alive)
+            model_info.keep_alive_seconds = keep_alive
+            model_info.resident_until = time.time() + keep_alive
+        except Exception as e:
+            self.logger.debug(f"Could not set keep_alive for {model_name}: {e}")
+    
+    def _touch_eviction_priority(self, model_name: str):
+        """
+        GreedyDual-Size priority: reload seconds per GB on top of the current floor.
+        
+        Models that are slow to reload relative to the memory they hold stay
+        resident longer; untouched models sink toward the floor, which rises
+        with each eviction, so recency still counts.
+        """
+        model_info = self.models.get(model_name) or ModelInfo(name=model_name)
+        reload_cost = model_info.load_time or 1.0
+        size_gb = model_info.memory_usage_mb / 1024 if model_info.memory_usage_mb else (model_info.size_gb or 1.0)
+        self._eviction_priority[model_name] = self._eviction_floor + reload_cost / max(size_gb, 0.1)
+    
     async def _check_resource_constraints(self) -> bool:
         """Check if current resource usage is within limits."""
         try:
@@ -673,26 +921,25 @@ class LocalModelManager:
             self.logger.error(f"Error checking resource constraints: {e}")
             return False
     
-    async def _free_resources(self):
-        """Free resources by unloading least recently used models."""
+    async def _free_resources(self, keep: Optional[str] = None):
+        """Free resources by evicting the loaded model that is cheapest to reload."""
         try:
-            max_loaded = self.performance_settings.get("max_loaded_models", 2)
+            lead = self.warm_pool_settings.get("prefetch_lead_seconds", 30)
+            now = time.time()
+            candidates = [name for name in self.loaded_models if name != keep]
             
-            if len(self.loaded_models) >= max_loaded:
-                # Find least recently used model
-                lru_model = None
-                lru_time = datetime.now()
-                
-                for model_name in self.loaded_models:
-                    if model_name in self.models:
-                        last_used = self.models[model_name].last_used
-                        if last_used and last_used < lru_time:
-                            lru_time = last_used
-                            lru_model = model_name
-                
-                if lru_model:
-                    await self.unload_model(lru_model)
-                    self.logger.info(f"Unloaded LRU model {lru_model} to free resources")
+            # Avoid evicting a model that is about to be used
+            not_due = [name for name in candidates
+                       if (self.predict_next_use(name, now) or float("inf")) - now > lead]
+            candidates = not_due or candidates
+            if not candidates:
+                return
+            
+            victim = min(candidates, key=lambda name: self._eviction_priority.get(name, self._eviction_floor))
+            self._eviction_floor = self._eviction_priority.get(victim, self._eviction_floor)
+            await self.unload_model(victim)
+            self.warm_pool_stats["evictions"] += 1
+            self.logger.info(f"Evicted model {victim} to free resources")
                     
         except Exception as e:
             self.logger.error(f"Error freeing resources: {e}")
@@ -717,6 +964,9 @@ class LocalModelManager:
             # Optimization task
             self._optimization_task = asyncio.create_task(self._optimization_loop())
 
+            # Warm pool prefetch task
+            self._prefetch_task = asyncio.create_task(self._prefetch_loop())
+
             self.logger.info("Background tasks started")
 
         except Exception as e:
@@ -749,8 +999,10 @@ class LocalModelManager:
                 cutoff_time = datetime.now() - timedelta(minutes=auto_unload_minutes)
                 
                 models_to_unload = []
-                for model_name in self.loaded_models:
-                    if model_name in self.models:
+                for model_name in list(self.loaded_models):
+                    if not self._is_resident(model_name):
+                        continue
+                    if model_name in self.models and self.predict_next_use(model_name) is None:
                         last_used = self.models[model_name].last_used
                         if last_used and last_used < cutoff_time:
                             models_to_unload.append(model_name)
@@ -786,6 +1038,49 @@ class LocalModelManager:
                 self.logger.error(f"Error in health check: {e}")
                 await asyncio.sleep(300)
 
+    async def _prefetch_loop(self):
+        """Background task that loads models ahead of their scheduled use."""
+        while True:
+            try:
+                lead = self.warm_pool_settings.get("prefetch_lead_seconds", 30)
+                now = time.time()
+                
+                # Drop uses that have passed
+                while self._upcoming_uses and self._upcoming_uses[0][0] < now - lead:
+                    heapq.heappop(self._upcoming_uses)
+                
+                wait = 60.0
+                if self._upcoming_uses:
+                    expected_at, model_name = self._upcoming_uses[0]
+                    model_info = self.models.get(model_name)
+                    # Start early enough to absorb the model's own load time
+                    start_at = expected_at - lead - (model_info.load_time if model_info else 0.0)
+                    if start_at <= now:
+                        # Load while the use is still queued so keep_alive covers it
+                        if self._is_resident(model_name):
+                            self.warm_pool_stats["prefetch_hits"] += 1
+                            await self._extend_keep_alive(model_name)
+                        elif await self.inference_scheduler.submit(
+                                model_name, lambda: self.ensure_model_loaded(model_name)):
+                            # Queued with the model's requests so a prefetch never interrupts another batch
+                            self.warm_pool_stats["prefetches"] += 1
+                        self._upcoming_uses.remove((expected_at, model_name))
+                        heapq.heapify(self._upcoming_uses)
+                        continue
+                    wait = min(wait, start_at - now)
+                
+                self._upcoming_changed.clear()
+                try:
+                    await asyncio.wait_for(self._upcoming_changed.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Error in prefetch loop: {e}")
+                await asyncio.sleep(60)
+    
     async def _optimization_loop(self):
         """Background task for model optimization."""
         while True:
@@ -31,10 +31,103 @@ import zipfile
 import tarfile
 import os
 import sqlite3
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import schedule
 
 
+_CHUNK_SIZE = 1024 * 1024
+
+
+class _HashingReader:
+    """File wrapper that hashes and counts bytes as they are read"""
+    
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.sha256.update(data)
+        self.size += len(data)
+        return data
+
+
+def _stream_checksum(fileobj) -> str:
+    """SHA-256 of a readable stream without buffering it whole"""
+    sha256_hash = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(_CHUNK_SIZE), b""):
+        sha256_hash.update(chunk)
+    return sha256_hash.hexdigest()
+
+
+def _archive_checksum(archive_file: Path, compression_type: str) -> str:
+    """Checksum of an archive's decompressed payload, streamed from the archive"""
+    if compression_type == "gzip":
+        with gzip.open(archive_file, 'rb') as f_in:
+            return _stream_checksum(f_in)
+    
+    if compression_type == "zip":
+        with zipfile.ZipFile(archive_file, 'r') as zipf:
+            with zipf.open(zipf.namelist()[0]) as f_in:
+                return _stream_checksum(f_in)
+    
+    if compression_type == "tar.gz":
+        with tarfile.open(archive_file, 'r:gz') as tar:
+            member = tar.getmembers()[0]
+            with tar.extractfile(member) as f_in:
+                return _stream_checksum(f_in)
+    
+    with open(archive_file, 'rb') as f_in:
+        return _stream_checksum(f_in)
+
+
+def _compress_archive(source_file: str, target_file: str, compression_type: Optional[str],
+                      verify: bool) -> Tuple[str, int, int, bool]:
+    """
+    Compress (or copy) a log file and optionally verify the result.
+
+    Runs in a worker process. The source is read once: its checksum and size
+    are computed while it is being compressed. Verification re-reads only the
+    archive, hashing the decompressed stream in memory.
+
+    Returns (original_checksum, original_size, compressed_size, verified).
+    """
+    source = Path(source_file)
+    target = Path(target_file)
+    
+    with open(source, 'rb') as raw_in:
+        reader = _HashingReader(raw_in)
+        
+        if compression_type is None:
+            with open(target, 'wb') as f_out:
+                shutil.copyfileobj(reader, f_out, _CHUNK_SIZE)
+        
+        elif compression_type == "gzip":
+            with gzip.open(target, 'wb') as f_out:
+                shutil.copyfileobj(reader, f_out, _CHUNK_SIZE)
+        
+        elif compression_type == "zip":
+            with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                with zipf.open(source.name, 'w', force_zip64=True) as f_out:
+                    shutil.copyfileobj(reader, f_out, _CHUNK_SIZE)
+        
+        elif compression_type == "tar.gz":
+            with tarfile.open(target, 'w:gz') as tar:
+                tar_info = tar.gettarinfo(str(source), arcname=source.name)
+                tar.addfile(tar_info, reader)
+        
+        else:
+            raise ValueError(f"Unsupported compression type: {compression_type}")
+    
+    original_checksum = reader.sha256.hexdigest()
+    verified = True
+    if verify:
+        verified = _archive_checksum(target, compression_type or "none") == original_checksum
+    
+    return original_checksum, reader.size, target.stat().st_size, verified
+
+
 @dataclass
 class ArchivePolicy:
     """Log archive policy configuration"""
@@ -117,6 +210,16 @@ class ArchiveDatabase:
                     ON archives(policy_name)
                 """)
                 
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_original_file
+                    ON archives(original_file)
+                """)
+                
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_policy_created_date
+                    ON archives(policy_name, created_date)
+                """)
+                
                 conn.commit()
             finally:
                 conn.close()
@@ -155,18 +258,7 @@ class ArchiveDatabase:
                 
                 row = cursor.fetchone()
                 if row:
-                    return ArchiveEntry(
-                        archive_id=row[0],
-                        original_file=row[1],
-                        archive_file=row[2],
-                        created_date=datetime.fromisoformat(row[3]),
-                        original_size=row[4],
-                        compressed_size=row[5],
-                        compression_ratio=row[6],
-                        checksum=row[7],
-                        policy_name=row[8],
-                        metadata=json.loads(row[9]) if row[9] else {}
-                    )
+                    return self._row_to_entry(row)
                 return None
             finally:
                 conn.close()
@@ -197,25 +289,94 @@ class ArchiveDatabase:
                 
                 cursor = conn.execute(query, params)
                 
-                archives = []
-                for row in cursor.fetchall():
-                    archives.append(ArchiveEntry(
-                        archive_id=row[0],
-                        original_file=row[1],
-                        archive_file=row[2],
-                        created_date=datetime.fromisoformat(row[3]),
-                        original_size=row[4],
-                        compressed_size=row[5],
-                        compression_ratio=row[6],
-                        checksum=row[7],
-                        policy_name=row[8],
-                        metadata=json.loads(row[9]) if row[9] else {}
-                    ))
+                return [self._row_to_entry(row) for row in cursor.fetchall()]
+            finally:
+                conn.close()
+    
+    def is_archived(self, original_file: str) -> bool:
+        """Check whether a file has been archived (indexed lookup)"""
+        with self.lock:
+            conn = sqlite3.connect(str(self.db_path))
+            try:
+                cursor = conn.execute("""
+                    SELECT 1 FROM archives WHERE original_file = ? LIMIT 1
+                """, (original_file,))
+                return cursor.fetchone() is not None
+            finally:
+                conn.close()
+    
+    def get_archived_files(self, original_files: List[str]) -> Set[str]:
+        """Return the subset of original_files that have already been archived"""
+        archived = set()
+        if not original_files:
+            return archived
+        
+        with self.lock:
+            conn = sqlite3.connect(str(self.db_path))
+            try:
+                # Stay well under SQLite's bound-parameter limit
+                for start in range(0, len(original_files), 500):
+                    chunk = original_files[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor = conn.execute(
+                        f"SELECT DISTINCT original_file FROM archives WHERE original_file IN ({placeholders})",
+                        chunk
+                    )
+                    archived.update(row[0] for row in cursor.fetchall())
+                return archived
+            finally:
+                conn.close()
+    
+    def search_archives(self, query: str, policy_name: Optional[str] = None,
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None) -> List[ArchiveEntry]:
+        """Search archive file names and metadata, narrowed by the indexed policy/date columns"""
+        with self.lock:
+            conn = sqlite3.connect(str(self.db_path))
+            try:
+                sql = "SELECT * FROM archives WHERE 1=1"
+                params: List[Any] = []
+                
+                if policy_name:
+                    sql += " AND policy_name = ?"
+                    params.append(policy_name)
+                
+                if start_date:
+                    sql += " AND created_date >= ?"
+                    params.append(start_date.isoformat())
                 
-                return archives
+                if end_date:
+                    sql += " AND created_date <= ?"
+                    params.append(end_date.isoformat())
+                
+                # LIKE is case-insensitive for ASCII, matching the previous lower() comparison
+                pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                sql += (" AND (original_file LIKE ? ESCAPE '\\' OR archive_file LIKE ? ESCAPE '\\'"
+                        " OR metadata LIKE ? ESCAPE '\\')")
+                params.extend([pattern, pattern, pattern])
+                
+                sql += " ORDER BY created_date DESC"
+                
+                return [self._row_to_entry(row) for row in conn.execute(sql, params).fetchall()]
             finally:
                 conn.close()
     
+    @staticmethod
+    def _row_to_entry(row) -> ArchiveEntry:
+        """Build an ArchiveEntry from an archives row"""
+        return ArchiveEntry(
+            archive_id=row[0],
+            original_file=row[1],
+            archive_file=row[2],
+            created_date=datetime.fromisoformat(row[3]),
+            original_size=row[4],
+            compressed_size=row[5],
+            compression_ratio=row[6],
+            checksum=row[7],
+            policy_name=row[8],
+            metadata=json.loads(row[9]) if row[9] else {}
+        )
+    
     def remove_archive(self, archive_id: str):
         """Remove archive entry from database"""
         with self.lock:
@@ -297,15 +458,24 @@ class ArchiveDatabase:
 
 
 class LogArchiver:
-    """Log archival system"""
+    """
+    Log archival system.
+
+    Compression and verification run in a process pool (created on first
+    use) so large logs don't hold up the scheduler or the event loop.
+    """
     
-    def __init__(self, archive_dir: str = "archives", db_path: str = "archives/archive.db"):
+    def __init__(self, archive_dir: str = "archives", db_path: str = "archives/archive.db",
+                 compression_workers: int = 2, start_scheduler: bool = True):
         self.archive_dir = Path(archive_dir)
         self.archive_dir.mkdir(parents=True, exist_ok=True)
         
         self.database = ArchiveDatabase(db_path)
         self.policies: Dict[str, ArchivePolicy] = {}
         self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="LogArchiver")
+        self.compression_workers = compression_workers
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
         self.scheduler_thread = None
         self.shutdown_event = threading.Event()
         
@@ -313,7 +483,8 @@ class LogArchiver:
         self._setup_default_policies()
         
         # Start scheduler
-        self._start_scheduler()
+        if start_scheduler:
+            self._start_scheduler()
     
     def _setup_default_policies(self):
         """Setup default archive policies"""
@@ -398,6 +569,13 @@ class LogArchiver:
             if policy.archive_interval == "weekly":
                 self.executor.submit(self._archive_by_policy, policy)
     
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Get (creating on first use) the compression process pool"""
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.compression_workers)
+            return self._process_pool
+    
     def _archive_by_policy(self, policy: ArchivePolicy):
         """Archive logs according to policy"""
         try:
@@ -405,7 +583,7 @@ class LogArchiver:
             log_files = self._find_archivable_files(policy)
             
             for log_file in log_files:
-                self.archive_file(log_file, policy.name)
+                self.archive_file_sync(log_file, policy.name)
                 
         except Exception as e:
             print(f"Error archiving with policy {policy.name}: {e}")
@@ -434,85 +612,116 @@ class LogArchiver:
                     file_mtime = datetime.fromtimestamp(log_file.stat().st_mtime)
                     
                     if file_mtime < cutoff_time:
-                        # Check if already archived
-                        if not self._is_already_archived(log_file):
-                            archivable_files.append(log_file)
+                        archivable_files.append(log_file)
         
-        return archivable_files
+        # One indexed lookup for all candidates instead of a scan per file
+        archived = self.database.get_archived_files([str(path) for path in archivable_files])
+        return [path for path in archivable_files if str(path) not in archived]
     
     def _is_already_archived(self, file_path: Path) -> bool:
         """Check if file is already archived"""
-        archives = self.database.list_archives()
-        for archive in archives:
-            if archive.original_file == str(file_path):
-                return True
-        return False
+        return self.database.is_archived(str(file_path))
+    
+    def _prepare_archive(self, file_path: Union[str, Path], policy_name: str
+                         ) -> Optional[Tuple[Path, ArchivePolicy, str, Path]]:
+        """Resolve policy and target path for an archive job"""
+        file_path = Path(file_path)
+        policy = self.policies.get(policy_name)
+        
+        if not policy or not file_path.exists():
+            return None
+        
+        # Generate archive ID and paths
+        archive_id = f"{policy_name}_{file_path.stem}_{int(time.time())}"
+        archive_file = self._get_archive_path(archive_id, policy)
+        return file_path, policy, archive_id, archive_file
+    
+    def _compress_args(self, file_path: Path, archive_file: Path, policy: ArchivePolicy) -> tuple:
+        """Arguments for the _compress_archive worker"""
+        return (
+            str(file_path),
+            str(archive_file),
+            policy.compression_type if policy.compression else None,
+            policy.verify_integrity
+        )
     
     async def archive_file(self, file_path: Union[str, Path], policy_name: str) -> Optional[ArchiveEntry]:
-        """Archive a single file"""
+        """Archive a single file, compressing in the process pool"""
         try:
-            file_path = Path(file_path)
-            policy = self.policies.get(policy_name)
-            
-            if not policy or not file_path.exists():
+            prepared = self._prepare_archive(file_path, policy_name)
+            if prepared is None:
                 return None
+            file_path, policy, archive_id, archive_file = prepared
             
-            # Generate archive ID and paths
-            archive_id = f"{policy_name}_{file_path.stem}_{int(time.time())}"
-            archive_file = self._get_archive_path(archive_id, policy)
-            
-            # Calculate original file checksum
-            original_checksum = self._calculate_checksum(file_path)
-            original_size = file_path.stat().st_size
-            
-            # Create archive
-            if policy.compression:
-                compressed_size = await self._compress_file(file_path, archive_file, policy.compression_type)
-            else:
-                shutil.copy2(file_path, archive_file)
-                compressed_size = archive_file.stat().st_size
-            
-            # Verify integrity if enabled
-            if policy.verify_integrity:
-                if not await self._verify_archive_integrity(file_path, archive_file, policy.compression_type):
-                    # Remove failed archive
-                    if archive_file.exists():
-                        archive_file.unlink()
-                    raise Exception("Archive integrity verification failed")
-            
-            # Calculate compression ratio
-            compression_ratio = (original_size - compressed_size) / original_size if original_size > 0 else 0
-            
-            # Create archive entry
-            archive_entry = ArchiveEntry(
-                archive_id=archive_id,
-                original_file=str(file_path),
-                archive_file=str(archive_file),
-                created_date=datetime.now(),
-                original_size=original_size,
-                compressed_size=compressed_size,
-                compression_ratio=compression_ratio,
-                checksum=original_checksum,
-                policy_name=policy_name,
-                metadata={
-                    "compression_type": policy.compression_type if policy.compression else "none",
-                    "original_mtime": file_path.stat().st_mtime
-                }
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_process_pool(), _compress_archive,
+                *self._compress_args(file_path, archive_file, policy)
             )
+            return self._finish_archive(file_path, policy, archive_id, archive_file, result)
             
-            # Save to database
-            self.database.add_archive(archive_entry)
-            
-            # Clean up original file if policy allows
-            if policy.cleanup_after_archive:
-                file_path.unlink()
+        except Exception as e:
+            print(f"Error archiving file {file_path}: {e}")
+            return None
+    
+    def archive_file_sync(self, file_path: Union[str, Path], policy_name: str) -> Optional[ArchiveEntry]:
+        """Archive a single file from a worker thread (blocks that thread only)"""
+        try:
+            prepared = self._prepare_archive(file_path, policy_name)
+            if prepared is None:
+                return None
+            file_path, policy, archive_id, archive_file = prepared
             
-            return archive_entry
+            future = self._get_process_pool().submit(
+                _compress_archive, *self._compress_args(file_path, archive_file, policy)
+            )
+            return self._finish_archive(file_path, policy, archive_id, archive_file, future.result())
             
         except Exception as e:
             print(f"Error archiving file {file_path}: {e}")
             return None
     
+    def _finish_archive(self, file_path: Path, policy: ArchivePolicy, archive_id: str,
+                        archive_file: Path, result: Tuple[str, int, int, bool]) -> ArchiveEntry:
+        """Record a completed archive job and clean up per policy"""
+        original_checksum, original_size, compressed_size, verified = result
+        
+        # Verify integrity if enabled
+        if not verified:
+            # Remove failed archive
+            if archive_file.exists():
+                archive_file.unlink()
+            raise Exception("Archive integrity verification failed")
+        
+        # Calculate compression ratio
+        compression_ratio = (original_size - compressed_size) / original_size if original_size > 0 else 0
+        
+        # Create archive entry
+        archive_entry = ArchiveEntry(
+            archive_id=archive_id,
+            original_file=str(file_path),
+            archive_file=str(archive_file),
+            created_date=datetime.now(),
+            original_size=original_size,
+            compressed_size=compressed_size,
+            compression_ratio=compression_ratio,
+            checksum=original_checksum,
+            policy_name=policy.name,
+            metadata={
+                "compression_type": policy.compression_type if policy.compression else "none",
+                "original_mtime": file_path.stat().st_mtime
+            }
+        )
+        
+        # Save to database
+        self.database.add_archive(archive_entry)
+        
+        # Clean up original file if policy allows
+        if policy.cleanup_after_archive:
+            file_path.unlink()
+        
+        return archive_entry
+    
     def _get_archive_path(self, archive_id: str, policy: ArchivePolicy) -> Path:
         """Get archive file path"""
         if policy.storage_location:
@@ -539,73 +748,21 @@ class LogArchiver:
         
         return date_dir / f"{archive_id}{extension}"
     
-    async def _compress_file(self, source_file: Path, target_file: Path, compression_type: str) -> int:
-        """Compress file and return compressed size"""
-        if compression_type == "gzip":
-            with open(source_file, 'rb') as f_in:
-                with gzip.open(target_file, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-        
-        elif compression_type == "zip":
-            with zipfile.ZipFile(target_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                zipf.write(source_file, source_file.name)
-        
-        elif compression_type == "tar.gz":
-            with tarfile.open(target_file, 'w:gz') as tar:
-                tar.add(source_file, arcname=source_file.name)
-        
-        else:
-            raise ValueError(f"Unsupported compression type: {compression_type}")
-        
-        return target_file.stat().st_size
-    
     async def _verify_archive_integrity(self, original_file: Path, archive_file: Path, compression_type: str) -> bool:
-        """Verify archive integrity"""
+        """Verify archive integrity by streaming both sides through SHA-256 (no temp copy)"""
         try:
-            # Create temporary file for decompression
-            temp_file = archive_file.parent / f"{archive_file.stem}_verify.tmp"
-            
-            try:
-                # Decompress based on type
-                if compression_type == "gzip":
-                    with gzip.open(archive_file, 'rb') as f_in:
-                        with open(temp_file, 'wb') as f_out:
-                            shutil.copyfileobj(f_in, f_out)
-                
-                elif compression_type == "zip":
-                    with zipfile.ZipFile(archive_file, 'r') as zipf:
-                        with zipf.open(zipf.namelist()[0]) as f_in:
-                            with open(temp_file, 'wb') as f_out:
-                                shutil.copyfileobj(f_in, f_out)
-                
-                elif compression_type == "tar.gz":
-                    with tarfile.open(archive_file, 'r:gz') as tar:
-                        member = tar.getmembers()[0]
-                        with tar.extractfile(member) as f_in:
-                            with open(temp_file, 'wb') as f_out:
-                                shutil.copyfileobj(f_in, f_out)
-                
-                # Compare checksums
-                original_checksum = self._calculate_checksum(original_file)
-                decompressed_checksum = self._calculate_checksum(temp_file)
-                
-                return original_checksum == decompressed_checksum
-                
-            finally:
-                # Clean up temp file
-                if temp_file.exists():
-                    temp_file.unlink()
-                    
+            loop = asyncio.get_running_loop()
+            archive_checksum = await loop.run_in_executor(
+                self._get_process_pool(), _archive_checksum, archive_file, compression_type
+            )
+            return archive_checksum == self._calculate_checksum(original_file)
         except Exception:
             return False
     
     def _calculate_checksum(self, file_path: Path) -> str:
         """Calculate file checksum"""
-        sha256_hash = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+            return _stream_checksum(f)
     
     async def extract_archive(self, archive_id: str, extract_to: Optional[str] = None) -> Optional[Path]:
         """Extract archive by ID"""
@@ -662,11 +819,8 @@ class LogArchiver:
             for policy_name, policy in self.policies.items():
                 cutoff_date = datetime.now() - timedelta(days=policy.retention_days)
                 
-                # Get old archives
-                old_archives = [
-                    archive for archive in self.database.list_archives(policy_name)
-                    if archive.created_date < cutoff_date
-                ]
+                # Get old archives (indexed on policy and date)
+                old_archives = self.database.list_archives(policy_name, end_date=cutoff_date)
                 
                 # Remove old archives
                 for archive in old_archives:
@@ -689,26 +843,7 @@ class LogArchiver:
                        start_date: Optional[datetime] = None,
                        end_date: Optional[datetime] = None) -> List[ArchiveEntry]:
         """Search archives by filename or metadata"""
-        archives = self.database.list_archives(policy_name, start_date, end_date)
-        
-        matching_archives = []
-        for archive in archives:
-            # Search in filename
-            if query.lower() in archive.original_file.lower():
-                matching_archives.append(archive)
-                continue
-            
-            # Search in archive filename
-            if query.lower() in archive.archive_file.lower():
-                matching_archives.append(archive)
-                continue
-            
-            # Search in metadata
-            metadata_str = json.dumps(archive.metadata).lower()
-            if query.lower() in metadata_str:
-                matching_archives.append(archive)
-        
-        return matching_archives
+        return self.database.search_archives(query, policy_name, start_date, end_date)
     
     def get_stats(self) -> ArchiveStats:
         """Get archive statistics"""
@@ -745,6 +880,9 @@ class LogArchiver:
             self.scheduler_thread.join(timeout=5.0)
         
         self.executor.shutdown(wait=True)
+        
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
 
 
 # Global archiver instance
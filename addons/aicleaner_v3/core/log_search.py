@@ -0,0 +1,534 @@
+"""
+Searchable Log Store for AICleaner v3
+Phase 1C: Logging System Enhancement
+
+This module indexes log files into day-partitioned SQLite FTS5 databases so
+troubleshooting queries don't have to read whole log files or extract
+archives first.
+
+Key Features:
+- Ingests the JSON lines written by FileLogHandler (and the plain-text
+  format written by SimpleFileHandler)
+- One SQLite database per day, so retention is a file delete
+- Incremental ingestion of live logs via per-file byte offsets that follow
+  the file across rotation, so rotated and archived copies of indexed
+  lines are not indexed twice
+- Streaming ingestion of gzip/zip/tar.gz archives without extracting them
+- Full-text search filtered by level, component, correlation ID and time,
+  streamed across partitions newest first
+"""
+
+import gzip
+import hashlib
+import json
+import re
+import sqlite3
+import tarfile
+import threading
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# Matches SimpleFileHandler's '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+_TEXT_LINE_PATTERN = re.compile(
+    r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (\w+) - ([^ ]+) - (.*)$"
+)
+
+_ARCHIVE_SUFFIXES = (".gz", ".zip")
+
+_PARTITION_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS entries (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        level TEXT NOT NULL,
+        component TEXT,
+        correlation_id TEXT,
+        source TEXT NOT NULL,
+        message TEXT NOT NULL,
+        raw TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_entries_timestamp ON entries(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_entries_level ON entries(level, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_entries_component ON entries(component, timestamp);
+    CREATE INDEX IF NOT EXISTS idx_entries_correlation ON entries(correlation_id);
+    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+        message, content='entries', content_rowid='id'
+    );
+"""
+
+_CATALOG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sources (
+        path TEXT PRIMARY KEY,
+        inode INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        mtime REAL NOT NULL,
+        offset INTEGER NOT NULL,
+        complete INTEGER NOT NULL DEFAULT 0,
+        device INTEGER NOT NULL DEFAULT 0,
+        head_hash TEXT
+    );
+"""
+
+# Columns added after the first catalog version, created on open if missing
+_CATALOG_COLUMNS = {
+    "device": "INTEGER NOT NULL DEFAULT 0",
+    "head_hash": "TEXT",
+}
+
+_CATALOG_INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_sources_file ON sources(device, inode);
+    CREATE INDEX IF NOT EXISTS idx_sources_head ON sources(head_hash);
+"""
+
+
+@dataclass
+class IndexedLogLine:
+    """A parsed log line ready for indexing"""
+    timestamp: str
+    level: str
+    message: str
+    component: Optional[str]
+    correlation_id: Optional[str]
+    raw: str
+
+
+@dataclass
+class IngestResult:
+    """Outcome of ingesting one source file"""
+    path: str
+    lines_indexed: int
+    lines_skipped: int
+    partitions: List[str]
+
+
+def parse_log_line(line: str) -> Optional[IndexedLogLine]:
+    """Parse a FileLogHandler JSON line or a SimpleFileHandler text line"""
+    line = line.rstrip("\n")
+    if not line.strip():
+        return None
+
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+            return IndexedLogLine(
+                timestamp=record["timestamp"],
+                level=record.get("level", "INFO"),
+                message=record.get("message", ""),
+                component=record.get("component") or record.get("module"),
+                correlation_id=record.get("correlation_id"),
+                raw=line
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    match = _TEXT_LINE_PATTERN.match(line)
+    if match:
+        timestamp, level, component, message = match.groups()
+        return IndexedLogLine(
+            timestamp=datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S").isoformat(),
+            level=level,
+            message=message,
+            component=component,
+            correlation_id=None,
+            raw=line
+        )
+
+    return None
+
+
+def _fts_query(query: str) -> str:
+    """Quote each term so user input can't inject FTS5 syntax"""
+    terms = [term.replace('"', '""') for term in query.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+@contextmanager
+def _open_line_stream(path: Path) -> Iterator[Iterable[bytes]]:
+    """Open a plain or compressed log file as a streaming iterator of raw lines"""
+    name = path.name
+    if name.endswith(".tar.gz"):
+        with tarfile.open(path, "r:gz") as tar:
+            member = next(m for m in tar.getmembers() if m.isfile())
+            with tar.extractfile(member) as raw:
+                yield raw
+    elif name.endswith(".gz"):
+        with gzip.open(path, "rb") as raw:
+            yield raw
+    elif name.endswith(".zip"):
+        with zipfile.ZipFile(path, "r") as zipf:
+            with zipf.open(zipf.namelist()[0]) as raw:
+                yield raw
+    else:
+        with open(path, "rb") as raw:
+            yield raw
+
+
+def _head_hash(path: Path) -> Optional[str]:
+    """
+    Hash of a log file's first complete line.
+
+    The first line carries the timestamp of the file's first entry, so it
+    identifies the content across renames, copies and compression.
+    """
+    with _open_line_stream(path) as lines:
+        first = next(iter(lines), b"")
+    if not first.endswith(b"\n"):
+        return None
+    return hashlib.sha1(first).hexdigest()
+
+
+class LogSearchIndex:
+    """Day-partitioned full-text index over live and archived logs"""
+
+    FETCH_SIZE = 200
+
+    def __init__(self, index_dir: str = "logs/index", batch_size: int = 1000):
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.lock = threading.RLock()
+        self._partitions: Dict[str, sqlite3.Connection] = {}
+
+        self._catalog = sqlite3.connect(str(self.index_dir / "catalog.db"), check_same_thread=False)
+        self._catalog.executescript(_CATALOG_SCHEMA)
+        existing = {row[1] for row in self._catalog.execute("PRAGMA table_info(sources)")}
+        for column, definition in _CATALOG_COLUMNS.items():
+            if column not in existing:
+                self._catalog.execute(f"ALTER TABLE sources ADD COLUMN {column} {definition}")
+        self._catalog.executescript(_CATALOG_INDEXES)
+        self._catalog.commit()
+
+    # Partitions
+
+    def _partition_path(self, day: str) -> Path:
+        return self.index_dir / f"logs-{day}.db"
+
+    def _partition(self, day: str) -> sqlite3.Connection:
+        """Get (creating if needed) the connection for one day (caller holds lock)"""
+        conn = self._partitions.get(day)
+        if conn is None:
+            conn = sqlite3.connect(str(self._partition_path(day)), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_PARTITION_SCHEMA)
+            self._partitions[day] = conn
+        return conn
+
+    def list_partitions(self) -> List[str]:
+        """Indexed days, newest first"""
+        days = [path.stem[len("logs-"):] for path in self.index_dir.glob("logs-*.db")]
+        return sorted(days, reverse=True)
+
+    def drop_partitions_before(self, day: str) -> int:
+        """Delete whole day partitions older than ``day`` (YYYY-MM-DD)"""
+        removed = 0
+        with self.lock:
+            for old_day in self.list_partitions():
+                if old_day >= day:
+                    continue
+                conn = self._partitions.pop(old_day, None)
+                if conn is not None:
+                    conn.close()
+                for suffix in ("", "-wal", "-shm"):
+                    path = Path(str(self._partition_path(old_day)) + suffix)
+                    if path.exists():
+                        path.unlink()
+                removed += 1
+        return removed
+
+    # Ingestion
+
+    def _write_batch(self, batch: List[Tuple[IndexedLogLine, str]], partitions: set):
+        """Insert parsed lines into their day partitions (caller holds lock)"""
+        by_day: Dict[str, List[Tuple[IndexedLogLine, str]]] = {}
+        for item in batch:
+            by_day.setdefault(item[0].timestamp[:10], []).append(item)
+
+        for day, items in by_day.items():
+            conn = self._partition(day)
+            with conn:
+                for parsed, source in items:
+                    cursor = conn.execute(
+                        "INSERT INTO entries (timestamp, level, component, correlation_id, source, message, raw) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (parsed.timestamp, parsed.level, parsed.component,
+                         parsed.correlation_id, source, parsed.message, parsed.raw)
+                    )
+                    conn.execute("INSERT INTO entries_fts (rowid, message) VALUES (?, ?)",
+                                 (cursor.lastrowid, parsed.message))
+            partitions.add(day)
+
+    def _ingest_lines(self, lines: Iterable[str], source: str) -> Tuple[int, int, set]:
+        """Parse and index a stream of lines in batches"""
+        indexed = skipped = 0
+        partitions: set = set()
+        batch: List[Tuple[IndexedLogLine, str]] = []
+
+        for line in lines:
+            parsed = parse_log_line(line)
+            if parsed is None:
+                if line.strip():
+                    skipped += 1
+                continue
+            batch.append((parsed, source))
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch, partitions)
+                indexed += len(batch)
+                batch = []
+
+        if batch:
+            self._write_batch(batch, partitions)
+            indexed += len(batch)
+
+        return indexed, skipped, partitions
+
+    @staticmethod
+    def _complete_lines(f, position: List[int]) -> Iterator[str]:
+        """Yield newline-terminated lines, tracking the byte offset consumed"""
+        for raw in f:
+            # A partial last line is still being written; pick it up next time
+            if not raw.endswith(b"\n"):
+                break
+            position[0] += len(raw)
+            yield raw.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _lines_after(lines: Iterable[bytes], skip: int, position: List[int]) -> Iterator[str]:
+        """Yield the lines after the first ``skip`` bytes, tracking the bytes read"""
+        for raw in lines:
+            start = position[0]
+            position[0] += len(raw)
+            if start >= skip:
+                yield raw.decode("utf-8", errors="replace")
+
+    def _indexed_prefix(self, head_hash: Optional[str], size: Optional[int] = None) -> int:
+        """
+        Bytes already indexed from content starting with the same first line.
+
+        Covers rotated copies and archives of a file indexed under another
+        path. Offsets beyond ``size`` belong to different content.
+        """
+        if head_hash is None:
+            return 0
+        sql = "SELECT MAX(offset) FROM sources WHERE head_hash = ?"
+        params: List[Any] = [head_hash]
+        if size is not None:
+            sql += " AND offset <= ?"
+            params.append(size)
+        return self._catalog.execute(sql, params).fetchone()[0] or 0
+
+    def _resume_offset(self, key: str, file_stat, head_hash: Optional[str]) -> int:
+        """
+        Byte offset to continue a live file from (caller holds lock).
+
+        The offset is tracked by device and inode, so it moves with the file
+        when it is renamed by rotation. A reused inode is told apart by the
+        first line, and a truncated file starts over. Rows written before
+        devices were recorded have device 0.
+        """
+        row = self._catalog.execute(
+            "SELECT path, offset, head_hash FROM sources "
+            "WHERE device IN (?, 0) AND inode = ? AND complete = 0 ORDER BY offset DESC",
+            (file_stat.st_dev, file_stat.st_ino)
+        ).fetchone()
+
+        if row and row[2] in (None, head_hash) and row[1] <= file_stat.st_size:
+            if row[0] != key:
+                # Renamed: the file carries its offset to the new path
+                self._catalog.execute("DELETE FROM sources WHERE path = ?", (row[0],))
+            return max(row[1], self._indexed_prefix(head_hash, file_stat.st_size))
+
+        return self._indexed_prefix(head_hash, file_stat.st_size)
+
+    def _detach_replaced(self, key: str, file_stat):
+        """
+        Keep the catalog row of a file that was rotated away from ``key``.
+
+        The new file at the path gets the row, and the old file's offset moves
+        to a row of its own until the old file is seen under its new name.
+        """
+        row = self._catalog.execute(
+            "SELECT device, inode FROM sources WHERE path = ? AND complete = 0", (key,)
+        ).fetchone()
+        if row and row[1] != file_stat.st_ino:
+            self._catalog.execute(
+                "UPDATE OR REPLACE sources SET path = ? WHERE path = ?",
+                (f"{key}@{row[0]}:{row[1]}", key)
+            )
+
+    def ingest_file(self, path: Union[str, Path]) -> IngestResult:
+        """
+        Index new lines from a log file.
+
+        Plain files are read from the last indexed byte offset, which follows
+        the file across renames and restarts from zero when the file was
+        truncated or replaced. Compressed archives are streamed once and then
+        marked complete. Lines already indexed from a file with the same
+        first line, such as the live file an archive was made from, are
+        skipped in both cases.
+        """
+        path = Path(path)
+        key = str(path.resolve())
+        file_stat = path.stat()
+
+        with self.lock:
+            is_archive = path.name.endswith(_ARCHIVE_SUFFIXES)
+            if is_archive:
+                row = self._catalog.execute(
+                    "SELECT size, mtime, complete FROM sources WHERE path = ?", (key,)
+                ).fetchone()
+                if row and row[2] and row[0] == file_stat.st_size and row[1] == file_stat.st_mtime:
+                    return IngestResult(key, 0, 0, [])
+
+                head_hash = _head_hash(path)
+                skip = self._indexed_prefix(head_hash)
+                position = [0]
+                with _open_line_stream(path) as lines:
+                    indexed, skipped, partitions = self._ingest_lines(
+                        self._lines_after(lines, skip, position), key
+                    )
+                # Offsets of archives count decompressed bytes
+                new_offset, complete = max(position[0], skip), 1
+            else:
+                head_hash = _head_hash(path)
+                offset = self._resume_offset(key, file_stat, head_hash)
+                indexed, skipped, partitions = 0, 0, set()
+                position = [offset]
+                if offset < file_stat.st_size:
+                    with open(path, "rb") as f:
+                        f.seek(offset)
+                        indexed, skipped, partitions = self._ingest_lines(
+                            self._complete_lines(f, position), key
+                        )
+                new_offset = position[0]
+                complete = 0
+
+            with self._catalog:
+                if not is_archive:
+                    self._detach_replaced(key, file_stat)
+                self._catalog.execute(
+                    "INSERT OR REPLACE INTO sources "
+                    "(path, inode, size, mtime, offset, complete, device, head_hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime,
+                     new_offset, complete, file_stat.st_dev, head_hash)
+                )
+
+        return IngestResult(key, indexed, skipped, sorted(partitions))
+
+    def ingest_directory(self, directory: Union[str, Path], pattern: str = "*.log*") -> List[IngestResult]:
+        """Index every matching log file or archive under a directory"""
+        results = []
+        directory = Path(directory)
+        if not directory.exists():
+            return results
+
+        for path in sorted(directory.rglob(pattern)):
+            if path.is_file() and not path.name.endswith((".db", "-wal", "-shm")):
+                try:
+                    results.append(self.ingest_file(path))
+                except (OSError, sqlite3.Error, tarfile.TarError, zipfile.BadZipFile) as e:
+                    print(f"Error indexing log file {path}: {e}")
+        return results
+
+    # Search
+
+    def search(self, query: Optional[str] = None, levels: Optional[Iterable[str]] = None,
+               component: Optional[str] = None, correlation_id: Optional[str] = None,
+               start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+               limit: Optional[int] = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Stream matching entries, newest first, partition by partition.
+
+        Partitions outside the time range are never opened, and rows are
+        fetched lazily so callers can stop early.
+        """
+        start_day = start_time.strftime("%Y-%m-%d") if start_time else None
+        end_day = end_time.strftime("%Y-%m-%d") if end_time else None
+
+        if query:
+            sql = ("SELECT e.timestamp, e.level, e.component, e.correlation_id, e.source, e.raw "
+                   "FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+                   "WHERE entries_fts MATCH ?")
+            base_params: List[Any] = [_fts_query(query)]
+        else:
+            sql = ("SELECT e.timestamp, e.level, e.component, e.correlation_id, e.source, e.raw "
+                   "FROM entries e WHERE 1=1")
+            base_params = []
+
+        level_list = [level.upper() for level in levels] if levels else []
+        if level_list:
+            sql += f" AND e.level IN ({','.join('?' * len(level_list))})"
+            base_params.extend(level_list)
+        if component:
+            sql += " AND e.component = ?"
+            base_params.append(component)
+        if correlation_id:
+            sql += " AND e.correlation_id = ?"
+            base_params.append(correlation_id)
+        if start_time:
+            sql += " AND e.timestamp >= ?"
+            base_params.append(start_time.isoformat())
+        if end_time:
+            sql += " AND e.timestamp <= ?"
+            base_params.append(end_time.isoformat())
+        sql += " ORDER BY e.timestamp DESC, e.id DESC"
+
+        remaining = limit
+        for day in self.list_partitions():
+            if (start_day and day < start_day) or (end_day and day > end_day):
+                continue
+
+            params = list(base_params)
+            day_sql = sql
+            if remaining is not None:
+                day_sql += " LIMIT ?"
+                params.append(remaining)
+
+            with self.lock:
+                cursor = self._partition(day).execute(day_sql, params)
+
+            # Fetch in pages so the lock is never held while the caller consumes rows
+            while True:
+                with self.lock:
+                    rows = cursor.fetchmany(self.FETCH_SIZE)
+                if not rows:
+                    break
+
+                for timestamp, level, row_component, row_correlation_id, source, raw in rows:
+                    yield {
+                        "timestamp": timestamp,
+                        "level": level,
+                        "component": row_component,
+                        "correlation_id": row_correlation_id,
+                        "source": source,
+                        "raw": raw
+                    }
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining <= 0:
+                            return
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        with self.lock:
+            sources = self._catalog.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+        partitions = self.list_partitions()
+        return {
+            "partitions": len(partitions),
+            "oldest_partition": partitions[-1] if partitions else None,
+            "newest_partition": partitions[0] if partitions else None,
+            "indexed_sources": sources,
+            "index_size": sum(path.stat().st_size for path in self.index_dir.glob("*.db"))
+        }
+
+    def close(self):
+        """Close all partition connections"""
+        with self.lock:
+            for conn in self._partitions.values():
+                conn.close()
+            self._partitions.clear()
+            self._catalog.close()
@@ -17,8 +17,11 @@ Key Features:
 
 import asyncio
 import json
+import os
+import sys
 import threading
 import time
+import traceback
 from collections import defaultdict, deque
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
@@ -36,6 +39,9 @@ from .enhanced_logging import (
 )
 
 
+_EMPTY_CATEGORIES: frozenset = frozenset()
+
+
 @dataclass
 class LoggingConfig:
     """Logging system configuration"""
@@ -54,6 +60,7 @@ class LoggingConfig:
     enable_analysis: bool = True
     enable_alerting: bool = True
     analysis_window: int = 300  # 5 minutes
+    analysis_bucket_seconds: int = 10
     alert_thresholds: Dict[str, Any] = field(default_factory=lambda: {
         "error_rate": 0.1,  # 10% error rate
         "critical_count": 5,  # 5 critical errors
@@ -144,92 +151,283 @@ class LogStream:
                     self.subscribers.discard(callback)
 
 
+class _EwmaStat:
+    """Exponentially weighted running mean and variance"""
+    
+    __slots__ = ("alpha", "mean", "variance", "samples")
+    
+    # Floor on the standard deviation, relative to the mean (or 1 when the mean
+    # is small), so a perfectly flat baseline still yields a finite score
+    MIN_RELATIVE_STD = 0.1
+    
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+        self.samples = 0
+    
+    def score(self, value: float) -> float:
+        """Z-score of value against the current mean/variance (before updating)"""
+        if self.samples == 0:
+            return 0.0
+        std = max(self.variance ** 0.5,
+                  self.MIN_RELATIVE_STD * max(1.0, abs(self.mean)))
+        return (value - self.mean) / std
+    
+    def update(self, value: float):
+        """Fold a new observation into the running statistics"""
+        if self.samples == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.samples += 1
+
+
+class _LogBucket:
+    """Counters for one time slice of the analysis window"""
+    
+    __slots__ = ("bucket_id", "total", "errors", "by_level", "by_category",
+                 "by_component", "by_component_level", "error_patterns",
+                 "metrics", "security_events")
+    
+    def __init__(self):
+        self.reset(-1)
+    
+    def reset(self, bucket_id: int):
+        self.bucket_id = bucket_id
+        self.total = 0
+        self.errors = 0
+        self.by_level: Dict[LogLevel, int] = defaultdict(int)
+        self.by_category: Dict[LogCategory, int] = defaultdict(int)
+        self.by_component: Dict[str, int] = defaultdict(int)
+        self.by_component_level: Dict[Tuple[str, LogLevel], int] = defaultdict(int)
+        self.error_patterns: Dict[str, int] = defaultdict(int)
+        # trend_key -> [count, sum, min, max, first, last]
+        self.metrics: Dict[str, List[float]] = {}
+        self.security_events: List[Dict[str, Any]] = []
+
+
 class LogAnalyzer:
-    """Log analysis and pattern detection"""
+    """
+    Log analysis and pattern detection over a sliding window.
+
+    The window is split into fixed-size time buckets held in a ring, so memory
+    is bounded by the bucket count (and the number of distinct components and
+    metrics) rather than by log volume, and ``analyze()`` only merges bucket
+    counters. Each time a bucket closes, its per-(component, level) counts and
+    per-metric averages are folded into EWMA mean/variance estimates, which
+    drive anomaly detection without rescanning the window. Volume baselines for
+    keys that have gone quiet are dropped once their mean decays below
+    ``idle_mean``, so components that stop logging do not accumulate.
+    """
     
-    def __init__(self, analysis_window: int = 300):
+    def __init__(self, analysis_window: int = 300, bucket_seconds: int = 10,
+                 ewma_alpha: float = 0.1, anomaly_threshold: float = 3.0,
+                 min_anomaly_count: int = 5, max_security_events_per_bucket: int = 20,
+                 idle_mean: float = 0.01):
         self.analysis_window = timedelta(seconds=analysis_window)
-        self.entry_buffer = deque()
-        self.error_patterns = defaultdict(int)
-        self.performance_trends = defaultdict(list)
-        self.security_events = []
+        self.bucket_seconds = max(1, bucket_seconds)
+        self.num_buckets = max(1, -(-analysis_window // self.bucket_seconds))
+        self.ewma_alpha = ewma_alpha
+        self.anomaly_threshold = anomaly_threshold
+        self.min_anomaly_count = min_anomaly_count
+        self.max_security_events_per_bucket = max_security_events_per_bucket
+        self.idle_mean = idle_mean
+        
+        self.buckets = [_LogBucket() for _ in range(self.num_buckets)]
+        self.current_bucket_id: Optional[int] = None
+        
+        # Per (component, level) volume and per-metric baselines
+        self.volume_stats: Dict[Tuple[str, LogLevel], _EwmaStat] = {}
+        self.metric_stats: Dict[str, _EwmaStat] = {}
+        self.recent_anomalies = deque(maxlen=50)
         self.anomaly_detectors = []
         self.lock = threading.Lock()
     
+    def _bucket_id(self, timestamp: datetime) -> int:
+        return int(timestamp.timestamp()) // self.bucket_seconds
+    
+    def _advance_to(self, bucket_id: int):
+        """Close buckets up to bucket_id, updating the EWMA baselines (caller holds lock)"""
+        if self.current_bucket_id is None:
+            self.current_bucket_id = bucket_id
+            self.buckets[bucket_id % self.num_buckets].reset(bucket_id)
+            return
+        
+        if bucket_id <= self.current_bucket_id:
+            return
+        
+        # Close the current bucket, then any empty ones in between (capped at a
+        # full ring: beyond that the baselines have decayed anyway)
+        closing = self.buckets[self.current_bucket_id % self.num_buckets]
+        if closing.bucket_id == self.current_bucket_id:
+            self._close_bucket(closing)
+        gap = min(bucket_id - self.current_bucket_id - 1, self.num_buckets)
+        for _ in range(gap):
+            self._close_empty_bucket()
+        
+        self.current_bucket_id = bucket_id
+        self.buckets[bucket_id % self.num_buckets].reset(bucket_id)
+    
+    def _close_bucket(self, bucket: _LogBucket):
+        """Score a finished bucket against the baselines, then fold it in"""
+        bucket_time = datetime.fromtimestamp(bucket.bucket_id * self.bucket_seconds)
+        
+        for key in set(self.volume_stats) | set(bucket.by_component_level):
+            count = bucket.by_component_level.get(key, 0)
+            stat = self.volume_stats.get(key)
+            if stat is None:
+                stat = self.volume_stats[key] = _EwmaStat(self.ewma_alpha)
+            
+            score = stat.score(count)
+            if (stat.samples >= 5 and count >= self.min_anomaly_count
+                    and score > self.anomaly_threshold):
+                component, level = key
+                self.recent_anomalies.append({
+                    "type": "volume_spike",
+                    "description": (f"{count} {level.name} entries from {component} in "
+                                    f"{self.bucket_seconds}s (baseline {stat.mean:.1f})"),
+                    "severity": LogLevel.WARNING,
+                    "score": score,
+                    "timestamp": bucket_time
+                })
+            stat.update(count)
+            if count == 0 and stat.mean < self.idle_mean:
+                del self.volume_stats[key]
+        
+        for trend_key, (count, total, _min, _max, _first, _last) in bucket.metrics.items():
+            average = total / count
+            stat = self.metric_stats.get(trend_key)
+            if stat is None:
+                stat = self.metric_stats[trend_key] = _EwmaStat(self.ewma_alpha)
+            
+            if ("response_time" in trend_key and stat.samples >= 5
+                    and stat.mean > 0 and average > stat.mean * 1.5):
+                self.recent_anomalies.append({
+                    "type": "performance_degradation",
+                    "description": f"Response time increased by {((average/stat.mean)-1)*100:.1f}% for {trend_key}",
+                    "severity": LogLevel.WARNING,
+                    "score": stat.score(average),
+                    "timestamp": bucket_time
+                })
+            stat.update(average)
+    
+    def _close_empty_bucket(self):
+        """Fold an empty interval into the volume baselines, dropping idle keys"""
+        for key, stat in list(self.volume_stats.items()):
+            stat.update(0)
+            if stat.mean < self.idle_mean:
+                del self.volume_stats[key]
+    
     def add_entry(self, entry: LogEntry):
         """Add log entry for analysis"""
+        bucket_id = self._bucket_id(entry.timestamp)
+        
         with self.lock:
-            # Add to buffer
-            self.entry_buffer.append(entry)
+            self._advance_to(bucket_id)
+            
+            # Late entries land in their own bucket if it is still in the ring
+            if bucket_id <= self.current_bucket_id - self.num_buckets:
+                return
+            bucket = self.buckets[bucket_id % self.num_buckets]
+            if bucket.bucket_id < bucket_id:
+                bucket.reset(bucket_id)
             
-            # Clean old entries
-            cutoff_time = datetime.now() - self.analysis_window
-            while (self.entry_buffer and 
-                   self.entry_buffer[0].timestamp < cutoff_time):
-                self.entry_buffer.popleft()
+            component = entry.context.component or "unknown"
+            bucket.total += 1
+            bucket.by_level[entry.level] += 1
+            bucket.by_category[entry.context.category] += 1
+            if entry.context.component:
+                bucket.by_component[entry.context.component] += 1
+            bucket.by_component_level[(component, entry.level)] += 1
             
             # Update patterns
-            self._update_patterns(entry)
+            if entry.level.value >= LogLevel.ERROR.value:
+                bucket.errors += 1
+                pattern_key = f"{entry.context.component}:{entry.context.operation}"
+                bucket.error_patterns[pattern_key] += 1
             
             # Track performance trends
-            self._update_performance_trends(entry)
+            if entry.performance_metrics:
+                for metric_name, value in entry.performance_metrics.items():
+                    if isinstance(value, (int, float)):
+                        trend_key = f"{component}:{metric_name}"
+                        point = bucket.metrics.get(trend_key)
+                        if point is None:
+                            bucket.metrics[trend_key] = [1, value, value, value, value, value]
+                        else:
+                            point[0] += 1
+                            point[1] += value
+                            point[2] = min(point[2], value)
+                            point[3] = max(point[3], value)
+                            point[5] = value
             
             # Track security events
-            self._track_security_events(entry)
-    
-    def _update_patterns(self, entry: LogEntry):
-        """Update error patterns"""
-        if entry.level.value >= LogLevel.ERROR.value:
-            # Create pattern key
-            pattern_key = f"{entry.context.component}:{entry.context.operation}"
-            self.error_patterns[pattern_key] += 1
-    
-    def _update_performance_trends(self, entry: LogEntry):
-        """Update performance trends"""
-        if entry.performance_metrics:
-            component = entry.context.component or "unknown"
-            metrics = entry.performance_metrics
-            
-            for metric_name, value in metrics.items():
-                if isinstance(value, (int, float)):
-                    trend_key = f"{component}:{metric_name}"
-                    self.performance_trends[trend_key].append({
-                        "timestamp": entry.timestamp,
-                        "value": value
-                    })
-                    
-                    # Keep only recent data
-                    cutoff_time = datetime.now() - self.analysis_window
-                    self.performance_trends[trend_key] = [
-                        point for point in self.performance_trends[trend_key]
-                        if point["timestamp"] > cutoff_time
-                    ]
-    
-    def _track_security_events(self, entry: LogEntry):
-        """Track security events"""
-        if entry.context.category == LogCategory.SECURITY:
-            security_event = {
-                "timestamp": entry.timestamp,
-                "message": entry.message,
-                "component": entry.context.component,
-                "security_context": entry.security_context,
-                "correlation_id": entry.context.correlation_id
-            }
-            self.security_events.append(security_event)
-            
-            # Keep only recent events
-            cutoff_time = datetime.now() - self.analysis_window
-            self.security_events = [
-                event for event in self.security_events
-                if event["timestamp"] > cutoff_time
-            ]
+            if (entry.context.category == LogCategory.SECURITY and
+                    len(bucket.security_events) < self.max_security_events_per_bucket):
+                bucket.security_events.append({
+                    "timestamp": entry.timestamp,
+                    "message": entry.message,
+                    "component": entry.context.component,
+                    "security_context": entry.security_context,
+                    "correlation_id": entry.context.correlation_id
+                })
+    
+    def _window_buckets(self) -> List[_LogBucket]:
+        """Buckets inside the window, oldest first (caller holds lock)"""
+        newest = self._bucket_id(datetime.now())
+        if self.current_bucket_id is not None:
+            newest = max(newest, self.current_bucket_id)
+        oldest = newest - self.num_buckets + 1
+        return sorted(
+            (bucket for bucket in self.buckets if oldest <= bucket.bucket_id <= newest),
+            key=lambda bucket: bucket.bucket_id
+        )
     
     def analyze(self) -> LogAnalysis:
-        """Perform comprehensive log analysis"""
+        """Perform log analysis by merging the bucket counters"""
         with self.lock:
-            entries = list(self.entry_buffer)
+            buckets = self._window_buckets()
+            
+            total_entries = 0
+            error_count = 0
+            entries_by_level = defaultdict(int)
+            entries_by_category = defaultdict(int)
+            entries_by_component = defaultdict(int)
+            error_patterns = defaultdict(int)
+            metrics: Dict[str, List[float]] = {}
+            security_events = []
+            
+            for bucket in buckets:
+                total_entries += bucket.total
+                error_count += bucket.errors
+                for level, count in bucket.by_level.items():
+                    entries_by_level[level] += count
+                for category, count in bucket.by_category.items():
+                    entries_by_category[category] += count
+                for component, count in bucket.by_component.items():
+                    entries_by_component[component] += count
+                for pattern, count in bucket.error_patterns.items():
+                    error_patterns[pattern] += count
+                for trend_key, point in bucket.metrics.items():
+                    merged = metrics.get(trend_key)
+                    if merged is None:
+                        metrics[trend_key] = list(point)
+                    else:
+                        merged[0] += point[0]
+                        merged[1] += point[1]
+                        merged[2] = min(merged[2], point[2])
+                        merged[3] = max(merged[3], point[3])
+                        merged[5] = point[5]
+                security_events.extend(bucket.security_events)
+            
+            bucket_counts = [(bucket.bucket_id, bucket.total) for bucket in buckets if bucket.total]
+            anomalies = self._detect_anomalies(total_entries, error_count, buckets)
         
-        if not entries:
+        if not total_entries:
             return LogAnalysis(
                 time_window=self.analysis_window,
                 total_entries=0,
@@ -243,92 +441,58 @@ class LogAnalyzer:
                 trends={}
             )
         
-        # Count entries by level
-        entries_by_level = defaultdict(int)
-        for entry in entries:
-            entries_by_level[entry.level] += 1
-        
-        # Count entries by category
-        entries_by_category = defaultdict(int)
-        for entry in entries:
-            entries_by_category[entry.context.category] += 1
-        
-        # Count entries by component
-        entries_by_component = defaultdict(int)
-        for entry in entries:
-            if entry.context.component:
-                entries_by_component[entry.context.component] += 1
-        
-        # Extract error patterns
-        error_patterns = [
-            {"pattern": pattern, "count": count}
-            for pattern, count in sorted(
-                self.error_patterns.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:10]
-        ]
-        
-        # Analyze performance trends
-        performance_summary = self._analyze_performance_trends()
-        
-        # Detect anomalies
-        anomalies = self._detect_anomalies()
-        
-        # Calculate trends
-        trends = self._calculate_trends(entries)
-        
         return LogAnalysis(
             time_window=self.analysis_window,
-            total_entries=len(entries),
+            total_entries=total_entries,
             entries_by_level=dict(entries_by_level),
             entries_by_category=dict(entries_by_category),
             entries_by_component=dict(entries_by_component),
-            error_patterns=error_patterns,
-            performance_summary=performance_summary,
-            security_events=list(self.security_events),
+            error_patterns=[
+                {"pattern": pattern, "count": count}
+                for pattern, count in sorted(
+                    error_patterns.items(),
+                    key=lambda x: x[1],
+                    reverse=True
+                )[:10]
+            ],
+            performance_summary=self._analyze_performance_trends(metrics),
+            security_events=security_events,
             anomalies=anomalies,
-            trends=trends
+            trends=self._calculate_trends(bucket_counts)
         )
     
-    def _analyze_performance_trends(self) -> Dict[str, Any]:
-        """Analyze performance trends"""
+    def _analyze_performance_trends(self, metrics: Dict[str, List[float]]) -> Dict[str, Any]:
+        """Summarize merged per-metric counters"""
         summary = {}
         
-        for trend_key, data_points in self.performance_trends.items():
-            if len(data_points) < 2:
+        for trend_key, (count, total, minimum, maximum, first, latest) in metrics.items():
+            if count < 2:
                 continue
             
-            values = [point["value"] for point in data_points]
-            
+            stat = self.metric_stats.get(trend_key)
             summary[trend_key] = {
-                "count": len(values),
-                "min": min(values),
-                "max": max(values),
-                "avg": sum(values) / len(values),
-                "latest": values[-1],
-                "trend": "increasing" if values[-1] > values[0] else "decreasing"
+                "count": int(count),
+                "min": minimum,
+                "max": maximum,
+                "avg": total / count,
+                "latest": latest,
+                "ewma": stat.mean if stat else None,
+                "trend": "increasing" if latest > first else "decreasing"
             }
         
         return summary
     
-    def _detect_anomalies(self) -> List[Dict[str, Any]]:
-        """Detect anomalies in log patterns"""
+    def _detect_anomalies(self, total_entries: int, error_count: int,
+                          buckets: List[_LogBucket]) -> List[Dict[str, Any]]:
+        """Collect anomalies from the incremental detectors (caller holds lock)"""
         anomalies = []
         
-        # Check for error rate spikes
-        recent_entries = [
-            entry for entry in self.entry_buffer
-            if entry.timestamp > datetime.now() - timedelta(minutes=5)
-        ]
-        
-        if recent_entries:
-            error_count = sum(
-                1 for entry in recent_entries
-                if entry.level.value >= LogLevel.ERROR.value
-            )
-            error_rate = error_count / len(recent_entries)
-            
+        # Error rate over the last five minutes of buckets
+        recent_cutoff = self._bucket_id(datetime.now() - timedelta(minutes=5))
+        recent_total = sum(bucket.total for bucket in buckets if bucket.bucket_id >= recent_cutoff)
+        recent_errors = sum(bucket.errors for bucket in buckets if bucket.bucket_id >= recent_cutoff)
+        if recent_total:
+            error_rate = recent_errors / recent_total
             if error_rate > 0.2:  # 20% error rate
                 anomalies.append({
                     "type": "high_error_rate",
@@ -337,63 +501,47 @@ class LogAnalyzer:
                     "timestamp": datetime.now()
                 })
         
-        # Check for performance degradation
-        for trend_key, data_points in self.performance_trends.items():
-            if "response_time" in trend_key and len(data_points) >= 5:
-                recent_values = [point["value"] for point in data_points[-5:]]
-                avg_recent = sum(recent_values) / len(recent_values)
-                
-                if len(data_points) >= 10:
-                    older_values = [point["value"] for point in data_points[-10:-5]]
-                    avg_older = sum(older_values) / len(older_values)
-                    
-                    if avg_recent > avg_older * 1.5:  # 50% increase
-                        anomalies.append({
-                            "type": "performance_degradation",
-                            "description": f"Response time increased by {((avg_recent/avg_older)-1)*100:.1f}% for {trend_key}",
-                            "severity": LogLevel.WARNING,
-                            "timestamp": datetime.now()
-                        })
+        cutoff = datetime.now() - self.analysis_window
+        anomalies.extend(
+            anomaly for anomaly in self.recent_anomalies
+            if anomaly["timestamp"] >= cutoff
+        )
         
         return anomalies
     
-    def _calculate_trends(self, entries: List[LogEntry]) -> Dict[str, Any]:
-        """Calculate logging trends"""
-        if len(entries) < 2:
+    def _calculate_trends(self, bucket_counts: List[Tuple[int, int]]) -> Dict[str, Any]:
+        """Calculate log rate trends (entries per minute) from bucket totals"""
+        if len(bucket_counts) < 2:
             return {}
         
-        # Calculate time-based trends
-        time_buckets = defaultdict(int)
-        bucket_size = timedelta(minutes=1)
-        
-        for entry in entries:
-            bucket_time = entry.timestamp.replace(second=0, microsecond=0)
-            time_buckets[bucket_time] += 1
-        
-        # Calculate rate trends
-        bucket_times = sorted(time_buckets.keys())
-        if len(bucket_times) >= 2:
-            recent_rate = time_buckets[bucket_times[-1]]
-            avg_rate = sum(time_buckets.values()) / len(time_buckets)
-            
-            return {
-                "log_rate_trend": "increasing" if recent_rate > avg_rate else "decreasing",
-                "current_rate": recent_rate,
-                "average_rate": avg_rate,
-                "rate_change": (recent_rate - avg_rate) / max(avg_rate, 1)
-            }
+        per_minute = 60.0 / self.bucket_seconds
+        recent_rate = bucket_counts[-1][1] * per_minute
+        avg_rate = sum(count for _, count in bucket_counts) / len(bucket_counts) * per_minute
         
-        return {}
+        return {
+            "log_rate_trend": "increasing" if recent_rate > avg_rate else "decreasing",
+            "current_rate": recent_rate,
+            "average_rate": avg_rate,
+            "rate_change": (recent_rate - avg_rate) / max(avg_rate, 1)
+        }
 
 
 class LoggingManager:
     """Enhanced logging manager"""
     
+    # Entries at or above this level always reach analysis and alerting,
+    # even when no handler would emit them
+    ALWAYS_ENABLED_LEVEL = LogLevel.WARNING
+    
     def __init__(self, config: LoggingConfig = None):
         self.config = config or LoggingConfig()
         self.handlers: Dict[str, LogHandler] = {}
         self.streams: Dict[str, LogStream] = {}
-        self.analyzer = LogAnalyzer(self.config.analysis_window)
+        
+        # Call-site gate: level value -> enabled categories (None means all)
+        self._level_gate: Dict[int, Optional[frozenset]] = {}
+        self.analyzer = LogAnalyzer(self.config.analysis_window,
+                                    bucket_seconds=self.config.analysis_bucket_seconds)
         self.alerts: List[LogAlert] = []
         self.alert_callbacks: Set[Callable[[LogAlert], None]] = set()
         
@@ -414,6 +562,7 @@ class LoggingManager:
         
         # Initialize logging system
         self._setup_logging()
+        self.refresh_level_gate()
         self._start_worker()
     
     def _setup_logging(self):
@@ -467,6 +616,42 @@ class LoggingManager:
                 log_filter=perf_filter
             )
     
+    def refresh_level_gate(self):
+        """
+        Recompute the call-site level/category gate.
+
+        Must be called after handler or stream filters are changed so that
+        ``is_enabled_for`` keeps matching what the handlers will accept.
+        """
+        filters = [handler.filter for handler in self.handlers.values() if handler.enabled]
+        filters.extend(stream.filter for stream in self.streams.values())
+        
+        gate = {}
+        for level in LogLevel:
+            if level.value >= self.ALWAYS_ENABLED_LEVEL.value and (
+                    self.config.enable_analysis or self.config.enable_alerting):
+                gate[level.value] = None
+                continue
+            
+            categories = set()
+            all_categories = False
+            for log_filter in filters:
+                if not (log_filter.min_level.value <= level.value <= log_filter.max_level.value):
+                    continue
+                if not log_filter.categories:
+                    all_categories = True
+                    break
+                categories.update(log_filter.categories)
+            gate[level.value] = None if all_categories else frozenset(categories)
+        
+        self._level_gate = gate
+    
+    def is_enabled_for(self, level: LogLevel, category: LogCategory = LogCategory.SYSTEM) -> bool:
+        """Check whether an entry with this level and category would be processed"""
+        # Keyed by the raw value: Enum.__hash__ is a Python-level call
+        categories = self._level_gate.get(level._value_, _EMPTY_CATEGORIES)
+        return categories is None or (bool(categories) and category in categories)
+    
     def _start_worker(self):
         """Start background worker thread"""
         self.worker_thread = threading.Thread(
@@ -496,6 +681,9 @@ class LoggingManager:
     async def _process_log_entry(self, entry: LogEntry):
         """Process a single log entry"""
         try:
+            # Apply deferred message formatting
+            entry.resolve_message()
+            
             # Update statistics
             self.stats["total_logs"] += 1
             self.stats["logs_by_level"][entry.level] += 1
@@ -594,16 +782,25 @@ class LoggingManager:
     
     def log(self, level: LogLevel, message: str, context: LogContext = None,
             exception: Exception = None, performance_metrics: Dict[str, Any] = None,
-            security_context: Dict[str, Any] = None):
-        """Log a message"""
+            security_context: Dict[str, Any] = None, args: Tuple[Any, ...] = ()):
+        """
+        Log a message.
+
+        Entries no handler would accept are dropped before anything is
+        allocated. ``message`` may be a %-style template; ``args`` are only
+        applied on the worker thread once the entry is known to be emitted.
+        """
+        category = context.category if context is not None else LogCategory.SYSTEM
+        if not self.is_enabled_for(level, category):
+            return
+        
         try:
             # Create log context if not provided
             if context is None:
                 context = LogContext()
             
             # Create log entry
-            import inspect
-            frame = inspect.currentframe().f_back
+            frame = sys._getframe(1)
             
             entry = LogEntry(
                 timestamp=datetime.now(),
@@ -620,7 +817,8 @@ class LoggingManager:
                 exception_info=str(exception) if exception else None,
                 stack_trace=traceback.format_exc() if exception else None,
                 performance_metrics=performance_metrics,
-                security_context=security_context
+                security_context=security_context,
+                args=args
             )
             
             # Add to queue
@@ -646,11 +844,13 @@ class LoggingManager:
         """Create a log stream"""
         stream = LogStream(name, log_filter)
         self.streams[name] = stream
+        self.refresh_level_gate()
         return stream
     
     def remove_stream(self, name: str):
         """Remove a log stream"""
         self.streams.pop(name, None)
+        self.refresh_level_gate()
     
     def add_alert_callback(self, callback: Callable[[LogAlert], None]):
         """Add alert callback"""
@@ -695,6 +895,13 @@ class LoggingManager:
         if self.worker_thread and self.worker_thread.is_alive():
             self.worker_thread.join(timeout=5.0)
         
+        # Flush and close buffered handlers
+        for handler in self.handlers.values():
+            try:
+                handler.close()
+            except Exception as e:
+                print(f"Error closing log handler {handler.name}: {e}")
+        
         # Shutdown executor
         self.executor.shutdown(wait=True)
 
@@ -719,53 +926,75 @@ class ComponentLogger:
         
         return context
     
-    def trace(self, message: str, operation: str = None, **kwargs):
+    def _enabled(self, level: LogLevel, category: LogCategory = LogCategory.SYSTEM) -> bool:
+        """Check the manager gate before building any context"""
+        return self.manager.is_enabled_for(level, category)
+    
+    def trace(self, message: str, *args, operation: str = None, **kwargs):
         """Log trace message"""
+        if not self._enabled(LogLevel.TRACE, kwargs.get("category", LogCategory.SYSTEM)):
+            return
         context = self._create_context(operation, **kwargs)
-        self.manager.log(LogLevel.TRACE, message, context)
+        self.manager.log(LogLevel.TRACE, message, context, args=args)
     
-    def debug(self, message: str, operation: str = None, **kwargs):
+    def debug(self, message: str, *args, operation: str = None, **kwargs):
         """Log debug message"""
+        if not self._enabled(LogLevel.DEBUG, kwargs.get("category", LogCategory.SYSTEM)):
+            return
         context = self._create_context(operation, **kwargs)
-        self.manager.log(LogLevel.DEBUG, message, context)
+        self.manager.log(LogLevel.DEBUG, message, context, args=args)
     
-    def info(self, message: str, operation: str = None, **kwargs):
+    def info(self, message: str, *args, operation: str = None, **kwargs):
         """Log info message"""
+        if not self._enabled(LogLevel.INFO, kwargs.get("category", LogCategory.SYSTEM)):
+            return
         context = self._create_context(operation, **kwargs)
-        self.manager.log(LogLevel.INFO, message, context)
+        self.manager.log(LogLevel.INFO, message, context, args=args)
     
-    def warning(self, message: str, operation: str = None, **kwargs):
+    def warning(self, message: str, *args, operation: str = None, **kwargs):
         """Log warning message"""
+        if not self._enabled(LogLevel.WARNING, kwargs.get("category", LogCategory.SYSTEM)):
+            return
         context = self._create_context(operation, **kwargs)
-        self.manager.log(LogLevel.WARNING, message, context)
+        self.manager.log(LogLevel.WARNING, message, context, args=args)
     
-    def error(self, message: str, operation: str = None, exception: Exception = None, **kwargs):
+    def error(self, message: str, *args, operation: str = None, exception: Exception = None, **kwargs):
         """Log error message"""
+        if not self._enabled(LogLevel.ERROR, kwargs.get("category", LogCategory.SYSTEM)):
+            return
         context = self._create_context(operation, **kwargs)
-        self.manager.log(LogLevel.ERROR, message, context, exception=exception)
+        self.manager.log(LogLevel.ERROR, message, context, exception=exception, args=args)
     
-    def critical(self, message: str, operation: str = None, exception: Exception = None, **kwargs):
+    def critical(self, message: str, *args, operation: str = None, exception: Exception = None, **kwargs):
         """Log critical message"""
+        if not self._enabled(LogLevel.CRITICAL, kwargs.get("category", LogCategory.SYSTEM)):
+            return
         context = self._create_context(operation, **kwargs)
-        self.manager.log(LogLevel.CRITICAL, message, context, exception=exception)
+        self.manager.log(LogLevel.CRITICAL, message, context, exception=exception, args=args)
     
-    def security(self, message: str, operation: str = None, security_context: Dict[str, Any] = None, **kwargs):
+    def security(self, message: str, *args, operation: str = None, security_context: Dict[str, Any] = None, **kwargs):
         """Log security message"""
+        if not self._enabled(LogLevel.SECURITY, LogCategory.SECURITY):
+            return
         context = self._create_context(operation, **kwargs)
         context.category = LogCategory.SECURITY
-        self.manager.log(LogLevel.SECURITY, message, context, security_context=security_context)
+        self.manager.log(LogLevel.SECURITY, message, context, security_context=security_context, args=args)
     
-    def audit(self, message: str, operation: str = None, **kwargs):
+    def audit(self, message: str, *args, operation: str = None, **kwargs):
         """Log audit message"""
+        if not self._enabled(LogLevel.AUDIT, LogCategory.AUDIT):
+            return
         context = self._create_context(operation, **kwargs)
         context.category = LogCategory.AUDIT
-        self.manager.log(LogLevel.AUDIT, message, context)
+        self.manager.log(LogLevel.AUDIT, message, context, args=args)
     
-    def performance(self, message: str, metrics: Dict[str, Any], operation: str = None, **kwargs):
+    def performance(self, message: str, metrics: Dict[str, Any], *args, operation: str = None, **kwargs):
         """Log performance message"""
+        if not self._enabled(LogLevel.INFO, LogCategory.PERFORMANCE):
+            return
         context = self._create_context(operation, **kwargs)
         context.category = LogCategory.PERFORMANCE
-        self.manager.log(LogLevel.INFO, message, context, performance_metrics=metrics)
+        self.manager.log(LogLevel.INFO, message, context, performance_metrics=metrics, args=args)
 
 
 # Global logging manager instance
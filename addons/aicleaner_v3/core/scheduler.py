@@ -3,12 +3,15 @@ Zone scheduler for AI Cleaner addon.
 Handles zone scheduling and analysis triggering.
 """
 import asyncio
+import heapq
+import itertools
 import logging
+import random
 import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from .analyzer import AnalysisPriority
+from .analysis_queue import AnalysisPriority
 
 class ZoneScheduler:
     """
@@ -18,6 +21,9 @@ class ZoneScheduler:
     - Scheduled zone analysis
     - Dynamic scheduling based on cleanliness
     - Manual analysis triggering
+    - Min-heap of due times; the loop sleeps until the earliest one and is
+      woken early by config changes and manual triggers
+    - Jittered due times so zones do not all hit the provider at once
     """
     
     def __init__(self, zone_analyzer, config):
@@ -37,6 +43,21 @@ class ZoneScheduler:
         # Zone schedules
         self.zone_schedules = {}
         
+        # Due times as (next_analysis, sequence, zone_name); entries that no
+        # longer match the zone's schedule are stale and skipped when popped
+        self._due_heap: List[Tuple[datetime, int, str]] = []
+        self._heap_sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        
+        # Spread due times by up to this share of the period, capped in seconds
+        scheduler_config = config.get("scheduler", {})
+        self.jitter_fraction = scheduler_config.get("jitter_fraction", 0.1)
+        self.max_jitter_seconds = scheduler_config.get("max_jitter_seconds", 600)
+        
+        # Statistics
+        self.wakeups = 0
+        self.scheduled_analyses = 0
+        
         # Running flag
         self.running = False
         
@@ -89,19 +110,123 @@ class ZoneScheduler:
         # Update next analysis time
         if zone_name in self.zone_schedules:
             # Get update frequency
-            zone_config = self._get_zone_config(zone_name)
-            update_frequency = zone_config.get("update_frequency", 6)  # Default: 6 hours
+            update_frequency = self.zone_schedules[zone_name]["update_frequency"]
             
             # Calculate next analysis time
-            next_analysis = datetime.now(timezone.utc) + timedelta(hours=update_frequency)
+            next_analysis = datetime.now(timezone.utc) + self._jittered_period(update_frequency)
             
             # Update schedule
-            self.zone_schedules[zone_name]["next_analysis"] = next_analysis
+            self._set_next_analysis(zone_name, next_analysis)
             
             self.logger.info(f"Updated next analysis time for zone {zone_name}: {next_analysis.isoformat()}")
             
         return analysis_id
         
+    async def update_config(self, config):
+        """
+        Apply a new configuration without restarting the scheduler.
+        
+        Added zones are scheduled, removed zones dropped, and zones whose
+        update frequency changed are rescheduled if that makes them due sooner.
+        
+        Args:
+            config: Configuration
+        """
+        self.config = config
+        now = datetime.now(timezone.utc)
+        zones = {zone.get("name"): zone for zone in config.get("zones", []) if zone.get("name")}
+        
+        for zone_name in list(self.zone_schedules):
+            if zone_name not in zones:
+                del self.zone_schedules[zone_name]
+                self.logger.info(f"Removed schedule for zone {zone_name}")
+        
+        for zone_name, zone in zones.items():
+            update_frequency = zone.get("update_frequency", 6)  # Default: 6 hours
+            schedule = self.zone_schedules.get(zone_name)
+            
+            if schedule is None:
+                initial_analysis = now + self._initial_delay()
+                self.zone_schedules[zone_name] = {"update_frequency": update_frequency, "next_analysis": None}
+                self._set_next_analysis(zone_name, initial_analysis)
+                self.logger.info(f"Added schedule for zone {zone_name}")
+            elif schedule["update_frequency"] != update_frequency:
+                schedule["update_frequency"] = update_frequency
+                next_analysis = now + self._jittered_period(update_frequency)
+                if schedule["next_analysis"] is None or next_analysis < schedule["next_analysis"]:
+                    self._set_next_analysis(zone_name, next_analysis)
+        
+        # Removed zones leave stale heap entries; wake so the loop re-evaluates
+        self._wakeup.set()
+        
+    def get_next_analysis(self, zone_name: str) -> Optional[datetime]:
+        """
+        Get the next scheduled analysis time of a zone.
+        
+        Args:
+            zone_name: Zone name
+            
+        Returns:
+            Next analysis time or None
+        """
+        schedule = self.zone_schedules.get(zone_name)
+        return schedule["next_analysis"] if schedule else None
+        
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+        
+        Returns:
+            Scheduler statistics
+        """
+        next_due = min(
+            (s["next_analysis"] for s in self.zone_schedules.values() if s["next_analysis"]),
+            default=None
+        )
+        return {
+            "zones": len(self.zone_schedules),
+            "heap_entries": len(self._due_heap),
+            "wakeups": self.wakeups,
+            "scheduled_analyses": self.scheduled_analyses,
+            "next_due": next_due.isoformat() if next_due else None
+        }
+        
+    def _set_next_analysis(self, zone_name: str, next_analysis: datetime):
+        """
+        Record a zone's next analysis time and wake the loop.
+        
+        Args:
+            zone_name: Zone name
+            next_analysis: Next analysis time
+        """
+        self.zone_schedules[zone_name]["next_analysis"] = next_analysis
+        heapq.heappush(self._due_heap, (next_analysis, next(self._heap_sequence), zone_name))
+        self._wakeup.set()
+        
+    def _jittered_period(self, update_frequency: float) -> timedelta:
+        """
+        Get an update period with random jitter.
+        
+        Args:
+            update_frequency: Update frequency in hours
+            
+        Returns:
+            Period until the next analysis
+        """
+        period = update_frequency * 3600
+        jitter = min(period * self.jitter_fraction, self.max_jitter_seconds)
+        return timedelta(seconds=period + random.uniform(-jitter, jitter))
+        
+    def _initial_delay(self) -> timedelta:
+        """
+        Get the delay before a newly scheduled zone's first analysis.
+        
+        Returns:
+            Staggered, jittered delay
+        """
+        stagger = len(self.zone_schedules) * 10  # 10 seconds between zones
+        return timedelta(seconds=stagger + random.uniform(0, 10))
+        
     async def _initialize_zone_schedules(self):
         """Initialize zone schedules."""
         # Get zones from config
@@ -115,14 +240,14 @@ class ZoneScheduler:
                 update_frequency = zone.get("update_frequency", 6)  # Default: 6 hours
                 
                 # Calculate initial analysis time (staggered)
-                initial_delay = len(self.zone_schedules) * 10  # 10 seconds between zones
-                initial_analysis = datetime.now(timezone.utc) + timedelta(seconds=initial_delay)
+                initial_analysis = datetime.now(timezone.utc) + self._initial_delay()
                 
                 # Create schedule
                 self.zone_schedules[zone_name] = {
                     "update_frequency": update_frequency,
-                    "next_analysis": initial_analysis
+                    "next_analysis": None
                 }
+                self._set_next_analysis(zone_name, initial_analysis)
                 
         self.logger.info(f"Initialized schedules for {len(self.zone_schedules)} zones")
         
@@ -133,8 +258,16 @@ class ZoneScheduler:
                 # Check for zones that need analysis
                 await self._check_schedules()
                 
-                # Wait before next check
-                await asyncio.sleep(10)  # Check every 10 seconds
+                # Sleep until the earliest due time, or until woken by a change
+                self._wakeup.clear()
+                timeout = None
+                if self._due_heap:
+                    timeout = max(0.0, (self._due_heap[0][0] - datetime.now(timezone.utc)).total_seconds())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self.wakeups += 1
                 
         except asyncio.CancelledError:
             # Task cancelled
@@ -147,15 +280,26 @@ class ZoneScheduler:
         """Check zone schedules."""
         now = datetime.now(timezone.utc)
         
-        for zone_name, schedule in self.zone_schedules.items():
-            next_analysis = schedule.get("next_analysis")
+        # Only zones at the top of the heap can be due
+        while self._due_heap and self._due_heap[0][0] <= now:
+            next_analysis, _, zone_name = heapq.heappop(self._due_heap)
+            schedule = self.zone_schedules.get(zone_name)
             
-            if next_analysis and now >= next_analysis:
-                # Time to analyze zone
-                self.logger.info(f"Scheduled analysis for zone {zone_name}")
+            if not schedule or schedule["next_analysis"] != next_analysis:
+                # Stale entry: zone removed or rescheduled
+                continue
                 
-                # Trigger analysis
+            # Time to analyze zone
+            self.logger.info(f"Scheduled analysis for zone {zone_name}")
+            self.scheduled_analyses += 1
+            
+            # Trigger analysis
+            try:
                 await self.trigger_analysis(zone_name, AnalysisPriority.SCHEDULED)
+            except Exception as e:
+                self.logger.error(f"Failed to queue scheduled analysis for zone {zone_name}: {e}")
+                # Retry later rather than dropping the zone from the heap
+                self._set_next_analysis(zone_name, now + timedelta(minutes=1))
                 
     def _get_zone_config(self, zone_name: str) -> Dict[str, Any]:
         """
@@ -72,9 +72,9 @@ class SimpleLogConfig:
     performance_threshold_ms: int = 5000  # 5 seconds
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
-    """Simplified log entry structure"""
+    """Simplified log entry structure (``args`` are applied lazily by the worker)"""
     timestamp: datetime
     level: LogLevel
     message: str
@@ -82,6 +82,17 @@ class LogEntry:
     component: str
     correlation_id: str
     metadata: Dict[str, Any] = field(default_factory=dict)
+    args: tuple = ()
+    
+    def resolve_message(self) -> str:
+        """Apply deferred %-style arguments to the message (idempotent)"""
+        if self.args:
+            try:
+                self.message = self.message % self.args
+            except (TypeError, ValueError):
+                self.message = f"{self.message} {self.args!r}"
+            self.args = ()
+        return self.message
 
 
 class SimpleLogHandler:
@@ -325,6 +336,8 @@ class SimpleLoggingManager:
         
         # Setup handlers
         self._setup_handlers()
+        self._min_level_value = 0
+        self.refresh_level_gate()
         self._start_worker()
     
     def _setup_handlers(self):
@@ -356,6 +369,16 @@ class SimpleLoggingManager:
                 self.config
             )
     
+    def refresh_level_gate(self):
+        """Recompute the call-site level gate after handlers are changed"""
+        levels = [handler.min_level.value for handler in self.handlers.values() if handler.enabled]
+        # Errors always count toward error-rate alerts, even with no handler attached
+        self._min_level_value = min(levels + [LogLevel.ERROR.value])
+    
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        """Check whether any handler would process an entry at this level"""
+        return level._value_ >= self._min_level_value
+    
     def _start_worker(self):
         """Start background worker thread"""
         self.worker_thread = threading.Thread(
@@ -384,6 +407,9 @@ class SimpleLoggingManager:
     async def _process_entry(self, entry: LogEntry):
         """Process a single log entry"""
         try:
+            # Apply deferred message formatting
+            entry.resolve_message()
+            
             # Update statistics
             self.stats["total_messages"] += 1
             self.stats["messages_by_level"][entry.level] += 1
@@ -434,6 +460,14 @@ class SimpleLoggingManager:
     def log(self, level: LogLevel, message: str, component: str = "system", 
             category: LogCategory = LogCategory.SYSTEM, **metadata):
         """Log a message"""
+        self._log(level, message, (), component, category, metadata)
+    
+    def _log(self, level: LogLevel, message: str, args: tuple, component: str,
+             category: LogCategory, metadata: Dict[str, Any]):
+        """Queue an entry, dropping it before allocation if no handler wants it"""
+        if level._value_ < self._min_level_value:
+            return
+        
         try:
             entry = LogEntry(
                 timestamp=datetime.now(),
@@ -442,7 +476,8 @@ class SimpleLoggingManager:
                 category=category,
                 component=component,
                 correlation_id=self._get_correlation_id(),
-                metadata=metadata
+                metadata=metadata,
+                args=args
             )
             
             try:
@@ -505,35 +540,43 @@ class SimpleComponentLogger:
         self.manager = manager
         self.component = component
     
-    def debug(self, message: str, **metadata):
+    def debug(self, message: str, *args, **metadata):
         """Log debug message"""
-        self.manager.log(LogLevel.DEBUG, message, self.component, LogCategory.SYSTEM, **metadata)
+        if self.manager.is_enabled_for(LogLevel.DEBUG):
+            self.manager._log(LogLevel.DEBUG, message, args, self.component, LogCategory.SYSTEM, metadata)
     
-    def info(self, message: str, **metadata):
+    def info(self, message: str, *args, **metadata):
         """Log info message"""
-        self.manager.log(LogLevel.INFO, message, self.component, LogCategory.SYSTEM, **metadata)
+        if self.manager.is_enabled_for(LogLevel.INFO):
+            self.manager._log(LogLevel.INFO, message, args, self.component, LogCategory.SYSTEM, metadata)
     
-    def warning(self, message: str, **metadata):
+    def warning(self, message: str, *args, **metadata):
         """Log warning message"""
-        self.manager.log(LogLevel.WARNING, message, self.component, LogCategory.SYSTEM, **metadata)
+        if self.manager.is_enabled_for(LogLevel.WARNING):
+            self.manager._log(LogLevel.WARNING, message, args, self.component, LogCategory.SYSTEM, metadata)
     
-    def error(self, message: str, **metadata):
+    def error(self, message: str, *args, **metadata):
         """Log error message"""
-        self.manager.log(LogLevel.ERROR, message, self.component, LogCategory.ERROR, **metadata)
+        if self.manager.is_enabled_for(LogLevel.ERROR):
+            self.manager._log(LogLevel.ERROR, message, args, self.component, LogCategory.ERROR, metadata)
     
-    def critical(self, message: str, **metadata):
+    def critical(self, message: str, *args, **metadata):
         """Log critical message"""
-        self.manager.log(LogLevel.CRITICAL, message, self.component, LogCategory.ERROR, **metadata)
+        if self.manager.is_enabled_for(LogLevel.CRITICAL):
+            self.manager._log(LogLevel.CRITICAL, message, args, self.component, LogCategory.ERROR, metadata)
     
-    def security(self, message: str, **metadata):
+    def security(self, message: str, *args, **metadata):
         """Log security message"""
-        self.manager.log(LogLevel.WARNING, message, self.component, LogCategory.SECURITY, **metadata)
+        if self.manager.is_enabled_for(LogLevel.WARNING):
+            self.manager._log(LogLevel.WARNING, message, args, self.component, LogCategory.SECURITY, metadata)
     
     def performance(self, message: str, duration: int = None, **metadata):
         """Log performance message"""
+        if not self.manager.is_enabled_for(LogLevel.INFO):
+            return
         if duration:
             metadata["duration"] = duration
-        self.manager.log(LogLevel.INFO, message, self.component, LogCategory.PERFORMANCE, **metadata)
+        self.manager._log(LogLevel.INFO, message, (), self.component, LogCategory.PERFORMANCE, metadata)
 
 
 # Global instance
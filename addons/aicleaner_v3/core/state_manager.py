@@ -21,6 +21,8 @@ class AnalysisState(Enum):
     HA_TODO_CREATION_SUCCESS = auto()
     NOTIFICATIONS_SENT = auto()
     CYCLE_COMPLETE = auto()
+    ADMISSION_DEFERRED = auto()
+    ADMISSION_DROPPED = auto()
 
 class StateManager:
     """
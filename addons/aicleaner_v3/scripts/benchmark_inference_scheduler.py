@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Local Inference Scheduling Benchmark
+
+Replays a request trace against a simulated Ollama server twice: once with
+requests sent as they arrive, and once through LocalInferenceScheduler.
+The server holds one model at a time, pays a load cost on every swap and
+runs up to OLLAMA_NUM_PARALLEL requests for the loaded model. Reports swaps
+per hour, throughput and latency for both runs in simulated time.
+
+A trace is JSON lines of {"t": arrival_seconds, "model": name, "service": seconds}.
+Without --trace a synthetic trace of zones on periodic schedules is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.inference_scheduler import LocalInferenceScheduler
+
+
+class SimulatedOllama:
+    """
+    Single-model server with parallel slots and a swap cost.
+
+    Requests are admitted in arrival order, as Ollama does: a request for
+    another model waits at the head of the queue until the loaded model is
+    idle, and everything behind it waits too.
+    """
+
+    def __init__(self, num_parallel: int, load_seconds: Dict[str, float], scale: float):
+        self.num_parallel = num_parallel
+        self.load_seconds = load_seconds
+        self.scale = scale
+        self.loaded: Optional[str] = None
+        self.active = 0
+        self.swaps = 0
+        self._condition = asyncio.Condition()
+        self._waiting: deque = deque()
+
+    async def generate(self, model: str, service: float):
+        async with self._condition:
+            ticket = object()
+            self._waiting.append(ticket)
+            await self._condition.wait_for(
+                lambda: self._waiting[0] is ticket and self.active < self.num_parallel
+                and (self.loaded == model or self.active == 0)
+            )
+            self._waiting.popleft()
+            if self.loaded != model:
+                if self.loaded is not None:
+                    self.swaps += 1
+                # Nothing else can start while the model loads
+                await asyncio.sleep(self.load_seconds.get(model, 10.0) * self.scale)
+                self.loaded = model
+            self.active += 1
+            self._condition.notify_all()
+
+        try:
+            await asyncio.sleep(service * self.scale)
+        finally:
+            async with self._condition:
+                self.active -= 1
+                self._condition.notify_all()
+
+
+def synthetic_trace(hours: float, zones: int, models: List[str], seed: int) -> List[Dict]:
+    """Zones analyzed every few minutes, each pinned to one model."""
+    rng = random.Random(seed)
+    trace = []
+    for zone in range(zones):
+        model = models[zone % len(models)]
+        period = rng.uniform(120, 600)
+        t = rng.uniform(0, period)
+        while t < hours * 3600:
+            trace.append({"t": t, "model": model, "service": rng.uniform(4, 12)})
+            t += period * rng.uniform(0.8, 1.2)
+    return sorted(trace, key=lambda r: r["t"])
+
+
+async def replay(trace: List[Dict], num_parallel: int, load_seconds: Dict[str, float],
+                 scale: float, scheduled: bool) -> Dict[str, float]:
+    """Replay a trace and return swap, throughput and latency figures."""
+    server = SimulatedOllama(num_parallel, load_seconds, scale)
+    scheduler = LocalInferenceScheduler(num_parallel=num_parallel, max_wait_seconds=120 * scale)
+    latencies: List[float] = []
+    start = time.monotonic()
+
+    async def request(entry):
+        await asyncio.sleep(max(0.0, start + entry["t"] * scale - time.monotonic()))
+        arrived = time.monotonic()
+        call = lambda: server.generate(entry["model"], entry["service"])
+        if scheduled:
+            await scheduler.submit(entry["model"], call)
+        else:
+            await call()
+        latencies.append((time.monotonic() - arrived) / scale)
+
+    await asyncio.gather(*(request(entry) for entry in trace))
+    elapsed_hours = (time.monotonic() - start) / scale / 3600
+    latencies.sort()
+    return {
+        "requests": len(trace),
+        "swaps": server.swaps,
+        "swaps_per_hour": server.swaps / elapsed_hours,
+        "throughput_per_hour": len(trace) / elapsed_hours,
+        "latency_p50_s": latencies[len(latencies) // 2],
+        "latency_p95_s": latencies[int(len(latencies) * 0.95)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare arrival-order and model-grouped local inference")
+    parser.add_argument("--trace", help="JSON lines trace file")
+    parser.add_argument("--hours", type=float, default=2.0, help="Synthetic trace length")
+    parser.add_argument("--zones", type=int, default=12, help="Synthetic trace zone count")
+    parser.add_argument("--models", default="llava:7b,llava:13b,moondream", help="Comma separated models")
+    parser.add_argument("--load-seconds", type=float, default=15.0, help="Model load cost per swap")
+    parser.add_argument("--num-parallel", type=int, default=int(os.environ.get("OLLAMA_NUM_PARALLEL", 2)))
+    parser.add_argument("--scale", type=float, default=0.0005, help="Wall seconds per simulated second")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    models = args.models.split(",")
+    if args.trace:
+        with open(args.trace) as f:
+            trace = sorted((json.loads(line) for line in f if line.strip()), key=lambda r: r["t"])
+    else:
+        trace = synthetic_trace(args.hours, args.zones, models, args.seed)
+    load_seconds = {model: args.load_seconds for model in {entry["model"] for entry in trace}}
+
+    results = {
+        "arrival_order": asyncio.run(replay(trace, args.num_parallel, load_seconds, args.scale, scheduled=False)),
+        "model_grouped": asyncio.run(replay(trace, args.num_parallel, load_seconds, args.scale, scheduled=True)),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Logging Overhead Benchmark
+
+Measures the per-call cost of log calls that are suppressed by the level gate
+in LoggingManager and SimpleLoggingManager, and the cost of an emitted call
+for comparison. Results are reported in nanoseconds per call.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.enhanced_logging import LogLevel
+from core.logging_manager import LoggingConfig, LoggingManager
+from core.simple_logging import LogLevel as SimpleLogLevel
+from core.simple_logging import SimpleLogConfig, SimpleLoggingManager
+
+
+def _ns_per_call(func: Callable[[], None], number: int, repeat: int = 5) -> float:
+    """Best-of-N nanoseconds per call."""
+    best = min(timeit.repeat(func, number=number, repeat=repeat))
+    return best / number * 1e9
+
+
+def run_benchmark(iterations: int = 200_000) -> Dict[str, float]:
+    """Run the suppressed/emitted call benchmarks."""
+    results: Dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        manager = LoggingManager(LoggingConfig(
+            log_directory=log_dir,
+            log_level=LogLevel.INFO,
+            console_logging=False,
+            ha_logging=False,
+            file_logging=False,
+            performance_logging=False,
+            enable_analysis=False,
+            enable_alerting=False,
+        ))
+        logger = manager.get_logger("benchmark")
+        payload = {"zone": "kitchen", "attempt": 3}
+
+        results["enhanced_trace_suppressed_ns"] = _ns_per_call(
+            lambda: logger.trace("zone %s attempt %d", "kitchen", 3, **payload), iterations)
+        results["enhanced_debug_suppressed_ns"] = _ns_per_call(
+            lambda: logger.debug("zone %s attempt %d", "kitchen", 3), iterations)
+        results["enhanced_manager_log_suppressed_ns"] = _ns_per_call(
+            lambda: manager.log(LogLevel.DEBUG, "zone %s", args=("kitchen",)), iterations)
+        manager.shutdown()
+
+        simple = SimpleLoggingManager(SimpleLogConfig(
+            log_directory=log_dir,
+            log_level=SimpleLogLevel.INFO,
+            enable_console=False,
+            enable_ha_integration=False,
+            enable_security_logging=False,
+            buffer_size=iterations + 1,
+        ))
+        simple_logger = simple.get_logger("benchmark")
+
+        results["simple_debug_suppressed_ns"] = _ns_per_call(
+            lambda: simple_logger.debug("zone %s attempt %d", "kitchen", 3, zone="kitchen"), iterations)
+        # Emitted calls pay for entry construction and queueing only
+        results["simple_info_emitted_ns"] = _ns_per_call(
+            lambda: simple_logger.info("zone %s attempt %d", "kitchen", 3), 1000, repeat=3)
+        simple.shutdown()
+
+    return results
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(json.dumps(run_benchmark(iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -436,7 +436,8 @@ class BackupManager:
             perf_sources = [
                 "performance_config.yaml",
                 "optimization_history.json",
-                "performance_cache.json"
+                "performance_cache.json",
+                "model_benchmarks.db"
             ]
             
             for source_name in perf_sources:
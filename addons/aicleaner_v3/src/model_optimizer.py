@@ -18,6 +18,7 @@ class OptimizationType(Enum):
     MEMORY = "memory"
     PERFORMANCE = "performance"
     AUTO = "auto"
+    BENCHMARK = "benchmark"
 
 
 @dataclass
@@ -0,0 +1,220 @@
+"""
+Optimization Worker - Dedicated event loop thread for optimization jobs
+Keeps long, partly blocking optimizer work off the loop that serves requests
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional
+
+
+ProgressCallback = Callable[[float], None]
+
+
+class OptimizationWorker:
+    """
+    Runs optimizer coroutines on their own event loop in a background thread:
+    - Blocking calls inside an optimizer stall the worker loop, not the request loop
+    - Resource budget: bounded concurrent jobs, a per-job timeout and a lower
+      CPU scheduling priority for the worker thread
+    - Progress reported by a job is delivered on the caller's loop
+    - Cancelling the awaiting task cancels the job on the worker loop
+    - A lag probe on the caller's loop holds back new jobs while requests
+      are already being delayed
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.logger = logging.getLogger(__name__)
+
+        # Resource budget
+        self.max_concurrent_jobs = max(1, int(config.get("worker_threads", 2)))
+        self.job_timeout_seconds = config.get("job_timeout_seconds", 1800.0)
+        self.worker_nice = config.get("worker_nice", 10)
+
+        # Request loop protection
+        self.max_loop_lag_ms = config.get("max_loop_lag_ms", 50.0)
+        self.max_admission_delay_seconds = config.get("max_admission_delay_seconds", 60.0)
+        self.lag_probe_interval = config.get("lag_probe_interval_seconds", 0.1)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._caller_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lag_probe: Optional[asyncio.Task] = None
+        self._recent_lag_ms: deque = deque(maxlen=10)
+        self._running_jobs = 0
+
+        # Statistics
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.jobs_cancelled = 0
+        self.jobs_timed_out = 0
+        self.admission_delays = 0
+        self._lag_totals = {"idle": [0.0, 0], "running": [0.0, 0]}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop_lag_ms(self) -> float:
+        """Worst lag of the caller's loop over the last few probes"""
+        return max(self._recent_lag_ms, default=0.0)
+
+    async def start(self) -> None:
+        """Start the worker thread and the lag probe on the calling loop"""
+        if self.is_running:
+            return
+
+        self._caller_loop = asyncio.get_running_loop()
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._thread_main, name="optimization-worker", daemon=True)
+        self._thread.start()
+        await asyncio.to_thread(self._ready.wait)
+
+        self._lag_probe = asyncio.create_task(self._probe_loop_lag())
+        self.logger.info(f"Optimization worker started ({self.max_concurrent_jobs} concurrent jobs)")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Cancel outstanding jobs and stop the worker thread"""
+        if self._lag_probe:
+            self._lag_probe.cancel()
+            await asyncio.gather(self._lag_probe, return_exceptions=True)
+            self._lag_probe = None
+
+        if not self.is_running:
+            return
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        await asyncio.to_thread(self._thread.join, timeout)
+        if self._thread.is_alive():
+            self.logger.warning("Optimization worker did not stop within timeout")
+        self._thread = None
+
+    async def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Run a coroutine on the worker loop outside the job budget.
+
+        Used for optimizer lifecycle calls (initialize, shutdown, hot swap)
+        so optimizer state only ever lives on the worker loop.
+        """
+        if not self.is_running:
+            coro.close()
+            raise RuntimeError("Optimization worker not running")
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._loop))
+
+    async def submit(self, job: Callable[[ProgressCallback], Awaitable[Any]],
+                     progress_callback: Optional[ProgressCallback] = None) -> Any:
+        """
+        Run an optimization job on the worker loop within the resource budget.
+
+        Args:
+            job: Called with a progress callback, returns the coroutine to run
+            progress_callback: Receives progress (0.0 to 1.0) on the caller's loop
+
+        Returns:
+            Result of the job
+        """
+        await self._wait_for_headroom()
+
+        caller_loop = asyncio.get_running_loop()
+
+        def report_progress(progress: float) -> None:
+            if progress_callback:
+                caller_loop.call_soon_threadsafe(progress_callback, progress)
+
+        try:
+            result = await self.run(self._run_job(job, report_progress))
+        except asyncio.CancelledError:
+            self.jobs_cancelled += 1
+            raise
+        except asyncio.TimeoutError:
+            self.jobs_timed_out += 1
+            raise
+        except Exception:
+            self.jobs_failed += 1
+            raise
+
+        self.jobs_completed += 1
+        return result
+
+    async def _run_job(self, job: Callable[[ProgressCallback], Awaitable[Any]],
+                       report_progress: ProgressCallback) -> Any:
+        """Worker loop side of a job: take a slot and enforce the timeout"""
+        async with self._slots:
+            self._running_jobs += 1
+            try:
+                return await asyncio.wait_for(job(report_progress), self.job_timeout_seconds)
+            finally:
+                self._running_jobs -= 1
+
+    async def _wait_for_headroom(self) -> None:
+        """Delay a new job while the caller's loop is lagging, up to a bound"""
+        deadline = time.monotonic() + self.max_admission_delay_seconds
+        delayed = False
+        while self.loop_lag_ms > self.max_loop_lag_ms and time.monotonic() < deadline:
+            delayed = True
+            await asyncio.sleep(self.lag_probe_interval)
+        if delayed:
+            self.admission_delays += 1
+
+    async def _probe_loop_lag(self) -> None:
+        """Measure how late the caller's loop wakes up from a short sleep"""
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.lag_probe_interval)
+            lag_ms = max(0.0, (time.monotonic() - start - self.lag_probe_interval) * 1000)
+            self._recent_lag_ms.append(lag_ms)
+
+            totals = self._lag_totals["running" if self._running_jobs else "idle"]
+            totals[0] += lag_ms
+            totals[1] += 1
+
+    def _thread_main(self) -> None:
+        """Worker thread: lower priority, own loop, run until stopped"""
+        try:
+            # Per-thread niceness on Linux; not supported everywhere
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.worker_nice)
+        except (AttributeError, OSError) as e:
+            self.logger.debug(f"Could not lower optimization worker priority: {e}")
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._slots = asyncio.Semaphore(self.max_concurrent_jobs)
+        self._ready.set()
+
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get worker statistics"""
+        def average(key: str) -> float:
+            total, count = self._lag_totals[key]
+            return total / count if count else 0.0
+
+        return {
+            "running": self.is_running,
+            "running_jobs": self._running_jobs,
+            "max_concurrent_jobs": self.max_concurrent_jobs,
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "jobs_cancelled": self.jobs_cancelled,
+            "jobs_timed_out": self.jobs_timed_out,
+            "admission_delays": self.admission_delays,
+            "loop_lag_ms": self.loop_lag_ms,
+            "avg_loop_lag_idle_ms": average("idle"),
+            "avg_loop_lag_running_ms": average("running"),
+        }
@@ -0,0 +1,364 @@
+"""
+Model Benchmark - Measured performance of local Ollama model variants
+Runs a fixed prompt/image suite against each model and keeps the results in SQLite
+"""
+
+import asyncio
+import base64
+import difflib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import aiohttp
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+# Bump when the suite or scoring changes so old rows are not compared with new ones
+# (2: agreement is measured against one reference model for the whole run)
+SUITE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    prompt: str
+    task_complexity: str  # simple, medium or complex
+    image_path: Optional[str] = None
+
+
+DEFAULT_BENCHMARK_SUITE: List[BenchmarkCase] = [
+    BenchmarkCase(
+        name="short_answer",
+        prompt="List three household surfaces that collect dust. Answer with a comma separated list.",
+        task_complexity="simple"
+    ),
+    BenchmarkCase(
+        name="task_list",
+        prompt=(
+            "A kitchen has dishes in the sink, crumbs on the counter and an overflowing bin. "
+            "Return a JSON array of cleaning tasks, each with 'description' and 'priority' (1-3)."
+        ),
+        task_complexity="medium"
+    ),
+    BenchmarkCase(
+        name="scene_reasoning",
+        prompt=(
+            "A living room has a spilled drink on a wool rug, a pile of laundry on the sofa, "
+            "toys across the floor and a dusty bookshelf. Explain which tasks should be done first "
+            "and why, then return the ordered tasks as a JSON array of objects with 'description', "
+            "'priority' (1-3) and 'estimated_minutes'."
+        ),
+        task_complexity="complex"
+    ),
+]
+
+
+@dataclass
+class BenchmarkResult:
+    model: str
+    quantization: str
+    case_name: str
+    task_complexity: str
+    tokens_per_second: float
+    time_to_first_token: float
+    total_seconds: float
+    peak_rss_mb: float
+    agreement: float
+    output: str = field(default="", repr=False)
+    created_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class ModelBenchmarkSummary:
+    model: str
+    quantization: str
+    cases: int
+    tokens_per_second: float
+    time_to_first_token: float
+    total_seconds: float
+    peak_rss_mb: float
+    agreement: float
+
+
+def output_agreement(reference: str, candidate: str) -> float:
+    """Similarity in [0, 1] between two outputs, compared word by word"""
+    reference_words = reference.lower().split()
+    candidate_words = candidate.lower().split()
+    if not reference_words and not candidate_words:
+        return 1.0
+    return difflib.SequenceMatcher(None, reference_words, candidate_words, autojunk=False).ratio()
+
+
+def base_model_name(model: str, quantization_levels: Sequence[str]) -> str:
+    """Model name with its quantization suffix removed, e.g. llava:7b-q4_K_M -> llava:7b"""
+    lowered = model.lower()
+    for quant in quantization_levels:
+        index = lowered.rfind(quant.lower())
+        if index > 0:
+            return model[:index].rstrip("-_.:")
+    return model
+
+
+class ModelBenchmarkStore:
+    """Persistent table of benchmark results, one row per model, case and suite version"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS model_benchmarks (
+                model TEXT NOT NULL,
+                quantization TEXT NOT NULL,
+                case_name TEXT NOT NULL,
+                task_complexity TEXT NOT NULL,
+                suite_version INTEGER NOT NULL,
+                tokens_per_second REAL NOT NULL,
+                time_to_first_token REAL NOT NULL,
+                total_seconds REAL NOT NULL,
+                peak_rss_mb REAL NOT NULL,
+                agreement REAL NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (model, case_name, suite_version)
+            )
+        """)
+        self._conn.commit()
+
+    def record(self, results: List[BenchmarkResult], suite_version: int = SUITE_VERSION) -> None:
+        """Store results, replacing earlier runs of the same model and case"""
+        with self._lock:
+            self._conn.executemany(
+                """INSERT OR REPLACE INTO model_benchmarks
+                   (model, quantization, case_name, task_complexity, suite_version, tokens_per_second,
+                    time_to_first_token, total_seconds, peak_rss_mb, agreement, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(r.model, r.quantization, r.case_name, r.task_complexity, suite_version,
+                  r.tokens_per_second, r.time_to_first_token, r.total_seconds, r.peak_rss_mb,
+                  r.agreement, r.created_at.isoformat()) for r in results]
+            )
+            self._conn.commit()
+
+    def summaries(self, task_complexity: Optional[str] = None,
+                  suite_version: int = SUITE_VERSION) -> Dict[str, ModelBenchmarkSummary]:
+        """Per-model averages, optionally limited to cases of one complexity"""
+        query = """SELECT model, quantization, COUNT(*), AVG(tokens_per_second), AVG(time_to_first_token),
+                          AVG(total_seconds), MAX(peak_rss_mb), AVG(agreement)
+                   FROM model_benchmarks WHERE suite_version = ?"""
+        params: List[Any] = [suite_version]
+        if task_complexity:
+            query += " AND task_complexity = ?"
+            params.append(task_complexity)
+        query += " GROUP BY model, quantization"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return {row[0]: ModelBenchmarkSummary(*row) for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _RssSampler:
+    """Samples the resident memory of local Ollama processes while a case runs"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _ollama_rss() -> int:
+        total = 0
+        for proc in psutil.process_iter(["name", "memory_info"]):
+            name = (proc.info.get("name") or "").lower()
+            memory = proc.info.get("memory_info")
+            if "ollama" in name and memory is not None:
+                total += memory.rss
+        return total
+
+    async def _run(self):
+        while True:
+            rss = await asyncio.to_thread(self._ollama_rss)
+            self.peak_bytes = max(self.peak_bytes, rss)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if PSUTIL_AVAILABLE:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> float:
+        """Stop sampling and return the peak in MB"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        return self.peak_bytes / (1024 * 1024)
+
+
+class ModelBenchmarkHarness:
+    """
+    Runs the benchmark suite against Ollama models:
+    - Tokens per second from Ollama's own eval counters
+    - Time to first token from the streamed response
+    - Peak RSS of local Ollama processes, or the resident size Ollama reports
+      when the server runs elsewhere
+    - Agreement of each output with the reference model's output for the
+      same case. One reference is used for every model in a run, so
+      agreement can be compared across model families
+    """
+
+    def __init__(self, base_url: str, store: ModelBenchmarkStore,
+                 suite: Optional[List[BenchmarkCase]] = None,
+                 num_predict: int = 256, request_timeout: float = 300.0):
+        self.base_url = base_url
+        self.store = store
+        self.suite = suite or DEFAULT_BENCHMARK_SUITE
+        self.num_predict = num_predict
+        self.request_timeout = request_timeout
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self, models: Dict[str, str], quantization_levels: Sequence[str],
+                  reference_model: Optional[str] = None) -> List[BenchmarkResult]:
+        """
+        Benchmark model variants and store the results.
+
+        Args:
+            models: Model name to quantization level
+            quantization_levels: Quantization levels from best to worst quality
+            reference_model: Model whose outputs every other model is scored
+                against (OllamaOptimizer passes the configured reference or its
+                largest model); when None, the best quality variant is used
+
+        Returns:
+            Results for every model and case
+        """
+        def quality_rank(model: str) -> int:
+            quant = models[model]
+            return quantization_levels.index(quant) if quant in quantization_levels else len(quantization_levels)
+
+        # The reference runs first; if it fails the next model to finish takes its place
+        ordered = sorted(models, key=lambda m: (m != reference_model, quality_rank(m),
+                                                base_model_name(m, quantization_levels)))
+        reference: Optional[Dict[str, str]] = None
+        results: List[BenchmarkResult] = []
+
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            for model in ordered:
+                try:
+                    model_results = await self._run_model(session, model, models[model])
+                except Exception as e:
+                    self.logger.error(f"Benchmark of {model} failed: {e}")
+                    continue
+                if reference is None:
+                    reference = {r.case_name: r.output for r in model_results}
+                    if reference_model and model != reference_model:
+                        self.logger.warning(f"Scoring benchmark agreement against {model} instead of {reference_model}")
+                for r in model_results:
+                    r.agreement = output_agreement(reference[r.case_name], r.output) if r.case_name in reference else 1.0
+                self.store.record(model_results)
+                results.extend(model_results)
+                self.logger.info(
+                    f"Benchmarked {model}: "
+                    f"{sum(r.tokens_per_second for r in model_results) / max(len(model_results), 1):.1f} tok/s"
+                )
+        return results
+
+    async def _run_model(self, session: aiohttp.ClientSession, model: str,
+                         quantization: str) -> List[BenchmarkResult]:
+        """Run every case against one model, after loading it so load time is excluded"""
+        await self._post(session, {"model": model, "prompt": "", "stream": False})
+
+        results = []
+        try:
+            for case in self.suite:
+                results.append(await self._run_case(session, model, quantization, case))
+        finally:
+            # Free memory before the next variant is measured
+            await self._post(session, {"model": model, "prompt": "", "keep_alive": 0, "stream": False})
+        return results
+
+    async def _run_case(self, session: aiohttp.ClientSession, model: str, quantization: str,
+                        case: BenchmarkCase) -> BenchmarkResult:
+        payload: Dict[str, Any] = {
+            "model": model,
+            "prompt": case.prompt,
+            "stream": True,
+            "options": {"temperature": 0, "seed": 42, "num_predict": self.num_predict},
+        }
+        if case.image_path:
+            payload["images"] = [base64.b64encode(Path(case.image_path).read_bytes()).decode("ascii")]
+
+        sampler = _RssSampler()
+        sampler.start()
+        start = time.perf_counter()
+        first_token_at = None
+        chunks: List[str] = []
+        final: Dict[str, Any] = {}
+        try:
+            async with session.post(f"{self.base_url}/api/generate", json=payload) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"Ollama API error {response.status}: {await response.text()}")
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("response"):
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        chunks.append(chunk["response"])
+                    if chunk.get("done"):
+                        final = chunk
+        finally:
+            peak_rss_mb = await sampler.stop()
+        total_seconds = time.perf_counter() - start
+
+        if not peak_rss_mb:
+            peak_rss_mb = await self._resident_size_mb(session, model)
+
+        eval_count = final.get("eval_count", len(chunks))
+        eval_seconds = final.get("eval_duration", 0) / 1e9 or total_seconds
+        output = "".join(chunks)
+        return BenchmarkResult(
+            model=model,
+            quantization=quantization,
+            case_name=case.name,
+            task_complexity=case.task_complexity,
+            tokens_per_second=eval_count / eval_seconds if eval_seconds else 0.0,
+            time_to_first_token=(first_token_at or time.perf_counter()) - start,
+            total_seconds=total_seconds,
+            peak_rss_mb=peak_rss_mb,
+            agreement=1.0,  # Scored against the reference output in run()
+            output=output,
+        )
+
+    async def _resident_size_mb(self, session: aiohttp.ClientSession, model: str) -> float:
+        """Memory Ollama reports for a loaded model"""
+        try:
+            async with session.get(f"{self.base_url}/api/ps") as response:
+                data = await response.json()
+            for entry in data.get("models", []):
+                if entry.get("name") == model or entry.get("model") == model:
+                    return entry.get("size", 0) / (1024 * 1024)
+        except Exception as e:
+            self.logger.debug(f"Could not read resident size of {model}: {e}")
+        return 0.0
+
+    async def _post(self, session: aiohttp.ClientSession, payload: Dict[str, Any]) -> None:
+        async with session.post(f"{self.base_url}/api/generate", json=payload) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Ollama API error {response.status}: {await response.text()}")
+            await response.read()
@@ -1,6 +1,6 @@
 """
 Ollama Optimizer - Ollama-specific model optimization
-Implements LRU memory management, quantization, and performance tuning
+Implements LRU memory management, quantization, performance tuning and benchmarking
 """
 
 import asyncio
@@ -12,6 +12,9 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 
 from ..model_optimizer import ModelOptimizer, OptimizationType, OptimizationResult
+from .model_benchmark import (
+    BenchmarkCase, ModelBenchmarkHarness, ModelBenchmarkStore, ModelBenchmarkSummary, base_model_name
+)
 
 
 @dataclass
@@ -31,6 +34,7 @@ class OllamaOptimizer(ModelOptimizer):
     - Dynamic quantization based on available resources
     - Smart model loading/unloading
     - Performance optimization for local models
+    - Model selection from measured benchmark results
     """
 
     def __init__(self, config: Dict[str, Any]):
@@ -60,6 +64,16 @@ class OllamaOptimizer(ModelOptimizer):
         
         # Performance tracking
         self._model_performance: Dict[str, Dict[str, float]] = {}
+        
+        # Measured benchmark results, see run_benchmarks()
+        self.benchmark_db_path = config.get("benchmark_db_path", "/data/performance/model_benchmarks.db")
+        self.benchmark_suite = [BenchmarkCase(**case) for case in config.get("benchmark_suite", [])] or None
+        # Model every benchmarked model is scored against, defaults to the largest available
+        self.benchmark_reference_model = config.get("benchmark_reference_model")
+        # Minimum agreement with the reference model, by task complexity
+        self.min_agreement = {"simple": 0.6, "medium": 0.75, "complex": 0.9}
+        self.min_agreement.update(config.get("benchmark_min_agreement", {}))
+        self._benchmark_store: Optional[ModelBenchmarkStore] = None
 
     async def initialize(self) -> None:
         """Initialize the Ollama optimizer"""
@@ -91,6 +105,10 @@ class OllamaOptimizer(ModelOptimizer):
         for model_name in list(self.loaded_models.keys()):
             await self._unload_model(model_name)
         
+        if self._benchmark_store:
+            self._benchmark_store.close()
+            self._benchmark_store = None
+        
         self.is_initialized = False
 
     async def optimize(self, optimization_type: OptimizationType, 
@@ -115,6 +133,8 @@ class OllamaOptimizer(ModelOptimizer):
                 result = await self._optimize_performance(progress_callback)
             elif optimization_type == OptimizationType.AUTO:
                 result = await self._optimize_auto(progress_callback)
+            elif optimization_type == OptimizationType.BENCHMARK:
+                result = await self._optimize_benchmark(progress_callback)
             else:
                 raise ValueError(f"Unsupported optimization type: {optimization_type}")
             
@@ -167,7 +187,8 @@ class OllamaOptimizer(ModelOptimizer):
                 "available_models": len(self.available_models),
                 "model_stats": model_stats,
                 "auto_quantization_enabled": self.enable_auto_quantization,
-                "optimizations_applied": len(self.current_optimizations)
+                "optimizations_applied": len(self.current_optimizations),
+                "benchmarked_models": len(self.get_benchmark_summaries())
             }
             
         except Exception as e:
@@ -181,6 +202,12 @@ class OllamaOptimizer(ModelOptimizer):
             # Ensure models are loaded based on usage and memory constraints
             await self._manage_model_loading()
             
+            # Prefer measured results when the models have been benchmarked
+            measured = self._select_from_benchmarks(task_complexity, max_response_time)
+            if measured:
+                await self._ensure_model_loaded(measured)
+                return measured
+            
             # Filter models by performance requirements
             suitable_models = []
             
@@ -210,6 +237,133 @@ class OllamaOptimizer(ModelOptimizer):
             self.logger.error(f"Failed to get best model for task: {e}")
             return None
 
+    async def run_benchmarks(self, models: Optional[List[str]] = None,
+                             progress_callback: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
+        """
+        Run the benchmark suite against local model variants and store the results.
+        
+        Args:
+            models: Models to benchmark, defaults to all available models
+            progress_callback: Optional progress reporting
+            
+        Returns:
+            Per-model summaries of the run
+        """
+        store = self._get_benchmark_store()
+        if store is None:
+            return {"error": "Benchmark store unavailable"}
+        
+        if not self.available_models:
+            await self._discover_models()
+        names = models or list(self.available_models)
+        reference = self._benchmark_reference_model()
+        if reference and reference not in names:
+            # Scores are only comparable when measured against the same reference
+            names = [reference] + names
+        variants = {
+            name: self.available_models[name].quantization if name in self.available_models else "unknown"
+            for name in names
+        }
+        
+        # Benchmarked models are unloaded afterwards; keep our view in sync
+        for name in names:
+            self.loaded_models.pop(name, None)
+        
+        if progress_callback:
+            progress_callback(0.1)
+        
+        harness = ModelBenchmarkHarness(self.ollama_base_url, store, suite=self.benchmark_suite)
+        results = await harness.run(variants, self.quantization_levels, reference_model=reference)
+        
+        if progress_callback:
+            progress_callback(1.0)
+        
+        benchmarked = {r.model for r in results}
+        return {
+            name: vars(summary)
+            for name, summary in self.get_benchmark_summaries().items()
+            if name in benchmarked
+        }
+
+    def get_benchmark_summaries(self, task_complexity: Optional[str] = None) -> Dict[str, ModelBenchmarkSummary]:
+        """Stored benchmark averages per model, optionally for one task complexity"""
+        store = self._get_benchmark_store()
+        if store is None:
+            return {}
+        try:
+            return store.summaries(task_complexity)
+        except Exception as e:
+            self.logger.error(f"Failed to read benchmark results: {e}")
+            return {}
+
+    def _benchmark_reference_model(self) -> Optional[str]:
+        """Configured reference model, or the largest available model at the best quantization"""
+        if self.benchmark_reference_model in self.available_models:
+            return self.benchmark_reference_model
+        if not self.available_models:
+            return None
+        return max(
+            self.available_models.values(),
+            key=lambda m: (m.size_gb, -self._get_quantization_priority(m.quantization))
+        ).name
+
+    def _get_benchmark_store(self) -> Optional[ModelBenchmarkStore]:
+        """Open the benchmark table on first use"""
+        if self._benchmark_store is None:
+            try:
+                self._benchmark_store = ModelBenchmarkStore(self.benchmark_db_path)
+            except Exception as e:
+                self.logger.warning(f"Cannot open benchmark store at {self.benchmark_db_path}: {e}")
+        return self._benchmark_store
+
+    def _select_from_benchmarks(self, task_complexity: str, max_response_time: float) -> Optional[str]:
+        """
+        Fastest benchmarked model that is good enough for the task.
+        
+        Models must be available, finish the suite's cases of this complexity
+        within max_response_time and agree with the reference model at least
+        as much as the complexity requires. All models are scored against the
+        same reference, so models of different families compete fairly. If
+        none agrees enough, the most accurate model within the time limit is
+        used.
+        """
+        summaries = self.get_benchmark_summaries(task_complexity) or self.get_benchmark_summaries()
+        within_time = [
+            summary for name, summary in summaries.items()
+            if name in self.available_models and summary.total_seconds <= max_response_time
+        ]
+        if not within_time:
+            return None
+        
+        floor = self.min_agreement.get(task_complexity, self.min_agreement["medium"])
+        good_enough = [summary for summary in within_time if summary.agreement >= floor]
+        if good_enough:
+            return min(good_enough, key=lambda s: (s.total_seconds, -s.agreement)).model
+        return max(within_time, key=lambda s: (s.agreement, -s.total_seconds)).model
+
+    def _measured_smaller_variant(self, model_name: str) -> Optional[ModelBenchmarkSummary]:
+        """
+        Benchmarked variant of the same base model using the least memory while agreeing enough.
+        
+        Agreement is measured against the suite's reference model, so the
+        variant must keep the medium floor's share of the current variant's
+        agreement rather than reach the floor itself.
+        """
+        summaries = self.get_benchmark_summaries()
+        current = summaries.get(model_name)
+        if current is None:
+            return None
+        
+        base = base_model_name(model_name, self.quantization_levels)
+        floor = self.min_agreement["medium"]
+        candidates = [
+            summary for name, summary in summaries.items()
+            if name != model_name and name in self.available_models
+            and base_model_name(name, self.quantization_levels) == base
+            and summary.agreement >= current.agreement * floor and summary.peak_rss_mb < current.peak_rss_mb
+        ]
+        return min(candidates, key=lambda s: s.peak_rss_mb) if candidates else None
+
     async def _optimize_quantization(self, progress_callback: Optional[Callable[[float], None]] = None) -> OptimizationResult:
         """Optimize model quantization based on available resources"""
         try:
@@ -238,8 +392,20 @@ class OllamaOptimizer(ModelOptimizer):
             
             # Apply quantization to models that would benefit
             total_models = len(self.loaded_models)
-            for i, (model_name, model) in enumerate(self.loaded_models.items()):
-                if self._should_requantize_model(model, target_quantization):
+            measured_switches = {}
+            for i, (model_name, model) in enumerate(list(self.loaded_models.items())):
+                variant = self._measured_smaller_variant(model_name) if memory_pressure > 0.7 else None
+                if variant:
+                    # Switch to a benchmarked variant instead of guessing by level
+                    original_size = model.size_gb
+                    if await self._unload_model(model_name) and await self._ensure_model_loaded(variant.model):
+                        memory_saved = original_size - self.available_models[variant.model].size_gb
+                        total_memory_saved += memory_saved
+                        optimized_models.append(variant.model)
+                        measured_switches[model_name] = variant.model
+                        self.logger.info(f"Switched {model_name} to measured variant {variant.model} "
+                                         f"(agreement {variant.agreement:.2f}), saved {memory_saved:.1f}GB")
+                elif self._should_requantize_model(model, target_quantization):
                     original_size = model.size_gb
                     success = await self._requantize_model(model_name, target_quantization)
                     
@@ -264,6 +430,7 @@ class OllamaOptimizer(ModelOptimizer):
                 memory_savings=total_memory_saved * 1024,  # Convert to MB
                 details={
                     "optimized_models": optimized_models,
+                    "measured_switches": measured_switches,
                     "target_quantization": target_quantization,
                     "memory_pressure_before": memory_pressure,
                     "total_memory_saved_gb": total_memory_saved
@@ -457,6 +624,38 @@ class OllamaOptimizer(ModelOptimizer):
         except Exception as e:
             raise Exception(f"Auto optimization failed: {e}")
 
+    async def _optimize_benchmark(self, progress_callback: Optional[Callable[[float], None]] = None) -> OptimizationResult:
+        """Benchmark local models so model selection uses measured results"""
+        try:
+            self.logger.info("Starting model benchmark")
+            
+            complexities = list(self.min_agreement)
+            selected_before = {c: self._select_from_benchmarks(c, float("inf")) for c in complexities}
+            
+            summaries = await self.run_benchmarks(progress_callback=progress_callback)
+            if "error" in summaries:
+                raise RuntimeError(summaries["error"])
+            
+            selected_models = {c: self._select_from_benchmarks(c, float("inf")) for c in complexities}
+            self.current_optimizations["benchmark"] = {"selected_models": selected_models}
+            
+            return OptimizationResult(
+                success=bool(summaries),
+                optimization_type=OptimizationType.BENCHMARK,
+                performance_improvement=0.0,  # Selection changes are reported in details
+                memory_savings=0.0,
+                details={
+                    "benchmarked_models": summaries,
+                    "selected_models_before": selected_before,
+                    "selected_models": selected_models
+                },
+                timestamp=datetime.now(),
+                error_message=None if summaries else "No model could be benchmarked"
+            )
+            
+        except Exception as e:
+            raise Exception(f"Benchmark optimization failed: {e}")
+
     # Helper methods
 
     async def _check_ollama_connection(self) -> bool:
@@ -482,10 +681,11 @@ class OllamaOptimizer(ModelOptimizer):
                             size_bytes = model_data.get("size", 0)
                             size_gb = size_bytes / (1024 ** 3)
                             
-                            # Extract quantization from model name
+                            # Prefer the quantization Ollama reports, else parse the name
+                            reported = model_data.get("details", {}).get("quantization_level", "").lower()
                             quantization = "q4_0"  # Default
                             for quant in self.quantization_levels:
-                                if quant in name.lower():
+                                if quant.lower() == reported or quant.lower() in name.lower():
                                     quantization = quant
                                     break
                             
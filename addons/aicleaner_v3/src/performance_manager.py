@@ -1,18 +1,19 @@
 """
 Performance Manager - Main performance optimization coordinator
-Implements hybrid architecture with integrated monitoring + async optimization workers
+Implements hybrid architecture with integrated monitoring + isolated optimization workers
 """
 
 import asyncio
 import logging
 from enum import Enum
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 from .resource_monitor import ResourceMonitor
 from .intelligent_router import IntelligentRouter
-from .model_optimizer import ModelOptimizer
+from .model_optimizer import ModelOptimizer, OptimizationType
+from .optimization_worker import OptimizationWorker
 from .optimizers.ollama_optimizer import OllamaOptimizer
 
 
@@ -27,6 +28,7 @@ class OptimizationStatus(Enum):
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 @dataclass
@@ -45,7 +47,7 @@ class PerformanceManager:
     """
     Main performance optimization coordinator implementing our hybrid architecture:
     - Integrated monitoring for real-time metrics
-    - Async background workers for heavy optimization tasks
+    - Optimization jobs isolated on a dedicated worker loop thread
     - Three-tier complexity management
     - Hot-swapping capabilities
     """
@@ -68,6 +70,16 @@ class PerformanceManager:
         self.optimization_tasks: Dict[str, OptimizationTask] = {}
         self.task_queue = asyncio.Queue()
         self.background_workers: List[asyncio.Task] = []
+        self._running_jobs: Dict[str, asyncio.Task] = {}
+        
+        # Optimizers run on their own loop so they cannot stall request handling
+        self.optimization_worker = OptimizationWorker(config.get("performance", {}))
+        
+        # Reads wait this long for a busy worker loop, then serve the last value
+        self.optimizer_read_timeout = config.get("performance", {}).get(
+            "optimizer_read_timeout_seconds", 2.0
+        )
+        self._optimizer_snapshots: Dict[Tuple[str, str], Any] = {}
         
         # Performance state
         self.complexity_level = ComplexityLevel(
@@ -91,9 +103,10 @@ class PerformanceManager:
             # Initialize intelligent router
             await self.intelligent_router.initialize(self.ai_provider_factory)
             
-            # Initialize optimizers
+            # Initialize optimizers on the worker loop, where all their work runs
+            await self.optimization_worker.start()
             for optimizer in self.optimizers.values():
-                await optimizer.initialize()
+                await self.optimization_worker.run(optimizer.initialize())
             
             # Start background workers
             await self._start_background_workers()
@@ -124,7 +137,12 @@ class PerformanceManager:
         await self.intelligent_router.shutdown()
         
         for optimizer in self.optimizers.values():
-            await optimizer.shutdown()
+            try:
+                await self.optimization_worker.run(optimizer.shutdown())
+            except Exception as e:
+                self.logger.error(f"Optimizer shutdown failed: {e}")
+        
+        await self.optimization_worker.stop()
 
     async def get_optimal_provider(self, request_data: Dict[str, Any]) -> str:
         """Get the optimal provider for a request using intelligent routing"""
@@ -154,6 +172,9 @@ class PerformanceManager:
         if provider not in self.optimizers:
             raise ValueError(f"No optimizer available for provider: {provider}")
         
+        # Validate the type now rather than failing in the worker
+        OptimizationType(optimization_type)
+        
         task_id = f"{provider}_{optimization_type}_{datetime.now().isoformat()}"
         task = OptimizationTask(
             id=task_id,
@@ -171,6 +192,56 @@ class PerformanceManager:
         """Get the status of an optimization task"""
         return self.optimization_tasks.get(task_id)
 
+    async def cancel_optimization(self, task_id: str) -> bool:
+        """
+        Cancel a queued or running optimization task
+        Returns False if the task is unknown or already finished
+        """
+        task = self.optimization_tasks.get(task_id)
+        if not task or task.status not in (OptimizationStatus.IDLE, OptimizationStatus.RUNNING):
+            return False
+        
+        task.status = OptimizationStatus.CANCELLED
+        task.end_time = datetime.now()
+        
+        running = self._running_jobs.get(task_id)
+        if running:
+            # Cancellation propagates to the job on the worker loop
+            running.cancel()
+            await asyncio.gather(running, return_exceptions=True)
+        
+        self.logger.info(f"Cancelled optimization task: {task_id}")
+        return True
+
+    async def call_optimizer(self, provider: str,
+                             call: Callable[[ModelOptimizer], Awaitable[Any]],
+                             snapshot_key: Optional[str] = None) -> Any:
+        """
+        Run a call against a provider's optimizer on the worker loop
+        Optimizer state is only touched there, so reads never race its
+        model management or optimization jobs. The call is bounded by
+        optimizer_read_timeout; on timeout the last result stored under
+        snapshot_key is returned, or asyncio.TimeoutError is raised if
+        there is none
+        """
+        if provider not in self.optimizers:
+            raise ValueError(f"No optimizer available for provider: {provider}")
+        
+        try:
+            result = await asyncio.wait_for(
+                self.optimization_worker.run(call(self.optimizers[provider])),
+                self.optimizer_read_timeout
+            )
+        except asyncio.TimeoutError:
+            if snapshot_key is None or (provider, snapshot_key) not in self._optimizer_snapshots:
+                raise
+            self.logger.warning(f"Optimizer worker busy, serving last known {provider} {snapshot_key}")
+            return self._optimizer_snapshots[(provider, snapshot_key)]
+        
+        if snapshot_key is not None:
+            self._optimizer_snapshots[(provider, snapshot_key)] = result
+        return result
+
     async def get_performance_metrics(self) -> Dict[str, Any]:
         """Get comprehensive performance metrics"""
         try:
@@ -187,7 +258,10 @@ class PerformanceManager:
                 "completed_tasks": len([t for t in self.optimization_tasks.values() 
                                       if t.status == OptimizationStatus.COMPLETED]),
                 "failed_tasks": len([t for t in self.optimization_tasks.values() 
-                                   if t.status == OptimizationStatus.FAILED])
+                                   if t.status == OptimizationStatus.FAILED]),
+                "cancelled_tasks": len([t for t in self.optimization_tasks.values() 
+                                      if t.status == OptimizationStatus.CANCELLED]),
+                "worker": self.optimization_worker.get_stats()
             }
             
             # Performance improvement metrics
@@ -221,10 +295,10 @@ class PerformanceManager:
                 optimizer = self.optimizers[provider]
                 
                 # Prepare new optimization in background
-                await optimizer.prepare_hot_swap(new_config)
+                await self.optimization_worker.run(optimizer.prepare_hot_swap(new_config))
                 
                 # Atomic switch to new configuration
-                success = await optimizer.execute_hot_swap()
+                success = await self.optimization_worker.run(optimizer.execute_hot_swap())
                 
                 if success:
                     self.logger.info(f"Hot-swap completed successfully for {provider}")
@@ -239,7 +313,8 @@ class PerformanceManager:
 
     async def _start_background_workers(self) -> None:
         """Start background optimization workers"""
-        num_workers = self.config.get("performance", {}).get("worker_threads", 2)
+        # One dispatcher per job slot on the worker loop
+        num_workers = self.optimization_worker.max_concurrent_jobs
         
         for i in range(num_workers):
             worker = asyncio.create_task(self._optimization_worker(f"worker_{i}"))
@@ -258,6 +333,8 @@ class PerformanceManager:
                 
                 if task_id not in self.optimization_tasks:
                     continue
+                if self.optimization_tasks[task_id].status == OptimizationStatus.CANCELLED:
+                    continue
                 
                 task = self.optimization_tasks[task_id]
                 task.status = OptimizationStatus.RUNNING
@@ -270,11 +347,28 @@ class PerformanceManager:
                 if not optimizer:
                     raise ValueError(f"No optimizer for provider: {provider}")
                 
-                # Execute optimization with progress tracking
-                async def progress_callback(progress: float):
-                    task.progress = progress
+                # Execute optimization on the worker loop, progress comes back here
+                def progress_callback(progress: float):
+                    if task.status == OptimizationStatus.RUNNING:
+                        task.progress = progress
                 
-                result = await optimizer.optimize(optimization_type, progress_callback)
+                def run_optimization(report):
+                    return optimizer.optimize(OptimizationType(optimization_type), report)
+                
+                job = asyncio.create_task(
+                    self.optimization_worker.submit(run_optimization, progress_callback)
+                )
+                self._running_jobs[task_id] = job
+                try:
+                    result = await job
+                except asyncio.CancelledError:
+                    if job.cancelled() and task.status == OptimizationStatus.CANCELLED:
+                        # Only this job was cancelled, keep the worker running
+                        self.logger.info(f"Task {task_id} cancelled")
+                        continue
+                    raise
+                finally:
+                    self._running_jobs.pop(task_id, None)
                 
                 # Update task status
                 task.status = OptimizationStatus.COMPLETED
@@ -284,6 +378,11 @@ class PerformanceManager:
                 
                 self.logger.info(f"Task {task_id} completed successfully")
                 
+                # The first measured benchmark becomes the performance baseline
+                if (OptimizationType(optimization_type) == OptimizationType.BENCHMARK
+                        and result.success and not self._performance_baseline):
+                    await self._establish_baseline()
+                
             except asyncio.CancelledError:
                 self.logger.info(f"Optimization worker {worker_id} cancelled")
                 break
@@ -303,8 +402,10 @@ class PerformanceManager:
         self.logger.info("Establishing performance baseline")
         
         try:
-            # Run lightweight benchmark
             baseline_results = await self._run_baseline_benchmark()
+            if not baseline_results:
+                self.logger.info("No model benchmarks stored yet, baseline deferred")
+                return
             self._performance_baseline = baseline_results
             
             self.logger.info(f"Performance baseline established: {baseline_results}")
@@ -313,36 +414,22 @@ class PerformanceManager:
             self.logger.error(f"Failed to establish baseline: {e}")
 
     async def _run_baseline_benchmark(self) -> Dict[str, float]:
-        """Run a quick benchmark to establish baseline performance"""
-        # Simple test prompts for different complexity levels
-        test_cases = [
-            {"type": "simple_text", "prompt": "Hello, how are you?", "expected_time": 5.0},
-            {"type": "medium_text", "prompt": "Write a short paragraph about renewable energy.", "expected_time": 10.0}
-        ]
-        
+        """
+        Baseline from the stored model benchmark results
+        Mean seconds per benchmark case for each measured model, keyed by
+        provider and model. Empty until a benchmark optimization has run
+        """
         results = {}
         
-        for test_case in test_cases:
-            try:
-                start_time = datetime.now()
-                
-                # Route and execute test request
-                provider = await self.intelligent_router.route_request(
-                    {"prompt": test_case["prompt"], "type": "text"}, {}
-                )
-                
-                # Simulate request execution time (in real implementation, 
-                # this would call the actual provider)
-                await asyncio.sleep(0.1)  # Minimal simulation
-                
-                end_time = datetime.now()
-                execution_time = (end_time - start_time).total_seconds()
-                
-                results[test_case["type"]] = execution_time
-                
-            except Exception as e:
-                self.logger.warning(f"Baseline test failed for {test_case['type']}: {e}")
-                results[test_case["type"]] = test_case["expected_time"]
+        for provider in self.optimizers:
+            if not hasattr(self.optimizers[provider], "get_benchmark_summaries"):
+                continue
+            
+            summaries = await self.call_optimizer(
+                provider, lambda optimizer: asyncio.to_thread(optimizer.get_benchmark_summaries)
+            )
+            for model, summary in summaries.items():
+                results[f"{provider}:{model}"] = summary.total_seconds
         
         return results
 
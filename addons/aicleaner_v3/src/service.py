@@ -1020,6 +1020,27 @@ async def get_optimization_status(task_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/v1/performance/optimize/{task_id}/cancel", dependencies=[Depends(get_api_key_or_allow_local)])
+async def cancel_optimization(task_id: str):
+    """Cancel a queued or running optimization task"""
+    global performance_manager
+    
+    if not performance_manager:
+        raise HTTPException(status_code=500, detail="Performance manager not initialized")
+    
+    try:
+        if not await performance_manager.cancel_optimization(task_id):
+            raise HTTPException(status_code=404, detail="No active optimization task with this id")
+        
+        return {"status": "success", "message": f"Optimization task cancelled: {task_id}"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Optimization cancellation failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/v1/performance/hot-swap", dependencies=[Depends(get_api_key_or_allow_local)])
 async def hot_swap_optimization(request: Dict[str, Any]):
     """Perform hot-swap of optimization configuration"""
@@ -1074,12 +1095,17 @@ async def get_ollama_optimization_status():
         raise HTTPException(status_code=500, detail="Performance manager not initialized")
     
     try:
-        ollama_optimizer = performance_manager.optimizers.get("ollama")
-        if not ollama_optimizer:
+        if "ollama" not in performance_manager.optimizers:
             raise HTTPException(status_code=404, detail="Ollama optimizer not found")
         
-        status = await ollama_optimizer.get_optimization_status()
-        performance_metrics = await ollama_optimizer.get_performance_metrics()
+        # Optimizer state lives on the optimization worker loop
+        status = await performance_manager.call_optimizer(
+            "ollama", lambda optimizer: optimizer.get_optimization_status(), snapshot_key="status"
+        )
+        performance_metrics = await performance_manager.call_optimizer(
+            "ollama", lambda optimizer: optimizer.get_performance_metrics(),
+            snapshot_key="performance_metrics"
+        )
         
         return {
             "status": "success",
@@ -1089,6 +1115,8 @@ async def get_ollama_optimization_status():
         
     except HTTPException:
         raise
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Ollama optimizer busy, no status available yet")
     except Exception as e:
         logger.error(f"Ollama status retrieval failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1106,12 +1134,13 @@ async def get_best_ollama_model(request: Dict[str, Any]):
     max_response_time = request.get('max_response_time', 30.0)
     
     try:
-        ollama_optimizer = performance_manager.optimizers.get("ollama")
-        if not ollama_optimizer:
+        if "ollama" not in performance_manager.optimizers:
             raise HTTPException(status_code=404, detail="Ollama optimizer not found")
         
-        best_model = await ollama_optimizer.get_best_model_for_task(
-            task_complexity, max_response_time
+        best_model = await performance_manager.call_optimizer(
+            "ollama",
+            lambda optimizer: optimizer.get_best_model_for_task(task_complexity, max_response_time),
+            snapshot_key=f"best_model:{task_complexity}:{max_response_time}"
         )
         
         return {
@@ -1123,6 +1152,8 @@ async def get_best_ollama_model(request: Dict[str, Any]):
         
     except HTTPException:
         raise
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Ollama optimizer busy, no model selection available yet")
     except Exception as e:
         logger.error(f"Best model selection failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
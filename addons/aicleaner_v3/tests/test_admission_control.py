@@ -0,0 +1,111 @@
+"""
+Tests for analysis admission control.
+"""
+
+import time
+from datetime import datetime, timezone
+
+from core.admission_control import AdmissionAction, AdmissionController
+from core.analysis_queue import AnalysisPriority
+
+
+NOW = datetime(2026, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+class TestAdmissionController:
+    """Test admission decisions and their metrics."""
+
+    def setup_method(self):
+        self.controller = AdmissionController({
+            "daily_budget": 1.0,
+            "tier_costs": {"manual": 0.1, "scheduled": 0.02, "local": 0.0},
+            "max_queue_delay_seconds": 300,
+            "expected_analysis_seconds": 30,
+            "max_deferrals": 1,
+        })
+
+    def decide(self, priority, spent_today=0.0, queue_size=0, deferrals=0):
+        return self.controller.decide("kitchen", priority, spent_today=spent_today,
+                                      queue_size=queue_size, workers=2,
+                                      deferrals=deferrals, now=NOW)
+
+    def test_admits_requested_tier_within_budget(self):
+        manual = self.decide(AnalysisPriority.MANUAL)
+        scheduled = self.decide(AnalysisPriority.SCHEDULED)
+
+        assert (manual.action, manual.model_tier) == (AdmissionAction.ADMIT, "manual")
+        assert (scheduled.action, scheduled.model_tier) == (AdmissionAction.ADMIT, "scheduled")
+
+    def test_downgrades_when_budget_runs_low(self):
+        # 0.8 spent leaves 0.2, below the scheduled reserve of 0.25
+        scheduled = self.decide(AnalysisPriority.SCHEDULED, spent_today=0.8)
+        manual = self.decide(AnalysisPriority.MANUAL, spent_today=0.95)
+
+        assert (scheduled.action, scheduled.model_tier) == (AdmissionAction.DOWNGRADE, "local")
+        assert scheduled.reason == "budget_low"
+        assert (manual.action, manual.model_tier) == (AdmissionAction.DOWNGRADE, "scheduled")
+
+    def test_admitted_cost_counts_against_budget(self):
+        for _ in range(8):
+            self.decide(AnalysisPriority.MANUAL)
+
+        decision = self.decide(AnalysisPriority.SCHEDULED)
+
+        assert decision.model_tier == "local"
+
+    def test_long_queue_drops_scheduled_and_defers_high_messiness(self):
+        # 30 queued requests at 30s over 2 workers wait 450s
+        scheduled = self.decide(AnalysisPriority.SCHEDULED, queue_size=30)
+        messy = self.decide(AnalysisPriority.HIGH_MESSINESS, queue_size=30)
+        messy_again = self.decide(AnalysisPriority.HIGH_MESSINESS, queue_size=30, deferrals=1)
+        manual = self.decide(AnalysisPriority.MANUAL, queue_size=30)
+
+        assert (scheduled.action, scheduled.reason) == (AdmissionAction.DROP, "queue_delay")
+        assert messy.action == AdmissionAction.DEFER
+        assert messy.defer_seconds > 0
+        assert (messy_again.action, messy_again.reason) == (AdmissionAction.DROP, "max_deferrals")
+        assert manual.action == AdmissionAction.ADMIT
+
+    def test_unhealthy_provider_downgrades_and_recovers(self):
+        now = time.monotonic()
+        for _ in range(5):
+            self.controller.record_outcome("scheduled", success=False, duration=5.0, now=now)
+
+        unhealthy = self.controller._decide(AnalysisPriority.SCHEDULED, "scheduled", 1.0, 0.0, 0)
+
+        assert (unhealthy.action, unhealthy.model_tier) == (AdmissionAction.DOWNGRADE, "local")
+        assert unhealthy.reason == "provider_unhealthy"
+        assert self.controller.get_tier_health("scheduled", now=now) < 0.5
+        assert self.controller.get_tier_health("scheduled", now=now + 600) == 1.0
+
+    def test_exhausted_budget_drops_all_but_manual(self):
+        self.controller.tier_costs["local"] = 0.01
+
+        scheduled = self.decide(AnalysisPriority.SCHEDULED, spent_today=1.0)
+        manual = self.decide(AnalysisPriority.MANUAL, spent_today=1.0)
+
+        assert (scheduled.action, scheduled.reason) == (AdmissionAction.DROP, "budget_exhausted")
+        assert (manual.action, manual.reason) == (AdmissionAction.DOWNGRADE, "manual_override")
+        assert manual.model_tier == "local"
+
+    def test_decisions_are_counted_and_exported(self):
+        self.decide(AnalysisPriority.SCHEDULED)
+        self.decide(AnalysisPriority.SCHEDULED, spent_today=0.8)
+        self.decide(AnalysisPriority.SCHEDULED, queue_size=30)
+
+        stats = self.controller.get_stats()
+        metrics = self.controller.get_metrics()
+
+        assert stats["decisions"] == {"admit": 1, "downgrade": 1, "defer": 0, "drop": 1}
+        assert stats["reasons"] == {"within_budget": 1, "budget_low": 1, "queue_delay": 1}
+        assert stats["estimated_cost_avoided"] == 0.04
+        assert [d["action"] for d in stats["recent_decisions"]] == ["admit", "downgrade", "drop"]
+        assert metrics['aicleaner_admission_decisions_total{priority="SCHEDULED",action="drop"}'] == 1
+
+    def test_disabled_admits_everything(self):
+        controller = AdmissionController({"enabled": False, "daily_budget": 0.01})
+
+        decision = controller.decide("kitchen", AnalysisPriority.SCHEDULED, spent_today=5.0,
+                                     queue_size=1000, workers=1, now=NOW)
+
+        assert (decision.action, decision.model_tier) == (AdmissionAction.ADMIT, "scheduled")
@@ -0,0 +1,119 @@
+"""
+Tests for snapshot change detection.
+"""
+
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw
+
+import core.change_detection
+
+from core.change_detection import ChangeDetector, compute_fingerprint
+
+
+def make_snapshot(objects=(), brightness=120):
+    """Build a JPEG room snapshot with rectangles standing in for objects."""
+    img = Image.new("RGB", (640, 480), (brightness, brightness, brightness))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([0, 300, 640, 480], fill=(90, 60, 30))
+    for x, y, color in objects:
+        draw.rectangle([x, y, x + 120, y + 90], fill=color)
+    output = BytesIO()
+    img.save(output, format="JPEG", quality=90)
+    return output.getvalue()
+
+
+class TestFingerprint:
+    """Test fingerprint similarity."""
+
+    def test_identical_snapshots_match(self):
+        snapshot = make_snapshot([(100, 100, (200, 0, 0))])
+
+        assert compute_fingerprint(snapshot).similarity(compute_fingerprint(snapshot)) == 1.0
+
+    def test_new_object_lowers_similarity(self):
+        clean = compute_fingerprint(make_snapshot())
+        messy = compute_fingerprint(make_snapshot([(60, 260, (20, 20, 200)),
+                                                   (400, 320, (220, 220, 0))]))
+
+        assert clean.similarity(messy) < 0.95
+
+    def test_path_and_bytes_agree(self, tmp_path):
+        snapshot = make_snapshot()
+        path = tmp_path / "snapshot.jpg"
+        path.write_bytes(snapshot)
+
+        assert compute_fingerprint(str(path)) == compute_fingerprint(snapshot)
+
+
+class TestChangeDetector:
+    """Test per-zone skip decisions."""
+
+    def setup_method(self):
+        self.detector = ChangeDetector(similarity_threshold=0.95, max_result_age=600,
+                                       max_consecutive_skips=2)
+        self.fingerprint = compute_fingerprint(make_snapshot())
+
+    def test_first_snapshot_is_analyzed(self):
+        decision = self.detector.check("kitchen", self.fingerprint)
+
+        assert decision.changed
+        assert decision.reason == "no_baseline"
+
+    def test_unchanged_snapshot_reuses_result(self):
+        self.detector.update("kitchen", self.fingerprint, {"tasks": []})
+
+        decision = self.detector.check("kitchen", self.fingerprint)
+
+        assert not decision.changed
+        assert decision.previous_result == {"tasks": []}
+        skip = self.detector.get_recent_skips("kitchen")[0]
+        assert skip.reason == "below_change_threshold"
+        assert skip.similarity == 1.0
+
+    def test_changed_snapshot_is_analyzed(self):
+        self.detector.update("kitchen", self.fingerprint, {"tasks": []})
+        messy = compute_fingerprint(make_snapshot([(60, 260, (20, 20, 200))]))
+
+        decision = self.detector.check("kitchen", messy)
+
+        assert decision.changed
+        assert decision.reason == "scene_changed"
+
+    def test_skips_are_bounded(self):
+        now = datetime.now()
+        self.detector.update("kitchen", self.fingerprint, {}, now=now)
+
+        assert not self.detector.check("kitchen", self.fingerprint, now=now).changed
+        assert not self.detector.check("kitchen", self.fingerprint, now=now).changed
+        assert self.detector.check("kitchen", self.fingerprint, now=now).reason == "max_skips_reached"
+
+        self.detector.update("kitchen", self.fingerprint, {}, now=now)
+        later = now + timedelta(seconds=601)
+        assert self.detector.check("kitchen", self.fingerprint, now=later).reason == "result_expired"
+
+    def test_stats(self):
+        self.detector.check("kitchen", self.fingerprint)
+        self.detector.update("kitchen", self.fingerprint, {})
+        self.detector.check("kitchen", self.fingerprint)
+
+        stats = self.detector.get_stats()
+        assert stats["checks"] == 2
+        assert stats["skips"] == 1
+        assert stats["skip_rate"] == 0.5
+        assert stats["zones"]["kitchen"]["reasons"] == {"no_baseline": 1, "below_change_threshold": 1}
+
+
+AI_CLEANER_COPY = Path(__file__).resolve().parents[3] / "ai_cleaner" / "core" / "change_detection.py"
+
+
+@pytest.mark.skipif(not AI_CLEANER_COPY.exists(), reason="ai_cleaner add-on not checked out")
+def test_ai_cleaner_ships_the_same_module():
+    # Each add-on image is built from its own directory, so ai_cleaner carries
+    # a copy of this module; it must not drift from the one tested here.
+    source = Path(core.change_detection.__file__).read_text(encoding="utf-8")
+
+    assert AI_CLEANER_COPY.read_text(encoding="utf-8") == source
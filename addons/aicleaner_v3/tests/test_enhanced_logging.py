@@ -0,0 +1,131 @@
+"""
+Tests for the enhanced logging handlers.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from core.enhanced_logging import (
+    FileLogHandler,
+    LogContext,
+    LogEntry,
+    LogFilter,
+    LogLevel,
+)
+
+
+def make_entry(message: str, level: LogLevel = LogLevel.INFO) -> LogEntry:
+    """Build a minimal log entry for handler tests."""
+    return LogEntry(
+        timestamp=datetime.now(),
+        level=level,
+        message=message,
+        context=LogContext(component="test"),
+        logger_name="test",
+        module=__name__,
+        function="make_entry",
+        line_number=0,
+        thread_id=threading.get_ident(),
+        thread_name=threading.current_thread().name,
+        process_id=os.getpid(),
+    )
+
+
+class TestFileLogHandler:
+    """Test the buffered FileLogHandler."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "aicleaner.log")
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def _read_lines(self, path=None):
+        with open(path or self.log_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def test_batches_are_written_on_close(self):
+        handler = FileLogHandler("file", self.log_path, batch_size=50, flush_interval=60.0,
+                                 log_filter=LogFilter(min_level=LogLevel.DEBUG))
+
+        for i in range(10):
+            assert asyncio.run(handler.handle_log(make_entry(f"message {i}")))
+
+        handler.close()
+
+        lines = self._read_lines()
+        assert [line["message"] for line in lines] == [f"message {i}" for i in range(10)]
+        assert handler.stats["messages_processed"] == 10
+        assert handler.stats["batches_written"] >= 1
+
+    def test_filtered_entries_are_not_queued(self):
+        handler = FileLogHandler("file", self.log_path, log_filter=LogFilter(min_level=LogLevel.WARNING))
+
+        assert not asyncio.run(handler.handle_log(make_entry("debug", LogLevel.DEBUG)))
+        handler.close()
+
+        assert handler.stats["messages_filtered"] == 1
+        assert handler.get_queue_stats()["queue_depth"] == 0
+
+    def test_full_queue_drops_oldest(self):
+        handler = FileLogHandler("file", self.log_path, batch_size=1000, flush_interval=60.0,
+                                 max_queue_size=3)
+
+        # Hold the write lock so the writer cannot drain the queue
+        with handler.lock:
+            for i in range(5):
+                asyncio.run(handler.handle_log(make_entry(f"message {i}")))
+            assert handler.stats["messages_dropped"] == 2
+
+        handler.close()
+
+        assert [line["message"] for line in self._read_lines()] == ["message 2", "message 3", "message 4"]
+
+    def test_rotation_and_background_compression(self):
+        handler = FileLogHandler("file", self.log_path, max_size=200, backup_count=2,
+                                 compression=True, batch_size=1, flush_interval=0.01)
+
+        for i in range(20):
+            asyncio.run(handler.handle_log(make_entry(f"message {i}")))
+            handler.flush()
+
+        handler.close()
+
+        assert handler.stats["rotations"] > 1
+        assert os.path.exists(os.path.join(self.temp_dir.name, "aicleaner.1.log"))
+        assert os.path.exists(os.path.join(self.temp_dir.name, "aicleaner.2.log.gz"))
+
+    def test_flush_racing_writer_keeps_line_order(self):
+        handler = FileLogHandler("file", self.log_path, batch_size=5, flush_interval=60.0)
+        write_batch = handler._write_batch
+        writer_started = threading.Event()
+
+        def slow_writer_batch(lines):
+            # Stall the background writer mid-batch so flush() runs concurrently
+            if threading.current_thread() is handler._writer_thread:
+                writer_started.set()
+                time.sleep(0.2)
+            write_batch(lines)
+
+        handler._write_batch = slow_writer_batch
+        for i in range(5):
+            asyncio.run(handler.handle_log(make_entry(f"message {i}")))
+        assert writer_started.wait(5.0)
+        asyncio.run(handler.handle_log(make_entry("message 5")))
+        handler.flush()
+        handler.close()
+
+        assert [line["message"] for line in self._read_lines()] == [f"message {i}" for i in range(6)]
+        assert handler.stats["batches_written"] == 2
+
+    def test_closed_handler_rejects_entries(self):
+        handler = FileLogHandler("file", self.log_path)
+        handler.close()
+
+        assert not asyncio.run(handler.handle_log(make_entry("late")))
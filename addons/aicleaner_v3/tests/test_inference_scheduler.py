@@ -0,0 +1,108 @@
+"""
+Tests for the LocalInferenceScheduler class.
+Following TDD principles with AAA pattern.
+"""
+import pytest
+import asyncio
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.inference_scheduler import LocalInferenceScheduler
+
+
+class TestLocalInferenceScheduler:
+    """Test suite for model-aware local inference scheduling."""
+
+    @staticmethod
+    def _recorder(log, model, delay=0.01):
+        """Coroutine factory that records when work for a model runs."""
+        async def work():
+            log.append(model)
+            await asyncio.sleep(delay)
+            return model
+        return work
+
+    @pytest.mark.asyncio
+    async def test_groups_interleaved_requests_by_model(self):
+        """Interleaved submissions run grouped, swapping once per batch."""
+        # Arrange
+        scheduler = LocalInferenceScheduler(num_parallel=1)
+        log = []
+        models = ["llava", "mistral", "llava", "mistral", "llava", "mistral"]
+
+        # Act
+        results = await asyncio.gather(*(scheduler.submit(m, self._recorder(log, m)) for m in models))
+
+        # Assert
+        assert results == models
+        assert log == ["llava", "llava", "llava", "mistral", "mistral", "mistral"]
+        assert scheduler.swaps == 1
+
+    @pytest.mark.asyncio
+    async def test_respects_parallel_slots(self):
+        """No more than num_parallel requests run at once."""
+        # Arrange
+        scheduler = LocalInferenceScheduler(num_parallel=2)
+        running = 0
+        peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        # Act
+        await asyncio.gather(*(scheduler.submit("llava", work) for _ in range(6)))
+
+        # Assert
+        assert peak == 2
+        assert scheduler.get_stats()["completed"] == 6
+
+    @pytest.mark.asyncio
+    async def test_overdue_model_is_served_before_active_backlog(self):
+        """A model waiting past max_wait_seconds takes over at the next swap point."""
+        # Arrange
+        scheduler = LocalInferenceScheduler(num_parallel=1, max_wait_seconds=0.0)
+        log = []
+
+        # Act
+        await asyncio.gather(
+            scheduler.submit("llava", self._recorder(log, "llava")),
+            scheduler.submit("mistral", self._recorder(log, "mistral")),
+            scheduler.submit("llava", self._recorder(log, "llava")),
+        )
+
+        # Assert
+        assert log == ["llava", "mistral", "llava"]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_the_submitter(self):
+        """Exceptions raised by the work propagate and free the slot."""
+        # Arrange
+        scheduler = LocalInferenceScheduler(num_parallel=1)
+
+        async def failing():
+            raise RuntimeError("model crashed")
+
+        # Act / Assert
+        with pytest.raises(RuntimeError):
+            await scheduler.submit("llava", failing)
+        assert await scheduler.submit("llava", self._recorder([], "llava")) == "llava"
+
+    def test_num_parallel_from_environment(self):
+        """Slot count defaults to OLLAMA_NUM_PARALLEL."""
+        # Arrange
+        os.environ["OLLAMA_NUM_PARALLEL"] = "4"
+        try:
+            # Act
+            scheduler = LocalInferenceScheduler()
+        finally:
+            del os.environ["OLLAMA_NUM_PARALLEL"]
+
+        # Assert
+        assert scheduler.num_parallel == 4
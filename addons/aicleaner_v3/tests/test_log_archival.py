@@ -0,0 +1,94 @@
+"""
+Tests for the log archival system.
+"""
+
+import asyncio
+import gzip
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from core.log_archival import ArchivePolicy, LogArchiver, _archive_checksum, _compress_archive
+
+
+class TestCompressArchive:
+    """Test the worker-process compression function."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = Path(self.temp_dir.name) / "aicleaner.log"
+        self.source.write_text("".join(f'{{"line": {i}}}\n' for i in range(5000)))
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    @pytest.mark.parametrize("compression_type,suffix", [
+        ("gzip", ".log.gz"), ("zip", ".log.zip"), ("tar.gz", ".log.tar.gz"), (None, ".log")
+    ])
+    def test_round_trip_is_verified(self, compression_type, suffix):
+        target = Path(self.temp_dir.name) / f"archive{suffix}"
+
+        checksum, original_size, compressed_size, verified = _compress_archive(
+            str(self.source), str(target), compression_type, True)
+
+        assert verified
+        assert original_size == self.source.stat().st_size
+        assert compressed_size == target.stat().st_size
+        assert _archive_checksum(target, compression_type or "none") == checksum
+
+    def test_corrupted_archive_fails_checksum(self):
+        target = Path(self.temp_dir.name) / "archive.log.gz"
+        checksum, _, _, _ = _compress_archive(str(self.source), str(target), "gzip", False)
+
+        with gzip.open(target, "wb") as f:
+            f.write(b"tampered")
+
+        assert _archive_checksum(target, "gzip") != checksum
+
+
+class TestLogArchiver:
+    """Test archive bookkeeping and indexed lookups."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        base = Path(self.temp_dir.name)
+        self.archiver = LogArchiver(archive_dir=str(base / "archives"),
+                                    db_path=str(base / "archives" / "archive.db"),
+                                    compression_workers=1, start_scheduler=False)
+        self.archiver.add_policy(ArchivePolicy(name="test", retention_days=1,
+                                               compression_type="gzip"))
+        self.log_file = base / "app.log"
+        self.log_file.write_text("hello\n" * 100)
+
+    def teardown_method(self):
+        self.archiver.shutdown()
+        self.temp_dir.cleanup()
+
+    def test_archive_file_records_entry(self):
+        entry = asyncio.run(self.archiver.archive_file(self.log_file, "test"))
+
+        assert entry is not None
+        assert Path(entry.archive_file).exists()
+        assert not self.log_file.exists()
+        assert self.archiver.database.is_archived(str(self.log_file))
+
+    def test_archive_file_sync_matches_async(self):
+        entry = self.archiver.archive_file_sync(self.log_file, "test")
+
+        assert entry is not None
+        assert entry.original_size == 600
+        assert self.archiver.database.get_archived_files([str(self.log_file), "other.log"]) == {
+            str(self.log_file)
+        }
+
+    def test_search_filters_by_query_and_date(self):
+        self.archiver.archive_file_sync(self.log_file, "test")
+
+        assert len(self.archiver.search_archives("APP.LOG")) == 1
+        assert self.archiver.search_archives("missing") == []
+        assert self.archiver.search_archives(
+            "app", start_date=datetime.now() + timedelta(days=1)) == []
+        # LIKE wildcards in the query are matched literally
+        assert self.archiver.search_archives("%") == []
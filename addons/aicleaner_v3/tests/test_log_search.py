@@ -0,0 +1,149 @@
+"""
+Tests for the searchable log store.
+"""
+
+import gzip
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+from core.log_search import LogSearchIndex, parse_log_line
+
+
+def json_line(timestamp, level, message, component="analyzer", correlation_id="abc"):
+    """Build a line in FileLogHandler's JSON format."""
+    return json.dumps({
+        "timestamp": timestamp.isoformat(),
+        "level": level,
+        "message": message,
+        "component": component,
+        "correlation_id": correlation_id,
+    }, separators=(',', ':')) + "\n"
+
+
+class TestParseLogLine:
+    """Test parsing of the supported log formats."""
+
+    def test_json_line(self):
+        parsed = parse_log_line(json_line(datetime(2025, 1, 2, 3, 4, 5), "ERROR", "boom"))
+
+        assert parsed.level == "ERROR"
+        assert parsed.component == "analyzer"
+        assert parsed.timestamp.startswith("2025-01-02")
+
+    def test_text_line(self):
+        parsed = parse_log_line("2025-01-02 03:04:05 - WARNING - camera - snapshot slow (ID: c000001)")
+
+        assert parsed.level == "WARNING"
+        assert parsed.component == "camera"
+        assert parsed.message == "snapshot slow (ID: c000001)"
+
+    def test_garbage_is_skipped(self):
+        assert parse_log_line("not a log line") is None
+        assert parse_log_line("{broken json") is None
+
+
+class TestLogSearchIndex:
+    """Test ingestion and search across partitions."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.base = Path(self.temp_dir.name)
+        self.index = LogSearchIndex(str(self.base / "index"), batch_size=2)
+        self.now = datetime.now().replace(microsecond=0)
+
+    def teardown_method(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def test_live_file_is_ingested_incrementally(self):
+        log_file = self.base / "aicleaner.log"
+        log_file.write_text(json_line(self.now, "INFO", "zone kitchen analyzed"))
+
+        assert self.index.ingest_file(log_file).lines_indexed == 1
+        assert self.index.ingest_file(log_file).lines_indexed == 0
+
+        with open(log_file, "a") as f:
+            f.write(json_line(self.now, "ERROR", "provider timeout"))
+            f.write('{"timestamp": "partial')
+
+        assert self.index.ingest_file(log_file).lines_indexed == 1
+        assert [r["level"] for r in self.index.search(levels=["error"])] == ["ERROR"]
+
+    def test_archives_are_streamed_and_partitioned_by_day(self):
+        yesterday = self.now - timedelta(days=1)
+        archive = self.base / "aicleaner.1.log.gz"
+        with gzip.open(archive, "wt") as f:
+            f.write(json_line(yesterday, "ERROR", "gemini quota exceeded", correlation_id="c1"))
+            f.write(json_line(self.now, "INFO", "gemini healthy", correlation_id="c2"))
+
+        result = self.index.ingest_file(archive)
+
+        assert result.lines_indexed == 2
+        assert len(result.partitions) == 2
+        assert self.index.ingest_file(archive).lines_indexed == 0
+
+        matches = list(self.index.search("gemini"))
+        assert [m["correlation_id"] for m in matches] == ["c2", "c1"]
+        assert [m["correlation_id"] for m in self.index.search(correlation_id="c1")] == ["c1"]
+        assert list(self.index.search("gemini", start_time=self.now - timedelta(minutes=1))) == [
+            matches[0]
+        ]
+
+    def test_rotation_does_not_reindex_lines(self):
+        log_file = self.base / "aicleaner.log"
+        rotated = self.base / "aicleaner.1.log"
+        with open(log_file, "w") as f:
+            f.write(json_line(self.now, "ERROR", "line one"))
+            f.write(json_line(self.now, "ERROR", "line two"))
+        self.index.ingest_directory(self.base)
+
+        # Rotate, write to both files, and ingest the new live file first
+        with open(log_file, "a") as f:
+            f.write(json_line(self.now, "ERROR", "line three"))
+        log_file.rename(rotated)
+        log_file.write_text(json_line(self.now, "ERROR", "line four"))
+        self.index.ingest_file(log_file)
+        self.index.ingest_file(rotated)
+
+        messages = sorted(json.loads(m["raw"])["message"] for m in self.index.search(levels=["ERROR"]))
+        assert messages == ["line four", "line one", "line three", "line two"]
+
+    def test_archive_of_indexed_file_adds_only_new_lines(self):
+        log_file = self.base / "aicleaner.1.log"
+        log_file.write_text(json_line(self.now, "ERROR", "indexed live"))
+        self.index.ingest_file(log_file)
+
+        archive = self.base / "archives" / "aicleaner.1.log.gz"
+        archive.parent.mkdir()
+        with gzip.open(archive, "wt") as f:
+            f.write(log_file.read_text())
+            f.write(json_line(self.now, "ERROR", "written before archival"))
+        log_file.unlink()
+
+        assert self.index.ingest_directory(self.base)[0].lines_indexed == 1
+        assert len(list(self.index.search(levels=["ERROR"]))) == 2
+
+    def test_filters_and_limit(self):
+        log_file = self.base / "aicleaner.log"
+        with open(log_file, "w") as f:
+            for i in range(5):
+                f.write(json_line(self.now, "ERROR", f"failure {i}", component="camera"))
+            f.write(json_line(self.now, "ERROR", "failure other", component="mqtt"))
+        self.index.ingest_directory(self.base)
+
+        assert len(list(self.index.search("failure", component="camera"))) == 5
+        assert len(list(self.index.search("failure", limit=3))) == 3
+        # FTS syntax in user input is treated literally
+        assert list(self.index.search('failure" OR "x')) == []
+
+    def test_drop_partitions_before(self):
+        old = self.now - timedelta(days=10)
+        log_file = self.base / "old.log"
+        log_file.write_text(json_line(old, "INFO", "ancient") + json_line(self.now, "INFO", "fresh"))
+        self.index.ingest_file(log_file)
+
+        assert self.index.drop_partitions_before(self.now.strftime("%Y-%m-%d")) == 1
+        assert [m["raw"] for m in self.index.search()] == [json_line(self.now, "INFO", "fresh").strip()]
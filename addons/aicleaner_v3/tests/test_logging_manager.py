@@ -0,0 +1,197 @@
+"""
+Tests for the enhanced LoggingManager.
+"""
+
+import tempfile
+from datetime import datetime, timedelta
+
+
+from core.enhanced_logging import LogCategory, LogContext, LogEntry, LogLevel
+from core.logging_manager import LogAnalyzer, LoggingConfig, LoggingManager
+
+
+class TestLoggingManagerGate:
+    """Test call-site level gating and deferred formatting."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manager = LoggingManager(LoggingConfig(
+            log_directory=self.temp_dir.name,
+            log_level=LogLevel.INFO,
+            console_logging=False,
+            ha_logging=False,
+            file_logging=False,
+            enable_analysis=False,
+            enable_alerting=False,
+            flush_interval=0.05,
+        ))
+        # Stop the worker so queued entries can be inspected
+        self.manager.shutdown_event.set()
+        self.manager.worker_thread.join(timeout=10.0)
+
+    def teardown_method(self):
+        self.manager.shutdown()
+        self.temp_dir.cleanup()
+
+    def test_suppressed_levels_are_not_queued(self):
+        logger = self.manager.get_logger("test")
+
+        logger.debug("hidden %s", "value")
+        logger.trace("hidden")
+
+        assert self.manager.log_queue.qsize() == 0
+
+    def test_category_gate_follows_handler_filters(self):
+        # Only the security handler (security/audit categories) accepts INFO
+        assert self.manager.is_enabled_for(LogLevel.INFO, LogCategory.SECURITY)
+        assert not self.manager.is_enabled_for(LogLevel.INFO, LogCategory.SYSTEM)
+        assert self.manager.is_enabled_for(LogLevel.INFO, LogCategory.PERFORMANCE)
+
+    def test_component_logger_gates_on_given_category(self):
+        logger = self.manager.get_logger("test")
+
+        logger.info("system entry")
+        logger.info("security entry", category=LogCategory.SECURITY)
+
+        assert self.manager.log_queue.qsize() == 1
+        entry = self.manager.log_queue.get_nowait()
+        assert entry.context.category == LogCategory.SECURITY
+
+    def test_stream_widens_gate(self):
+        assert not self.manager.is_enabled_for(LogLevel.INFO)
+
+        self.manager.create_stream("ui")
+        assert self.manager.is_enabled_for(LogLevel.INFO)
+
+        self.manager.remove_stream("ui")
+        assert not self.manager.is_enabled_for(LogLevel.INFO)
+
+    def test_message_formatting_is_deferred(self):
+        context = LogContext(category=LogCategory.SECURITY)
+        self.manager.log(LogLevel.INFO, "zone %s took %d ms", context, args=("kitchen", 42))
+
+        entry = self.manager.log_queue.get_nowait()
+        assert entry.message == "zone %s took %d ms"
+        assert entry.resolve_message() == "zone kitchen took 42 ms"
+        assert entry.args == ()
+
+    def test_log_entry_uses_slots(self):
+        context = LogContext(category=LogCategory.SECURITY)
+        self.manager.log(LogLevel.INFO, "message", context)
+
+        entry = self.manager.log_queue.get_nowait()
+        assert not hasattr(entry, "__dict__")
+
+
+def make_entry(level=LogLevel.INFO, component="analyzer", timestamp=None,
+               category=LogCategory.SYSTEM, metrics=None):
+    """Build a log entry for analyzer tests."""
+    return LogEntry(
+        timestamp=timestamp or datetime.now(),
+        level=level,
+        message="message",
+        context=LogContext(component=component, operation="op", category=category),
+        logger_name="test",
+        module=__name__,
+        function="make_entry",
+        line_number=0,
+        thread_id=0,
+        thread_name="MainThread",
+        process_id=0,
+        performance_metrics=metrics,
+    )
+
+
+class TestLogAnalyzer:
+    """Test the bucketed sliding-window analyzer."""
+
+    def test_counts_are_merged_across_buckets(self):
+        analyzer = LogAnalyzer(analysis_window=60, bucket_seconds=10)
+        now = datetime.now()
+
+        for offset in (0, 15, 25):
+            analyzer.add_entry(make_entry(timestamp=now - timedelta(seconds=offset)))
+        analyzer.add_entry(make_entry(level=LogLevel.ERROR, timestamp=now))
+
+        analysis = analyzer.analyze()
+        assert analysis.total_entries == 4
+        assert analysis.entries_by_level[LogLevel.ERROR] == 1
+        assert analysis.entries_by_component["analyzer"] == 4
+        assert analysis.error_patterns == [{"pattern": "analyzer:op", "count": 1}]
+
+    def test_entries_outside_window_expire(self):
+        analyzer = LogAnalyzer(analysis_window=30, bucket_seconds=10)
+        old = datetime.now() - timedelta(seconds=120)
+
+        analyzer.add_entry(make_entry(timestamp=old))
+        analyzer.add_entry(make_entry())
+
+        assert analyzer.analyze().total_entries == 1
+
+    def test_memory_is_bounded_by_bucket_count(self):
+        analyzer = LogAnalyzer(analysis_window=60, bucket_seconds=10)
+        start = datetime.now() - timedelta(hours=1)
+
+        for second in range(0, 3600, 2):
+            analyzer.add_entry(make_entry(timestamp=start + timedelta(seconds=second)))
+
+        assert len(analyzer.buckets) == 6
+        assert analyzer.analyze().total_entries <= 30
+
+    def test_volume_spike_is_detected(self):
+        analyzer = LogAnalyzer(analysis_window=600, bucket_seconds=10)
+        start = datetime.now() - timedelta(seconds=300)
+
+        # Steady baseline of one error per bucket, then a burst
+        for bucket in range(20):
+            analyzer.add_entry(make_entry(level=LogLevel.ERROR,
+                                          timestamp=start + timedelta(seconds=bucket * 10)))
+        burst_time = start + timedelta(seconds=200)
+        for _ in range(30):
+            analyzer.add_entry(make_entry(level=LogLevel.ERROR, timestamp=burst_time))
+        analyzer.add_entry(make_entry(timestamp=burst_time + timedelta(seconds=10)))
+
+        anomaly_types = {anomaly["type"] for anomaly in analyzer.analyze().anomalies}
+        assert "volume_spike" in anomaly_types
+
+    def test_flat_baseline_scores_are_finite(self):
+        analyzer = LogAnalyzer(analysis_window=600, bucket_seconds=10)
+        start = datetime.now() - timedelta(seconds=300)
+
+        # Exactly two warnings per bucket leaves zero variance
+        for bucket in range(21):
+            for _ in range(2):
+                analyzer.add_entry(make_entry(level=LogLevel.WARNING,
+                                              timestamp=start + timedelta(seconds=bucket * 10)))
+
+        stat = analyzer.volume_stats[("analyzer", LogLevel.WARNING)]
+        assert stat.variance == 0
+        assert stat.score(3) == 5.0
+        assert stat.score(2) == 0.0
+
+    def test_idle_volume_baselines_are_evicted(self):
+        analyzer = LogAnalyzer(analysis_window=60, bucket_seconds=10)
+        start = datetime.now() - timedelta(seconds=1000)
+
+        # Short-lived components log once each while one component keeps going
+        for bucket in range(100):
+            timestamp = start + timedelta(seconds=bucket * 10)
+            analyzer.add_entry(make_entry(component="steady", timestamp=timestamp))
+            if bucket < 20:
+                analyzer.add_entry(make_entry(component=f"worker-{bucket}", timestamp=timestamp))
+
+        assert set(analyzer.volume_stats) == {("steady", LogLevel.INFO)}
+
+    def test_performance_summary_uses_bucket_aggregates(self):
+        analyzer = LogAnalyzer(analysis_window=60, bucket_seconds=10)
+        now = datetime.now()
+
+        for value in (100, 200, 300):
+            analyzer.add_entry(make_entry(category=LogCategory.PERFORMANCE, timestamp=now,
+                                          metrics={"response_time": value}))
+
+        summary = analyzer.analyze().performance_summary["analyzer:response_time"]
+        assert summary["count"] == 3
+        assert summary["avg"] == 200
+        assert summary["min"] == 100 and summary["max"] == 300
+        assert summary["trend"] == "increasing"
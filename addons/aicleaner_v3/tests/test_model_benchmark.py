@@ -0,0 +1,293 @@
+"""
+Tests for the local model benchmark store and benchmark-driven model selection.
+Following TDD principles with AAA pattern.
+"""
+import pytest
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock
+import sys
+import os
+
+from aiohttp import web
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.optimizers.model_benchmark import (
+    BenchmarkResult, ModelBenchmarkHarness, ModelBenchmarkStore, base_model_name, output_agreement
+)
+from src.model_optimizer import OptimizationType
+from src.optimizers.ollama_optimizer import OllamaOptimizer, ModelInfo
+
+
+def _result(model, case, complexity, total_seconds, agreement, rss=4000.0, quantization="q4_0"):
+    return BenchmarkResult(
+        model=model, quantization=quantization, case_name=case, task_complexity=complexity,
+        tokens_per_second=20.0, time_to_first_token=0.5, total_seconds=total_seconds,
+        peak_rss_mb=rss, agreement=agreement
+    )
+
+
+class TestModelBenchmarkStore:
+    """Test suite for the persistent benchmark table."""
+
+    def test_record_replaces_earlier_runs(self, tmp_path):
+        """Re-running a case replaces its row instead of adding another."""
+        # Arrange
+        store = ModelBenchmarkStore(tmp_path / "bench.db")
+        store.record([_result("llava:7b", "short_answer", "simple", 4.0, 1.0)])
+
+        # Act
+        store.record([_result("llava:7b", "short_answer", "simple", 2.0, 1.0)])
+        summary = store.summaries()["llava:7b"]
+        store.close()
+
+        # Assert
+        assert summary.cases == 1
+        assert summary.total_seconds == 2.0
+
+    def test_summaries_filter_by_complexity(self, tmp_path):
+        """Summaries can be limited to the cases of one task complexity."""
+        # Arrange
+        store = ModelBenchmarkStore(tmp_path / "bench.db")
+        store.record([
+            _result("llava:7b", "short_answer", "simple", 2.0, 1.0),
+            _result("llava:7b", "scene_reasoning", "complex", 10.0, 1.0),
+        ])
+
+        # Act
+        simple = store.summaries("simple")["llava:7b"]
+        overall = store.summaries()["llava:7b"]
+        store.close()
+
+        # Assert
+        assert simple.total_seconds == 2.0
+        assert overall.total_seconds == 6.0
+
+    def test_results_persist_across_instances(self, tmp_path):
+        """A new store on the same file sees earlier results."""
+        # Arrange
+        store = ModelBenchmarkStore(tmp_path / "bench.db")
+        store.record([_result("llava:7b", "short_answer", "simple", 2.0, 1.0)])
+        store.close()
+
+        # Act
+        reopened = ModelBenchmarkStore(tmp_path / "bench.db")
+        summaries = reopened.summaries()
+        reopened.close()
+
+        # Assert
+        assert "llava:7b" in summaries
+
+    def test_helpers(self):
+        """Agreement is word-based and quantization suffixes are stripped."""
+        # Act / Assert
+        assert output_agreement("the floor is clean", "The floor is clean") == 1.0
+        assert output_agreement("the floor is clean", "dishes in sink") < 0.5
+        assert base_model_name("llava:7b-q4_K_M", ["q4_0", "q4_K_M"]) == "llava:7b"
+        assert base_model_name("llava:7b", ["q4_0"]) == "llava:7b"
+
+
+class TestBenchmarkModelSelection:
+    """Test suite for choosing models from the benchmark table."""
+
+    @pytest.fixture
+    def optimizer(self, tmp_path):
+        """Create an OllamaOptimizer with three benchmarked variants of one model."""
+        optimizer = OllamaOptimizer({"benchmark_db_path": str(tmp_path / "bench.db")})
+        for name, quant, size in [("llava:7b-q8_0", "q8_0", 14.0), ("llava:7b-q5_K_M", "q5_K_M", 7.5),
+                                  ("llava:7b-q4_0", "q4_0", 4.0)]:
+            optimizer.available_models[name] = ModelInfo(
+                name=name, size_gb=size, quantization=quant, last_used=datetime.now(), load_time=5.0
+            )
+        optimizer._get_benchmark_store().record([
+            _result("llava:7b-q8_0", "scene_reasoning", "complex", 20.0, 1.0, rss=15000, quantization="q8_0"),
+            _result("llava:7b-q5_K_M", "scene_reasoning", "complex", 12.0, 0.95, rss=8000, quantization="q5_K_M"),
+            _result("llava:7b-q4_0", "scene_reasoning", "complex", 6.0, 0.7, rss=4500, quantization="q4_0"),
+            _result("llava:7b-q8_0", "short_answer", "simple", 3.0, 1.0, rss=15000, quantization="q8_0"),
+            _result("llava:7b-q5_K_M", "short_answer", "simple", 2.0, 0.9, rss=8000, quantization="q5_K_M"),
+            _result("llava:7b-q4_0", "short_answer", "simple", 1.0, 0.8, rss=4500, quantization="q4_0"),
+        ])
+        optimizer._manage_model_loading = AsyncMock()
+        optimizer._ensure_model_loaded = AsyncMock(return_value=True)
+        yield optimizer
+        optimizer._benchmark_store.close()
+
+    @pytest.mark.asyncio
+    async def test_fastest_model_meeting_agreement_floor(self, optimizer):
+        """Complex tasks skip variants that disagree with the reference."""
+        # Act
+        model = await optimizer.get_best_model_for_task("complex", max_response_time=30.0)
+
+        # Assert
+        assert model == "llava:7b-q5_K_M"
+
+    @pytest.mark.asyncio
+    async def test_simple_tasks_accept_smaller_variant(self, optimizer):
+        """Simple tasks take the fastest variant above the lower floor."""
+        # Act
+        model = await optimizer.get_best_model_for_task("simple", max_response_time=30.0)
+
+        # Assert
+        assert model == "llava:7b-q4_0"
+
+    @pytest.mark.asyncio
+    async def test_best_agreement_within_time_when_floor_unreachable(self, optimizer):
+        """If only disagreeing variants are fast enough, the most accurate of them wins."""
+        # Act
+        model = await optimizer.get_best_model_for_task("complex", max_response_time=7.0)
+
+        # Assert
+        assert model == "llava:7b-q4_0"
+
+    def test_measured_smaller_variant(self, optimizer):
+        """Memory pressure switches to the smallest variant that still agrees enough."""
+        # Act
+        variant = optimizer._measured_smaller_variant("llava:7b-q8_0")
+
+        # Assert
+        assert variant.model == "llava:7b-q4_0"
+
+
+class TestCrossFamilySelection:
+    """Test suite for comparing models of different families."""
+
+    @pytest.fixture
+    def optimizer(self, tmp_path):
+        """Create an OllamaOptimizer with two model families and no sibling variants."""
+        optimizer = OllamaOptimizer({"benchmark_db_path": str(tmp_path / "bench.db")})
+        for name, size in [("llava:13b", 8.0), ("moondream", 1.7)]:
+            optimizer.available_models[name] = ModelInfo(
+                name=name, size_gb=size, quantization="q4_0", last_used=datetime.now(), load_time=5.0
+            )
+        optimizer._manage_model_loading = AsyncMock()
+        optimizer._ensure_model_loaded = AsyncMock(return_value=True)
+        yield optimizer
+        optimizer._benchmark_store.close()
+
+    @pytest.mark.asyncio
+    async def test_models_scored_against_one_reference(self, optimizer):
+        """Every model is scored against the largest model's outputs, across families."""
+        # Arrange
+        outputs = {
+            "llava:13b": "wipe the spilled drink from the rug first then fold the laundry",
+            "moondream": "clean room",
+        }
+
+        async def run_model(session, model, quantization):
+            return [BenchmarkResult(
+                model=model, quantization=quantization, case_name="scene_reasoning",
+                task_complexity="complex", tokens_per_second=20.0, time_to_first_token=0.5,
+                total_seconds=20.0 if model == "llava:13b" else 2.0, peak_rss_mb=4000.0,
+                agreement=1.0, output=outputs[model]
+            )]
+
+        harness = ModelBenchmarkHarness("http://localhost:11434", optimizer._get_benchmark_store())
+        harness._run_model = run_model
+
+        # Act
+        results = await harness.run({"moondream": "q4_0", "llava:13b": "q4_0"},
+                                    optimizer.quantization_levels,
+                                    reference_model=optimizer._benchmark_reference_model())
+        model = await optimizer.get_best_model_for_task("complex", max_response_time=30.0)
+
+        # Assert
+        agreement = {r.model: r.agreement for r in results}
+        assert agreement["llava:13b"] == 1.0
+        assert agreement["moondream"] < 0.5
+        assert model == "llava:13b"
+
+    @pytest.mark.asyncio
+    async def test_fast_disagreeing_family_not_preferred(self, optimizer):
+        """A fast model of another family loses to an accurate slower one for complex tasks."""
+        # Arrange
+        optimizer._get_benchmark_store().record([
+            _result("llava:13b", "scene_reasoning", "complex", 20.0, 1.0),
+            _result("moondream", "scene_reasoning", "complex", 2.0, 0.4),
+        ])
+
+        # Act
+        complex_model = await optimizer.get_best_model_for_task("complex", max_response_time=30.0)
+        fast_model = await optimizer.get_best_model_for_task("complex", max_response_time=5.0)
+
+        # Assert
+        assert complex_model == "llava:13b"
+        assert fast_model == "moondream"
+
+
+@asynccontextmanager
+async def _fake_ollama(outputs, delays):
+    """Local stand-in for the Ollama generate and ps endpoints."""
+    async def generate(request):
+        payload = await request.json()
+        if not payload.get("stream"):
+            return web.json_response({"done": True})
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await asyncio.sleep(delays[payload["model"]])
+        for word in outputs[payload["model"]].split():
+            await response.write(json.dumps({"response": word + " "}).encode() + b"\n")
+        await response.write(json.dumps({"done": True, "eval_count": 10, "eval_duration": 10 ** 8}).encode())
+        return response
+
+    async def ps(request):
+        return web.json_response({"models": []})
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    app.router.add_get("/api/ps", ps)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        await runner.cleanup()
+
+
+class TestBenchmarkOptimization:
+    """Test suite for the benchmark optimization type."""
+
+    @pytest.mark.asyncio
+    async def test_benchmark_run_changes_model_selection(self, tmp_path):
+        """Running the harness through optimize() switches selection to the measured results."""
+        # Arrange
+        outputs = {
+            "llava:13b": "wipe the spilled drink from the rug first then fold the laundry",
+            "moondream": "clean room",
+        }
+        async with _fake_ollama(outputs, {"llava:13b": 0.05, "moondream": 0.0}) as base_url:
+            optimizer = OllamaOptimizer({
+                "base_url": base_url,
+                "benchmark_db_path": str(tmp_path / "bench.db"),
+                "benchmark_suite": [{"name": "scene_reasoning", "prompt": "Plan the cleaning.",
+                                     "task_complexity": "complex"}],
+            })
+            for name, size in [("llava:13b", 8.0), ("moondream", 1.7)]:
+                optimizer.available_models[name] = ModelInfo(
+                    name=name, size_gb=size, quantization="q4_0", last_used=datetime.now(), load_time=5.0
+                )
+            optimizer._model_performance = {"llava:13b": {"avg_response_time": 20.0},
+                                            "moondream": {"avg_response_time": 2.0}}
+            optimizer._manage_model_loading = AsyncMock()
+            optimizer._ensure_model_loaded = AsyncMock(return_value=True)
+            optimizer.is_initialized = True
+            before = await optimizer.get_best_model_for_task("complex", max_response_time=30.0)
+
+            # Act
+            result = await optimizer.optimize(OptimizationType.BENCHMARK)
+            after = await optimizer.get_best_model_for_task("complex", max_response_time=30.0)
+            optimizer._benchmark_store.close()
+
+        # Assert
+        assert result.success, result.error_message
+        assert set(result.details["benchmarked_models"]) == {"llava:13b", "moondream"}
+        assert result.details["benchmarked_models"]["moondream"]["agreement"] < 0.5
+        assert result.details["selected_models"]["complex"] == "llava:13b"
+        assert before == "moondream"
+        assert after == "llava:13b"
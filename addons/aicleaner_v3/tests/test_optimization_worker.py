@@ -0,0 +1,315 @@
+"""
+Tests for the OptimizationWorker and isolated optimization jobs in PerformanceManager.
+Following TDD principles with AAA pattern.
+"""
+import pytest
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.optimization_worker import OptimizationWorker
+from src.performance_manager import PerformanceManager, OptimizationStatus
+
+
+# Allowed request latency increase while optimizations run
+LATENCY_BUDGET_PERCENT = 10
+
+
+def _blocking_optimization(steps=20, step_seconds=0.03):
+    """Job factory doing blocking I/O and some CPU work, like model management does."""
+    async def optimize(report):
+        for step in range(steps):
+            time.sleep(step_seconds)
+            sum(i * i for i in range(2000))
+            report((step + 1) / steps)
+            await asyncio.sleep(0)
+        return "done"
+    return optimize
+
+
+async def _request_latencies(count=100, concurrency=4):
+    """Simulate /v1/generate handlers awaiting a provider and return their p95 latency."""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def handle():
+        async with semaphore:
+            start = time.monotonic()
+            await asyncio.sleep(0.02)
+            latencies.append(time.monotonic() - start)
+
+    await asyncio.gather(*(handle() for _ in range(count)))
+    latencies.sort()
+    return latencies[int(len(latencies) * 0.95)]
+
+
+async def _median_p95(rounds=3):
+    """Median p95 over a few rounds, so one scheduler hiccup does not decide the result."""
+    return sorted([await _request_latencies() for _ in range(rounds)])[rounds // 2]
+
+
+@asynccontextmanager
+async def _running_worker(**config):
+    """Start a worker with two job slots unless configured otherwise."""
+    worker = OptimizationWorker({"worker_threads": 2, "lag_probe_interval_seconds": 0.01, **config})
+    await worker.start()
+    try:
+        yield worker
+    finally:
+        await worker.stop()
+
+
+class TestOptimizationWorker:
+    """Test suite for the dedicated optimization loop thread."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_run_on_worker_thread(self):
+        """Jobs run on the worker thread, not the caller's."""
+        async with _running_worker() as worker:
+            # Arrange
+            async def job(report):
+                return threading.current_thread().name
+
+            # Act
+            thread_name = await worker.submit(job)
+
+            # Assert
+            assert thread_name == "optimization-worker"
+            assert worker.get_stats()["jobs_completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_progress_reported_on_caller_loop(self):
+        """Progress callbacks run on the caller's thread."""
+        async with _running_worker() as worker:
+            # Arrange
+            progress = []
+            caller = threading.current_thread()
+
+            def on_progress(value):
+                assert threading.current_thread() is caller
+                progress.append(value)
+
+            # Act
+            await worker.submit(_blocking_optimization(steps=4, step_seconds=0.001), on_progress)
+            await asyncio.sleep(0.01)
+
+            # Assert
+            assert progress == [0.25, 0.5, 0.75, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_cancellation_reaches_job(self):
+        """Cancelling the submitting task cancels the job on the worker loop."""
+        async with _running_worker() as worker:
+            # Arrange
+            cancelled = threading.Event()
+
+            async def job(report):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+
+            task = asyncio.create_task(worker.submit(job))
+            await asyncio.sleep(0.05)
+
+            # Act
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+            # Assert
+            assert await asyncio.to_thread(cancelled.wait, 1.0)
+            assert worker.get_stats()["jobs_cancelled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_concurrency_and_time(self):
+        """Jobs beyond the slot count wait and overlong jobs time out."""
+        # Arrange
+        running = 0
+        peak = 0
+
+        async def job(report):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+
+        async def slow_job(report):
+            await asyncio.sleep(1)
+
+        # Act
+        async with _running_worker(worker_threads=1, job_timeout_seconds=0.1) as worker:
+            await asyncio.gather(*(worker.submit(job) for _ in range(3)))
+            with pytest.raises(asyncio.TimeoutError):
+                await worker.submit(slow_job)
+
+        # Assert
+        assert peak == 1
+        assert worker.get_stats()["jobs_timed_out"] == 1
+
+    @pytest.mark.asyncio
+    async def test_request_latency_within_budget_under_load(self):
+        """Load test: request p95 latency stays within budget while optimizations run."""
+        async with _running_worker() as worker:
+            # Arrange
+            baseline_p95 = await _median_p95()
+
+            # Act
+            jobs = [asyncio.create_task(worker.submit(_blocking_optimization(steps=1000))) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            loaded_p95 = await _median_p95()
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+
+            # Assert
+            assert loaded_p95 <= baseline_p95 * (1 + LATENCY_BUDGET_PERCENT / 100)
+
+    @pytest.mark.asyncio
+    async def test_same_load_on_request_loop_exceeds_budget(self):
+        """Control: the same jobs on the request loop break the budget."""
+        # Arrange
+        baseline_p95 = await _median_p95()
+
+        # Act
+        job = asyncio.create_task(_blocking_optimization(steps=1000)(lambda progress: None))
+        loaded_p95 = await _request_latencies()
+        job.cancel()
+        await asyncio.gather(job, return_exceptions=True)
+
+        # Assert
+        assert loaded_p95 > baseline_p95 * (1 + LATENCY_BUDGET_PERCENT / 100)
+
+
+class _FakeOptimizer:
+    """Optimizer stand-in whose AUTO optimization blocks for a while."""
+
+    def __init__(self, steps=10):
+        self.steps = steps
+        self.thread_name = None
+
+    async def get_optimization_status(self):
+        return {"thread": threading.current_thread().name}
+
+    async def optimize(self, optimization_type, progress_callback=None):
+        self.thread_name = threading.current_thread().name
+        return await _blocking_optimization(steps=self.steps)(progress_callback)
+
+
+@asynccontextmanager
+async def _running_manager():
+    """PerformanceManager with a fake optimizer and running workers."""
+    manager = PerformanceManager({"performance": {"worker_threads": 1}}, ai_provider_factory=None)
+    manager.optimizers = {"ollama": _FakeOptimizer()}
+    await manager.optimization_worker.start()
+    await manager._start_background_workers()
+    try:
+        yield manager
+    finally:
+        for worker in manager.background_workers:
+            worker.cancel()
+        await asyncio.gather(*manager.background_workers, return_exceptions=True)
+        await manager.optimization_worker.stop()
+
+
+class TestPerformanceManagerIsolation:
+    """Test suite for optimization tasks dispatched through PerformanceManager."""
+
+    @pytest.mark.asyncio
+    async def test_task_completes_on_worker_with_progress(self):
+        """A scheduled optimization runs on the worker thread and reports progress."""
+        async with _running_manager() as manager:
+            # Act
+            task_id = await manager.optimize_provider("ollama", "auto")
+            await manager.task_queue.join()
+            await asyncio.sleep(0.01)
+            task = await manager.get_optimization_status(task_id)
+
+            # Assert
+            assert task.status == OptimizationStatus.COMPLETED
+            assert task.progress == 1.0
+            assert manager.optimizers["ollama"].thread_name == "optimization-worker"
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_task(self):
+        """Cancelling a running task marks it cancelled and frees the worker."""
+        async with _running_manager() as manager:
+            # Arrange
+            manager.optimizers["ollama"].steps = 100
+            task_id = await manager.optimize_provider("ollama", "auto")
+            await asyncio.sleep(0.1)
+
+            # Act
+            cancelled = await manager.cancel_optimization(task_id)
+            manager.optimizers["ollama"].steps = 1
+            next_id = await manager.optimize_provider("ollama", "auto")
+            await manager.task_queue.join()
+
+            # Assert
+            assert cancelled is True
+            assert (await manager.get_optimization_status(task_id)).status == OptimizationStatus.CANCELLED
+            assert (await manager.get_optimization_status(next_id)).status == OptimizationStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_optimizer_reads_run_on_worker(self):
+        """Optimizer calls from request handlers run on the worker thread."""
+        async with _running_manager() as manager:
+            # Act
+            status = await manager.call_optimizer("ollama", lambda optimizer: optimizer.get_optimization_status())
+
+            # Assert
+            assert status == {"thread": "optimization-worker"}
+            with pytest.raises(ValueError):
+                await manager.call_optimizer("missing", lambda optimizer: optimizer.get_optimization_status())
+
+    @pytest.mark.asyncio
+    async def test_baseline_comes_from_stored_benchmarks(self):
+        """The performance baseline is built from measured benchmark results, not simulated."""
+        async with _running_manager() as manager:
+            # Arrange
+            optimizer = manager.optimizers["ollama"]
+            await manager._establish_baseline()
+            no_benchmarks = manager._performance_baseline
+            optimizer.get_benchmark_summaries = lambda: {
+                "llava:13b": SimpleNamespace(total_seconds=12.5),
+                "moondream": SimpleNamespace(total_seconds=2.0),
+            }
+
+            # Act
+            await manager._establish_baseline()
+
+            # Assert
+            assert no_benchmarks is None
+            assert manager._performance_baseline == {"ollama:llava:13b": 12.5, "ollama:moondream": 2.0}
+
+    @pytest.mark.asyncio
+    async def test_stalled_optimizer_read_serves_last_known_value(self):
+        """A read that outlasts the timeout returns the last snapshot instead of hanging."""
+        async with _running_manager() as manager:
+            # Arrange
+            manager.optimizer_read_timeout = 0.1
+            fresh = await manager.call_optimizer(
+                "ollama", lambda optimizer: optimizer.get_optimization_status(), snapshot_key="status"
+            )
+
+            def stall(optimizer):
+                return asyncio.sleep(5, result={"thread": "stale"})
+
+            # Act
+            start = time.monotonic()
+            served = await manager.call_optimizer("ollama", stall, snapshot_key="status")
+            elapsed = time.monotonic() - start
+
+            # Assert
+            assert served == fresh
+            assert elapsed < 1.0
+            with pytest.raises(asyncio.TimeoutError):
+                await manager.call_optimizer("ollama", stall, snapshot_key="metrics")
@@ -167,4 +167,25 @@ class TestZoneAnalyzer:
         # Act & Assert
         # For now, just verify that the analysis was queued successfully
         assert analysis_id is not None
-        assert isinstance(analysis_id, str)
\ No newline at end of file
+        assert isinstance(analysis_id, str)
+    @pytest.mark.asyncio
+    async def test_stop_cancels_repeatedly_deferred_analysis(self, analyzer):
+        """Test that a request deferred again stays tracked until stop."""
+        # Arrange
+        analyzer.admission_controller.max_queue_delay = 10
+        analyzer.admission_controller.expected_analysis_seconds = 30
+        analyzer.admission_controller.defer_seconds = 0.01
+        analyzer.admission_controller.max_deferrals = 5
+        await analyzer.queue_analysis(zone_name="Kitchen", priority=AnalysisPriority.MANUAL)
+
+        # Act
+        analysis_id = await analyzer.queue_analysis(
+            zone_name="Kitchen",
+            priority=AnalysisPriority.HIGH_MESSINESS
+        )
+        await asyncio.sleep(0.05)
+
+        # Assert
+        assert analysis_id in analyzer._deferred_analyses
+        await analyzer.stop()
+        assert not analyzer._deferred_analyses
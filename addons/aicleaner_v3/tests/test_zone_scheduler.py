@@ -0,0 +1,120 @@
+"""
+Tests for the ZoneScheduler class.
+Following TDD principles with AAA pattern.
+"""
+import pytest
+import asyncio
+from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock
+import sys
+import os
+
+# Add the parent directory to the path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.scheduler import ZoneScheduler
+from core.analysis_queue import AnalysisPriority
+
+
+class TestZoneScheduler:
+    """Test suite for heap-based zone scheduling."""
+
+    @pytest.fixture
+    def zone_analyzer(self):
+        """Create a zone analyzer whose queued analyses are recorded."""
+        analyzer = AsyncMock()
+        analyzer.queue_analysis = AsyncMock(return_value="analysis-id")
+        return analyzer
+
+    @staticmethod
+    def _config(zones, **scheduler):
+        return {"zones": [{"name": name, "update_frequency": hours} for name, hours in zones],
+                "scheduler": scheduler}
+
+    @pytest.mark.asyncio
+    async def test_sleeps_until_earliest_due_zone(self, zone_analyzer):
+        """The loop wakes once per due time instead of polling."""
+        # Arrange
+        scheduler = ZoneScheduler(zone_analyzer, self._config([("kitchen", 6), ("garage", 6)]))
+        await scheduler._initialize_zone_schedules()
+        now = datetime.now(timezone.utc)
+        scheduler._set_next_analysis("kitchen", now + timedelta(seconds=0.05))
+        scheduler._set_next_analysis("garage", now + timedelta(hours=1))
+
+        # Act
+        scheduler.running = True
+        task = asyncio.create_task(scheduler._scheduler_loop())
+        await asyncio.sleep(0.3)
+        scheduler.running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        # Assert
+        zone_analyzer.queue_analysis.assert_called_once_with("kitchen", AnalysisPriority.SCHEDULED)
+        assert scheduler.get_stats()["wakeups"] <= 3
+
+    @pytest.mark.asyncio
+    async def test_manual_trigger_reschedules_zone(self, zone_analyzer):
+        """A manual trigger pushes the zone's next scheduled analysis out by its period."""
+        # Arrange
+        scheduler = ZoneScheduler(zone_analyzer, self._config([("kitchen", 1)], jitter_fraction=0.0))
+        await scheduler._initialize_zone_schedules()
+
+        # Act
+        await scheduler.trigger_analysis("kitchen")
+        await scheduler._check_schedules()
+
+        # Assert
+        assert zone_analyzer.queue_analysis.call_count == 1
+        delay = scheduler.get_next_analysis("kitchen") - datetime.now(timezone.utc)
+        assert timedelta(minutes=59) < delay <= timedelta(hours=1)
+
+    @pytest.mark.asyncio
+    async def test_config_change_wakes_loop(self, zone_analyzer):
+        """Adding a zone wakes a loop that is sleeping on a distant deadline."""
+        # Arrange
+        scheduler = ZoneScheduler(zone_analyzer, self._config([("garage", 6)]))
+        await scheduler._initialize_zone_schedules()
+        scheduler._set_next_analysis("garage", datetime.now(timezone.utc) + timedelta(hours=6))
+        scheduler.running = True
+        task = asyncio.create_task(scheduler._scheduler_loop())
+        await asyncio.sleep(0.05)
+
+        # Act
+        await scheduler.update_config(self._config([("garage", 6), ("kitchen", 6)]))
+        scheduler._set_next_analysis("kitchen", datetime.now(timezone.utc))
+        await asyncio.sleep(0.05)
+        scheduler.running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        # Assert
+        zone_analyzer.queue_analysis.assert_called_once_with("kitchen", AnalysisPriority.SCHEDULED)
+
+    @pytest.mark.asyncio
+    async def test_removed_zone_is_not_analyzed(self, zone_analyzer):
+        """Heap entries of removed zones are skipped."""
+        # Arrange
+        scheduler = ZoneScheduler(zone_analyzer, self._config([("kitchen", 6)]))
+        await scheduler._initialize_zone_schedules()
+        scheduler._set_next_analysis("kitchen", datetime.now(timezone.utc))
+
+        # Act
+        await scheduler.update_config(self._config([]))
+        await scheduler._check_schedules()
+
+        # Assert
+        zone_analyzer.queue_analysis.assert_not_called()
+        assert scheduler.get_stats()["zones"] == 0
+
+    def test_due_times_are_jittered(self, zone_analyzer):
+        """Zones with the same period get spread-out due times."""
+        # Arrange
+        scheduler = ZoneScheduler(zone_analyzer, self._config([], jitter_fraction=0.1, max_jitter_seconds=600))
+
+        # Act
+        periods = [scheduler._jittered_period(6).total_seconds() for _ in range(50)]
+
+        # Assert
+        assert all(6 * 3600 - 600 <= p <= 6 * 3600 + 600 for p in periods)
+        assert max(periods) - min(periods) > 60
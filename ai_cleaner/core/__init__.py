@@ -15,7 +15,24 @@ from .config import (
 from .camera_manager import (
     CameraManager,
     ImageData,
-    CameraError
+    CameraError,
+    ImagePreprocessor,
+    PreprocessedImage,
+    preprocess_image,
+    FetchScheduler,
+    SnapshotEntry
+)
+
+from .change_detection import (
+    ChangeDetector,
+    ImageFingerprint,
+    compute_fingerprint
+)
+
+from .image_encoding import (
+    AdaptiveEncoder,
+    EncodingProfile,
+    benchmark_encodings
 )
 
 from .ha_link import (
@@ -55,6 +72,21 @@ __all__ = [
     'CameraManager',
     'ImageData',
     'CameraError',
+    'ImagePreprocessor',
+    'PreprocessedImage',
+    'preprocess_image',
+    'FetchScheduler',
+    'SnapshotEntry',
+    
+    # Change Detection
+    'ChangeDetector',
+    'ImageFingerprint',
+    'compute_fingerprint',
+    
+    # Snapshot Encoding
+    'AdaptiveEncoder',
+    'EncodingProfile',
+    'benchmark_encodings',
     
     # Home Assistant Integration
     'HAEntityManager',
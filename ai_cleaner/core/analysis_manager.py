@@ -14,6 +14,8 @@ import json
 
 from .config import get_config, AiCleanerConfig
 from .camera_manager import CameraManager, ImageData, CameraError
+from .change_detection import compute_fingerprint
+from .image_encoding import AdaptiveEncoder, parse_profiles
 from .providers.base import BaseAIProvider, ImageAnalysis, CleaningPlan, CleaningTask
 from .providers.gemini import GeminiProvider
 from .ha_link import HAEntityManager
@@ -67,6 +69,11 @@ class PDCACycle:
     improvements_identified: List[str] = field(default_factory=list)
     adaptations_made: List[str] = field(default_factory=list)
     
+    # Change detection (plan phase reused the previous analysis)
+    analysis_skipped: bool = False
+    skip_reason: Optional[str] = None
+    snapshot_similarity: Optional[float] = None
+    
     # Error tracking
     errors: List[str] = field(default_factory=list)
     retry_count: int = 0
@@ -107,6 +114,10 @@ class AnalysisManager:
         self.ai_provider: Optional[BaseAIProvider] = None
         self.ha_manager: Optional[HAEntityManager] = None
         self.scheduler: Optional[ZoneScheduler] = None
+        self.image_encoder = AdaptiveEncoder(
+            profiles=parse_profiles(self.config.encoding_profiles),
+            token_budget=self.config.encoding_token_budget
+        )
         
         # State tracking
         self.state = AnalysisState.IDLE
@@ -299,9 +310,35 @@ class AnalysisManager:
                 cycle.add_error(f"No camera configured for zone {cycle.zone_id}")
                 return False
             
-            # Capture image
-            self.logger.debug(f"Capturing image from {camera_entity}")
-            image = await self.camera_manager.get_camera_snapshot(camera_entity)
+            # Capture image, encoded for the provider and model in use
+            provider_name = self.ai_provider.name
+            model_name = self.ai_provider.config.get('model')
+            encoding = self.image_encoder.profile_for(provider_name, model_name)
+            self.logger.debug(f"Capturing image from {camera_entity} at {encoding}")
+            image = await self.camera_manager.get_camera_snapshot(
+                camera_entity, max_dimension=encoding.max_dimension, quality=encoding.quality
+            )
+            
+            # Reuse the previous analysis if the zone has not changed
+            zone_key = cycle.zone_id or 'default'
+            detector = self.scheduler.change_detector if self.scheduler else None
+            fingerprint = None
+            if detector:
+                try:
+                    loop = asyncio.get_running_loop()
+                    fingerprint = await loop.run_in_executor(None, compute_fingerprint, image.data)
+                except Exception as e:
+                    self.logger.warning(f"Change detection failed for {camera_entity}: {e}")
+            
+            if fingerprint is not None:
+                check = detector.check(zone_key, fingerprint)
+                cycle.snapshot_similarity = check.similarity
+                if not check.changed:
+                    cycle.image_analysis = check.previous_result
+                    cycle.analysis_skipped = True
+                    cycle.skip_reason = check.reason
+                    self.logger.info(f"Skipped analysis for zone {zone_key}: {check.reason} (similarity {check.similarity:.3f})")
+                    return True
             
             # Analyze image with AI
             self.logger.debug("Analyzing image with AI provider")
@@ -310,6 +347,7 @@ class AnalysisManager:
                 cycle.zone_id,
                 context=self._get_analysis_context(cycle.zone_id)
             )
+            self.image_encoder.record_usage(provider_name, model_name, encoding, analysis.prompt_tokens)
             
             # Create cleaning plan
             self.logger.debug("Creating cleaning plan")
@@ -321,6 +359,8 @@ class AnalysisManager:
             # Store results
             cycle.image_analysis = analysis
             cycle.cleaning_plan = plan
+            if fingerprint is not None:
+                detector.update(zone_key, fingerprint, analysis)
             
             # Update HA entities
             await self.ha_manager.update_last_analysis(datetime.now(), analysis)
@@ -428,7 +468,7 @@ class AnalysisManager:
                     improvements.append("Zone is very clean, can reduce analysis frequency")
                     adaptations.append("Decreased analysis frequency")
                 
-                if len(cycle.cleaning_plan.tasks) > 10:
+                if cycle.cleaning_plan and len(cycle.cleaning_plan.tasks) > 10:
                     improvements.append("Many tasks created, consider task prioritization")
                     adaptations.append("Enhanced task filtering")
             
@@ -599,6 +639,7 @@ class AnalysisManager:
                 'initialized': self.ai_provider.is_initialized if self.ai_provider else False
             },
             'scheduler_status': self.scheduler.get_status() if self.scheduler else None,
+            'image_encoding': self.image_encoder.get_status(),
             'recent_cycles': [
                 {
                     'id': cycle.id,
@@ -608,6 +649,9 @@ class AnalysisManager:
                     'current_phase': cycle.current_phase.value,
                     'tasks_created': cycle.tasks_created,
                     'errors': len(cycle.errors),
+                    'analysis_skipped': cycle.analysis_skipped,
+                    'skip_reason': cycle.skip_reason,
+                    'snapshot_similarity': cycle.snapshot_similarity,
                     'cleanliness_score': cycle.image_analysis.overall_cleanliness_score if cycle.image_analysis else None
                 }
                 for cycle in self.completed_cycles[-5:]  # Last 5 cycles
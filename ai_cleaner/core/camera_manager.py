@@ -6,6 +6,11 @@ Handles image fetching from IP cameras via Home Assistant API.
 import asyncio
 import aiohttp
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple, Any
 from io import BytesIO
@@ -24,15 +29,117 @@ class CameraError(Exception):
     pass
 
 
+@dataclass
+class PreprocessedImage:
+    """Result of preprocessing a snapshot for AI analysis."""
+    data: bytes
+    width: int
+    height: int
+    format: Optional[str]
+    original_width: int
+    original_height: int
+    resized: bool
+
+
+def preprocess_image(data: bytes, max_width: int = 1024, max_height: int = 1024,
+                     quality: int = 85, optimize: bool = False) -> PreprocessedImage:
+    """
+    Decode an image once and downscale it to fit within the given bounds.
+
+    JPEG sources are decoded with ``draft()`` so libjpeg performs the bulk of
+    the downscale in DCT space, and the remaining resize uses ``reducing_gap``
+    to shrink by an integer factor before the final LANCZOS pass. This runs in
+    worker processes, so it must stay a module-level function.
+    """
+    with Image.open(BytesIO(data)) as img:
+        format_name = img.format
+        width, height = img.size
+        if width <= max_width and height <= max_height:
+            return PreprocessedImage(data, width, height, format_name, width, height, False)
+
+        ratio = min(max_width / width, max_height / height)
+        new_size = (max(1, int(width * ratio)), max(1, int(height * ratio)))
+
+        if format_name == 'JPEG':
+            img.draft('RGB', new_size)
+        resized_img = img.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        output = BytesIO()
+        if (format_name or 'JPEG').upper() in ['JPEG', 'JPG']:
+            if resized_img.mode not in ('RGB', 'L'):
+                resized_img = resized_img.convert('RGB')
+            resized_img.save(output, format='JPEG', quality=quality, optimize=optimize)
+            format_name = 'JPEG'
+        else:
+            resized_img.save(output, format=format_name)
+
+        return PreprocessedImage(output.getvalue(), new_size[0], new_size[1], format_name,
+                                 width, height, True)
+
+
+class ImagePreprocessor:
+    """
+    Runs image preprocessing off the event loop.
+
+    Work is dispatched to a lazily created process pool so concurrent snapshot
+    fetches do not serialize decode/resize/encode on the loop thread. With
+    ``max_workers=0`` the work runs in the loop's default thread executor
+    instead, which is useful where process creation is not permitted.
+    """
+
+    def __init__(self, max_workers: int = 2, max_width: int = 1024,
+                 max_height: int = 1024, quality: int = 85):
+        self.max_workers = max_workers
+        self.max_width = max_width
+        self.max_height = max_height
+        self.quality = quality
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.logger = logging.getLogger(__name__)
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Get the process pool, creating it on first use."""
+        if self.max_workers <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def process(self, data: bytes, max_width: Optional[int] = None, max_height: Optional[int] = None,
+                      quality: Optional[int] = None) -> PreprocessedImage:
+        """Preprocess image bytes in the worker pool, optionally overriding the target size and quality."""
+        loop = asyncio.get_running_loop()
+        args = (data, max_width or self.max_width, max_height or self.max_height, quality or self.quality)
+        try:
+            return await loop.run_in_executor(self._get_pool(), preprocess_image, *args)
+        except BrokenProcessPool:
+            self.logger.warning("Preprocessing pool broken, falling back to thread executor")
+            self._pool = None
+            self.max_workers = 0
+            return await loop.run_in_executor(None, preprocess_image, *args)
+
+    def close(self):
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
 class ImageData:
     """Container for camera image data and metadata."""
     
-    def __init__(self, data: bytes, entity_id: str, timestamp: Optional[datetime] = None):
+    def __init__(self, data: bytes, entity_id: str, timestamp: Optional[datetime] = None,
+                 size: Optional[Tuple[int, int]] = None, format: Optional[str] = None):
         self.data = data
         self.entity_id = entity_id
         self.timestamp = timestamp or datetime.now()
-        self._size: Optional[Tuple[int, int]] = None
-        self._format: Optional[str] = None
+        self._size: Optional[Tuple[int, int]] = size
+        self._format: Optional[str] = format
+    
+    @classmethod
+    def from_preprocessed(cls, result: PreprocessedImage, entity_id: str,
+                          timestamp: Optional[datetime] = None) -> 'ImageData':
+        """Create ImageData from a preprocessing result without re-reading the header."""
+        return cls(result.data, entity_id, timestamp, (result.width, result.height), result.format)
     
     @property
     def size(self) -> Tuple[int, int]:
@@ -74,36 +181,57 @@ class ImageData:
             return False
     
     def resize(self, max_width: int = 1024, max_height: int = 1024, quality: int = 85) -> bytes:
-        """Resize image for AI processing."""
+        """
+        Resize image for AI processing.
+        
+        This runs synchronously; use ImagePreprocessor from async code.
+        """
         try:
-            with Image.open(BytesIO(self.data)) as img:
-                # Calculate new size maintaining aspect ratio
-                width, height = img.size
-                if width <= max_width and height <= max_height:
-                    return self.data
-                
-                ratio = min(max_width / width, max_height / height)
-                new_width = int(width * ratio)
-                new_height = int(height * ratio)
-                
-                # Resize image
-                resized_img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-                # Save to bytes
-                output = BytesIO()
-                format_name = img.format or 'JPEG'
-                if format_name.upper() in ['JPEG', 'JPG']:
-                    resized_img.save(output, format='JPEG', quality=quality, optimize=True)
-                else:
-                    resized_img.save(output, format=format_name)
-                
-                return output.getvalue()
-                
+            return preprocess_image(self.data, max_width, max_height, quality).data
         except Exception as e:
             logger.error(f"Failed to resize image: {e}")
             return self.data
 
 
+@dataclass
+class SnapshotEntry:
+    """Last raw snapshot of a camera with the cache validators HA sent for it."""
+    data: bytes
+    captured_at: datetime
+    fetched_at: float  # time.monotonic() of the last fetch or revalidation
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    images: Dict[Optional[Tuple[int, int]], 'asyncio.Future[ImageData]'] = field(default_factory=dict)  # keyed by (max_dimension, quality), None for raw
+
+
+class FetchScheduler:
+    """
+    Paces snapshot fetches through Home Assistant.
+    
+    Fetch starts are spaced at least ``interval`` seconds apart and at most
+    ``max_concurrent`` fetches run at once, so polling many cameras spreads
+    the load over time instead of bursting.
+    """
+    
+    def __init__(self, interval: float, max_concurrent: int):
+        self.interval = interval
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._next_slot = 0.0
+        self.delayed_fetches = 0
+    
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for the next fetch slot and hold a concurrency permit."""
+        now = time.monotonic()
+        start = max(now, self._next_slot)
+        self._next_slot = start + self.interval
+        if start > now:
+            self.delayed_fetches += 1
+            await asyncio.sleep(start - now)
+        async with self._semaphore:
+            yield
+
+
 class CameraManager:
     """Manages camera image fetching from Home Assistant."""
     
@@ -115,6 +243,15 @@ class CameraManager:
         self._camera_info_cache: Dict[str, Dict] = {}
         self._cache_timeout = timedelta(minutes=5)
         self._last_cache_update: Optional[datetime] = None
+        self.preprocessor = ImagePreprocessor(max_workers=self.config.max_concurrent_analysis)
+        
+        # Snapshot cache shared by all consumers of a camera
+        self.snapshot_ttl = self.config.snapshot_cache_ttl
+        self.fetch_scheduler = FetchScheduler(self.config.snapshot_fetch_interval,
+                                              self.config.max_concurrent_analysis)
+        self._snapshots: Dict[str, SnapshotEntry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._snapshot_stats = {'hits': 0, 'fetches': 0, 'not_modified': 0, 'deduplicated': 0}
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -151,14 +288,23 @@ class CameraManager:
         if self._session and not self._session.closed:
             await self._session.close()
             self.logger.debug("HTTP session closed")
+        self.preprocessor.close()
     
-    async def get_camera_snapshot(self, entity_id: str, resize_for_ai: bool = True) -> ImageData:
+    async def get_camera_snapshot(self, entity_id: str, resize_for_ai: bool = True,
+                                  max_age: Optional[float] = None, max_dimension: Optional[int] = None,
+                                  quality: Optional[int] = None) -> ImageData:
         """
         Get camera snapshot from Home Assistant.
         
+        Snapshots younger than the cache TTL are shared between callers, and
+        concurrent requests for the same camera wait on a single fetch.
+        
         Args:
             entity_id: Camera entity ID (e.g., 'camera.living_room')
             resize_for_ai: Whether to resize image for AI processing
+            max_age: Maximum snapshot age in seconds (defaults to snapshot_cache_ttl, 0 forces a fetch)
+            max_dimension: Longest side when resizing (defaults to the preprocessor size)
+            quality: JPEG quality when resizing (defaults to the preprocessor quality)
             
         Returns:
             ImageData object containing the image
@@ -166,47 +312,154 @@ class CameraManager:
         Raises:
             CameraError: If snapshot cannot be obtained
         """
+        entry = await self._get_snapshot_entry(entity_id, self.snapshot_ttl if max_age is None else max_age)
+        
+        # Callers sharing a snapshot also share each encoding of it
+        encoding = None
+        if resize_for_ai:
+            encoding = (max_dimension or max(self.preprocessor.max_width, self.preprocessor.max_height),
+                        quality or self.preprocessor.quality)
+        build = entry.images.get(encoding)
+        if build is None:
+            build = asyncio.ensure_future(self._build_image(entry, entity_id, encoding))
+            entry.images[encoding] = build
+            build.add_done_callback(lambda t: self._build_done(entry, encoding, t))
+        return await asyncio.shield(build)
+    
+    async def _get_snapshot_entry(self, entity_id: str, max_age: float) -> SnapshotEntry:
+        """Return a cached snapshot or join/start the fetch for this camera."""
+        entry = self._snapshots.get(entity_id)
+        if entry is not None and time.monotonic() - entry.fetched_at < max_age:
+            self._snapshot_stats['hits'] += 1
+            return entry
+        
+        task = self._inflight.get(entity_id)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_snapshot(entity_id))
+            self._inflight[entity_id] = task
+            task.add_done_callback(lambda t: self._fetch_done(entity_id, t))
+        else:
+            self._snapshot_stats['deduplicated'] += 1
+        
+        # Shielded so one cancelled caller does not abort the fetch for the others
+        return await asyncio.shield(task)
+    
+    def _build_done(self, entry: SnapshotEntry, encoding: Optional[Tuple[int, int]], task: asyncio.Task):
+        # Failed builds are dropped so the next caller retries instead of re-raising
+        if task.cancelled() or task.exception() is not None:
+            if entry.images.get(encoding) is task:
+                del entry.images[encoding]
+    
+    def _fetch_done(self, entity_id: str, task: asyncio.Task):
+        if self._inflight.get(entity_id) is task:
+            del self._inflight[entity_id]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved when every waiter was cancelled
+    
+    async def _fetch_snapshot(self, entity_id: str) -> SnapshotEntry:
+        """Fetch a snapshot, revalidating the cached one when HA sent validators."""
         await self._ensure_session()
         
+        previous = self._snapshots.get(entity_id)
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+        
         try:
             # Get camera snapshot via HA API
             url = f"{self.config.ha_url}/api/camera_proxy/{entity_id}"
             
-            self.logger.debug(f"Fetching snapshot from {entity_id}")
-            
-            async with self._session.get(url) as response:
-                if response.status == 200:
-                    image_data = await response.read()
-                    
-                    if not image_data:
-                        raise CameraError(f"Empty image data received from {entity_id}")
-                    
-                    # Create ImageData object
-                    image = ImageData(image_data, entity_id)
+            async with self.fetch_scheduler.slot():
+                self.logger.debug(f"Fetching snapshot from {entity_id}")
+                
+                async with self._session.get(url, headers=headers) as response:
+                    if response.status == 304 and previous is not None:
+                        previous.fetched_at = time.monotonic()
+                        self._snapshot_stats['not_modified'] += 1
+                        self.logger.debug(f"Snapshot from {entity_id} not modified")
+                        return previous
                     
-                    # Resize if requested
-                    if resize_for_ai:
-                        resized_data = image.resize()
-                        if resized_data != image_data:
-                            image = ImageData(resized_data, entity_id, image.timestamp)
-                            self.logger.debug(f"Resized image from {len(image_data)} to {len(resized_data)} bytes")
+                    if response.status == 200:
+                        image_data = await response.read()
+                        
+                        if not image_data:
+                            raise CameraError(f"Empty image data received from {entity_id}")
+                        
+                        entry = SnapshotEntry(
+                            data=image_data,
+                            captured_at=datetime.now(),
+                            fetched_at=time.monotonic(),
+                            etag=response.headers.get('ETag'),
+                            last_modified=response.headers.get('Last-Modified')
+                        )
+                        self._snapshots[entity_id] = entry
+                        self._snapshot_stats['fetches'] += 1
+                        return entry
                     
-                    self.logger.info(f"Successfully captured snapshot from {entity_id} ({image.size[0]}x{image.size[1]}, {image.size_bytes} bytes)")
-                    return image
-                
-                elif response.status == 404:
-                    raise CameraError(f"Camera entity not found: {entity_id}")
-                elif response.status == 401:
-                    raise CameraError("Unauthorized - check Home Assistant token")
-                else:
-                    error_text = await response.text()
-                    raise CameraError(f"Failed to get snapshot from {entity_id}: HTTP {response.status} - {error_text}")
+                    elif response.status == 404:
+                        raise CameraError(f"Camera entity not found: {entity_id}")
+                    elif response.status == 401:
+                        raise CameraError("Unauthorized - check Home Assistant token")
+                    else:
+                        error_text = await response.text()
+                        raise CameraError(f"Failed to get snapshot from {entity_id}: HTTP {response.status} - {error_text}")
         
+        except CameraError:
+            raise
         except aiohttp.ClientError as e:
             raise CameraError(f"Network error getting snapshot from {entity_id}: {e}")
         except Exception as e:
             raise CameraError(f"Unexpected error getting snapshot from {entity_id}: {e}")
     
+    async def _build_image(self, entry: SnapshotEntry, entity_id: str,
+                           encoding: Optional[Tuple[int, int]]) -> ImageData:
+        """Create ImageData for a snapshot, resizing off the event loop if an encoding is given."""
+        image = ImageData(entry.data, entity_id, entry.captured_at)
+        if encoding is not None:
+            max_dimension, quality = encoding
+            try:
+                result = await self.preprocessor.process(entry.data, max_dimension, max_dimension, quality)
+            except Exception as e:
+                self.logger.error(f"Failed to resize image from {entity_id}: {e}")
+            else:
+                image = ImageData.from_preprocessed(result, entity_id, entry.captured_at)
+                if result.resized:
+                    self.logger.debug(
+                        f"Resized image from {result.original_width}x{result.original_height} "
+                        f"({len(entry.data)} bytes) to {result.width}x{result.height} "
+                        f"({len(result.data)} bytes)")
+        
+        self.logger.info(f"Successfully captured snapshot from {entity_id} ({image.size[0]}x{image.size[1]}, {image.size_bytes} bytes)")
+        return image
+    
+    def invalidate_snapshot(self, entity_id: Optional[str] = None):
+        """
+        Drop cached snapshots so the next request fetches a new frame.
+        
+        Args:
+            entity_id: Camera entity ID, or None for all cameras
+        """
+        if entity_id is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(entity_id, None)
+    
+    def get_snapshot_cache_stats(self) -> Dict[str, Any]:
+        """Get snapshot cache and fetch scheduler statistics."""
+        stats = self._snapshot_stats
+        requests = stats['hits'] + stats['deduplicated'] + stats['fetches'] + stats['not_modified']
+        return {
+            'ttl_seconds': self.snapshot_ttl,
+            'cameras_cached': len(self._snapshots),
+            'in_flight': len(self._inflight),
+            **stats,
+            'reuse_rate': (stats['hits'] + stats['deduplicated']) / requests if requests else 0.0,
+            'delayed_fetches': self.fetch_scheduler.delayed_fetches,
+        }
+    
     async def get_multiple_snapshots(self, entity_ids: List[str], resize_for_ai: bool = True) -> Dict[str, ImageData]:
         """
         Get snapshots from multiple cameras concurrently.
@@ -223,18 +476,14 @@ class CameraManager:
         
         self.logger.info(f"Fetching snapshots from {len(entity_ids)} cameras")
         
-        # Create semaphore to limit concurrent requests
-        semaphore = asyncio.Semaphore(self.config.max_concurrent_analysis)
-        
         async def fetch_single(entity_id: str) -> Tuple[str, Optional[ImageData]]:
-            """Fetch single snapshot with semaphore protection."""
-            async with semaphore:
-                try:
-                    image = await self.get_camera_snapshot(entity_id, resize_for_ai)
-                    return entity_id, image
-                except CameraError as e:
-                    self.logger.error(f"Failed to fetch snapshot from {entity_id}: {e}")
-                    return entity_id, None
+            """Fetch single snapshot; the fetch scheduler paces the requests."""
+            try:
+                image = await self.get_camera_snapshot(entity_id, resize_for_ai)
+                return entity_id, image
+            except CameraError as e:
+                self.logger.error(f"Failed to fetch snapshot from {entity_id}: {e}")
+                return entity_id, None
         
         # Execute all requests concurrently
         tasks = [fetch_single(entity_id) for entity_id in entity_ids]
@@ -386,7 +635,7 @@ class CameraManager:
             
             # Test snapshot access
             try:
-                image = await self.get_camera_snapshot(entity_id, resize_for_ai=False)
+                image = await self.get_camera_snapshot(entity_id, resize_for_ai=False, max_age=0)
                 test_results['snapshot_available'] = True
                 test_results['image_size'] = image.size
                 test_results['image_format'] = image.format
@@ -439,6 +688,7 @@ class CameraManager:
             'session_active': False,
             'cameras_configured': 0,
             'cache_entries': len(self._camera_info_cache),
+            'snapshot_cache': self.get_snapshot_cache_stats(),
             'errors': []
         }
         
@@ -0,0 +1,249 @@
+"""
+Snapshot change detection for zone analysis.
+
+Each zone keeps the fingerprint of the snapshot behind its last provider
+result. A new snapshot is fingerprinted with a difference hash (dHash) and a
+coarse colour histogram; when it is close enough to the baseline the previous
+result is reused instead of calling the AI provider again.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from io import BytesIO
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from PIL import Image
+
+
+HASH_SIZE = 8
+HISTOGRAM_BINS = 8
+_THUMBNAIL_SIZE = (64, 64)
+
+
+@dataclass(frozen=True)
+class ImageFingerprint:
+    """Perceptual fingerprint of a snapshot."""
+    dhash: int
+    histogram: Tuple[float, ...]
+
+    def similarity(self, other: "ImageFingerprint") -> float:
+        """
+        Similarity in [0, 1] between two fingerprints.
+
+        The hash catches structural changes (objects moved, added or removed)
+        and the histogram catches colour changes the hash is blind to. The
+        lower of the two scores is used so either kind of change counts.
+        """
+        hash_bits = HASH_SIZE * HASH_SIZE
+        hash_similarity = 1.0 - bin(self.dhash ^ other.dhash).count("1") / hash_bits
+        histogram_similarity = sum(
+            min(a, b) for a, b in zip(self.histogram, other.histogram)
+        ) / 3.0
+        return min(hash_similarity, histogram_similarity)
+
+
+def compute_fingerprint(image: Union[str, bytes]) -> ImageFingerprint:
+    """
+    Fingerprint an image file or encoded image bytes.
+
+    JPEG sources are decoded with draft() at roughly thumbnail size, so this
+    costs a fraction of a full decode.
+
+    Args:
+        image: Image path or encoded image bytes
+
+    Returns:
+        Image fingerprint
+    """
+    source = BytesIO(image) if isinstance(image, bytes) else image
+    with Image.open(source) as img:
+        img.draft("RGB", _THUMBNAIL_SIZE)
+        thumbnail = img.convert("RGB").resize(_THUMBNAIL_SIZE, Image.Resampling.BILINEAR)
+
+    gray = thumbnail.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR)
+    pixels = gray.tobytes()
+    dhash = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            dhash = (dhash << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+
+    # 256 bins per channel collapsed to HISTOGRAM_BINS, each channel normalized
+    raw = thumbnail.histogram()
+    step = 256 // HISTOGRAM_BINS
+    total = float(_THUMBNAIL_SIZE[0] * _THUMBNAIL_SIZE[1])
+    histogram = tuple(
+        sum(raw[channel * 256 + start:channel * 256 + start + step]) / total
+        for channel in range(3)
+        for start in range(0, 256, step)
+    )
+
+    return ImageFingerprint(dhash=dhash, histogram=histogram)
+
+
+@dataclass
+class ChangeDecision:
+    """Outcome of comparing a snapshot with its zone baseline."""
+    changed: bool
+    similarity: float
+    reason: str
+    previous_result: Any = None
+
+
+@dataclass
+class SkipRecord:
+    """A provider call that was skipped because the zone was unchanged."""
+    zone: str
+    timestamp: datetime
+    reason: str
+    similarity: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "zone": self.zone,
+            "timestamp": self.timestamp.isoformat(),
+            "reason": self.reason,
+            "similarity": round(self.similarity, 4),
+        }
+
+
+@dataclass
+class _ZoneBaseline:
+    fingerprint: ImageFingerprint
+    result: Any
+    updated_at: datetime
+    consecutive_skips: int = 0
+
+
+@dataclass
+class _ZoneCounters:
+    checks: int = 0
+    skips: int = 0
+    reasons: Dict[str, int] = field(default_factory=dict)
+
+
+class ChangeDetector:
+    """
+    Per-zone snapshot change detector.
+
+    Snapshots are compared with the one behind the last provider result, not
+    the previous snapshot, so slow drift still accumulates into a change.
+    Results are reused for at most ``max_result_age`` seconds and
+    ``max_consecutive_skips`` runs before a fresh analysis is forced.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, max_result_age: int = 3600,
+                 max_consecutive_skips: int = 12, history_size: int = 100):
+        """
+        Initialize the change detector.
+
+        Args:
+            similarity_threshold: Minimum similarity for a snapshot to count as unchanged
+            max_result_age: Seconds a cached result may be reused
+            max_consecutive_skips: Skips allowed before a fresh analysis is forced
+            history_size: Number of skip records kept
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_result_age = max_result_age
+        self.max_consecutive_skips = max_consecutive_skips
+
+        self._baselines: Dict[str, _ZoneBaseline] = {}
+        self._counters: Dict[str, _ZoneCounters] = {}
+        self.skip_history: Deque[SkipRecord] = deque(maxlen=history_size)
+
+    def check(self, zone: str, fingerprint: ImageFingerprint,
+              now: Optional[datetime] = None) -> ChangeDecision:
+        """
+        Decide whether a snapshot needs a fresh analysis.
+
+        Args:
+            zone: Zone name
+            fingerprint: Fingerprint of the new snapshot
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            Change decision; previous_result is set when the analysis can be skipped
+        """
+        now = now or datetime.now()
+        counters = self._counters.setdefault(zone, _ZoneCounters())
+        counters.checks += 1
+
+        baseline = self._baselines.get(zone)
+        if baseline is None:
+            decision = ChangeDecision(True, 0.0, "no_baseline")
+        else:
+            similarity = fingerprint.similarity(baseline.fingerprint)
+            if similarity < self.similarity_threshold:
+                decision = ChangeDecision(True, similarity, "scene_changed")
+            elif (now - baseline.updated_at).total_seconds() > self.max_result_age:
+                decision = ChangeDecision(True, similarity, "result_expired")
+            elif baseline.consecutive_skips >= self.max_consecutive_skips:
+                decision = ChangeDecision(True, similarity, "max_skips_reached")
+            else:
+                baseline.consecutive_skips += 1
+                counters.skips += 1
+                decision = ChangeDecision(False, similarity, "below_change_threshold",
+                                          baseline.result)
+                self.skip_history.append(SkipRecord(zone, now, decision.reason, similarity))
+
+        counters.reasons[decision.reason] = counters.reasons.get(decision.reason, 0) + 1
+        return decision
+
+    def update(self, zone: str, fingerprint: ImageFingerprint, result: Any,
+               now: Optional[datetime] = None):
+        """
+        Store a fresh provider result as the zone baseline.
+
+        Args:
+            zone: Zone name
+            fingerprint: Fingerprint of the analyzed snapshot
+            result: Analysis result to reuse for unchanged snapshots
+            now: Current time (defaults to datetime.now())
+        """
+        self._baselines[zone] = _ZoneBaseline(fingerprint, result, now or datetime.now())
+
+    def invalidate(self, zone: Optional[str] = None):
+        """
+        Drop cached baselines so the next snapshot is analyzed.
+
+        Args:
+            zone: Zone name, or None for all zones
+        """
+        if zone is None:
+            self._baselines.clear()
+        else:
+            self._baselines.pop(zone, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get change detection statistics.
+
+        Returns:
+            Totals, per-zone counters and recent skip records
+        """
+        checks = sum(c.checks for c in self._counters.values())
+        skips = sum(c.skips for c in self._counters.values())
+        return {
+            "similarity_threshold": self.similarity_threshold,
+            "checks": checks,
+            "skips": skips,
+            "skip_rate": skips / checks if checks else 0.0,
+            "zones": {
+                zone: {"checks": c.checks, "skips": c.skips, "reasons": dict(c.reasons)}
+                for zone, c in self._counters.items()
+            },
+            "recent_skips": [record.to_dict() for record in self.skip_history],
+        }
+
+    def get_recent_skips(self, zone: Optional[str] = None) -> List[SkipRecord]:
+        """
+        Get recorded skips, newest last.
+
+        Args:
+            zone: Restrict to one zone
+
+        Returns:
+            Skip records
+        """
+        return [r for r in self.skip_history if zone is None or r.zone == zone]
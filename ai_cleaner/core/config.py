@@ -81,10 +81,22 @@ class AiCleanerConfig(BaseModel):
     enable_scheduling: bool = Field(default=True, description="Enable scheduled analysis")
     quiet_hours_start: Optional[str] = Field(default=None, description="Quiet hours start time (HH:MM)")
     quiet_hours_end: Optional[str] = Field(default=None, description="Quiet hours end time (HH:MM)")
+    cleanliness_threshold: float = Field(default=0.6, ge=0.0, le=1.0, description="Cleanliness score below which a zone needs cleaning; analyses are scheduled ahead of the forecast crossing")
     
     # Performance settings
     max_concurrent_analysis: int = Field(default=2, ge=1, le=10, description="Maximum concurrent image analyses")
     analysis_timeout: int = Field(default=120, ge=30, le=600, description="Analysis timeout in seconds")
+    snapshot_cache_ttl: float = Field(default=5.0, ge=0.0, le=300.0, description="Seconds a camera snapshot is reused by other consumers")
+    snapshot_fetch_interval: float = Field(default=0.5, ge=0.0, le=30.0, description="Minimum seconds between snapshot fetch starts")
+    
+    # Snapshot encoding settings
+    encoding_profiles: Dict[str, List[int]] = Field(default_factory=dict, description="Per 'provider' or 'provider/model' [max_dimension, quality] overrides")
+    encoding_token_budget: Optional[int] = Field(default=None, ge=100, description="Prompt tokens per analysis above which snapshots are encoded smaller")
+    
+    # Change detection settings
+    enable_change_detection: bool = Field(default=True, description="Reuse the previous analysis when a zone snapshot is unchanged")
+    change_similarity_threshold: float = Field(default=0.95, ge=0.0, le=1.0, description="Minimum snapshot similarity to skip analysis")
+    change_max_result_age: int = Field(default=3600, ge=60, le=86400, description="Maximum age in seconds of a reused analysis")
     
     # Notification settings
     enable_notifications: bool = Field(default=True, description="Enable Home Assistant notifications")
@@ -249,17 +261,20 @@ class ConfigManager:
             'AI_CLEANER_CAMERA_ENTITY': 'camera_entity',
             'AI_CLEANER_TODO_ENTITY': 'todo_entity',
             'AI_CLEANER_PRIVACY_LEVEL': 'privacy_level',
+            'AI_CLEANER_ENABLE_CHANGE_DETECTION': 'enable_change_detection',
+            'AI_CLEANER_CHANGE_SIMILARITY_THRESHOLD': 'change_similarity_threshold',
+            'AI_CLEANER_SNAPSHOT_CACHE_TTL': 'snapshot_cache_ttl',
         }
         
         for env_var, config_key in env_mappings.items():
             value = os.getenv(env_var)
             if value is not None:
                 # Convert string values to appropriate types
-                if config_key in ['save_images', 'enable_zones', 'auto_create_tasks', 'enable_scheduling', 'enable_notifications']:
+                if config_key in ['save_images', 'enable_zones', 'auto_create_tasks', 'enable_scheduling', 'enable_notifications', 'enable_change_detection']:
                     value = value.lower() in ('true', '1', 'yes', 'on')
-                elif config_key in ['analysis_interval', 'max_concurrent_analysis', 'analysis_timeout', 'notification_threshold']:
+                elif config_key in ['analysis_interval', 'max_concurrent_analysis', 'analysis_timeout', 'notification_threshold', 'change_max_result_age']:
                     value = int(value)
-                elif config_key in ['task_priority_threshold']:
+                elif config_key in ['task_priority_threshold', 'change_similarity_threshold', 'snapshot_cache_ttl']:
                     value = float(value)
                 
                 env_config[config_key] = value
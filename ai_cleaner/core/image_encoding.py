@@ -0,0 +1,232 @@
+"""
+Adaptive snapshot encoding for AI Cleaner addon.
+Chooses the resolution and JPEG quality sent to each provider and model.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .camera_manager import preprocess_image
+from .providers.base import BaseAIProvider, ImageAnalysis
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, order=True)
+class EncodingProfile:
+    """Target longest side and JPEG quality for an encoded snapshot."""
+    max_dimension: int
+    quality: int
+
+    def __str__(self) -> str:
+        return f"{self.max_dimension}px@q{self.quality}"
+
+
+# Candidate settings, cheapest first
+ENCODING_LADDER: Tuple[EncodingProfile, ...] = (
+    EncodingProfile(384, 70),
+    EncodingProfile(512, 75),
+    EncodingProfile(768, 80),
+    EncodingProfile(1024, 85),
+    EncodingProfile(1536, 90),
+)
+
+# Keyed by "provider/model", then "provider", then "default"
+DEFAULT_ENCODING_PROFILES: Dict[str, EncodingProfile] = {
+    'default': EncodingProfile(1024, 85),
+    'gemini': EncodingProfile(768, 80),
+    'ollama': EncodingProfile(672, 85),
+}
+
+
+def parse_profiles(raw: Dict[str, Sequence[int]]) -> Dict[str, EncodingProfile]:
+    """Convert config entries of the form ``{"gemini/model": [768, 80]}``."""
+    return {key: EncodingProfile(int(value[0]), int(value[1])) for key, value in raw.items()}
+
+
+class AdaptiveEncoder:
+    """
+    Picks the encoding profile for each provider and model.
+
+    The starting point comes from the profile table. When a token budget is
+    set and the observed prompt tokens at the active profile exceed it, the
+    encoder steps down one rung of the ladder. If a smaller rung does not
+    reduce tokens (the provider bills a fixed cost per image), it returns to
+    the larger rung and stops stepping down for that model, since smaller
+    frames would only cost accuracy.
+    """
+
+    def __init__(self, profiles: Optional[Dict[str, EncodingProfile]] = None,
+                 token_budget: Optional[int] = None,
+                 ladder: Iterable[EncodingProfile] = ENCODING_LADDER,
+                 smoothing: float = 0.3):
+        self.profiles = dict(DEFAULT_ENCODING_PROFILES)
+        self.profiles.update(profiles or {})
+        self.token_budget = token_budget
+        self.ladder: List[EncodingProfile] = sorted(ladder)
+        self.smoothing = smoothing
+        self._tokens: Dict[Tuple[str, str, EncodingProfile], float] = {}
+        self._active: Dict[Tuple[str, str], EncodingProfile] = {}
+        self._fixed_cost: set = set()
+
+    def configured_profile(self, provider: str, model: Optional[str]) -> EncodingProfile:
+        """Profile from the table, before any token-based adjustment."""
+        for key in (f"{provider}/{model}", provider, 'default'):
+            if key in self.profiles:
+                return self.profiles[key]
+        return DEFAULT_ENCODING_PROFILES['default']
+
+    def profile_for(self, provider: str, model: Optional[str]) -> EncodingProfile:
+        """Profile to use for the next snapshot sent to a provider and model."""
+        return self._active.get((provider, model or '')) or self.configured_profile(provider, model)
+
+    def record_usage(self, provider: str, model: Optional[str], profile: EncodingProfile,
+                     prompt_tokens: Optional[int]):
+        """
+        Record the prompt tokens billed for a snapshot encoded with a profile.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            profile: Profile the snapshot was encoded with
+            prompt_tokens: Prompt tokens reported by the provider, if any
+        """
+        if prompt_tokens is None:
+            return
+
+        model = model or ''
+        key = (provider, model, profile)
+        previous = self._tokens.get(key)
+        observed = prompt_tokens if previous is None else previous + self.smoothing * (prompt_tokens - previous)
+        self._tokens[key] = observed
+
+        if self.token_budget is None or profile != self.profile_for(provider, model):
+            return
+
+        higher = self._next_rung(profile, up=True)
+        higher_tokens = self._tokens.get((provider, model, higher)) if higher else None
+        if higher_tokens is not None and observed >= 0.95 * higher_tokens:
+            self._active[(provider, model)] = higher
+            self._fixed_cost.add((provider, model))
+            logger.info(f"Smaller snapshots do not reduce tokens for {provider}/{model}, keeping {higher}")
+            return
+
+        if observed > self.token_budget and (provider, model) not in self._fixed_cost:
+            lower = self._next_rung(profile, up=False)
+            if lower is not None:
+                self._active[(provider, model)] = lower
+                logger.info(f"Prompt tokens {observed:.0f} over budget {self.token_budget} for "
+                            f"{provider}/{model}, encoding at {lower}")
+
+    def set_profile(self, provider: str, model: Optional[str], profile: EncodingProfile):
+        """Pin a profile, e.g. the cheapest acceptable one from a benchmark run."""
+        self.profiles[f"{provider}/{model}" if model else provider] = profile
+        self._active.pop((provider, model or ''), None)
+        self._fixed_cost.discard((provider, model or ''))
+
+    def _next_rung(self, profile: EncodingProfile, up: bool) -> Optional[EncodingProfile]:
+        if up:
+            candidates = [p for p in self.ladder if p.max_dimension > profile.max_dimension]
+            return candidates[0] if candidates else None
+        candidates = [p for p in self.ladder if p.max_dimension < profile.max_dimension]
+        return candidates[-1] if candidates else None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get active profiles and observed token usage."""
+        return {
+            'token_budget': self.token_budget,
+            'active_profiles': {
+                f"{provider}/{model}": str(profile) for (provider, model), profile in self._active.items()
+            },
+            'observed_prompt_tokens': {
+                f"{provider}/{model}@{profile}": round(tokens, 1)
+                for (provider, model, profile), tokens in self._tokens.items()
+            },
+            'fixed_cost_models': sorted(f"{provider}/{model}" for provider, model in self._fixed_cost),
+        }
+
+
+def analysis_agreement(reference: ImageAnalysis, candidate: ImageAnalysis) -> float:
+    """
+    Agreement in [0, 1] between two analyses of the same scene.
+
+    Averages the cleanliness score agreement and the overlap (Jaccard) of the
+    suggested task categories.
+    """
+    score_agreement = 1.0 - min(1.0, abs(reference.overall_cleanliness_score - candidate.overall_cleanliness_score))
+    reference_categories = {task.category for task in reference.suggested_tasks}
+    candidate_categories = {task.category for task in candidate.suggested_tasks}
+    union = reference_categories | candidate_categories
+    category_agreement = len(reference_categories & candidate_categories) / len(union) if union else 1.0
+    return (score_agreement + category_agreement) / 2
+
+
+@dataclass
+class EncodingBenchmarkResult:
+    """Aggregate benchmark figures for one encoding profile."""
+    profile: EncodingProfile
+    mean_bytes: float
+    mean_seconds: float
+    mean_prompt_tokens: Optional[float]
+    agreement: float
+
+
+async def benchmark_encodings(provider: BaseAIProvider, images: List[bytes],
+                              profiles: Iterable[EncodingProfile] = ENCODING_LADDER,
+                              reference_profile: Optional[EncodingProfile] = None) -> List[EncodingBenchmarkResult]:
+    """
+    Analyze each image at several encodings and compare with a reference.
+
+    The reference analysis uses ``reference_profile``, or the original image
+    when none is given.
+
+    Args:
+        provider: Initialized AI provider
+        images: Encoded snapshots
+        profiles: Profiles to evaluate
+        reference_profile: Profile for the reference analysis
+
+    Returns:
+        One result per profile, cheapest first
+    """
+    def encode(data: bytes, profile: Optional[EncodingProfile]) -> bytes:
+        if profile is None:
+            return data
+        return preprocess_image(data, profile.max_dimension, profile.max_dimension, profile.quality).data
+
+    references = [await provider.analyze_image(encode(image, reference_profile)) for image in images]
+
+    results = []
+    for profile in sorted(profiles):
+        sizes, durations, tokens, agreements = [], [], [], []
+        for image, reference in zip(images, references):
+            encoded = encode(image, profile)
+            start = time.perf_counter()
+            analysis = await provider.analyze_image(encoded)
+            durations.append(time.perf_counter() - start)
+            sizes.append(len(encoded))
+            if analysis.prompt_tokens is not None:
+                tokens.append(analysis.prompt_tokens)
+            agreements.append(analysis_agreement(reference, analysis))
+
+        results.append(EncodingBenchmarkResult(
+            profile=profile,
+            mean_bytes=sum(sizes) / len(sizes),
+            mean_seconds=sum(durations) / len(durations),
+            mean_prompt_tokens=sum(tokens) / len(tokens) if tokens else None,
+            agreement=sum(agreements) / len(agreements),
+        ))
+        logger.info(f"Benchmarked {profile}: agreement {results[-1].agreement:.3f}")
+
+    return results
+
+
+def cheapest_acceptable(results: List[EncodingBenchmarkResult], min_agreement: float) -> Optional[EncodingProfile]:
+    """Smallest profile whose agreement with the reference is at least ``min_agreement``."""
+    for result in sorted(results, key=lambda r: r.profile):
+        if result.agreement >= min_agreement:
+            return result.profile
+    return None
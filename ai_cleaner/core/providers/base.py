@@ -5,7 +5,7 @@ Defines the interface for vision analysis and cleaning plan generation.
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -90,6 +90,7 @@ class ImageAnalysis:
     suggested_tasks: List[CleaningTask]
     analysis_timestamp: Optional[datetime] = None
     processing_time_seconds: Optional[float] = None
+    prompt_tokens: Optional[int] = None  # As reported by the provider, including the image
     
     def __post_init__(self):
         """Set default values after initialization."""
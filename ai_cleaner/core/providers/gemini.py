@@ -181,10 +181,11 @@ class GeminiProvider(BaseAIProvider):
             ]
             
             # Generate response
-            response_text = await self._generate_response_with_image(contents)
+            response_text, prompt_tokens = await self._generate_response_with_image(contents)
             
             # Parse response
             analysis = self._parse_analysis_response(response_text, zone_id)
+            analysis.prompt_tokens = prompt_tokens
             
             # Set processing time
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -252,8 +253,8 @@ Guidelines:
         
         return base_prompt
     
-    async def _generate_response_with_image(self, contents: List[Dict]) -> str:
-        """Generate response from Gemini with image input."""
+    async def _generate_response_with_image(self, contents: List[Dict]) -> Tuple[str, Optional[int]]:
+        """Generate response from Gemini with image input, with the prompt token count if reported."""
         for attempt in range(self.max_retries):
             try:
                 response = await asyncio.wait_for(
@@ -266,7 +267,8 @@ Guidelines:
                 )
                 
                 if response.text:
-                    return response.text.strip()
+                    usage = getattr(response, 'usage_metadata', None)
+                    return response.text.strip(), getattr(usage, 'prompt_token_count', None)
                 else:
                     raise AIProviderAnalysisError("Empty response from Gemini")
             
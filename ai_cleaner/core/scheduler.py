@@ -4,14 +4,18 @@ Manages timed analysis, quiet hours, and adaptive scheduling.
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any, Set
+from typing import Deque, Dict, List, Optional, Callable, Any, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import crontab
 
 from .config import get_config, AiCleanerConfig, ZoneConfig
+from .change_detection import ChangeDetector
 
 
 logger = logging.getLogger(__name__)
@@ -99,19 +103,173 @@ class ScheduledTask:
         return self.current_retries < self.max_retries
 
 
+class CleanlinessForecaster:
+    """
+    Forecasts when a zone's cleanliness score falls below a threshold.
+    
+    The score drop per hour is modelled as a base rate plus an hour of day and
+    a day of week effect. Each pair of consecutive analyses without a cleaning
+    in between is one observation: the score drop equals the rate summed over
+    the hours between them. The model is fitted by ridge regression on decayed
+    sufficient statistics, so it follows changing habits without keeping history.
+    
+    A cleaning between two sparse analyses shows up as a score well above
+    the prediction; such pairs are skipped unless they keep recurring,
+    which means the zone really got slower to soil.
+    """
+    
+    NUM_FEATURES = 1 + 24 + 7  # base rate, hour of day, day of week
+    
+    def __init__(self, ridge: float = 0.1, half_life_hours: float = 336.0, reset_margin: float = 0.05,
+                 min_samples: int = 6, max_gap_hours: float = 24.0):
+        self.ridge = ridge
+        self.half_life_hours = half_life_hours  # Older observations fade out over weeks
+        self.reset_margin = reset_margin  # Larger score increases are cleanings
+        self.min_samples = min_samples
+        self.max_gap_hours = max_gap_hours
+        
+        n = self.NUM_FEATURES
+        self._xtx = [[0.0] * n for _ in range(n)]
+        self._xty = [0.0] * n
+        self._weights: Optional[List[float]] = None
+        self.samples = 0
+        self.hidden_cleanings = 0
+        self._consecutive_hidden = 0
+        self.last_observation: Optional[Tuple[datetime, float]] = None
+    
+    def observe(self, timestamp: datetime, score: float):
+        """Add an analysis result."""
+        if self.last_observation:
+            previous_time, previous_score = self.last_observation
+            hours = (timestamp - previous_time).total_seconds() / 3600
+            if 0 < hours <= self.max_gap_hours and score - previous_score <= self.reset_margin:
+                x = self._exposure(previous_time, timestamp)
+                drop = previous_score - score
+                if self._is_hidden_cleaning(x, drop):
+                    self.hidden_cleanings += 1
+                    self._consecutive_hidden += 1
+                else:
+                    self._consecutive_hidden = 0
+                    self._add_sample(x, drop, 0.5 ** (hours / self.half_life_hours))
+        self.last_observation = (timestamp, score)
+    
+    def _is_hidden_cleaning(self, x: List[float], drop: float) -> bool:
+        """Whether the score dropped so much less than predicted that a cleaning likely happened."""
+        if self.samples < self.min_samples or self._consecutive_hidden >= 2:
+            return False
+        if self._weights is None:
+            self._weights = self._solve()
+        predicted = max(0.0, sum(w * xi for w, xi in zip(self._weights, x)))
+        return predicted - drop > self.reset_margin + 0.5 * predicted
+    
+    @classmethod
+    def _exposure(cls, start: datetime, end: datetime) -> List[float]:
+        """Hours spent in each hour of day and day of week between start and end."""
+        x = [0.0] * cls.NUM_FEATURES
+        t = start
+        while t < end:
+            step_end = min(t.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1), end)
+            hours = (step_end - t).total_seconds() / 3600
+            x[0] += hours
+            x[1 + t.hour] += hours
+            x[25 + t.weekday()] += hours
+            t = step_end
+        return x
+    
+    def _add_sample(self, x: List[float], drop: float, decay: float):
+        """Fold one observation into the decayed normal equations."""
+        n = self.NUM_FEATURES
+        for i in range(n):
+            row = self._xtx[i]
+            xi = x[i]
+            for j in range(n):
+                row[j] = row[j] * decay + xi * x[j]
+            self._xty[i] = self._xty[i] * decay + xi * drop
+        self.samples += 1
+        self._weights = None
+    
+    def _solve(self) -> List[float]:
+        """Ridge solution; time of day and day of week effects shrink towards zero."""
+        n = self.NUM_FEATURES
+        a = [row[:] + [self._xty[i]] for i, row in enumerate(self._xtx)]
+        for i in range(n):
+            a[i][i] += self.ridge if i else 1e-9
+        
+        # Gaussian elimination with partial pivoting
+        for col in range(n):
+            pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+            a[col], a[pivot] = a[pivot], a[col]
+            if abs(a[col][col]) < 1e-12:
+                continue
+            for r in range(col + 1, n):
+                factor = a[r][col] / a[col][col]
+                if factor:
+                    for c in range(col, n + 1):
+                        a[r][c] -= factor * a[col][c]
+        
+        weights = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            if abs(a[i][i]) < 1e-12:
+                continue
+            weights[i] = (a[i][n] - sum(a[i][j] * weights[j] for j in range(i + 1, n))) / a[i][i]
+        return weights
+    
+    def rate_at(self, t: datetime) -> float:
+        """Predicted score drop per hour at a given time."""
+        if self._weights is None:
+            self._weights = self._solve()
+        w = self._weights
+        return max(0.0, w[0] + w[1 + t.hour] + w[25 + t.weekday()])
+    
+    def forecast_crossing(self, threshold: float, max_hours: float = 48.0) -> Optional[datetime]:
+        """
+        Time at which the score is expected to reach the threshold.
+        
+        Returns None until enough observations exist. A crossing beyond
+        max_hours is reported as the end of the horizon.
+        """
+        if self.samples < self.min_samples or not self.last_observation:
+            return None
+        
+        t, score = self.last_observation
+        if score <= threshold:
+            return t
+        
+        horizon = t + timedelta(hours=max_hours)
+        while t < horizon:
+            step_end = min(t.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1), horizon)
+            hours = (step_end - t).total_seconds() / 3600
+            rate = self.rate_at(t)
+            if rate > 0 and score - rate * hours <= threshold:
+                return t + timedelta(hours=(score - threshold) / rate)
+            score -= rate * hours
+            t = step_end
+        return horizon
+
+
 class AdaptiveScheduler:
     """
     Adaptive scheduler that learns from analysis results and adjusts timing.
+    
+    Once a zone has enough history, its next analysis is placed shortly
+    before the forecast time its cleanliness drops below the threshold;
+    until then the frequency multiplier below is used.
     """
     
-    def __init__(self):
+    def __init__(self, cleanliness_threshold: float = 0.6):
         self.zone_scores: Dict[str, List[float]] = {}  # Historical cleanliness scores
         self.zone_frequency: Dict[str, float] = {}  # Analysis frequency multiplier
         self.learning_rate = 0.1
         self.min_frequency_multiplier = 0.5
         self.max_frequency_multiplier = 3.0
+        
+        # Threshold crossing forecasts
+        self.cleanliness_threshold = cleanliness_threshold
+        self.forecast_lead_fraction = 0.1  # Analyze this share of the time early
+        self.forecasters: Dict[str, CleanlinessForecaster] = {}
     
-    def record_analysis_result(self, zone_id: str, cleanliness_score: float):
+    def record_analysis_result(self, zone_id: str, cleanliness_score: float,
+                               timestamp: Optional[datetime] = None):
         """Record analysis result for adaptive learning."""
         if zone_id not in self.zone_scores:
             self.zone_scores[zone_id] = []
@@ -124,6 +282,11 @@ class AdaptiveScheduler:
         
         # Adapt frequency based on cleanliness trend
         self._adapt_zone_frequency(zone_id)
+        
+        # Learn how quickly the zone gets messy
+        if zone_id not in self.forecasters:
+            self.forecasters[zone_id] = CleanlinessForecaster()
+        self.forecasters[zone_id].observe(timestamp or datetime.now(), cleanliness_score)
     
     def _adapt_zone_frequency(self, zone_id: str):
         """Adapt analysis frequency based on cleanliness trends."""
@@ -168,6 +331,38 @@ class AdaptiveScheduler:
         """Get frequency multiplier for a zone."""
         return self.zone_frequency.get(zone_id, 1.0)
     
+    def forecast_threshold_crossing(self, zone_id: str) -> Optional[datetime]:
+        """Forecast time the zone's cleanliness drops below the threshold."""
+        forecaster = self.forecasters.get(zone_id)
+        if not forecaster:
+            return None
+        return forecaster.forecast_crossing(self.cleanliness_threshold)
+    
+    def get_forecast_interval(self, zone_id: str, regular_interval: float,
+                              now: Optional[datetime] = None) -> Optional[float]:
+        """
+        Seconds from now until the next analysis should run, based on the forecast.
+        
+        The analysis runs a little ahead of the forecast crossing. A crossing
+        sooner than the regular interval is analyzed at the crossing itself,
+        so analyses do not bunch up as it approaches.
+        
+        Returns None when there is no forecast yet or the zone is already
+        below the threshold, in which case the regular interval applies.
+        """
+        crossing = self.forecast_threshold_crossing(zone_id)
+        if crossing is None:
+            return None
+        
+        last_analysis = self.forecasters[zone_id].last_observation[0]
+        if crossing <= last_analysis:
+            return None
+        
+        run_at = crossing
+        if (crossing - last_analysis).total_seconds() > regular_interval:
+            run_at -= (crossing - last_analysis) * self.forecast_lead_fraction
+        return (run_at - (now or datetime.now())).total_seconds()
+    
     def get_zone_priority(self, zone_id: str) -> SchedulePriority:
         """Get recommended priority for a zone based on history."""
         if zone_id not in self.zone_scores:
@@ -196,11 +391,28 @@ class ZoneScheduler:
         self.logger = logging.getLogger(__name__)
         
         self.tasks: Dict[str, ScheduledTask] = {}
-        self.adaptive_scheduler = AdaptiveScheduler()
+        self.adaptive_scheduler = AdaptiveScheduler(self.config.cleanliness_threshold)
         self.running_tasks: Set[str] = set()
         self._scheduler_task: Optional[asyncio.Task] = None
         self._running = False
         self._callbacks: Dict[ScheduleType, Callable] = {}
+        
+        # Due times as (next_run, sequence, task_id); entries whose next_run
+        # no longer matches the task are stale and skipped when popped
+        self._due_heap: List[Tuple[datetime, int, str]] = []
+        self._heap_sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        
+        # Regular interval and recently used intervals per zone, for the API call report
+        self.zone_intervals: Dict[str, Dict[str, Any]] = {}
+        
+        # Lets zone analysis runs reuse results for unchanged snapshots
+        self.change_detector: Optional[ChangeDetector] = None
+        if self.config.enable_change_detection:
+            self.change_detector = ChangeDetector(
+                similarity_threshold=self.config.change_similarity_threshold,
+                max_result_age=self.config.change_max_result_age
+            )
     
     def register_callback(self, task_type: ScheduleType, callback: Callable):
         """Register callback for a task type."""
@@ -220,6 +432,7 @@ class ZoneScheduler:
             
             # Add to tasks
             self.tasks[task.id] = task
+            self._schedule(task)
             
             self.logger.info(f"Added scheduled task: {task.name} (ID: {task.id})")
             return True
@@ -255,6 +468,7 @@ class ZoneScheduler:
         """Enable a scheduled task."""
         if task_id in self.tasks:
             self.tasks[task_id].enabled = True
+            self._schedule(self.tasks[task_id])
             return True
         return False
     
@@ -295,6 +509,7 @@ class ZoneScheduler:
         if ScheduleType.HEALTH_CHECK in self._callbacks:
             health_check_task.callback = self._callbacks[ScheduleType.HEALTH_CHECK]
             self.tasks[health_check_task.id] = health_check_task
+            self._schedule(health_check_task)
         
         # Cleanup task (runs daily)
         cleanup_task = ScheduledTask(
@@ -310,28 +525,14 @@ class ZoneScheduler:
         if ScheduleType.CLEANUP in self._callbacks:
             cleanup_task.callback = self._callbacks[ScheduleType.CLEANUP]
             self.tasks[cleanup_task.id] = cleanup_task
+            self._schedule(cleanup_task)
         
         self.logger.info(f"Setup {len(self.tasks)} default scheduled tasks")
     
     def _create_zone_analysis_task(self, zone: ZoneConfig):
         """Create analysis task for a zone."""
         task_id = f"zone_analysis_{zone.id}"
-        
-        # Calculate interval based on zone priority and adaptive frequency
-        base_interval = self.config.analysis_interval
-        priority_multiplier = {
-            1: 2.0,    # Low priority = less frequent
-            2: 1.5,
-            3: 1.0,    # Normal priority = base frequency
-            4: 0.75,
-            5: 0.5     # High priority = more frequent
-        }.get(zone.priority, 1.0)
-        
-        adaptive_multiplier = self.adaptive_scheduler.get_zone_frequency_multiplier(zone.id)
-        
-        # Final interval (lower = more frequent)
-        interval = int(base_interval * priority_multiplier / adaptive_multiplier)
-        interval = max(60, min(86400, interval))  # Clamp between 1 minute and 1 day
+        interval = self._calculate_zone_interval(zone)
         
         # Determine priority
         adaptive_priority = self.adaptive_scheduler.get_zone_priority(zone.id)
@@ -351,6 +552,69 @@ class ZoneScheduler:
         if ScheduleType.ZONE_ANALYSIS in self._callbacks:
             task.callback = self._callbacks[ScheduleType.ZONE_ANALYSIS]
             self.tasks[task_id] = task
+            self._schedule(task)
+    
+    def _calculate_zone_interval(self, zone: ZoneConfig) -> int:
+        """Analysis interval for a zone: forecast when available, else priority and adaptive frequency."""
+        base_interval = self.config.analysis_interval
+        priority_multiplier = {
+            1: 2.0,    # Low priority = less frequent
+            2: 1.5,
+            3: 1.0,    # Normal priority = base frequency
+            4: 0.75,
+            5: 0.5     # High priority = more frequent
+        }.get(zone.priority, 1.0)
+        
+        adaptive_multiplier = self.adaptive_scheduler.get_zone_frequency_multiplier(zone.id)
+        
+        # Regular interval (lower = more frequent)
+        regular = int(base_interval * priority_multiplier / adaptive_multiplier)
+        regular = max(60, min(86400, regular))  # Clamp between 1 minute and 1 day
+        
+        # Analyze shortly before the zone is expected to need cleaning
+        forecast = self.adaptive_scheduler.get_forecast_interval(zone.id, regular)
+        interval = max(60, min(86400, int(forecast))) if forecast is not None else regular
+        
+        intervals = self.zone_intervals.setdefault(zone.id, {'regular': regular, 'recent': deque(maxlen=48)})
+        intervals['regular'] = regular
+        intervals['recent'].append(interval)
+        return interval
+    
+    def get_api_call_savings(self) -> Dict[str, Any]:
+        """Expected analyses per day with forecasts compared to regular intervals."""
+        zones = {}
+        for zone_id, intervals in self.zone_intervals.items():
+            crossing = self.adaptive_scheduler.forecast_threshold_crossing(zone_id)
+            recent: Deque[int] = intervals['recent']
+            regular_calls = 86400 / intervals['regular']
+            expected_calls = 86400 * len(recent) / sum(recent)
+            zones[zone_id] = {
+                'regular_calls_per_day': round(regular_calls, 1),
+                'expected_calls_per_day': round(expected_calls, 1),
+                'forecast_crossing': crossing.isoformat() if crossing else None
+            }
+        
+        return {
+            'cleanliness_threshold': self.adaptive_scheduler.cleanliness_threshold,
+            'zones': zones,
+            'api_calls_saved_per_day': round(sum(
+                zone['regular_calls_per_day'] - zone['expected_calls_per_day'] for zone in zones.values()
+            ), 1)
+        }
+    
+    def _schedule(self, task: ScheduledTask):
+        """Queue a task's next run and wake the loop so it can sleep until the earliest one."""
+        if task.enabled and task.next_run:
+            heapq.heappush(self._due_heap, (task.next_run, next(self._heap_sequence), task.id))
+            self._wakeup.set()
+    
+    def _quiet_hours_end(self, now: datetime) -> datetime:
+        """First time after now that is outside quiet hours."""
+        end = datetime.strptime(self.config.quiet_hours_end, '%H:%M').time()
+        end_at = datetime.combine(now.date(), end) + timedelta(minutes=1)
+        if end_at <= now:
+            end_at += timedelta(days=1)
+        return end_at
     
     def is_quiet_hours(self) -> bool:
         """Check if currently in quiet hours."""
@@ -391,13 +655,29 @@ class ZoneScheduler:
     
     async def _scheduler_loop(self):
         """Main scheduler loop."""
+        # Tasks may have been added before their entries could be queued
+        for task in self.tasks.values():
+            self._schedule(task)
+        
         while self._running:
             try:
-                # Get due tasks
-                due_tasks = [task for task in self.tasks.values() if task.is_due()]
+                # Pop due tasks, skipping stale entries
+                now = datetime.now()
+                due: Dict[str, ScheduledTask] = {}
+                while self._due_heap and self._due_heap[0][0] <= now:
+                    run_at, _, task_id = heapq.heappop(self._due_heap)
+                    task = self.tasks.get(task_id)
+                    if task and task.enabled and task.next_run == run_at and task_id not in self.running_tasks:
+                        due[task_id] = task
+                due_tasks = list(due.values())
                 
-                # Filter out tasks in quiet hours (unless critical)
+                # Defer tasks in quiet hours (unless critical) until quiet hours end
                 if self.is_quiet_hours():
+                    quiet_end = self._quiet_hours_end(now)
+                    for task in due_tasks:
+                        if task.priority != SchedulePriority.CRITICAL:
+                            task.next_run = quiet_end
+                            self._schedule(task)
                     due_tasks = [
                         task for task in due_tasks 
                         if task.priority == SchedulePriority.CRITICAL
@@ -414,8 +694,15 @@ class ZoneScheduler:
                     if task.id not in self.running_tasks:
                         asyncio.create_task(self._execute_task(task))
                 
-                # Sleep before next check
-                await asyncio.sleep(10)  # Check every 10 seconds
+                # Sleep until the earliest due time or until a task is (re)scheduled
+                self._wakeup.clear()
+                timeout = None
+                if self._due_heap:
+                    timeout = max(0.0, (self._due_heap[0][0] - datetime.now()).total_seconds())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
             
             except asyncio.CancelledError:
                 break
@@ -468,6 +755,7 @@ class ZoneScheduler:
         
         finally:
             self.running_tasks.discard(task.id)
+            self._schedule(task)
     
     def record_analysis_result(self, zone_id: str, cleanliness_score: float):
         """Record analysis result for adaptive scheduling."""
@@ -494,20 +782,13 @@ class ZoneScheduler:
             return
         
         # Calculate new interval
-        base_interval = self.config.analysis_interval
-        priority_multiplier = {
-            1: 2.0, 2: 1.5, 3: 1.0, 4: 0.75, 5: 0.5
-        }.get(zone.priority, 1.0)
-        
-        adaptive_multiplier = self.adaptive_scheduler.get_zone_frequency_multiplier(zone.id)
-        
-        new_interval = int(base_interval * priority_multiplier / adaptive_multiplier)
-        new_interval = max(60, min(86400, new_interval))
+        new_interval = self._calculate_zone_interval(zone)
         
         # Update task
         if new_interval != task.interval_seconds:
             task.interval_seconds = new_interval
             task.calculate_next_run()
+            self._schedule(task)
             
             self.logger.info(f"Updated {zone.name} analysis interval to {new_interval}s")
     
@@ -527,6 +808,8 @@ class ZoneScheduler:
                 default=None
             ),
             'zone_frequencies': dict(self.adaptive_scheduler.zone_frequency),
+            'predictive_scheduling': self.get_api_call_savings(),
+            'change_detection': self.change_detector.get_stats() if self.change_detector else None,
             'tasks': [
                 {
                     'id': task.id,
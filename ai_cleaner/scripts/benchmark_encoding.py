@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Snapshot Encoding Benchmark
+
+Analyzes sample snapshots at each rung of the encoding ladder and reports
+payload size, latency, prompt tokens and agreement with a reference
+analysis of the original image, then recommends the cheapest profile that
+meets the agreement threshold.
+
+Usage:
+    AI_CLEANER_GEMINI_API_KEY=... python scripts/benchmark_encoding.py snapshot1.jpg snapshot2.jpg
+    python scripts/benchmark_encoding.py --sizes-only snapshot1.jpg
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.camera_manager import preprocess_image
+from core.image_encoding import ENCODING_LADDER, benchmark_encodings, cheapest_acceptable
+from core.providers.gemini import GeminiProvider
+
+
+def print_sizes(images):
+    """Report encoded sizes without calling a provider."""
+    print(f"{'profile':<14} {'mean bytes':>12} {'ratio':>8}")
+    original = sum(len(image) for image in images) / len(images)
+    for profile in ENCODING_LADDER:
+        sizes = [len(preprocess_image(image, profile.max_dimension, profile.max_dimension, profile.quality).data)
+                 for image in images]
+        mean = sum(sizes) / len(sizes)
+        print(f"{str(profile):<14} {mean:>12.0f} {mean / original:>8.2%}")
+
+
+async def run(images, model: str, min_agreement: float, output: str):
+    provider = GeminiProvider({'api_key': os.environ.get('AI_CLEANER_GEMINI_API_KEY'), 'model': model})
+    if not await provider.initialize():
+        print(f"Provider initialization failed: {provider.last_error}")
+        return 1
+
+    results = await benchmark_encodings(provider, images)
+
+    print(f"{'profile':<14} {'bytes':>10} {'seconds':>8} {'tokens':>8} {'agreement':>10}")
+    for result in results:
+        tokens = f"{result.mean_prompt_tokens:.0f}" if result.mean_prompt_tokens is not None else '-'
+        print(f"{str(result.profile):<14} {result.mean_bytes:>10.0f} {result.mean_seconds:>8.2f} "
+              f"{tokens:>8} {result.agreement:>10.3f}")
+
+    best = cheapest_acceptable(results, min_agreement)
+    if best:
+        print(f"\nCheapest profile with agreement >= {min_agreement}: {best}")
+        print(f'encoding_profiles: {{"{provider.name}/{model}": [{best.max_dimension}, {best.quality}]}}')
+    else:
+        print(f"\nNo profile reached agreement {min_agreement}")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump([
+                {
+                    'max_dimension': r.profile.max_dimension,
+                    'quality': r.profile.quality,
+                    'mean_bytes': r.mean_bytes,
+                    'mean_seconds': r.mean_seconds,
+                    'mean_prompt_tokens': r.mean_prompt_tokens,
+                    'agreement': r.agreement,
+                }
+                for r in results
+            ], f, indent=2)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark snapshot encodings against a reference analysis')
+    parser.add_argument('images', nargs='+', help='Sample snapshots')
+    parser.add_argument('--model', default='gemini-1.5-pro-vision-latest', help='Gemini model name')
+    parser.add_argument('--min-agreement', type=float, default=0.9, help='Required agreement with the reference')
+    parser.add_argument('--output', help='Write results as JSON')
+    parser.add_argument('--sizes-only', action='store_true', help='Only report encoded sizes')
+    args = parser.parse_args()
+
+    images = [Path(path).read_bytes() for path in args.images]
+    if args.sizes_only:
+        print_sizes(images)
+        return 0
+    return asyncio.run(run(images, args.model, args.min_agreement, args.output))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Snapshot Preprocessing Benchmark
+
+Compares the legacy on-loop resize (full decode, LANCZOS, optimized JPEG
+re-encode) with preprocess_image (draft decode, reducing_gap resize) for
+synthetic 1080p and 4K JPEG snapshots, and measures event-loop stall while
+a batch of snapshots is preprocessed concurrently through ImagePreprocessor.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from io import BytesIO
+from typing import Dict, List
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from core.camera_manager import ImagePreprocessor, preprocess_image
+
+
+RESOLUTIONS = {
+    '1080p': (1920, 1080),
+    '4k': (3840, 2160),
+}
+
+
+def make_snapshot(width: int, height: int) -> bytes:
+    """Build a JPEG with enough detail to resemble a camera frame."""
+    img = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    draw = ImageDraw.Draw(img)
+    for i in range(0, width, 40):
+        draw.line([(i, 0), (width - i, height)], fill=(i % 255, 80, 160), width=3)
+    output = BytesIO()
+    img.save(output, format='JPEG', quality=90)
+    return output.getvalue()
+
+
+def legacy_resize(data: bytes, max_width: int = 1024, max_height: int = 1024, quality: int = 85) -> bytes:
+    """The resize path used before preprocessing moved off the loop."""
+    with Image.open(BytesIO(data)) as img:
+        width, height = img.size
+        ratio = min(max_width / width, max_height / height)
+        resized = img.resize((int(width * ratio), int(height * ratio)), Image.Resampling.LANCZOS)
+        output = BytesIO()
+        resized.save(output, format='JPEG', quality=quality, optimize=True)
+        return output.getvalue()
+
+
+def _best_ms(func, data: bytes, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+async def _loop_stall(preprocessor: ImagePreprocessor, snapshots: List[bytes]) -> Dict[str, float]:
+    """Preprocess snapshots concurrently and record the worst loop tick delay."""
+    max_lag = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal max_lag
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.001)
+
+    tick_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(preprocessor.process(data) for data in snapshots))
+    elapsed = time.perf_counter() - start
+    running = False
+    await tick_task
+    return {'batch_ms': round(elapsed * 1000, 1), 'max_loop_lag_ms': round(max_lag * 1000, 1)}
+
+
+def run_benchmark(batch_size: int = 8, repeat: int = 5, workers: int = 2) -> Dict[str, Dict]:
+    """Run the per-image and concurrent batch benchmarks."""
+    results: Dict[str, Dict] = {}
+
+    for name, (width, height) in RESOLUTIONS.items():
+        data = make_snapshot(width, height)
+        result = preprocess_image(data)
+        entry = {
+            'input_bytes': len(data),
+            'output_size': [result.width, result.height],
+            'output_bytes': len(result.data),
+            'legacy_ms': round(_best_ms(legacy_resize, data, repeat), 2),
+            'preprocess_ms': round(_best_ms(preprocess_image, data, repeat), 2),
+        }
+
+        snapshots = [data] * batch_size
+        inline = ImagePreprocessor(max_workers=0)
+        pooled = ImagePreprocessor(max_workers=workers)
+        try:
+            # Warm the pool so process start-up is not measured
+            asyncio.run(_loop_stall(pooled, snapshots[:workers]))
+            entry['thread_batch'] = asyncio.run(_loop_stall(inline, snapshots))
+            entry['process_batch'] = asyncio.run(_loop_stall(pooled, snapshots))
+        finally:
+            pooled.close()
+
+        results[name] = entry
+
+    return results
+
+
+def main():
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    print(json.dumps(run_benchmark(batch_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()
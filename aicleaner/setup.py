@@ -76,6 +76,7 @@ setup(
             "requests>=2.31.0,<3.0.0",
             "tenacity>=8.2.0,<9.0.0", 
             "cryptography>=41.0.0,<42.0.0",
+            "watchdog>=3.0.0,<7.0.0",
         ],
     },
     entry_points={
@@ -131,6 +131,7 @@ class ConfigurationLoader:
             'AICLEANER_OLLAMA_MODEL': ['ollama', 'model'],
             'AICLEANER_PRIVACY_LEVEL': ['processing', 'privacy_level'],
             'AICLEANER_BATCH_SIZE': ['processing', 'batch_size'],
+            'AICLEANER_DATA_DIR': ['processing', 'data_directory'],
             'AICLEANER_LOG_LEVEL': ['logging', 'level'],
             'AICLEANER_MQTT_HOST': ['home_assistant', 'mqtt_host'],
             'AICLEANER_MQTT_PORT': ['home_assistant', 'mqtt_port'],
@@ -33,6 +33,14 @@ class OllamaConfig(BaseModel):
 class ProcessingConfig(BaseModel):
     privacy_level: PrivacyLevel = Field(default=PrivacyLevel.FAST, description="Privacy level for processing")
     batch_size: int = Field(default=10, ge=1, le=100, description="Number of images to process in parallel")
+    load_workers: int = Field(default=4, ge=1, le=64, description="Concurrent file reads in the processing pipeline")
+    preprocess_workers: int = Field(default=2, ge=1, le=32, description="Concurrent image preprocessing jobs")
+    queue_size: int = Field(default=100, ge=1, le=10000, description="Maximum images buffered between pipeline stages")
+    data_directory: str = Field(default="~/.aicleaner", description="Directory for persistent state such as directory watch cursors")
+    checkpoint_file: Optional[str] = Field(default=None, description="File recording completed images so interrupted runs resume")
+    result_cache_enabled: bool = Field(default=True, description="Reuse analysis results for identical image content")
+    result_cache_path: str = Field(default="aicleaner_results.db", description="SQLite file for cached analysis results")
+    result_cache_max_mb: float = Field(default=100.0, gt=0, le=10240, description="Maximum size of cached results in MB")
     max_image_size_mb: float = Field(default=10.0, gt=0, le=50, description="Maximum image size in MB")
     supported_formats: List[str] = Field(
         default=["jpg", "jpeg", "png", "gif", "bmp", "webp"],
@@ -45,6 +53,7 @@ class HealthConfig(BaseModel):
     check_interval: int = Field(default=60, ge=10, le=3600, description="Health check interval in seconds")
     max_failures: int = Field(default=3, ge=1, le=10, description="Max consecutive failures before marking unhealthy")
     timeout: int = Field(default=10, ge=1, le=60, description="Health check timeout in seconds")
+    idle_probe_threshold: int = Field(default=300, ge=0, le=86400, description="Probe a provider only after this many seconds without live traffic")
 
 
 class LoggingConfig(BaseModel):
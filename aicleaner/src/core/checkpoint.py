@@ -0,0 +1,130 @@
+"""
+Processing checkpoint for AI Cleaner image batches.
+
+Completed images are appended to a JSON-lines file so an interrupted batch
+can resume where it stopped instead of re-analyzing every image.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..providers.base_provider import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessingCheckpoint:
+    """Append-only record of images that finished processing.
+
+    An image counts as completed only while its size and mtime still match the
+    recorded values, so files modified after analysis are processed again.
+    Entries are buffered and written with an fsync every ``flush_every``
+    records, which bounds the work repeated after a crash. ``record()`` only
+    buffers; callers on an event loop run ``flush()`` and ``close()`` in an
+    executor so the fsync does not block the loop.
+    """
+
+    def __init__(self, path: Path, flush_every: int = 50):
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self._completed: Dict[str, Tuple[int, int]] = {}
+        self._pending: List[str] = []
+        self._file = None
+        self._lines_on_disk = 0
+
+    def load(self) -> int:
+        """Load existing entries and open the file for appending.
+
+        A truncated last line from a crash mid-write is ignored.
+
+        Returns:
+            Number of completed images loaded
+        """
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._lines_on_disk += 1
+                    try:
+                        entry = json.loads(line)
+                        self._completed[entry['path']] = (entry['size'], entry['mtime_ns'])
+                    except (ValueError, KeyError):
+                        continue
+
+        # Rewrite when superseded entries dominate the file
+        if self._lines_on_disk > 2 * len(self._completed) + self.flush_every:
+            self._compact()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+        if self._completed:
+            logger.info(f"Loaded checkpoint with {len(self._completed)} completed images from {self.path}")
+        return len(self._completed)
+
+    def is_completed(self, file_path: Path) -> bool:
+        """Check whether an image was completed and has not changed since."""
+        recorded = self._completed.get(str(file_path))
+        if recorded is None:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return recorded == (stat.st_size, stat.st_mtime_ns)
+
+    def record(self, file_path: Path, size: int, mtime_ns: int, file_hash: Optional[str],
+               result: AnalysisResult) -> bool:
+        """Record a completed image.
+
+        Returns:
+            True once ``flush_every`` entries are buffered and flush() is due
+        """
+        key = str(file_path)
+        self._completed[key] = (size, mtime_ns)
+        self._pending.append(json.dumps({
+            'path': key,
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'hash': file_hash,
+            'action': result.action,
+            'confidence': result.confidence,
+        }, separators=(',', ':')))
+
+        return len(self._pending) >= self.flush_every
+
+    def flush(self) -> None:
+        """Write buffered entries and fsync them."""
+        if not self._pending or self._file is None:
+            return
+        lines, self._pending = self._pending, []
+        self._file.write('\n'.join(lines) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._lines_on_disk += len(lines)
+
+    def close(self) -> None:
+        """Flush remaining entries and close the file."""
+        try:
+            self.flush()
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _compact(self) -> None:
+        """Rewrite the file with one line per completed image."""
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for key, (size, mtime_ns) in self._completed.items():
+                f.write(json.dumps({'path': key, 'size': size, 'mtime_ns': mtime_ns},
+                                   separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self._lines_on_disk = len(self._completed)
+
+    def __len__(self) -> int:
+        return len(self._completed)
@@ -5,12 +5,14 @@ circuit breaker patterns, and Home Assistant integration.
 
 import asyncio
 import logging
+import math
 import time
-import statistics
-from typing import Dict, List, Optional, Callable, Any, AsyncGenerator
+from array import array
+from typing import Dict, List, Optional, Callable, Any, AsyncGenerator, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import deque, defaultdict
+from itertools import islice
 import json
 
 from ..config.schema import AICleanerConfig, HealthConfig
@@ -18,6 +20,11 @@ from ..providers.base_provider import LLMProvider, ProviderHealth, ProviderStatu
 
 logger = logging.getLogger(__name__)
 
+# Live requests considered when deriving status from traffic
+PASSIVE_WINDOW = 20
+PASSIVE_DEGRADED_ERROR_RATE = 0.2
+PASSIVE_UNHEALTHY_ERROR_RATE = 0.5
+
 
 class CircuitBreakerState(Enum):
     """Circuit breaker states for provider health management."""
@@ -26,16 +33,79 @@ class CircuitBreakerState(Enum):
     HALF_OPEN = "half_open"  # Testing if service has recovered
 
 
+class RingBuffer:
+    """Fixed-capacity ring of numbers backed by a preallocated array."""
+    
+    __slots__ = ("_data", "_start", "_size")
+    
+    def __init__(self, capacity: int, typecode: str = "d"):
+        self._data = array(typecode, [0]) * capacity
+        self._start = 0
+        self._size = 0
+    
+    def append(self, value) -> Optional[float]:
+        """Append a value, returning the evicted oldest value once full."""
+        capacity = len(self._data)
+        if self._size < capacity:
+            self._data[(self._start + self._size) % capacity] = value
+            self._size += 1
+            return None
+        evicted = self._data[self._start]
+        self._data[self._start] = value
+        self._start = (self._start + 1) % capacity
+        return evicted
+    
+    def tolist(self) -> list:
+        """Values oldest first."""
+        if self._size < len(self._data):
+            return self._data[:self._size].tolist()
+        return (self._data[self._start:] + self._data[:self._start]).tolist()
+    
+    def sum(self) -> float:
+        return math.fsum(self._data[:self._size] if self._size < len(self._data) else self._data)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self):
+        return iter(self.tolist())
+
+
+_STATUS_CODES = {status: code for code, status in enumerate(ProviderStatus)}
+_STATUSES = list(ProviderStatus)
+
+# Columns of the system history export
+SYSTEM_HISTORY_COLUMNS = ("timestamp", "overall_availability", "avg_response_time",
+                          "healthy_providers", "total_providers", "system_health")
+
+# Response time trend detection: CUSUM on residuals from a slow EWMA baseline
+TREND_WARMUP = 10          # Samples before trends are reported
+TREND_HOLD = 10            # Samples a detected trend stays flagged
+EWMA_FAST_ALPHA = 0.3
+EWMA_SLOW_ALPHA = 0.05
+CUSUM_K = 0.5              # Allowed drift, in baseline standard deviations
+CUSUM_H = 5.0              # Decision threshold, in baseline standard deviations
+CUSUM_Z_CLIP = 3.0         # Caps one outlier's contribution so spikes alone do not alarm
+MIN_RELATIVE_SCALE = 0.05  # Scale floor as a fraction of the baseline for very steady series
+
+
 @dataclass
 class HealthMetrics:
-    """Comprehensive health metrics for a provider."""
+    """Comprehensive health metrics for a provider.
+    
+    All statistics are maintained incrementally: windowed averages from
+    running sums over fixed-size arrays, overall mean and variance with
+    Welford's algorithm, and trend detection with a two-sided CUSUM test on
+    response times standardized against an EWMA baseline.
+    """
     provider_name: str
     current_health: ProviderHealth
     
     # Historical tracking
-    response_times: deque = field(default_factory=lambda: deque(maxlen=100))
-    error_rates: deque = field(default_factory=lambda: deque(maxlen=100))
-    status_history: deque = field(default_factory=lambda: deque(maxlen=50))
+    response_times: RingBuffer = field(default_factory=lambda: RingBuffer(100))
+    error_rates: RingBuffer = field(default_factory=lambda: RingBuffer(100))
+    status_times: RingBuffer = field(default_factory=lambda: RingBuffer(50))
+    status_codes: RingBuffer = field(default_factory=lambda: RingBuffer(50, "b"))
     
     # Circuit breaker state
     circuit_state: CircuitBreakerState = CircuitBreakerState.CLOSED
@@ -55,54 +125,150 @@ class HealthMetrics:
     improvement_trend: bool = False
     trend_confidence: float = 0.0
     
-    def update_health(self, health: ProviderHealth) -> None:
-        """Update health metrics with new health check result."""
+    # Passive signals from live traffic
+    request_outcomes: RingBuffer = field(default_factory=lambda: RingBuffer(PASSIVE_WINDOW, "B"))
+    passive_requests: int = 0
+    timeouts: int = 0
+    last_activity: Optional[float] = None
+    
+    # Active probe accounting
+    probe_count: int = 0
+    probe_time_ms: float = 0.0
+    last_probe_time: Optional[float] = None
+    
+    # Streaming statistics state
+    _window_sum: float = field(default=0.0, init=False, repr=False)
+    _updates_since_resum: int = field(default=0, init=False, repr=False)
+    _recent_failures: int = field(default=0, init=False, repr=False)
+    _welford_count: int = field(default=0, init=False, repr=False)
+    _welford_mean: float = field(default=0.0, init=False, repr=False)
+    _welford_m2: float = field(default=0.0, init=False, repr=False)
+    ewma_fast: float = field(default=0.0, init=False)
+    ewma_slow: float = field(default=0.0, init=False)
+    _ewma_var: float = field(default=0.0, init=False, repr=False)
+    _cusum_high: float = field(default=0.0, init=False, repr=False)
+    _cusum_low: float = field(default=0.0, init=False, repr=False)
+    _samples_since_alarm: int = field(default=0, init=False, repr=False)
+    
+    @property
+    def status_history(self) -> List[Tuple[float, ProviderStatus]]:
+        """(timestamp, status) pairs, oldest first."""
+        return [(ts, _STATUSES[code]) for ts, code in zip(self.status_times.tolist(), self.status_codes.tolist())]
+    
+    @property
+    def response_time_stddev(self) -> float:
+        """Standard deviation of all response times seen."""
+        if self._welford_count < 2:
+            return 0.0
+        return math.sqrt(self._welford_m2 / (self._welford_count - 1))
+    
+    def update_health(self, health: ProviderHealth, success: Optional[bool] = None) -> None:
+        """Update health metrics with a health check result or a live request outcome."""
+        now = time.time()
         self.current_health = health
-        self.response_times.append(health.response_time_ms)
         self.error_rates.append(health.error_rate)
-        self.status_history.append((time.time(), health.status))
+        self.status_times.append(now)
+        self.status_codes.append(_STATUS_CODES[health.status])
         
         # Update counters
         self.total_requests += 1
-        if health.status in [ProviderStatus.HEALTHY, ProviderStatus.DEGRADED]:
+        if success is None:
+            success = health.status in [ProviderStatus.HEALTHY, ProviderStatus.DEGRADED]
+        if success:
             self.successful_requests += 1
             self.success_count += 1
         else:
             self.failed_requests += 1
             self.failure_count += 1
-            self.last_failure_time = time.time()
-        
-        # Calculate average response time
-        if self.response_times:
-            self.avg_response_time = statistics.mean(self.response_times)
+            self.last_failure_time = now
+        
+        # Windowed average response time from a running sum
+        response_time = health.response_time_ms
+        evicted = self.response_times.append(response_time)
+        self._window_sum += response_time - (evicted if evicted is not None else 0.0)
+        self._updates_since_resum += 1
+        if self._updates_since_resum >= len(self.response_times):
+            # Periodically recompute to shed floating point drift
+            self._window_sum = self.response_times.sum()
+            self._updates_since_resum = 0
+        self.avg_response_time = self._window_sum / len(self.response_times)
         
         # Analyze trends
-        self._analyze_trends()
-    
-    def _analyze_trends(self) -> None:
-        """Analyze health trends over time."""
-        if len(self.response_times) < 10:
+        self._analyze_trends(response_time)
+    
+    def record_request(self, latency_ms: float, success: bool, timed_out: bool = False,
+                       error_message: Optional[str] = None) -> None:
+        """Update health from a live request, deriving status from the recent error rate."""
+        now = time.time()
+        self.last_activity = now
+        self.passive_requests += 1
+        if timed_out:
+            self.timeouts += 1
+        
+        evicted = self.request_outcomes.append(0 if success else 1)
+        self._recent_failures += (0 if success else 1) - (evicted or 0)
+        error_rate = self._recent_failures / len(self.request_outcomes)
+        if error_rate >= PASSIVE_UNHEALTHY_ERROR_RATE:
+            status = ProviderStatus.UNHEALTHY
+        elif error_rate >= PASSIVE_DEGRADED_ERROR_RATE or timed_out:
+            status = ProviderStatus.DEGRADED
+        else:
+            status = ProviderStatus.HEALTHY
+        
+        self.update_health(ProviderHealth(
+            status=status,
+            response_time_ms=latency_ms,
+            error_rate=error_rate,
+            last_check=now,
+            error_message=None if success else error_message
+        ), success=success)
+    
+    def seconds_since_signal(self, now: float) -> float:
+        """Seconds since the last live request or probe."""
+        last_signal = max(self.last_activity or 0.0, self.last_probe_time or 0.0)
+        return now - last_signal
+    
+    def _analyze_trends(self, value: float) -> None:
+        """Update running statistics and test for a shift in response time."""
+        # Welford's running mean and variance
+        self._welford_count += 1
+        delta = value - self._welford_mean
+        self._welford_mean += delta / self._welford_count
+        self._welford_m2 += delta * (value - self._welford_mean)
+        
+        if self._welford_count == 1:
+            self.ewma_fast = self.ewma_slow = value
             return
         
-        # Analyze response time trend
-        recent_times = list(self.response_times)[-10:]
-        older_times = list(self.response_times)[-20:-10] if len(self.response_times) >= 20 else []
+        # Standardize against the slow baseline before it absorbs this sample
+        scale = max(math.sqrt(self._ewma_var), MIN_RELATIVE_SCALE * abs(self.ewma_slow), 1e-6)
+        z = max(-CUSUM_Z_CLIP, min(CUSUM_Z_CLIP, (value - self.ewma_slow) / scale))
         
-        if older_times:
-            recent_avg = statistics.mean(recent_times)
-            older_avg = statistics.mean(older_times)
-            
-            # Degradation if recent times are significantly higher
-            if recent_avg > older_avg * 1.3:
-                self.degradation_trend = True
-                self.improvement_trend = False
-                self.trend_confidence = min(1.0, (recent_avg / older_avg - 1.0) * 2)
-            # Improvement if recent times are significantly lower
-            elif recent_avg < older_avg * 0.8:
-                self.improvement_trend = True
-                self.degradation_trend = False
-                self.trend_confidence = min(1.0, (1.0 - recent_avg / older_avg) * 2)
-            else:
+        self.ewma_fast += EWMA_FAST_ALPHA * (value - self.ewma_fast)
+        residual = value - self.ewma_slow
+        self.ewma_slow += EWMA_SLOW_ALPHA * residual
+        # Winsorized so a single outlier does not widen the scale and mask later shifts
+        clipped = z * scale
+        self._ewma_var = (1 - EWMA_SLOW_ALPHA) * (self._ewma_var + EWMA_SLOW_ALPHA * clipped * clipped)
+        
+        if self._welford_count < TREND_WARMUP:
+            return
+        
+        self._cusum_high = max(0.0, self._cusum_high + z - CUSUM_K)
+        self._cusum_low = max(0.0, self._cusum_low - z - CUSUM_K)
+        
+        if self._cusum_high > CUSUM_H or self._cusum_low > CUSUM_H:
+            # Degradation if response times shifted up, improvement if down
+            self.degradation_trend = self._cusum_high > CUSUM_H
+            self.improvement_trend = not self.degradation_trend
+            self.trend_confidence = min(1.0, max(self._cusum_high, self._cusum_low) / (2 * CUSUM_H))
+            self._cusum_high = self._cusum_low = 0.0
+            self._samples_since_alarm = 0
+            # Re-baseline on the new level so the same shift is not reported again
+            self.ewma_slow = self.ewma_fast
+        else:
+            self._samples_since_alarm += 1
+            if self._samples_since_alarm >= TREND_HOLD:
                 self.degradation_trend = False
                 self.improvement_trend = False
                 self.trend_confidence = 0.0
@@ -121,6 +287,8 @@ class HealthMetrics:
             "circuit_state": self.circuit_state.value,
             "availability": self.get_availability(),
             "avg_response_time_ms": self.avg_response_time,
+            "response_time_stddev_ms": self.response_time_stddev,
+            "response_time_ewma_ms": self.ewma_fast,
             "total_requests": self.total_requests,
             "success_rate": self.successful_requests / max(self.total_requests, 1),
             "failure_count": self.failure_count,
@@ -129,7 +297,13 @@ class HealthMetrics:
             "improvement_trend": self.improvement_trend,
             "trend_confidence": self.trend_confidence,
             "last_check": self.current_health.last_check,
-            "error_message": self.current_health.error_message
+            "error_message": self.current_health.error_message,
+            "passive_requests": self.passive_requests,
+            "timeouts": self.timeouts,
+            "last_activity": self.last_activity,
+            "probe_count": self.probe_count,
+            "probe_time_ms": self.probe_time_ms,
+            "last_probe_time": self.last_probe_time
         }
 
 
@@ -215,6 +389,11 @@ class HealthMonitor:
         # Performance aggregation
         self._system_performance_history: deque = deque(maxlen=1000)
         
+        # Active probe accounting
+        self._probe_cost_per_call: Dict[str, float] = {}
+        self._probes_skipped = 0
+        self._started_at = time.time()
+        
         logger.info("Health monitoring system initialized")
     
     def register_provider(self, provider_name: str, provider: LLMProvider) -> None:
@@ -239,8 +418,35 @@ class HealthMonitor:
                 success_threshold=2
             )
             
+            try:
+                cost = provider.get_capabilities().estimated_cost_per_request
+            except Exception:
+                cost = None
+            self._probe_cost_per_call[provider_name] = cost or 0.0
+            
             logger.info(f"Registered provider for health monitoring: {provider_name}")
     
+    def record_request(self, provider_name: str, latency_ms: float, success: bool,
+                       timed_out: bool = False, error_message: Optional[str] = None) -> None:
+        """
+        Record the outcome of a live request to a provider.
+        
+        Live traffic is the primary health signal; providers that receive it
+        are not probed by the monitoring loop.
+        """
+        metrics = self.provider_metrics.get(provider_name)
+        if metrics is None:
+            return
+        
+        circuit_breaker = self.circuit_breakers[provider_name]
+        if success:
+            circuit_breaker.record_success()
+        else:
+            circuit_breaker.record_failure()
+        
+        metrics.record_request(latency_ms, success, timed_out, error_message)
+        metrics.circuit_state = circuit_breaker.state
+    
     def add_health_callback(self, callback: Callable[[Dict[str, HealthMetrics]], None]) -> None:
         """Add a callback to be notified of health changes."""
         self._health_callbacks.append(callback)
@@ -297,23 +503,29 @@ class HealthMonitor:
                 # Use shorter interval on error to recover quickly
                 await asyncio.sleep(min(self.health_config.check_interval, 30))
     
-    async def _perform_health_checks(self, provider_registry) -> Dict[str, ProviderHealth]:
-        """Perform health checks on all providers with timeout handling."""
+    def _needs_probe(self, provider_name: str, now: float, force: bool = False) -> bool:
+        """Probe only providers in HALF_OPEN state or idle past the probe threshold."""
+        if force:
+            return True
+        if self.circuit_breakers[provider_name].state == CircuitBreakerState.HALF_OPEN:
+            return True
+        metrics = self.provider_metrics[provider_name]
+        return metrics.seconds_since_signal(now) >= self.health_config.idle_probe_threshold
+    
+    async def _perform_health_checks(self, provider_registry, force: bool = False) -> Dict[str, ProviderHealth]:
+        """Probe providers that lack live traffic, with timeout handling."""
         health_results = {}
         
-        # Create health check tasks for all registered providers
+        # Create health check tasks for providers that need a probe
         health_tasks = {}
+        now = time.time()
         
         for provider_name in self.provider_metrics.keys():
             provider = provider_registry.get_provider(provider_name)
             if provider:
                 # Check circuit breaker before attempting health check
                 circuit_breaker = self.circuit_breakers[provider_name]
-                if circuit_breaker.should_allow_request():
-                    health_tasks[provider_name] = asyncio.create_task(
-                        self._safe_health_check(provider, provider_name)
-                    )
-                else:
+                if not circuit_breaker.should_allow_request():
                     # Circuit breaker is open, mark as unhealthy
                     health_results[provider_name] = ProviderHealth(
                         status=ProviderStatus.OFFLINE,
@@ -322,6 +534,12 @@ class HealthMonitor:
                         last_check=time.time(),
                         error_message="Circuit breaker open"
                     )
+                elif self._needs_probe(provider_name, now, force):
+                    health_tasks[provider_name] = asyncio.create_task(
+                        self._safe_health_check(provider, provider_name)
+                    )
+                else:
+                    self._probes_skipped += 1
         
         # Wait for all health checks with timeout
         if health_tasks:
@@ -364,6 +582,9 @@ class HealthMonitor:
         """Perform a single health check with error handling and circuit breaker updates."""
         start_time = time.time()
         circuit_breaker = self.circuit_breakers[provider_name]
+        metrics = self.provider_metrics[provider_name]
+        metrics.probe_count += 1
+        metrics.last_probe_time = start_time
         
         try:
             # Perform health check with timeout
@@ -378,11 +599,13 @@ class HealthMonitor:
             else:
                 circuit_breaker.record_failure()
             
+            metrics.probe_time_ms += (time.time() - start_time) * 1000
             return health
             
         except asyncio.TimeoutError:
             circuit_breaker.record_failure()
             processing_time = (time.time() - start_time) * 1000
+            metrics.probe_time_ms += processing_time
             return ProviderHealth(
                 status=ProviderStatus.OFFLINE,
                 response_time_ms=processing_time,
@@ -394,6 +617,7 @@ class HealthMonitor:
         except Exception as e:
             circuit_breaker.record_failure()
             processing_time = (time.time() - start_time) * 1000
+            metrics.probe_time_ms += processing_time
             return ProviderHealth(
                 status=ProviderStatus.OFFLINE,
                 response_time_ms=processing_time,
@@ -501,16 +725,17 @@ class HealthMonitor:
         
         # Calculate trends if we have enough history
         trends = {}
-        if len(self._system_performance_history) >= 10:
-            recent_metrics = list(self._system_performance_history)[-10:]
-            older_metrics = list(self._system_performance_history)[-20:-10] if len(self._system_performance_history) >= 20 else []
+        if len(self._system_performance_history) >= 20:
+            # Newest first; avoids copying the whole history on every call
+            window = list(islice(reversed(self._system_performance_history), 20))
+            recent_metrics, older_metrics = window[:10], window[10:]
             
             if older_metrics:
-                recent_availability = statistics.mean([m["overall_availability"] for m in recent_metrics])
-                older_availability = statistics.mean([m["overall_availability"] for m in older_metrics])
+                recent_availability = math.fsum(m["overall_availability"] for m in recent_metrics) / 10
+                older_availability = math.fsum(m["overall_availability"] for m in older_metrics) / 10
                 
-                recent_response_time = statistics.mean([m["avg_response_time"] for m in recent_metrics])
-                older_response_time = statistics.mean([m["avg_response_time"] for m in older_metrics])
+                recent_response_time = math.fsum(m["avg_response_time"] for m in recent_metrics) / 10
+                older_response_time = math.fsum(m["avg_response_time"] for m in older_metrics) / 10
                 
                 trends = {
                     "availability_trend": "improving" if recent_availability > older_availability else "degrading",
@@ -522,12 +747,32 @@ class HealthMonitor:
         return {
             **latest_metrics,
             "trends": trends,
+            "probes": self._get_probe_summary(),
             "provider_details": {
                 name: metrics.get_performance_summary()
                 for name, metrics in self.provider_metrics.items()
             }
         }
     
+    def _get_probe_summary(self) -> Dict[str, Any]:
+        """Summarize active probe frequency and estimated cost."""
+        hours = max(time.time() - self._started_at, 60.0) / 3600
+        total_probes = sum(m.probe_count for m in self.provider_metrics.values())
+        passive_requests = sum(m.passive_requests for m in self.provider_metrics.values())
+        return {
+            "idle_probe_threshold": self.health_config.idle_probe_threshold,
+            "total_probes": total_probes,
+            "probes_skipped": self._probes_skipped,
+            "probes_per_hour": total_probes / hours,
+            "probe_time_ms": sum(m.probe_time_ms for m in self.provider_metrics.values()),
+            "estimated_probe_cost": sum(
+                m.probe_count * self._probe_cost_per_call.get(name, 0.0)
+                for name, m in self.provider_metrics.items()
+            ),
+            "passive_requests": passive_requests,
+            "probe_share": total_probes / max(total_probes + passive_requests, 1),
+        }
+    
     def get_health_status_for_ha(self) -> Dict[str, Any]:
         """Get health status formatted for Home Assistant integration."""
         system_summary = self.get_system_performance_summary()
@@ -561,7 +806,7 @@ class HealthMonitor:
     async def force_health_check(self, provider_registry) -> Dict[str, ProviderHealth]:
         """Force an immediate health check on all providers."""
         logger.info("Performing forced health check on all providers")
-        health_results = await self._perform_health_checks(provider_registry)
+        health_results = await self._perform_health_checks(provider_registry, force=True)
         await self._update_metrics(health_results)
         await self._notify_health_callbacks()
         return health_results
@@ -584,7 +829,10 @@ class HealthMonitor:
     def export_health_history(self) -> Dict[str, Any]:
         """Export health history for analysis or backup."""
         return {
-            "system_performance_history": list(self._system_performance_history),
+            "system_performance_history": {
+                column: [m[column] for m in self._system_performance_history]
+                for column in SYSTEM_HISTORY_COLUMNS
+            },
             "provider_metrics": {
                 name: {
                     "provider_name": metrics.provider_name,
@@ -595,9 +843,14 @@ class HealthMonitor:
                         "last_check": metrics.current_health.last_check,
                         "error_message": metrics.current_health.error_message
                     },
-                    "response_times": list(metrics.response_times),
-                    "error_rates": list(metrics.error_rates),
-                    "status_history": [(ts, status.value) for ts, status in metrics.status_history],
+                    "history": {
+                        "response_time_ms": metrics.response_times.tolist(),
+                        "error_rate": metrics.error_rates.tolist(),
+                    },
+                    "status_history": {
+                        "timestamp": metrics.status_times.tolist(),
+                        "status": [_STATUSES[code].value for code in metrics.status_codes.tolist()],
+                    },
                     "circuit_state": metrics.circuit_state.value,
                     "performance_summary": metrics.get_performance_summary()
                 }
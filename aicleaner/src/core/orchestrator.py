@@ -1,7 +1,10 @@
 import asyncio
 import logging
+import os
+import threading
 import time
-from typing import Dict, List, Optional, Tuple, AsyncGenerator
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, AsyncGenerator
 from dataclasses import dataclass, field
 from pathlib import Path
 import hashlib
@@ -16,7 +19,9 @@ from ..providers.base_provider import (
     PrivacyLevel
 )
 from ..providers.gemini_provider import GeminiProvider
+from .checkpoint import ProcessingCheckpoint
 from .health import HealthMonitor
+from .result_cache import AnalysisResultCache, prompt_version
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,7 @@ class ProcessingStats:
     kept_images: int = 0
     deleted_images: int = 0
     failed_images: int = 0
+    resumed_images: int = 0
     total_processing_time: float = 0.0
     start_time: float = field(default_factory=time.time)
     
@@ -47,22 +53,98 @@ class ProcessingStats:
 
 @dataclass
 class ImageProcessingTask:
-    """Represents a single image processing task."""
+    """Represents a single image processing task.
+    
+    Construction does no I/O; file_hash, file_size and file_mtime_ns are
+    filled in when the image is read for analysis.
+    """
     file_path: Path
     priority: int = 0
     retry_count: int = 0
     max_retries: int = 3
+    file_hash: Optional[str] = None
+    file_size: Optional[int] = None
+    file_mtime_ns: Optional[int] = None
+    image_data: Optional[bytes] = None
+    result: Optional[AnalysisResult] = None
+    started_at: float = 0.0
+
+
+class FileHashCache:
+    """LRU memo of content hashes keyed by (path, size, mtime_ns).
     
-    def __post_init__(self):
-        self.file_hash = self._calculate_hash()
+    Shared by the executor threads that read images, so access is locked.
+    """
     
-    def _calculate_hash(self) -> str:
-        """Calculate SHA-256 hash of the image file."""
-        try:
-            with open(self.file_path, 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()[:16]  # First 16 chars
-        except Exception:
-            return f"error_{int(time.time())}"
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._hashes: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Tuple[str, int, int]) -> Optional[str]:
+        """Get a memoized hash, or None if the file is new or has changed."""
+        with self._lock:
+            file_hash = self._hashes.get(key)
+            if file_hash is None:
+                self.misses += 1
+                return None
+            self._hashes.move_to_end(key)
+            self.hits += 1
+            return file_hash
+    
+    def put(self, key: Tuple[str, int, int], file_hash: str) -> None:
+        """Memoize a hash, evicting the least recently used entry when full."""
+        with self._lock:
+            self._hashes[key] = file_hash
+            self._hashes.move_to_end(key)
+            while len(self._hashes) > self.max_entries:
+                self._hashes.popitem(last=False)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get memo size and hit/miss counts."""
+        return {"entries": len(self._hashes), "hits": self.hits, "misses": self.misses}
+    
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Sentinel passed down the pipeline queues when a stage has drained
+_STAGE_DONE = object()
+
+
+def read_image_file(file_path: Path, hash_cache: FileHashCache) -> Tuple[bytes, str, int, int]:
+    """Read an image once, hashing it as it streams in unless the hash is memoized.
+    
+    The memo key comes from fstat on the open file, so it describes exactly
+    the bytes that are read.
+    
+    Returns:
+        (data, hash, size, mtime_ns); hash is the first 16 hex chars of SHA-256
+    """
+    with open(file_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        key = (str(file_path), stat.st_size, stat.st_mtime_ns)
+        file_hash = hash_cache.get(key)
+        
+        if file_hash is not None:
+            return f.read(), file_hash, stat.st_size, stat.st_mtime_ns
+        
+        hasher = hashlib.sha256()
+        buffer = bytearray()
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            buffer += chunk
+    
+    file_hash = hasher.hexdigest()[:16]  # First 16 chars
+    hash_cache.put(key, file_hash)
+    return bytes(buffer), file_hash, stat.st_size, stat.st_mtime_ns
 
 
 class ProviderRegistry:
@@ -181,6 +263,11 @@ class AICleanerOrchestrator:
         self.stats = ProcessingStats()
         self._shutdown_event = asyncio.Event()
         self._processing_semaphore: Optional[asyncio.Semaphore] = None
+        self.hash_cache = FileHashCache()
+        # Optional CPU-bound transform applied to image bytes before analysis
+        self.image_preprocessor: Optional[Callable[[bytes], bytes]] = None
+        self._pipeline_queues: Dict[str, asyncio.Queue] = {}
+        self.result_cache: Optional[AnalysisResultCache] = None
         
     async def initialize(self, config_path: Optional[str] = None) -> bool:
         """Initialize the orchestrator with configuration and providers."""
@@ -192,6 +279,9 @@ class AICleanerOrchestrator:
             # Set up processing semaphore based on batch size
             self._processing_semaphore = asyncio.Semaphore(self.config.processing.batch_size)
             
+            # Open persistent result cache
+            self._open_result_cache()
+            
             # Initialize health monitor
             self.health_monitor = HealthMonitor(self.config)
             
@@ -216,6 +306,21 @@ class AICleanerOrchestrator:
             logger.error(f"Orchestrator initialization failed: {e}")
             return False
     
+    def _open_result_cache(self) -> None:
+        """Open the result cache if enabled; failures only disable caching."""
+        processing = self.config.processing
+        if not processing.result_cache_enabled or self.result_cache:
+            return
+        try:
+            self.result_cache = AnalysisResultCache(
+                Path(processing.result_cache_path),
+                max_size_mb=processing.result_cache_max_mb
+            )
+            logger.info(f"Result cache opened at {processing.result_cache_path}")
+        except Exception as e:
+            logger.error(f"Result cache unavailable, continuing without it: {e}")
+            self.result_cache = None
+    
     async def _register_providers(self) -> None:
         """Register providers based on configuration."""
         # Register Gemini provider if configured
@@ -243,89 +348,182 @@ class AICleanerOrchestrator:
             await self.health_monitor.start_monitoring(self.provider_registry)
             logger.info("Comprehensive health monitoring started")
     
-    async def process_images(self, image_paths: List[Path], 
-                           progress_callback: Optional[callable] = None) -> ProcessingStats:
-        """Process a batch of images with provider failover and health monitoring."""
+    async def process_images(self, image_paths: Iterable[Path], 
+                           progress_callback: Optional[callable] = None,
+                           checkpoint_path: Optional[str] = None) -> ProcessingStats:
+        """Process images through a bounded discover → load → preprocess → analyze → act pipeline.
+        
+        Stages are connected by bounded queues, so memory stays flat no matter
+        how many paths are supplied; image_paths may be a lazy iterator. Each
+        completed image is reported through progress_callback and, when a
+        checkpoint file is configured, recorded so a rerun after a crash skips it.
+        """
+        processing = self.config.processing
         
         # Initialize statistics
         self.stats = ProcessingStats()
-        self.stats.total_images = len(image_paths)
+        self.stats.total_images = len(image_paths) if hasattr(image_paths, '__len__') else 0
         self.stats.start_time = time.time()
         
-        logger.info(f"Starting processing of {len(image_paths)} images")
+        checkpoint = None
+        checkpoint_file = checkpoint_path or processing.checkpoint_file
+        if checkpoint_file:
+            checkpoint = ProcessingCheckpoint(Path(checkpoint_file))
+            await asyncio.get_running_loop().run_in_executor(None, checkpoint.load)
         
-        # Create processing tasks
-        tasks = [
-            ImageProcessingTask(path, priority=i) 
-            for i, path in enumerate(image_paths)
-        ]
+        logger.info(f"Starting processing of {self.stats.total_images or 'streamed'} images")
         
-        # Process images with controlled concurrency
-        semaphore = asyncio.Semaphore(self.config.processing.batch_size)
-        processing_tasks = [
-            self._process_single_image(task, semaphore, progress_callback)
-            for task in tasks
+        queues = {
+            name: asyncio.Queue(maxsize=processing.queue_size)
+            for name in ("load", "preprocess", "analyze", "act")
+        }
+        self._pipeline_queues = queues
+        
+        async def load(task: ImageProcessingTask) -> Optional[ImageProcessingTask]:
+            return await self._load_stage(task, checkpoint)
+        
+        async def act(task: ImageProcessingTask) -> None:
+            await self._act_stage(task, checkpoint, progress_callback)
+        
+        stages = [
+            self._run_stage("load", queues["load"], queues["preprocess"], load,
+                            processing.load_workers),
+            self._run_stage("preprocess", queues["preprocess"], queues["analyze"],
+                            self._preprocess_stage, processing.preprocess_workers),
+            self._run_stage("analyze", queues["analyze"], queues["act"],
+                            self._analyze_stage, processing.batch_size),
+            # A single act worker keeps stats, callbacks and checkpoint writes ordered
+            self._run_stage("act", queues["act"], None, act, 1),
         ]
         
-        # Wait for all processing to complete
-        results = await asyncio.gather(*processing_tasks, return_exceptions=True)
+        try:
+            await asyncio.gather(self._discover_stage(image_paths, queues["load"]), *stages)
+        finally:
+            self._pipeline_queues = {}
+            if checkpoint is not None:
+                await asyncio.get_running_loop().run_in_executor(None, checkpoint.close)
         
         # Update final statistics
         self.stats.total_processing_time = time.time() - self.stats.start_time
         
         logger.info(f"Processing complete. Processed: {self.stats.processed_images}, "
                    f"Kept: {self.stats.kept_images}, Deleted: {self.stats.deleted_images}, "
-                   f"Failed: {self.stats.failed_images}")
+                   f"Failed: {self.stats.failed_images}, Resumed: {self.stats.resumed_images}")
         
         return self.stats
     
-    async def _process_single_image(self, task: ImageProcessingTask, 
-                                  semaphore: asyncio.Semaphore,
-                                  progress_callback: Optional[callable] = None) -> Optional[AnalysisResult]:
-        """Process a single image with provider failover."""
+    async def _discover_stage(self, image_paths: Iterable[Path], out_queue: asyncio.Queue) -> None:
+        """Feed tasks into the pipeline, waiting whenever the load queue is full."""
+        count_paths = self.stats.total_images == 0
+        try:
+            for i, path in enumerate(image_paths):
+                if count_paths:
+                    self.stats.total_images += 1
+                await out_queue.put(ImageProcessingTask(Path(path), priority=i))
+        except Exception as e:
+            logger.error(f"Image discovery failed: {e}")
+        finally:
+            await out_queue.put(_STAGE_DONE)
+    
+    async def _run_stage(self, name: str, in_queue: asyncio.Queue, out_queue: Optional[asyncio.Queue],
+                         handler: Callable[[ImageProcessingTask], Awaitable[Optional[ImageProcessingTask]]],
+                         workers: int) -> None:
+        """Run a pipeline stage with a fixed number of workers.
         
-        async with semaphore:
-            start_time = time.time()
-            
-            try:
-                # Validate image file
-                if not self._validate_image_file(task.file_path):
-                    self.stats.failed_images += 1
-                    logger.warning(f"Invalid image file: {task.file_path}")
-                    return None
-                
-                # Load image data
-                image_data = await self._load_image_data(task.file_path)
-                if not image_data:
+        Items for which the handler returns None are dropped. When the
+        upstream stage finishes, every worker drains and exits, then the stage
+        signals the downstream queue.
+        """
+        async def worker() -> None:
+            while True:
+                task = await in_queue.get()
+                if task is _STAGE_DONE:
+                    # Leave the sentinel for sibling workers
+                    await in_queue.put(_STAGE_DONE)
+                    return
+                try:
+                    task = await handler(task)
+                except Exception as e:
                     self.stats.failed_images += 1
-                    return None
-                
-                # Get analysis result with provider failover
-                result = await self._analyze_with_failover(image_data, task)
-                
-                # Update statistics
-                processing_time = time.time() - start_time
-                self.stats.processed_images += 1
-                self.stats.total_processing_time += processing_time
-                
-                if result.action == "delete":
-                    self.stats.deleted_images += 1
-                else:
-                    self.stats.kept_images += 1
-                
-                # Report progress
-                if progress_callback:
-                    await progress_callback(task.file_path, result, self.stats)
-                
-                logger.debug(f"Processed {task.file_path}: {result.action} "
-                           f"(confidence: {result.confidence:.2f}, time: {processing_time:.2f}s)")
-                
-                return result
-                
+                    logger.error(f"{name} stage failed for {task.file_path}: {e}")
+                    continue
+                if task is not None and out_queue is not None:
+                    await out_queue.put(task)
+        
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+        finally:
+            if out_queue is not None:
+                await out_queue.put(_STAGE_DONE)
+    
+    async def _load_stage(self, task: ImageProcessingTask,
+                          checkpoint: Optional[ProcessingCheckpoint]) -> Optional[ImageProcessingTask]:
+        """Validate the file, skip it if checkpointed, and read it."""
+        loop = asyncio.get_running_loop()
+        task.started_at = time.time()
+        
+        # Validate image file
+        if not await loop.run_in_executor(None, self._validate_image_file, task.file_path):
+            self.stats.failed_images += 1
+            logger.warning(f"Invalid image file: {task.file_path}")
+            return None
+        
+        if checkpoint is not None and await loop.run_in_executor(None, checkpoint.is_completed, task.file_path):
+            self.stats.resumed_images += 1
+            return None
+        
+        # Load image data (hashed during the same read)
+        task.image_data = await self._load_image_data(task)
+        if not task.image_data:
+            self.stats.failed_images += 1
+            return None
+        
+        return task
+    
+    async def _preprocess_stage(self, task: ImageProcessingTask) -> ImageProcessingTask:
+        """Apply the configured image preprocessor off the event loop."""
+        if self.image_preprocessor is not None:
+            loop = asyncio.get_running_loop()
+            task.image_data = await loop.run_in_executor(None, self.image_preprocessor, task.image_data)
+        return task
+    
+    async def _analyze_stage(self, task: ImageProcessingTask) -> ImageProcessingTask:
+        """Analyze the image and release its bytes."""
+        # Get analysis result with provider failover
+        task.result = await self._analyze_with_failover(task.image_data, task)
+        task.image_data = None
+        return task
+    
+    async def _act_stage(self, task: ImageProcessingTask, checkpoint: Optional[ProcessingCheckpoint],
+                         progress_callback: Optional[callable]) -> None:
+        """Record the result, report progress and checkpoint the image."""
+        result = task.result
+        
+        # Update statistics
+        processing_time = time.time() - task.started_at
+        self.stats.processed_images += 1
+        self.stats.total_processing_time += processing_time
+        
+        if result.action == "delete":
+            self.stats.deleted_images += 1
+        else:
+            self.stats.kept_images += 1
+        
+        # Report progress
+        if progress_callback:
+            try:
+                await progress_callback(task.file_path, result, self.stats)
             except Exception as e:
-                self.stats.failed_images += 1
-                logger.error(f"Failed to process {task.file_path}: {e}")
-                return None
+                logger.error(f"Progress callback failed for {task.file_path}: {e}")
+        
+        # Fallback results from failed analyses are retried on the next run
+        if checkpoint is not None and "error" not in result.metadata:
+            if checkpoint.record(task.file_path, task.file_size, task.file_mtime_ns,
+                                 task.file_hash, result):
+                await asyncio.get_running_loop().run_in_executor(None, checkpoint.flush)
+        
+        logger.debug(f"Processed {task.file_path}: {result.action} "
+                   f"(confidence: {result.confidence:.2f}, time: {processing_time:.2f}s)")
     
     def _validate_image_file(self, file_path: Path) -> bool:
         """Validate image file format and size."""
@@ -352,22 +550,43 @@ class AICleanerOrchestrator:
             logger.error(f"Error validating {file_path}: {e}")
             return False
     
-    async def _load_image_data(self, file_path: Path) -> Optional[bytes]:
-        """Load image data from file."""
+    async def _load_image_data(self, task: ImageProcessingTask) -> Optional[bytes]:
+        """Load image data from file and record its hash, size and mtime on the task."""
         try:
             # Use asyncio to avoid blocking
-            loop = asyncio.get_event_loop()
-            image_data = await loop.run_in_executor(
-                None, lambda: file_path.read_bytes()
+            loop = asyncio.get_running_loop()
+            image_data, task.file_hash, task.file_size, task.file_mtime_ns = await loop.run_in_executor(
+                None, read_image_file, task.file_path, self.hash_cache
             )
             return image_data
         except Exception as e:
-            logger.error(f"Failed to load image {file_path}: {e}")
+            logger.error(f"Failed to load image {task.file_path}: {e}")
             return None
     
     async def _analyze_with_failover(self, image_data: bytes, task: ImageProcessingTask) -> AnalysisResult:
         """Analyze image with automatic provider failover."""
         
+        # Identical content analyzed earlier with the same prompt and privacy level
+        cache_key = None
+        if self.result_cache and task.file_hash:
+            cache_key = (
+                task.file_hash,
+                prompt_version(self.config.analysis_prompt),
+                self.config.processing.privacy_level.value
+            )
+            loop = asyncio.get_running_loop()
+            try:
+                cached = await loop.run_in_executor(
+                    None, self.result_cache.get, cache_key[0],
+                    [p.value for p in self.config.provider_priority], cache_key[1], cache_key[2]
+                )
+            except Exception as e:
+                logger.warning(f"Result cache lookup failed: {e}")
+                cached = None
+            if cached:
+                logger.debug(f"Result cache hit for {task.file_path} (provider: {cached[0]})")
+                return cached[1]
+        
         # Get list of healthy providers in priority order from health monitor
         if self.health_monitor:
             healthy_providers = self.health_monitor.get_healthy_providers()
@@ -391,6 +610,7 @@ class AICleanerOrchestrator:
             if not provider:
                 continue
                 
+            start_time = time.time()
             try:
                 # Check if provider supports the configured privacy level
                 if not await provider.supports_privacy_level(self.config.processing.privacy_level):
@@ -398,22 +618,36 @@ class AICleanerOrchestrator:
                     continue
                 
                 # Attempt analysis
+                start_time = time.time()
                 result = await provider.analyze(
                     image_data=image_data,
                     prompt=self.config.analysis_prompt,
                     privacy_level=self.config.processing.privacy_level
                 )
+                latency_ms = (time.time() - start_time) * 1000
                 
                 # Validate result
                 if self._validate_analysis_result(result):
                     logger.debug(f"Successful analysis with provider: {provider_type}")
+                    self._record_provider_request(provider_type, latency_ms, "error" not in result.metadata,
+                                                  error_message=result.metadata.get("error"))
+                    if cache_key and "error" not in result.metadata:
+                        await self._store_cached_result(cache_key, provider_type, result)
                     return result
                 else:
                     logger.warning(f"Invalid result from provider {provider_type}")
+                    self._record_provider_request(provider_type, latency_ms, False,
+                                                  error_message="Invalid analysis result")
                     
+            except asyncio.TimeoutError:
+                logger.error(f"Analysis timed out with provider {provider_type}")
+                self._record_provider_request(provider_type, (time.time() - start_time) * 1000, False,
+                                              timed_out=True, error_message="Analysis timeout")
+                continue
             except Exception as e:
                 logger.error(f"Analysis failed with provider {provider_type}: {e}")
-                # Provider will be marked unhealthy in next health check
+                self._record_provider_request(provider_type, (time.time() - start_time) * 1000, False,
+                                              error_message=str(e))
                 continue
         
         # All providers failed - return conservative default
@@ -426,6 +660,23 @@ class AICleanerOrchestrator:
             processing_time=0.0
         )
     
+    def _record_provider_request(self, provider_type: str, latency_ms: float, success: bool,
+                                 timed_out: bool = False, error_message: Optional[str] = None) -> None:
+        """Feed a live request outcome to the health monitor."""
+        if self.health_monitor:
+            self.health_monitor.record_request(provider_type, latency_ms, success, timed_out, error_message)
+    
+    async def _store_cached_result(self, cache_key: Tuple[str, str, str], provider_type: str,
+                                   result: AnalysisResult) -> None:
+        """Store a provider result in the result cache."""
+        content_hash, prompt_ver, privacy_level = cache_key
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.result_cache.put, content_hash, provider_type, prompt_ver, privacy_level, result
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache result for {content_hash}: {e}")
+    
     def _validate_analysis_result(self, result: AnalysisResult) -> bool:
         """Validate analysis result for basic sanity checks."""
         try:
@@ -493,10 +744,14 @@ class AICleanerOrchestrator:
                 "kept_images": self.stats.kept_images,
                 "deleted_images": self.stats.deleted_images,
                 "failed_images": self.stats.failed_images,
+                "resumed_images": self.stats.resumed_images,
                 "completion_rate": self.stats.completion_rate,
                 "deletion_rate": self.stats.deletion_rate,
                 "average_processing_time": self.stats.average_processing_time
             },
+            "file_hash_cache": self.hash_cache.get_stats(),
+            "result_cache": self.result_cache.get_stats() if self.result_cache else {"enabled": False},
+            "pipeline_queues": {name: queue.qsize() for name, queue in self._pipeline_queues.items()},
             "configuration": {
                 "privacy_level": self.config.processing.privacy_level.value,
                 "batch_size": self.config.processing.batch_size,
@@ -538,6 +793,10 @@ class AICleanerOrchestrator:
         # Clean up providers
         await self.provider_registry.cleanup_all()
         
+        if self.result_cache:
+            self.result_cache.close()
+            self.result_cache = None
+        
         logger.info("Orchestrator shutdown complete")
     
     async def get_health_status_for_ha(self) -> Dict[str, Any]:
@@ -0,0 +1,193 @@
+"""
+Persistent analysis result cache for AI Cleaner.
+
+Results are stored in SQLite keyed by image content hash, provider, prompt
+version and privacy level, so duplicate images and re-runs reuse earlier
+analyses instead of calling a provider again.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..providers.base_provider import AnalysisResult
+
+logger = logging.getLogger(__name__)
+
+
+def prompt_version(prompt: str) -> str:
+    """Short stable identifier for an analysis prompt."""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+
+
+class AnalysisResultCache:
+    """SQLite-backed result cache with LRU eviction by stored size.
+
+    Methods are synchronous and thread-safe; the orchestrator calls them from
+    the default executor so lookups do not block the event loop.
+    """
+
+    # Rows removed per eviction query
+    EVICTION_BATCH = 100
+
+    def __init__(self, db_path: Path, max_size_mb: float = 100.0):
+        self.db_path = Path(db_path)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                content_hash TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                privacy_level TEXT NOT NULL,
+                action TEXT NOT NULL,
+                confidence REAL NOT NULL,
+                reasoning TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                processing_time REAL NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (content_hash, prompt_version, privacy_level, provider)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_last_access ON results(last_access)")
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT COALESCE(SUM(size_bytes), 0), COUNT(*) FROM results").fetchone()
+        self._total_bytes, self._entries = row
+
+    def get(self, content_hash: str, providers: List[str], prompt_ver: str,
+            privacy_level: str) -> Optional[Tuple[str, AnalysisResult]]:
+        """Find a cached result, preferring providers in the given order.
+
+        Returns:
+            (provider, result) or None on a miss
+        """
+        if not providers:
+            return None
+
+        placeholders = ','.join('?' * len(providers))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT provider, action, confidence, reasoning, metadata, processing_time
+                    FROM results
+                    WHERE content_hash = ? AND prompt_version = ? AND privacy_level = ?
+                      AND provider IN ({placeholders})""",
+                (content_hash, prompt_ver, privacy_level, *providers)
+            ).fetchall()
+
+            if not rows:
+                self.misses += 1
+                return None
+
+            provider, action, confidence, reasoning, metadata, processing_time = min(
+                rows, key=lambda r: providers.index(r[0])
+            )
+            self._conn.execute(
+                """UPDATE results SET last_access = ?
+                   WHERE content_hash = ? AND prompt_version = ? AND privacy_level = ? AND provider = ?""",
+                (time.time(), content_hash, prompt_ver, privacy_level, provider)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        result = AnalysisResult(
+            action=action,
+            confidence=confidence,
+            reasoning=reasoning,
+            metadata={**json.loads(metadata), "cached": True, "cached_provider": provider},
+            processing_time=processing_time
+        )
+        return provider, result
+
+    def put(self, content_hash: str, provider: str, prompt_ver: str, privacy_level: str,
+            result: AnalysisResult) -> None:
+        """Store a result and evict least recently used entries over the size limit."""
+        metadata = json.dumps(result.metadata, default=str)
+        size_bytes = len(content_hash) + len(result.reasoning) + len(metadata) + 64
+        now = time.time()
+        key = (content_hash, prompt_ver, privacy_level, provider)
+
+        with self._lock:
+            previous = self._conn.execute(
+                """SELECT size_bytes FROM results
+                   WHERE content_hash = ? AND prompt_version = ? AND privacy_level = ? AND provider = ?""",
+                key
+            ).fetchone()
+            self._conn.execute(
+                """INSERT OR REPLACE INTO results
+                   (content_hash, prompt_version, privacy_level, provider, action, confidence,
+                    reasoning, metadata, processing_time, size_bytes, created_at, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (*key, result.action, result.confidence, result.reasoning, metadata,
+                 result.processing_time, size_bytes, now, now)
+            )
+            if previous:
+                self._total_bytes -= previous[0]
+            else:
+                self._entries += 1
+            self._total_bytes += size_bytes
+
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used rows until under the size limit. Caller holds the lock."""
+        while self._total_bytes > self.max_size_bytes and self._entries > 0:
+            rows = self._conn.execute(
+                """SELECT rowid, size_bytes FROM results ORDER BY last_access LIMIT ?""",
+                (self.EVICTION_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+
+            evicted = []
+            for rowid, size_bytes in rows:
+                if self._total_bytes <= self.max_size_bytes:
+                    break
+                evicted.append((rowid,))
+                self._total_bytes -= size_bytes
+
+            self._conn.executemany("DELETE FROM results WHERE rowid = ?", evicted)
+            self._entries -= len(evicted)
+            self.evictions += len(evicted)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+            self._total_bytes = 0
+            self._entries = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._entries,
+            "size_bytes": self._total_bytes,
+            "max_size_bytes": self.max_size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -14,7 +14,7 @@ import time
 import traceback
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Callable, AsyncGenerator
+from typing import Dict, Any, Optional, List, Callable, AsyncGenerator, Tuple
 from dataclasses import dataclass, field
 import argparse
 import os
@@ -36,8 +36,16 @@ except ImportError:
     print("Warning: paho-mqtt not installed. MQTT integration will be disabled.")
     mqtt = None
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    # Directory watching falls back to polling
+    Observer = None
+    FileSystemEventHandler = None
+
 from .config.loader import ConfigurationLoader
-from .config.schema import AICleanerConfig
+from .config.schema import AICleanerConfig, ProcessingConfig
 from .core.orchestrator import AICleanerOrchestrator
 from .core.health import HealthMonitor
 
@@ -66,19 +74,78 @@ class AppStats:
         self.uptime = time.time() - self.start_time
 
 
+class _ImageEventHandler(FileSystemEventHandler if FileSystemEventHandler else object):
+    """Forwards watchdog events from the observer thread to the event loop."""
+    
+    def __init__(self, watcher: 'DirectoryWatcher'):
+        super().__init__()
+        self.watcher = watcher
+        
+    def _forward(self, path: str, closed: bool) -> None:
+        self.watcher._loop.call_soon_threadsafe(self.watcher._on_file_event, Path(path), closed)
+        
+    def on_created(self, event) -> None:
+        if not event.is_directory:
+            self._forward(event.src_path, False)
+            
+    def on_modified(self, event) -> None:
+        if not event.is_directory:
+            self._forward(event.src_path, False)
+            
+    def on_closed(self, event) -> None:
+        # IN_CLOSE_WRITE: the writer is done with the file
+        if not event.is_directory:
+            self._forward(event.src_path, True)
+            
+    def on_moved(self, event) -> None:
+        # Files renamed into place are complete
+        if not event.is_directory:
+            self._forward(event.dest_path, True)
+
+
 class DirectoryWatcher:
-    """Watch directories for new images to process automatically."""
+    """Watch directories for new images to process automatically.
     
-    def __init__(self, app: 'AICleanerApp'):
+    Uses watchdog (inotify on Linux) when it is installed and falls back to
+    polling otherwise. Events are debounced per file: a file is dispatched
+    once it has been closed after writing and stayed quiet for
+    ``debounce_seconds``, or, where close events are unavailable, once it has
+    been quiet for ``settle_seconds``. A per-directory mtime cursor is
+    persisted to ``state_file`` so a restart only picks up files added since.
+    Without an explicit ``state_file`` it lives in the configured
+    ``processing.data_directory``, resolved when watching starts.
+    """
+    
+    STATE_FILENAME = 'aicleaner_watch_state.json'
+    
+    def __init__(self, app: 'AICleanerApp', state_file: Optional[Path] = None,
+                 poll_interval: float = 60.0, debounce_seconds: float = 2.0,
+                 settle_seconds: float = 10.0):
         self.app = app
         self.watched_directories: List[Path] = []
+        self.state_file: Optional[Path] = Path(state_file) if state_file else None
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        self.settle_seconds = settle_seconds
         self._monitoring_task: Optional[asyncio.Task] = None
         self._shutdown_event = asyncio.Event()
+        self._observer = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # path -> (last event time, closed after write)
+        self._pending: Dict[Path, Tuple[float, bool]] = {}
+        self._cursors: Dict[str, int] = {}
+        
+    @property
+    def mode(self) -> str:
+        """Current watching mode."""
+        return "inotify" if self._observer else "polling"
         
     def add_directory(self, directory: Path) -> bool:
         """Add a directory to watch for new images."""
         if directory.exists() and directory.is_dir():
             self.watched_directories.append(directory)
+            if self._observer:
+                self._observer.schedule(_ImageEventHandler(self), str(directory), recursive=False)
             logger.info(f"Added directory to watch: {directory}")
             return True
         logger.warning(f"Cannot watch non-existent directory: {directory}")
@@ -90,12 +157,35 @@ class DirectoryWatcher:
             return
             
         self._shutdown_event.clear()
+        self._loop = asyncio.get_running_loop()
+        
+        if self.state_file is None:
+            data_directory = (self.app.config.processing.data_directory
+                              if self.app.config else ProcessingConfig().data_directory)
+            self.state_file = Path(data_directory).expanduser().resolve() / self.STATE_FILENAME
+        self._cursors = await self._loop.run_in_executor(None, self._load_cursors)
+        
+        if Observer is not None:
+            try:
+                observer = Observer()
+                for directory in self.watched_directories:
+                    observer.schedule(_ImageEventHandler(self), str(directory), recursive=False)
+                observer.start()
+                self._observer = observer
+            except Exception as e:
+                logger.warning(f"File system events unavailable, falling back to polling: {e}")
+                self._observer = None
+        
         self._monitoring_task = asyncio.create_task(self._watch_loop())
-        logger.info("Directory watching started")
+        logger.info(f"Directory watching started ({self.mode})")
         
     async def stop_watching(self) -> None:
         """Stop monitoring directories."""
         self._shutdown_event.set()
+        if self._observer:
+            self._observer.stop()
+            await asyncio.get_running_loop().run_in_executor(None, self._observer.join)
+            self._observer = None
         if self._monitoring_task:
             self._monitoring_task.cancel()
             try:
@@ -105,30 +195,84 @@ class DirectoryWatcher:
             self._monitoring_task = None
         logger.info("Directory watching stopped")
         
+    def _is_image(self, path: Path) -> bool:
+        """Check whether a path has a supported image extension."""
+        formats = self.app.config.processing.supported_formats if self.app.config else []
+        return path.suffix.lower().lstrip('.') in formats
+        
+    def _on_file_event(self, path: Path, closed: bool) -> None:
+        """Record a file system event; runs on the event loop."""
+        if not self._is_image(path):
+            return
+        _, was_closed = self._pending.get(path, (0.0, False))
+        self._pending[path] = (time.monotonic(), closed or was_closed)
+        
+    def _take_ready_files(self) -> Dict[Path, List[Path]]:
+        """Pop debounced files that are ready, grouped by directory."""
+        now = time.monotonic()
+        ready: Dict[Path, List[Path]] = {}
+        for path, (last_event, closed) in list(self._pending.items()):
+            quiet = now - last_event
+            if quiet >= (self.debounce_seconds if closed else self.settle_seconds):
+                del self._pending[path]
+                ready.setdefault(path.parent, []).append(path)
+        return ready
+        
+    def _scan_directory(self, directory: Path) -> List[Path]:
+        """List images newer than the directory cursor in a single scandir pass.
+        
+        Files modified within settle_seconds are left for the next scan
+        since they may still be being written.
+        """
+        cursor = self._cursors.get(str(directory), 0)
+        settled_before = time.time_ns() - int(self.settle_seconds * 1e9)
+        new_images = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not self._is_image(Path(entry.name)):
+                    continue
+                mtime_ns = entry.stat().st_mtime_ns
+                if cursor < mtime_ns <= settled_before:
+                    new_images.append(Path(entry.path))
+        return new_images
+        
+    async def _dispatch(self, directory: Path, images: List[Path]) -> None:
+        """Process new images and advance the directory cursor."""
+        logger.info(f"Found {len(images)} new images in {directory}")
+        await self.app.process_directory_async(directory, images)
+        
+        latest = self._cursors.get(str(directory), 0)
+        for image in images:
+            try:
+                latest = max(latest, image.stat().st_mtime_ns)
+            except OSError:
+                continue
+        self._cursors[str(directory)] = latest
+        await asyncio.get_running_loop().run_in_executor(None, self._save_cursors)
+        
     async def _watch_loop(self) -> None:
         """Main directory watching loop."""
-        last_scan_times = {}
+        loop = asyncio.get_running_loop()
+        # Catch up on files added while not running
+        next_scan = 0.0
         
         while not self._shutdown_event.is_set():
             try:
-                for directory in self.watched_directories:
-                    last_scan = last_scan_times.get(str(directory), 0)
+                if time.monotonic() >= next_scan:
+                    for directory in list(self.watched_directories):
+                        new_images = await loop.run_in_executor(None, self._scan_directory, directory)
+                        new_images = [p for p in new_images if p not in self._pending]
+                        if new_images:
+                            await self._dispatch(directory, new_images)
+                    # With file system events, scanning is only a safety net
+                    next_scan = time.monotonic() + (
+                        self.poll_interval * 10 if self._observer else self.poll_interval
+                    )
                     
-                    # Find new images since last scan
-                    new_images = []
-                    for pattern in ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp', '*.webp']:
-                        for image_path in directory.glob(pattern):
-                            if image_path.stat().st_mtime > last_scan:
-                                new_images.append(image_path)
-                                
-                    if new_images:
-                        logger.info(f"Found {len(new_images)} new images in {directory}")
-                        await self.app.process_directory_async(directory, new_images)
-                        
-                    last_scan_times[str(directory)] = time.time()
+                for directory, images in self._take_ready_files().items():
+                    await self._dispatch(directory, images)
                     
-                # Wait before next scan
-                await asyncio.sleep(60)  # Check every minute
+                await asyncio.sleep(min(self.debounce_seconds, self.poll_interval))
                 
             except asyncio.CancelledError:
                 logger.info("Directory watcher cancelled")
@@ -136,6 +280,25 @@ class DirectoryWatcher:
             except Exception as e:
                 logger.error(f"Error in directory watcher: {e}")
                 await asyncio.sleep(30)
+                
+    def _load_cursors(self) -> Dict[str, int]:
+        """Load persisted per-directory cursors."""
+        try:
+            with open(self.state_file, 'r') as f:
+                return {k: int(v) for k, v in json.load(f).get('cursors', {}).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable watch state {self.state_file}: {e}")
+            return {}
+            
+    def _save_cursors(self) -> None:
+        """Persist per-directory cursors atomically."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump({'cursors': self._cursors}, f)
+        os.replace(temp_file, self.state_file)
 
 
 class MQTTClient:
@@ -749,7 +912,7 @@ class AICleanerApp:
                 "integrations": {
                     "web_api": "active" if self.web_api.runner else "inactive",
                     "mqtt": "connected" if (self.mqtt_client and self.mqtt_client.connected) else "disconnected",
-                    "directory_watcher": "active" if self.directory_watcher._monitoring_task else "inactive"
+                    "directory_watcher": self.directory_watcher.mode if self.directory_watcher._monitoring_task else "inactive"
                 },
                 "watched_directories": [str(d) for d in self.directory_watcher.watched_directories]
             }
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Privacy sanitization throughput benchmark
+
+Compares the previous full-resolution detect + Gaussian blur path with the
+downscaled-detection pixelation path, sequentially and across a process pool.
+
+Usage:
+    python scripts/benchmark_privacy.py [--count 24] [--size 1920x1080] [image ...]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from core.privacy_engine import (  # noqa: E402
+    PrivacyEngine, PrivacyLevel, SanitizationOptions, _get_face_cascade, sanitize_image_bytes
+)
+
+
+def synthetic_image(width: int, height: int, seed: int) -> bytes:
+    """Noisy room-like frame with printed text, encoded as JPEG"""
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 180, dtype=np.uint8)
+    for _ in range(12):
+        x1, y1 = int(rng.integers(0, width - 50)), int(rng.integers(0, height - 50))
+        x2, y2 = x1 + int(rng.integers(40, width // 3)), y1 + int(rng.integers(40, height // 3))
+        cv2.rectangle(image, (x1, y1), (x2, y2), tuple(int(c) for c in rng.integers(0, 255, 3)), -1)
+    for line in range(8):
+        cv2.putText(image, f"INVOICE 2024-{seed:03d}-{line}", (40, 80 + line * 60),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (20, 20, 20), 2)
+    noise = rng.normal(0, 6, image.shape)
+    image = np.clip(image + noise, 0, 255).astype(np.uint8)
+    _, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return buffer.tobytes()
+
+
+def legacy_sanitize(image_bytes: bytes) -> int:
+    """Previous implementation: full-resolution detection, Gaussian blur per region"""
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    regions = 0
+    cascade = _get_face_cascade()
+    if cascade is not None:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        for (x, y, w, h) in cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)):
+            image[y:y+h, x:x+w] = cv2.GaussianBlur(image[y:y+h, x:x+w], (99, 99), 30)
+            regions += 1
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
+    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for contour in contours:
+        if 100 < cv2.contourArea(contour) < 10000:
+            x, y, w, h = cv2.boundingRect(contour)
+            if 0.1 < w / h < 10:
+                image[y:y+h, x:x+w] = cv2.GaussianBlur(image[y:y+h, x:x+w], (15, 15), 0)
+                regions += 1
+    cv2.imencode('.jpg', image)
+    return regions
+
+
+def report(name: str, elapsed: float, count: int, regions: int):
+    print(f"{name:<28} {elapsed:8.2f}s {count / elapsed:8.2f} img/s {regions:8d} regions")
+
+
+async def sanitize_concurrently(engine: PrivacyEngine, images: List[bytes]):
+    """Issue one process_image call per image at once, as concurrent requests would"""
+    return await asyncio.gather(*(
+        engine.process_image(image, PrivacyLevel.LEVEL_2_SANITIZED) for image in images
+    ))
+
+
+async def run_pool(images: List[bytes], workers: int) -> float:
+    engine = PrivacyEngine({'max_workers': workers})
+    try:
+        # Warm the pool so worker start-up is not counted
+        await sanitize_concurrently(engine, images[:workers])
+        start = time.perf_counter()
+        results = await sanitize_concurrently(engine, images)
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.close()
+    report(f"pixelate pool ({workers} procs)", elapsed, len(images),
+           sum(len(r.objects_detected) for r in results))
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('images', nargs='*', help='Image files to use instead of synthetic frames')
+    parser.add_argument('--count', type=int, default=24, help='Number of synthetic frames')
+    parser.add_argument('--size', default='1920x1080', help='Synthetic frame size WIDTHxHEIGHT')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='Process pool size')
+    args = parser.parse_args()
+
+    if args.images:
+        images = [Path(p).read_bytes() for p in args.images]
+    else:
+        width, height = (int(v) for v in args.size.lower().split('x'))
+        images = [synthetic_image(width, height, i) for i in range(args.count)]
+    print(f"{len(images)} images, {args.workers} workers\n")
+
+    start = time.perf_counter()
+    regions = sum(legacy_sanitize(image) for image in images)
+    report("legacy blur (sequential)", time.perf_counter() - start, len(images), regions)
+
+    options = SanitizationOptions()
+    start = time.perf_counter()
+    regions = sum(len(sanitize_image_bytes(image, options).objects_detected) for image in images)
+    report("pixelate (sequential)", time.perf_counter() - start, len(images), regions)
+
+    asyncio.run(run_pool(images, args.workers))
+
+
+if __name__ == '__main__':
+    main()
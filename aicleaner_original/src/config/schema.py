@@ -103,15 +103,11 @@ class PrivacyConfig(BaseModel):
     allow_level_override: bool = Field(default=True, description="Allow per-request privacy level override")
     
     # Sanitization settings
-    face_blur_strength: int = Field(default=99, ge=3, le=199, description="Face blur kernel size (odd numbers)")
-    text_blur_strength: int = Field(default=15, ge=3, le=51, description="Text blur kernel size (odd numbers)")
     min_face_size: int = Field(default=30, ge=10, le=200, description="Minimum face detection size")
-    
-    @validator('face_blur_strength', 'text_blur_strength')
-    def validate_blur_strength(cls, v):
-        if v % 2 == 0:
-            raise ValueError('Blur strength must be odd number')
-        return v
+    detection_max_dimension: int = Field(default=960, ge=160, le=4096, description="Longest side of the downscaled copy used for detection")
+    pixelation_block_size: int = Field(default=16, ge=2, le=128, description="Pixelation cell size in pixels")
+    jpeg_quality: int = Field(default=95, ge=50, le=100, description="JPEG quality of sanitized images")
+    max_workers: Optional[int] = Field(default=None, ge=1, le=32, description="Worker processes for batch sanitization (None = CPU count)")
     
     @validator('default_level')
     def validate_privacy_level(cls, v):
@@ -139,6 +135,19 @@ class AnnotationConfig(BaseModel):
     show_confidence: bool = Field(default=True, description="Show confidence scores")
     alpha: float = Field(default=0.8, ge=0.1, le=1.0, description="Annotation transparency")
     
+    # Output
+    output_format: str = Field(default="JPEG", description="Annotated image format (JPEG, WEBP or PNG)")
+    output_quality: int = Field(default=90, ge=10, le=100, description="Annotated image quality")
+    preview_max_dimension: Optional[int] = Field(default=None, ge=160, le=4096, description="Downscale annotated images to this longest side")
+    max_workers: int = Field(default=2, ge=1, le=16, description="Annotation rendering threads")
+    
+    @validator('output_format')
+    def validate_output_format(cls, v):
+        v = v.upper()
+        if v not in ('JPEG', 'WEBP', 'PNG'):
+            raise ValueError(f'Unsupported annotation output format: {v}')
+        return v
+    
     @validator('box_color', 'text_color', 'background_color')
     def validate_color(cls, v):
         if not isinstance(v, list) or len(v) != 3:
@@ -3,16 +3,53 @@ Annotation Engine for AICleaner V3
 Handles bounding box processing and image overlay for visual annotations
 """
 
+import asyncio
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Any
 import io
+import logging
 import time
 
 from ..providers.base_provider import BoundingBox, Task
 
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=8)
+def _load_font(size: int) -> ImageFont.ImageFont:
+    """Load a font for text rendering, shared by all engines and workers"""
+    try:
+        # Try to load a system font
+        return ImageFont.truetype("arial.ttf", size)
+    except:
+        try:
+            # Try alternative font names
+            return ImageFont.truetype("DejaVuSans.ttf", size)
+        except:
+            # Use default PIL font
+            return ImageFont.load_default()
+
+@lru_cache(maxsize=4096)
+def _text_width(font: ImageFont.ImageFont, text: str) -> int:
+    """Rendered width of a line; task labels repeat, so measurements are cached"""
+    if hasattr(font, 'getbbox'):
+        bbox = font.getbbox(text)
+        return bbox[2] - bbox[0]
+    # Fallback for older PIL versions
+    return font.getsize(text)[0]
+
+@lru_cache(maxsize=8)
+def _line_height(font: ImageFont.ImageFont) -> int:
+    if hasattr(font, 'getbbox'):
+        bbox = font.getbbox('Ay')
+        return bbox[3] - bbox[1] + 2  # Add small padding
+    # Fallback for older PIL versions
+    return font.getsize('Ay')[1] + 2
+
 @dataclass
 class AnnotationStyle:
     """Configuration for visual annotation styling"""
@@ -32,6 +69,18 @@ class AnnotationConfig:
     number_tasks: bool = True
     show_confidence: bool = True
 
+@dataclass
+class AnnotationOutput:
+    """Encoding of annotated images"""
+    format: str = 'JPEG'                 # JPEG, WEBP or PNG
+    quality: int = 90
+    max_dimension: Optional[int] = None  # Longest side of a downscaled preview
+
+    def save_kwargs(self) -> Dict[str, Any]:
+        if self.format == 'PNG':
+            return {'format': 'PNG'}
+        return {'format': self.format, 'quality': self.quality}
+
 class AnnotationEngine:
     """Engine for creating visual annotations on images"""
     
@@ -39,67 +88,106 @@ class AnnotationEngine:
         self.config = config
         self.style = AnnotationStyle()
         self.annotation_config = AnnotationConfig()
-        
-        # Try to load a font, fallback to default if not available
-        self._font = self._load_font()
+        self.output = AnnotationOutput(
+            format=str(config.get('output_format', 'JPEG')).upper(),
+            quality=config.get('output_quality', 90),
+            max_dimension=config.get('preview_max_dimension')
+        )
+        self.max_workers = config.get('max_workers', 2)
+        self._executor: Optional[ThreadPoolExecutor] = None
     
-    def _load_font(self) -> Optional[ImageFont.FreeTypeFont]:
-        """Load a font for text rendering"""
-        try:
-            # Try to load a system font
-            return ImageFont.truetype("arial.ttf", self.style.font_size)
-        except:
-            try:
-                # Try alternative font names
-                return ImageFont.truetype("DejaVuSans.ttf", self.style.font_size)
-            except:
-                # Use default PIL font
-                return ImageFont.load_default()
+    @property
+    def _font(self) -> ImageFont.ImageFont:
+        return _load_font(self.style.font_size)
     
-    async def annotate_image(self, image_bytes: bytes, tasks: List[Task]) -> bytes:
+    async def annotate_image(self, image_bytes: bytes, tasks: List[Task], output: Optional[AnnotationOutput] = None) -> bytes:
         """
         Add visual annotations to an image based on tasks
         
         Args:
             image_bytes: Original image as bytes
             tasks: List of tasks with bounding box annotations
+            output: Encoding override, defaults to the configured output
             
         Returns:
             Annotated image as bytes
         """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._render, image_bytes, tasks, output or self.output)
+    
+    async def annotate_many(self, items: List[Tuple[bytes, List[Task]]], output: Optional[AnnotationOutput] = None) -> List[bytes]:
+        """
+        Annotate several images concurrently on the worker pool
+        
+        Args:
+            items: (image bytes, tasks) pairs
+            output: Encoding override, e.g. a WebP preview for the dashboard
+            
+        Returns:
+            Annotated images as bytes, in input order
+        """
+        return list(await asyncio.gather(*(
+            self.annotate_image(image_bytes, tasks, output) for image_bytes, tasks in items
+        )))
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='annotate')
+        return self._executor
+    
+    def close(self) -> None:
+        """Shut down the rendering worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def _render(self, image_bytes: bytes, tasks: List[Task], output: AnnotationOutput) -> bytes:
+        """Decode, draw and encode one image; runs on a worker thread"""
         start_time = time.time()
         
-        # Convert bytes to PIL Image
         image = Image.open(io.BytesIO(image_bytes))
+        original_width = image.size[0]
+        
+        # Previews let the JPEG decoder skip most of the full-resolution work
+        if output.max_dimension:
+            image.draft('RGB', (output.max_dimension, output.max_dimension))
         if image.mode != 'RGB':
             image = image.convert('RGB')
+        if output.max_dimension:
+            image.thumbnail((output.max_dimension, output.max_dimension))
+        scale = image.size[0] / original_width
         
-        # Create a copy for annotation
-        annotated = image.copy()
-        draw = ImageDraw.Draw(annotated)
+        # Draw directly on the decoded image
+        draw = ImageDraw.Draw(image)
         
         # Filter tasks that have annotations
         annotated_tasks = [task for task in tasks if task.annotation is not None]
         
         # Draw annotations for each task
         for i, task in enumerate(annotated_tasks, 1):
-            await self._draw_task_annotation(draw, task, i, image.size)
+            self._draw_task_annotation(draw, task, i, image.size, scale)
         
         # Convert back to bytes
-        output = io.BytesIO()
-        annotated.save(output, format='JPEG', quality=90)
+        buffer = io.BytesIO()
+        image.save(buffer, **output.save_kwargs())
         
-        processing_time = time.time() - start_time
-        print(f"Image annotation completed in {processing_time:.3f} seconds")
+        logger.debug(f"Image annotation completed in {time.time() - start_time:.3f} seconds")
         
-        return output.getvalue()
+        return buffer.getvalue()
     
-    async def _draw_task_annotation(self, draw: ImageDraw.Draw, task: Task, task_number: int, image_size: Tuple[int, int]) -> None:
+    def _draw_task_annotation(self, draw: ImageDraw.Draw, task: Task, task_number: int, image_size: Tuple[int, int], scale: float = 1.0) -> None:
         """Draw annotation for a single task"""
         if task.annotation is None:
             return
         
         bbox = task.annotation
+        if scale != 1.0:
+            bbox = BoundingBox(
+                x1=int(bbox.x1 * scale),
+                y1=int(bbox.y1 * scale),
+                x2=int(bbox.x2 * scale),
+                y2=int(bbox.y2 * scale)
+            )
         
         # Ensure bounding box is within image bounds
         bbox = self._clamp_bbox(bbox, image_size)
@@ -116,7 +204,7 @@ class AnnotationEngine:
         
         # Draw text background and text
         if text_lines:
-            await self._draw_text_with_background(draw, text_lines, bbox, image_size)
+            self._draw_text_with_background(draw, text_lines, bbox, image_size)
     
     def _clamp_bbox(self, bbox: BoundingBox, image_size: Tuple[int, int]) -> BoundingBox:
         """Ensure bounding box coordinates are within image bounds"""
@@ -154,7 +242,7 @@ class AnnotationEngine:
         
         return lines
     
-    async def _draw_text_with_background(self, draw: ImageDraw.Draw, text_lines: List[str], bbox: BoundingBox, image_size: Tuple[int, int]) -> None:
+    def _draw_text_with_background(self, draw: ImageDraw.Draw, text_lines: List[str], bbox: BoundingBox, image_size: Tuple[int, int]) -> None:
         """Draw text with a background for readability"""
         
         # Calculate text dimensions
@@ -203,31 +291,15 @@ class AnnotationEngine:
         if not text_lines:
             return (0, 0, 0, 0)
         
-        max_width = 0
-        total_height = 0
-        line_height = self._get_line_height()
-        
-        for line in text_lines:
-            if hasattr(self._font, 'getbbox'):
-                bbox = self._font.getbbox(line)
-                width = bbox[2] - bbox[0]
-            else:
-                # Fallback for older PIL versions
-                width, _ = self._font.getsize(line)
-            
-            max_width = max(max_width, width)
-            total_height += line_height
+        font = self._font
+        max_width = max(_text_width(font, line) for line in text_lines)
+        total_height = self._get_line_height() * len(text_lines)
         
         return (0, 0, max_width, total_height)
     
     def _get_line_height(self) -> int:
         """Get line height for text rendering"""
-        if hasattr(self._font, 'getbbox'):
-            bbox = self._font.getbbox('Ay')
-            return bbox[3] - bbox[1] + 2  # Add small padding
-        else:
-            # Fallback for older PIL versions
-            return self._font.getsize('Ay')[1] + 2
+        return _line_height(self._font)
     
     def create_summary_image(self, tasks: List[Task], image_size: Tuple[int, int] = (400, 300)) -> bytes:
         """
@@ -479,4 +479,5 @@ class PDCAOrchestrator:
     async def shutdown(self) -> None:
         """Clean shutdown of orchestrator"""
         self.logger.info("Shutting down orchestrator")
-        # Could add cleanup logic here if needed
\ No newline at end of file
+        self.privacy_engine.close()
+        self.annotation_engine.close()
\ No newline at end of file
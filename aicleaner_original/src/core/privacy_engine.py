@@ -3,8 +3,11 @@ Privacy Engine for AICleaner V3
 Handles image sanitization for the 4-level privacy spectrum
 """
 
+import asyncio
 import cv2
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
 from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
@@ -17,6 +20,9 @@ class PrivacyLevel(Enum):
     LEVEL_3_METADATA = 3  # Metadata only to cloud (limited effectiveness)
     LEVEL_4_LOCAL = 4     # Full local processing (maximum privacy)
 
+# Levels that forward the original bytes and never need a decoded image
+PASS_THROUGH_LEVELS = (PrivacyLevel.LEVEL_1_RAW, PrivacyLevel.LEVEL_4_LOCAL)
+
 @dataclass
 class DetectedObject:
     """Represents an object detected during privacy scanning"""
@@ -33,24 +39,194 @@ class SanitizationResult:
     processing_time: float
     privacy_level: PrivacyLevel
 
+@dataclass(frozen=True)
+class SanitizationOptions:
+    """Tuning for Level 2 sanitization, picklable for worker processes"""
+    detection_max_dimension: int = 960  # Longest side of the copy used for detection
+    pixelation_block_size: int = 16     # Mosaic cell size in full-resolution pixels
+    min_face_size: int = 30             # In full-resolution pixels
+    jpeg_quality: int = 95
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'SanitizationOptions':
+        return cls(
+            detection_max_dimension=int(config.get('detection_max_dimension', cls.detection_max_dimension)),
+            pixelation_block_size=int(config.get('pixelation_block_size', cls.pixelation_block_size)),
+            min_face_size=int(config.get('min_face_size', cls.min_face_size)),
+            jpeg_quality=int(config.get('jpeg_quality', cls.jpeg_quality)),
+        )
+
+# Loaded lazily once per process, so pool workers each build their own
+_face_cascade = None
+_face_cascade_loaded = False
+
+def _get_face_cascade():
+    """Load OpenCV's pre-trained face cascade for the current process"""
+    global _face_cascade, _face_cascade_loaded
+    if not _face_cascade_loaded:
+        _face_cascade_loaded = True
+        try:
+            cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            )
+            _face_cascade = None if cascade.empty() else cascade
+        except Exception as e:
+            print(f"Warning: Could not initialize face detection: {e}")
+            _face_cascade = None
+    return _face_cascade
+
+def _decode_image(image_bytes: bytes) -> np.ndarray:
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Invalid image data")
+    return image
+
+def _detect_regions(image: np.ndarray, options: SanitizationOptions) -> List[DetectedObject]:
+    """
+    Detect faces and text-like regions on a downscaled grayscale copy
+
+    Boxes are mapped back to full-resolution coordinates. Faces smaller than
+    the cascade window at detection scale are missed, so
+    detection_max_dimension trades recall on small faces for speed.
+    """
+    height, width = image.shape[:2]
+    scale = min(1.0, options.detection_max_dimension / float(max(height, width)))
+    if scale < 1.0:
+        small = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+    else:
+        small = image
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def to_full(x, y, w, h) -> tuple:
+        return (
+            int(x / scale),
+            int(y / scale),
+            min(width, int(np.ceil((x + w) / scale))),
+            min(height, int(np.ceil((y + h) / scale))),
+        )
+
+    detected = []
+
+    face_cascade = _get_face_cascade()
+    if face_cascade is not None:
+        min_face = max(24, round(options.min_face_size * scale))
+        faces = face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.1,
+            minNeighbors=5,
+            minSize=(min_face, min_face)
+        )
+        for (x, y, w, h) in faces:
+            detected.append(DetectedObject(
+                type="face",
+                confidence=0.8,  # OpenCV doesn't provide confidence scores
+                bbox=to_full(x, y, w, h)
+            ))
+
+    # Use adaptive threshold to find text-like regions
+    binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
+    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    # Area limits are in full-resolution pixels
+    area_scale = scale * scale
+    min_area, max_area = 100 * area_scale, 10000 * area_scale
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if min_area < area < max_area:  # Text-like size range
+            x, y, w, h = cv2.boundingRect(contour)
+            # Text usually has certain aspect ratios
+            if 0.1 < w / h < 10:
+                detected.append(DetectedObject(
+                    type="text",
+                    confidence=0.6,
+                    bbox=to_full(x, y, w, h)
+                ))
+
+    return detected
+
+def _pixelate_regions(image: np.ndarray, regions: List[DetectedObject], block_size: int) -> None:
+    """
+    Pixelate all detected regions in place
+
+    The frame is mosaicked once (area downscale, nearest-neighbour upscale)
+    and copied into the union of the boxes, so the cost does not grow with
+    the number of regions.
+    """
+    if not regions:
+        return
+
+    height, width = image.shape[:2]
+    mask = np.zeros((height, width), dtype=bool)
+    for obj in regions:
+        x1, y1, x2, y2 = obj.bbox
+        mask[y1:y2, x1:x2] = True
+
+    ys, xs = np.nonzero(mask.any(axis=1))[0], np.nonzero(mask.any(axis=0))[0]
+    top, bottom, left, right = ys[0], ys[-1] + 1, xs[0], xs[-1] + 1
+    roi = image[top:bottom, left:right]
+    roi_h, roi_w = roi.shape[:2]
+
+    block = max(1, block_size)
+    mosaic = cv2.resize(roi, (max(1, roi_w // block), max(1, roi_h // block)), interpolation=cv2.INTER_AREA)
+    mosaic = cv2.resize(mosaic, (roi_w, roi_h), interpolation=cv2.INTER_NEAREST)
+    np.copyto(roi, mosaic, where=mask[top:bottom, left:right, None])
+
+def _generate_metadata(image: np.ndarray, detected_objects: List[DetectedObject]) -> Dict[str, Any]:
+    """Generate metadata about the image for analysis"""
+    height, width = image.shape[:2]
+
+    return {
+        "image_dimensions": {"width": width, "height": height},
+        "objects_sanitized": len(detected_objects),
+        "sanitization_types": list(set(obj.type for obj in detected_objects)),
+        "privacy_level": "sanitized",
+        "processing_method": "opencv_pixelate"
+    }
+
+def sanitize_image_bytes(image_bytes: bytes, options: SanitizationOptions = SanitizationOptions()) -> SanitizationResult:
+    """
+    Decode, sanitize and re-encode one image for Level 2
+
+    Synchronous and module-level so it can run in a thread or a worker process.
+
+    Args:
+        image_bytes: Encoded image data
+        options: Sanitization tuning
+
+    Returns:
+        SanitizationResult with the pixelated JPEG
+    """
+    start_time = time.time()
+    image = _decode_image(image_bytes)
+
+    detected_objects = _detect_regions(image, options)
+    _pixelate_regions(image, detected_objects, options.pixelation_block_size)
+
+    _, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, options.jpeg_quality])
+
+    return SanitizationResult(
+        sanitized_image=buffer.tobytes(),
+        metadata=_generate_metadata(image, detected_objects),
+        objects_detected=detected_objects,
+        processing_time=time.time() - start_time,
+        privacy_level=PrivacyLevel.LEVEL_2_SANITIZED
+    )
+
 class PrivacyEngine:
     """Core privacy processing engine"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
+        self.options = SanitizationOptions.from_config(config)
+        self.max_workers = config.get('max_workers')
+        self._process_pool: Optional[ProcessPoolExecutor] = None
         self._face_cascade = None
         self._initialize_detectors()
     
     def _initialize_detectors(self):
         """Initialize OpenCV classifiers for privacy detection"""
-        try:
-            # Load OpenCV's pre-trained face cascade
-            self._face_cascade = cv2.CascadeClassifier(
-                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            )
-        except Exception as e:
-            print(f"Warning: Could not initialize face detection: {e}")
-            self._face_cascade = None
+        self._face_cascade = _get_face_cascade()
     
     async def process_image(self, image_bytes: bytes, privacy_level: PrivacyLevel) -> SanitizationResult:
         """
@@ -65,82 +241,58 @@ class PrivacyEngine:
         """
         start_time = time.time()
         
-        # Convert bytes to OpenCV image
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image is None:
-            raise ValueError("Invalid image data")
-        
-        # Process based on privacy level
-        if privacy_level == PrivacyLevel.LEVEL_1_RAW:
-            return SanitizationResult(
-                sanitized_image=image_bytes,  # No processing
-                metadata={},
-                objects_detected=[],
-                processing_time=time.time() - start_time,
-                privacy_level=privacy_level
-            )
+        # Pass-through levels forward the original bytes without decoding
+        if privacy_level in PASS_THROUGH_LEVELS:
+            return self._pass_through(image_bytes, privacy_level, start_time)
         
         elif privacy_level == PrivacyLevel.LEVEL_2_SANITIZED:
-            return await self._sanitize_image(image, image_bytes, start_time, privacy_level)
+            return await self._sanitize_image(image_bytes)
         
         elif privacy_level == PrivacyLevel.LEVEL_3_METADATA:
+            image = _decode_image(image_bytes)
             return await self._extract_metadata_only(image, start_time, privacy_level)
-        
-        elif privacy_level == PrivacyLevel.LEVEL_4_LOCAL:
-            # For local processing, we still need to pass the image
-            # but mark it for local-only processing
-            return SanitizationResult(
-                sanitized_image=image_bytes,
-                metadata={"local_processing": True},
-                objects_detected=[],
-                processing_time=time.time() - start_time,
-                privacy_level=privacy_level
-            )
     
-    async def _sanitize_image(self, image, original_bytes: bytes, start_time: float, privacy_level: PrivacyLevel) -> SanitizationResult:
-        """Sanitize image by blurring sensitive areas"""
-        detected_objects = []
-        sanitized_image = image.copy()
-        
-        # Detect and blur faces
-        if self._face_cascade is not None:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            faces = self._face_cascade.detectMultiScale(
-                gray, 
-                scaleFactor=1.1, 
-                minNeighbors=5,
-                minSize=(30, 30)
-            )
-            
-            for (x, y, w, h) in faces:
-                # Apply strong gaussian blur to face region
-                face_region = sanitized_image[y:y+h, x:x+w]
-                blurred_face = cv2.GaussianBlur(face_region, (99, 99), 30)
-                sanitized_image[y:y+h, x:x+w] = blurred_face
-                
-                detected_objects.append(DetectedObject(
-                    type="face",
-                    confidence=0.8,  # OpenCV doesn't provide confidence scores
-                    bbox=(x, y, x+w, y+h)
-                ))
-        
-        # Detect and blur text/documents (simple approach using contours)
-        detected_objects.extend(await self._detect_and_blur_text(sanitized_image))
-        
-        # Convert back to bytes
-        _, buffer = cv2.imencode('.jpg', sanitized_image)
-        sanitized_bytes = buffer.tobytes()
-        
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._process_pool
+    
+    def _shutdown_process_pool(self):
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+    
+    def close(self):
+        """Shut down the sanitization worker pool"""
+        self._shutdown_process_pool()
+    
+    def _pass_through(self, image_bytes: bytes, privacy_level: PrivacyLevel, start_time: float) -> SanitizationResult:
+        # For local processing, we still need to pass the image
+        # but mark it for local-only processing
+        metadata = {"local_processing": True} if privacy_level == PrivacyLevel.LEVEL_4_LOCAL else {}
         return SanitizationResult(
-            sanitized_image=sanitized_bytes,
-            metadata=self._generate_metadata(image, detected_objects),
-            objects_detected=detected_objects,
+            sanitized_image=image_bytes,  # No processing
+            metadata=metadata,
+            objects_detected=[],
             processing_time=time.time() - start_time,
             privacy_level=privacy_level
         )
     
+    async def _sanitize_image(self, image_bytes: bytes) -> SanitizationResult:
+        """Sanitize image by pixelating sensitive areas in the worker process pool
+        
+        Concurrent requests are spread across worker processes. If the pool
+        breaks, sanitization falls back to the default thread executor.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_process_pool(), sanitize_image_bytes,
+                                              image_bytes, self.options)
+        except BrokenProcessPool as e:
+            print(f"Warning: Privacy worker pool failed, sanitizing in threads: {e}")
+            self._shutdown_process_pool()
+            return await loop.run_in_executor(None, sanitize_image_bytes, image_bytes, self.options)
+    
     async def _extract_metadata_only(self, image, start_time: float, privacy_level: PrivacyLevel) -> SanitizationResult:
         """Extract only metadata from image for Level 3 processing"""
         
@@ -175,62 +327,10 @@ class PrivacyEngine:
             privacy_level=privacy_level
         )
     
-    async def _detect_and_blur_text(self, image) -> List[DetectedObject]:
-        """Simple text/document detection and blurring"""
-        detected = []
-        
-        # Convert to grayscale for text detection
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Use adaptive threshold to find text-like regions
-        binary = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 11, 2)
-        
-        # Find contours that might be text
-        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if 100 < area < 10000:  # Text-like size range
-                x, y, w, h = cv2.boundingRect(contour)
-                aspect_ratio = w / h
-                
-                # Text usually has certain aspect ratios
-                if 0.1 < aspect_ratio < 10:
-                    # Apply blur to potential text region
-                    text_region = image[y:y+h, x:x+w]
-                    blurred_text = cv2.GaussianBlur(text_region, (15, 15), 0)
-                    image[y:y+h, x:x+w] = blurred_text
-                    
-                    detected.append(DetectedObject(
-                        type="text",
-                        confidence=0.6,
-                        bbox=(x, y, x+w, y+h)
-                    ))
-        
-        return detected
-    
-    def _generate_metadata(self, image, detected_objects: List[DetectedObject]) -> Dict[str, Any]:
-        """Generate metadata about the image for analysis"""
-        height, width = image.shape[:2]
-        
-        return {
-            "image_dimensions": {"width": width, "height": height},
-            "objects_sanitized": len(detected_objects),
-            "sanitization_types": list(set(obj.type for obj in detected_objects)),
-            "privacy_level": "sanitized",
-            "processing_method": "opencv_blur"
-        }
-    
     def _get_dominant_color(self, image) -> np.ndarray:
         """Get dominant color in image"""
-        pixels = image.reshape(-1, 3)
-        pixels = np.float32(pixels)
-        
-        # Use k-means to find dominant color
-        criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 1.0)
-        _, labels, centers = cv2.kmeans(pixels, 1, None, criteria, 10, cv2.KMEANS_RANDOM_CENTERS)
-        
-        return centers[0].astype(np.uint8)
+        # A single k-means cluster converges to the mean colour
+        return image.reshape(-1, 3).mean(axis=0).astype(np.uint8)
     
     def get_privacy_level_description(self, level: PrivacyLevel) -> str:
         """Get human-readable description of privacy level"""
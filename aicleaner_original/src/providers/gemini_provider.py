@@ -4,7 +4,6 @@ Enhanced with visual grounding capabilities for bounding box annotations
 """
 
 import asyncio
-import base64
 import json
 import time
 from typing import Dict, Any, List, Optional, Tuple
@@ -16,6 +15,7 @@ from .base_provider import (
     LLMProvider, AnalysisResult, Task, BoundingBox, 
     ProviderHealth, ProviderStatus, ProviderCapability
 )
+from .payload_cache import IMAGE_PLACEHOLDER, JSON_HEADERS, build_json_body, image_cache
 
 class GeminiProvider(LLMProvider):
     """
@@ -157,8 +157,8 @@ Respond ONLY with valid JSON, no other text."""
         """Make API request to Gemini with retry logic"""
         session = await self._get_session()
         
-        # Encode image to base64
-        image_b64 = base64.b64encode(image).decode('utf-8')
+        # Encoded once per image and shared with retries and other providers
+        image_b64 = image_cache.get(image)
         
         # Prepare request
         url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
@@ -171,7 +171,7 @@ Respond ONLY with valid JSON, no other text."""
                         {
                             "inline_data": {
                                 "mime_type": "image/jpeg",
-                                "data": image_b64
+                                "data": IMAGE_PLACEHOLDER
                             }
                         }
                     ]
@@ -185,13 +185,15 @@ Respond ONLY with valid JSON, no other text."""
             }
         }
         
+        body = build_json_body(payload, image_b64)
+        
         # Retry logic
         last_exception = None
         for attempt in range(self.max_retries):
             try:
                 self.logger.debug(f"Making Gemini API request (attempt {attempt + 1}/{self.max_retries})")
                 
-                async with session.post(url, json=payload) as response:
+                async with session.post(url, data=body, headers=JSON_HEADERS) as response:
                     if response.status == 200:
                         data = await response.json()
                         return data
@@ -4,7 +4,6 @@ Connects to external user-managed Ollama instance for local LLM processing
 """
 
 import asyncio
-import base64
 import json
 import time
 from typing import Dict, Any, List, Optional, Tuple
@@ -16,6 +15,7 @@ from .base_provider import (
     LLMProvider, AnalysisResult, Task, BoundingBox, 
     ProviderHealth, ProviderStatus, ProviderCapability
 )
+from .payload_cache import IMAGE_PLACEHOLDER, JSON_HEADERS, build_json_body, image_cache
 
 class OllamaProvider(LLMProvider):
     """
@@ -135,14 +135,14 @@ Respond with valid JSON only."""
         """Make vision request to Ollama API"""
         session = await self._get_session()
         
-        # Encode image to base64
-        image_b64 = base64.b64encode(image).decode('utf-8')
+        # Encoded once per image and shared with retries and other providers
+        image_b64 = image_cache.get(image)
         
         url = f"{self.base_url}/api/generate"
         payload = {
             "model": model,
             "prompt": prompt,
-            "images": [image_b64],
+            "images": [IMAGE_PLACEHOLDER],
             "stream": False,
             "options": {
                 "temperature": kwargs.get('temperature', 0.1),
@@ -151,7 +151,7 @@ Respond with valid JSON only."""
             }
         }
         
-        return await self._execute_ollama_request(session, url, payload)
+        return await self._execute_ollama_request(session, url, build_json_body(payload, image_b64))
     
     async def _make_text_request(self, prompt: str, model: str, **kwargs) -> Dict[str, Any]:
         """Make text-only request to Ollama API"""
@@ -169,17 +169,17 @@ Respond with valid JSON only."""
             }
         }
         
-        return await self._execute_ollama_request(session, url, payload)
+        return await self._execute_ollama_request(session, url, build_json_body(payload))
     
-    async def _execute_ollama_request(self, session: aiohttp.ClientSession, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute request to Ollama with retry logic"""
+    async def _execute_ollama_request(self, session: aiohttp.ClientSession, url: str, body: bytes) -> Dict[str, Any]:
+        """Execute request to Ollama with retry logic, reusing the serialized body"""
         last_exception = None
         
         for attempt in range(self.max_retries):
             try:
                 self.logger.debug(f"Making Ollama request to {self.host}:{self.port} (attempt {attempt + 1})")
                 
-                async with session.post(url, json=payload) as response:
+                async with session.post(url, data=body, headers=JSON_HEADERS) as response:
                     if response.status == 200:
                         data = await response.json()
                         return data
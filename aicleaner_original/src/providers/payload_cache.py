@@ -0,0 +1,111 @@
+"""
+Shared request payload helpers for AICleaner V3 providers
+Encodes each image to base64 once and reuses it across retries and providers
+"""
+
+import base64
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Stands in for the image data while the rest of the payload is serialized
+IMAGE_PLACEHOLDER = "__aicleaner_image_b64__"
+_PLACEHOLDER_TOKEN = json.dumps(IMAGE_PLACEHOLDER).encode('ascii')
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+class EncodedImageCache:
+    """
+    Small LRU of base64-encoded images keyed by content digest
+
+    The orchestrator passes the same bytes object to every attempt and every
+    provider in a fallback chain, so lookups first match by identity and only
+    hash the image when it is a new object.
+    """
+
+    def __init__(self, max_entries: int = 8, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[bytes, Tuple[bytes, bytes]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(image: bytes) -> bytes:
+        """Content digest used as the cache key"""
+        return hashlib.blake2b(image, digest_size=16).digest()
+
+    def get(self, image: bytes) -> bytes:
+        """Return the base64 encoding of an image as ASCII bytes"""
+        with self._lock:
+            for key, (source, encoded) in self._entries.items():
+                if source is image:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return encoded
+
+        key = self.digest(image)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        encoded = base64.b64encode(image)
+
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries:
+                self._entries[key] = (image, encoded)
+                self._total_bytes += len(image) + len(encoded)
+                self._evict()
+        return encoded
+
+    def _evict(self) -> None:
+        """Drop least recently used entries over the limits. Caller holds the lock."""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, (source, encoded) = self._entries.popitem(last=False)
+            self._total_bytes -= len(source) + len(encoded)
+
+    def clear(self) -> None:
+        """Remove all cached encodings"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit counts"""
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Shared by all providers so a failover does not encode the image again
+image_cache = EncodedImageCache()
+
+
+def build_json_body(payload: Dict[str, Any], image_b64: Optional[bytes] = None) -> bytes:
+    """
+    Serialize a request payload to bytes once so retries can reuse it
+
+    When ``image_b64`` is given, the payload must contain IMAGE_PLACEHOLDER
+    where the image string belongs. The encoded image is spliced into the
+    serialized bytes instead of being passed through the JSON encoder, which
+    would copy and scan the whole string.
+    """
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    if image_b64 is None:
+        return body
+    head, tail = body.split(_PLACEHOLDER_TOKEN, 1)
+    return b''.join((head, b'"', image_b64, b'"', tail))